@@ -0,0 +1,107 @@
+# path: benchmarks/bench_classifier.py
+"""
+Бенчмарк BidClassifier против наивного подхода «regex на каждое слово».
+
+Генерирует словарь из нескольких тысяч ключевых фраз (по категориям)
+и поток описаний заявок, после чего сравнивает:
+- BidClassifier — один автомат Ахо–Корасик, один проход по тексту;
+- baseline — re.search для каждой фразы по каждому описанию.
+
+Пример:
+
+    poetry run python benchmarks/bench_classifier.py --keywords 5000 --bids 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from typing import Sequence
+
+from dan_max_bids_parser.domain.entities import ConfigEntryEntity
+from dan_max_bids_parser.domain.services.classifier import BidClassifier
+
+_BASE_CARGO = ["щебень", "песок", "гравий", "отсев", "пгс", "грунт", "камень", "торф"]
+_ADJECTIVES = ["гранитный", "речной", "карьерный", "мытый", "сеяный", "известняковый", "крупный"]
+_FILLER = "нужен транспорт загрузка утром оплата на карту без ндс срочно звонить".split()
+
+
+def generate_config(keywords: int, seed: int) -> list[ConfigEntryEntity]:
+    """Словарь из ~keywords фраз, разбитый на категории по 50 фраз."""
+    rng = random.Random(seed)
+    categories: dict[str, list[str]] = {}
+    for idx in range(keywords):
+        category = f"cat-{idx // 50}"
+        phrase = f"{rng.choice(_ADJECTIVES)} {rng.choice(_BASE_CARGO)} марки{idx}"
+        categories.setdefault(category, []).append(phrase)
+    return [
+        ConfigEntryEntity(
+            id=1,
+            code="bench",
+            name="bench",
+            data={"target": "cargo_type", "categories": categories},
+        )
+    ]
+
+
+def generate_descriptions(count: int, phrases: Sequence[str], seed: int) -> list[str]:
+    """Описания из «шума», в половину которых вставлена фраза из словаря."""
+    rng = random.Random(seed + 1)
+    result = []
+    for idx in range(count):
+        words = rng.choices(_FILLER, k=25)
+        if idx % 2 == 0:
+            words.insert(rng.randint(0, len(words)), rng.choice(phrases))
+        result.append(" ".join(words))
+    return result
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keywords", type=int, default=5_000)
+    parser.add_argument("--bids", type=int, default=20_000)
+    parser.add_argument(
+        "--baseline-bids",
+        type=int,
+        default=200,
+        help="Сколько описаний прогнать через наивный baseline (он медленный).",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    entries = generate_config(args.keywords, args.seed)
+    phrases = [p for ps in entries[0].data["categories"].values() for p in ps]
+    descriptions = generate_descriptions(args.bids, phrases, args.seed)
+
+    classifier = BidClassifier()
+    started = time.perf_counter()
+    classifier.refresh(entries)
+    compile_time = time.perf_counter() - started
+    print(f"Compiled {classifier.keywords_count} keywords in {compile_time * 1000:.1f} ms")
+
+    started = time.perf_counter()
+    matched = sum(1 for text in descriptions if classifier.match(text))
+    elapsed = time.perf_counter() - started
+    ac_rate = len(descriptions) / elapsed
+    print(f"Aho-Corasick: {len(descriptions)} bids in {elapsed:.2f}s ({ac_rate:,.0f} bids/s, matched {matched})")
+
+    patterns = [re.compile(re.escape(phrase), re.IGNORECASE) for phrase in phrases]
+    sample = descriptions[: args.baseline_bids]
+    started = time.perf_counter()
+    for text in sample:
+        for pattern in patterns:
+            pattern.search(text)
+    elapsed = time.perf_counter() - started
+    baseline_rate = len(sample) / elapsed
+    print(f"Regex per keyword: {len(sample)} bids in {elapsed:.2f}s ({baseline_rate:,.0f} bids/s)")
+    print(f"Speedup: x{ac_rate / baseline_rate:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
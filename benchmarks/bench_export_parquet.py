@@ -0,0 +1,115 @@
+# path: benchmarks/bench_export_parquet.py
+"""
+Бенчмарк колоночной выгрузки (ExportAnalyticsService + ParquetDatasetWriter)
+в сравнении с CSV-дампом тех же колонок.
+
+База SQLite заполняется N синтетическими заявками в отдельном процессе
+(bench_export_xlsx.fill_database). Печатаются время, размер на диске и
+пиковый RSS для Parquet (zstd) и для CSV (csv.writer по тем же порциям).
+
+    poetry run python benchmarks/bench_export_parquet.py --rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import multiprocessing
+import resource
+import tempfile
+import time
+from pathlib import Path
+from typing import Sequence
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from bench_export_xlsx import fill_database
+
+from dan_max_bids_parser.application.use_cases.export_analytics import ExportAnalyticsCommand
+from dan_max_bids_parser.application.use_cases.export_analytics_service import (
+    ExportAnalyticsService,
+)
+from dan_max_bids_parser.domain.services import analytics_export
+from dan_max_bids_parser.infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+from dan_max_bids_parser.infrastructure.export.parquet_writer import ParquetDatasetWriter
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _dir_mb(path: Path) -> float:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file()) / 2**20
+
+
+def export_parquet(db_path: str, out_dir: Path, batch_size: int, queue) -> None:
+    engine = create_engine(f"sqlite:///{db_path}", future=True)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    service = ExportAnalyticsService(
+        lambda: SqlAlchemyUnitOfWork(factory), ParquetDatasetWriter(out_dir)
+    )
+    started = time.perf_counter()
+    result = service.execute(ExportAnalyticsCommand(batch_size=batch_size))
+    queue.put((result.datasets[0].rows, time.perf_counter() - started, _peak_rss_mb()))
+
+
+def export_csv(db_path: str, out_path: Path, batch_size: int, queue) -> None:
+    engine = create_engine(f"sqlite:///{db_path}", future=True)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    columns = analytics_export.BID_COLUMNS
+    started = time.perf_counter()
+    rows = 0
+    with SqlAlchemyUnitOfWork(factory) as uow, open(out_path, "w", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow([name for name, _, _ in columns])
+        codes = {s.id: s.code for s in uow.sources.list_all()}
+        for batch in uow.bids.iter_batches(batch_size):
+            writer.writerows([[get(b, codes) for _, _, get in columns] for b in batch])
+            rows += len(batch)
+    queue.put((rows, time.perf_counter() - started, _peak_rss_mb()))
+
+
+def _run_isolated(target, *args):
+    """Отдельный процесс — чтобы пиковый RSS относился только к выгрузке."""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=target, args=(*args, queue))
+    process.start()
+    stats = queue.get()
+    process.join()
+    return stats
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parquet vs CSV analytics export benchmark")
+    parser.add_argument("--rows", type=int, action="append", help="Число заявок.")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    print(f"{'rows':>9} {'format':<8} {'seconds':>8} {'rows/s':>9} {'MB':>8} {'peak RSS':>9}")
+    for rows in args.rows or [200_000]:
+        with tempfile.TemporaryDirectory(prefix="dan_max_parquet_") as tmp:
+            db_path = str(Path(tmp) / "bench.sqlite")
+            filler = multiprocessing.Process(target=fill_database, args=(db_path, rows, 5000))
+            filler.start()
+            filler.join()
+
+            parquet_dir = Path(tmp) / "parquet"
+            csv_path = Path(tmp) / "bids.csv"
+            results = {
+                "parquet": (_run_isolated(export_parquet, db_path, parquet_dir, args.batch_size),
+                            _dir_mb(parquet_dir)),
+                "csv": (_run_isolated(export_csv, db_path, csv_path, args.batch_size),
+                        csv_path.stat().st_size / 2**20),
+            }
+            for fmt, ((count, seconds, rss), size) in results.items():
+                print(f"{count:>9,} {fmt:<8} {seconds:>8.1f} {count / seconds:>9,.0f} "
+                      f"{size:>8.1f} {rss:>7.1f}MB")
+            print(f"{'':>9} csv/parquet size ratio: {results['csv'][1] / results['parquet'][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
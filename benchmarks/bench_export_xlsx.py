@@ -0,0 +1,166 @@
+# path: benchmarks/bench_export_xlsx.py
+"""
+Бенчмарк потоковой XLSX-выгрузки (ExportBidsToXlsxService + XlsxExportWriter).
+
+База SQLite заполняется N синтетическими заявками в отдельном процессе
+(чтобы пик RSS заполнения не попал в замер), затем выгрузка идёт в этом
+процессе. Печатаются rows/s, RSS до выгрузки, максимум RSS во время
+выгрузки (снимается после каждой порции) и его прирост — при потоковой
+записи прирост не зависит от N.
+
+Пример:
+
+    poetry run python benchmarks/bench_export_xlsx.py --rows 1000000
+    poetry run python benchmarks/bench_export_xlsx.py --rows 100000 --rows 400000
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from datagen import CARGOS, CITIES, TRANSPORT, telegram_text
+
+from dan_max_bids_parser.application.use_cases.export_bids_to_xlsx import (
+    ExportBidsToXlsxCommand,
+)
+from dan_max_bids_parser.application.use_cases.export_bids_to_xlsx_service import (
+    ExportBidsToXlsxService,
+)
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import Bid, ConfigExport, Source
+from dan_max_bids_parser.infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+from dan_max_bids_parser.infrastructure.export.xlsx_writer import XlsxExportWriter
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return None
+
+
+def fill_database(db_path: str, rows: int, chunk_size: int, seed: int = 42) -> None:
+    engine = create_engine(f"sqlite:///{db_path}", future=True)
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(seed)
+    now = datetime(2025, 3, 12, 8, 0)
+    with engine.begin() as conn:
+        conn.execute(insert(Source), [{"id": 1, "code": "ATI", "name": "ATI", "kind": "html"}])
+        conn.execute(
+            insert(ConfigExport),
+            [{
+                "code": "bench", "name": "bench", "is_active": True,
+                "data": {"chunk_size": chunk_size}, "created_at": now, "updated_at": now,
+            }],
+        )
+        batch: list[dict[str, Any]] = []
+        for idx in range(rows):
+            created = now - timedelta(seconds=idx)
+            batch.append({
+                "source_id": 1,
+                "external_id": f"bid-{idx}",
+                "title": rng.choice(CARGOS),
+                "description": telegram_text(rng),
+                "cargo_type": rng.choice(CARGOS).split()[0].lower(),
+                "transport_type": rng.choice(TRANSPORT),
+                "load_location": rng.choice(CITIES),
+                "unload_location": rng.choice(CITIES),
+                "weight_value": rng.randint(5, 40),
+                "price_value": rng.randint(10, 90) * 1000,
+                "price_currency": "RUB",
+                "contact_phone": f"+79{rng.randint(10**8, 10**9 - 1)}",
+                "url": f"https://example.test/bid/{idx}",
+                "published_at": created,
+                "created_at": created,
+                "updated_at": created,
+            })
+            if len(batch) == 10_000:
+                conn.execute(insert(Bid), batch)
+                batch.clear()
+        if batch:
+            conn.execute(insert(Bid), batch)
+    engine.dispose()
+
+
+class _RssSamplingWriter(XlsxExportWriter):
+    """XlsxExportWriter, снимающий RSS после каждой порции."""
+
+    peak_rss_mb: float = 0.0
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        super().write_rows(rows)
+        self.peak_rss_mb = max(self.peak_rss_mb, _rss_mb() or 0.0)
+
+
+def run_export(db_path: str, out_path: Path) -> dict[str, float]:
+    engine = create_engine(f"sqlite:///{db_path}", future=True)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    writers: list[_RssSamplingWriter] = []
+
+    def writer_factory(spec, path):
+        writers.append(_RssSamplingWriter(path, spec.sheet))
+        return writers[-1]
+
+    service = ExportBidsToXlsxService(lambda: SqlAlchemyUnitOfWork(factory), writer_factory)
+    rss_before = _rss_mb() or 0.0
+    started = time.perf_counter()
+    result = service.execute(ExportBidsToXlsxCommand(export_code="bench", output_path=str(out_path)))
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+    return {
+        "rows": result.rows,
+        "seconds": elapsed,
+        "rows_per_sec": result.rows / elapsed,
+        "rss_before_mb": rss_before,
+        "rss_peak_mb": writers[0].peak_rss_mb,
+        "file_mb": out_path.stat().st_size / 2**20,
+    }
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="XLSX export benchmark")
+    parser.add_argument(
+        "--rows", type=int, action="append", help="Число заявок (можно несколько раз)."
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    sizes = args.rows or [200_000]
+    print(f"{'rows':>9} {'seconds':>8} {'rows/s':>9} {'RSS before':>11} {'RSS peak':>9} "
+          f"{'RSS delta':>10} {'file MB':>8}")
+    for rows in sizes:
+        with tempfile.TemporaryDirectory(prefix="dan_max_export_") as tmp:
+            db_path = str(Path(tmp) / "bench.sqlite")
+            filler = multiprocessing.Process(
+                target=fill_database, args=(db_path, rows, args.chunk_size)
+            )
+            filler.start()
+            filler.join()
+            if filler.exitcode != 0:
+                raise SystemExit(f"fill_database failed with exit code {filler.exitcode}")
+
+            stats = run_export(db_path, Path(tmp) / "bids.xlsx")
+            print(
+                f"{stats['rows']:>9,} {stats['seconds']:>8.1f} {stats['rows_per_sec']:>9,.0f} "
+                f"{stats['rss_before_mb']:>9.1f}MB {stats['rss_peak_mb']:>7.1f}MB "
+                f"{stats['rss_peak_mb'] - stats['rss_before_mb']:>8.1f}MB {stats['file_mb']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
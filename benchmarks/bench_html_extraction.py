@@ -0,0 +1,187 @@
+# path: benchmarks/bench_html_extraction.py
+"""
+Бенчмарк извлечения заявок из HTML: lxml-движок против BeautifulSoup.
+
+Корпус — страницы-листинги в стиле ATI (таблица заявок + «обвязка» сайта).
+Можно взять сохранённые страницы (--corpus DIR, файлы *.html) или
+сгенерировать детерминированный корпус (--pages, --rows, --seed);
+сгенерированный корпус можно сохранить для повторных прогонов (--save-corpus).
+
+Пример:
+
+    poetry run python benchmarks/bench_html_extraction.py --pages 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Callable, Sequence
+
+from bs4 import BeautifulSoup
+
+from dan_max_bids_parser.infrastructure.parsing.html_extractor import compile_extractor
+
+# Те же правила, что кладутся в config_source.data для ATI-подобного листинга.
+ATI_LIKE_CONFIG = {
+    "parser": {
+        "type": "html",
+        "items": {"css": "table.bids-list tr.bid-row"},
+        "fields": {
+            "external_id": {"xpath": "./@data-bid-id"},
+            "title": {"css": "td.bid-cargo a.bid-link"},
+            "url": {"css": "td.bid-cargo a.bid-link", "attr": "href", "absolute": True},
+            "load_point": {"css": "td.bid-route span.route-from"},
+            "unload_point": {"css": "td.bid-route span.route-to"},
+            "weight_tons": {"css": "td.bid-weight"},
+            "price": {"css": "td.bid-price"},
+            "transport_type": {"css": "td.bid-transport"},
+            "published_at": {"css": "td.bid-date"},
+            "contact": {"css": "td.bid-contact span", "multiple": True, "join": ", "},
+        },
+    }
+}
+
+_CARGOS = ["Щебень гранитный", "Песок мытый", "ПГС", "Гравий", "Отсев", "Керамзит"]
+_CITIES = ["Москва", "Тверь", "Клин", "Химки", "Калуга", "Тула", "Рязань", "Ярославль"]
+_TRANSPORT = ["самосвал 20 т", "самосвал 30 т", "тонар", "полуприцеп"]
+
+
+def generate_ati_like_page(rng: random.Random, rows: int) -> str:
+    """Генерирует одну страницу-листинг с rows заявками."""
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Грузы</title>",
+        "<script>window.__STATE__ = {};</script>",
+        "<link rel='stylesheet' href='/static/app.css'></head><body>",
+        "<header><nav>",
+        "".join(f"<a href='/section/{i}'>Раздел {i}</a>" for i in range(30)),
+        "</nav></header><main><div class='filters'>",
+        "".join(f"<label><input type='checkbox' name='f{i}'>Фильтр {i}</label>" for i in range(40)),
+        "</div><table class='bids-list'><thead><tr><th>Груз</th><th>Маршрут</th></tr></thead><tbody>",
+    ]
+    for _ in range(rows):
+        bid_id = rng.randint(10_000_000, 99_999_999)
+        parts.append(
+            f"<tr class='bid-row' data-bid-id='{bid_id}'>"
+            f"<td class='bid-cargo'><a class='bid-link' href='/loads/{bid_id}'>{rng.choice(_CARGOS)}</a>"
+            f"<div class='bid-note'>Погрузка экскаватором, {rng.randint(1, 5)} машины</div></td>"
+            f"<td class='bid-route'><span class='route-from'>{rng.choice(_CITIES)}</span>"
+            f" — <span class='route-to'>{rng.choice(_CITIES)}</span>"
+            f"<small>{rng.randint(20, 900)} км</small></td>"
+            f"<td class='bid-weight'>{rng.randint(5, 40)} т</td>"
+            f"<td class='bid-price'>{rng.randint(8, 90) * 1000} руб</td>"
+            f"<td class='bid-transport'>{rng.choice(_TRANSPORT)}</td>"
+            f"<td class='bid-date'>сегодня {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}</td>"
+            f"<td class='bid-contact'><span>+7 9{rng.randint(10, 99)} {rng.randint(100, 999)}-"
+            f"{rng.randint(10, 99)}-{rng.randint(10, 99)}</span><span>ООО Карьер</span></td>"
+            "</tr>"
+        )
+    parts.append("</tbody></table></main><footer>")
+    parts.append("".join(f"<p>Текст подвала {i}</p>" for i in range(20)))
+    parts.append("</footer></body></html>")
+    return "".join(parts)
+
+
+def _bs4_extractor(config: dict) -> Callable[[str, str], list[dict[str, str]]]:
+    """
+    Базовая линия: те же CSS-селекторы, но через BeautifulSoup(lxml).
+
+    Поддерживает только CSS-поля; XPath-атрибут external_id читаем вручную.
+    """
+    parser_cfg = config["parser"]
+    items_css = parser_cfg["items"]["css"]
+    fields = parser_cfg["fields"]
+
+    def extract(payload: str, base_url: str) -> list[dict[str, str]]:
+        soup = BeautifulSoup(payload, "lxml")
+        result: list[dict[str, str]] = []
+        for row in soup.select(items_css):
+            record: dict[str, str] = {}
+            for name, spec in fields.items():
+                if "xpath" in spec:
+                    value = row.get("data-bid-id")
+                elif spec.get("multiple"):
+                    parts = [el.get_text(" ", strip=True) for el in row.select(spec["css"])]
+                    value = spec.get("join", " ").join(p for p in parts if p)
+                else:
+                    el = row.select_one(spec["css"])
+                    if el is None:
+                        continue
+                    value = el.get(spec["attr"]) if "attr" in spec else el.get_text(" ", strip=True)
+                if value:
+                    record[name] = value
+            result.append(record)
+        return result
+
+    return extract
+
+
+def load_corpus(args: argparse.Namespace) -> list[str]:
+    if args.corpus:
+        files = sorted(Path(args.corpus).glob("*.html"))
+        if not files:
+            raise SystemExit(f"No *.html files in {args.corpus}")
+        return [f.read_text(encoding="utf-8") for f in files]
+
+    rng = random.Random(args.seed)
+    pages = [generate_ati_like_page(rng, args.rows) for _ in range(args.pages)]
+
+    if args.save_corpus:
+        target = Path(args.save_corpus)
+        target.mkdir(parents=True, exist_ok=True)
+        for idx, page in enumerate(pages):
+            (target / f"page_{idx:04d}.html").write_text(page, encoding="utf-8")
+    return pages
+
+
+def measure(
+    name: str,
+    extract: Callable[[str, str], list[dict[str, str]]],
+    pages: Sequence[str],
+    repeat: int,
+) -> tuple[float, int]:
+    """Возвращает (лучшее значение pages/s, число извлечённых заявок)."""
+    best = 0.0
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = 0
+        for page in pages:
+            rows += len(extract(page, "https://ati.example/loads"))
+        elapsed = time.perf_counter() - started
+        best = max(best, len(pages) / elapsed)
+    print(f"{name:<14} {best:10.1f} pages/s   ({rows} bids per pass)")
+    return best, rows
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="Каталог с сохранёнными *.html страницами.")
+    parser.add_argument("--save-corpus", help="Сохранить сгенерированный корпус в каталог.")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=50, help="Заявок на страницу.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    pages = load_corpus(args)
+    size_kb = sum(len(p) for p in pages) / len(pages) / 1024
+    print(f"Corpus: {len(pages)} pages, avg {size_kb:.1f} KiB")
+
+    extractor = compile_extractor(ATI_LIKE_CONFIG)
+    lxml_rate, lxml_rows = measure("lxml compiled", extractor.extract, pages, args.repeat)
+    bs4_rate, bs4_rows = measure("bs4 baseline", _bs4_extractor(ATI_LIKE_CONFIG), pages, args.repeat)
+
+    if lxml_rows != bs4_rows:
+        print(f"WARNING: row count mismatch (lxml={lxml_rows}, bs4={bs4_rows})")
+    print(f"Speedup: x{lxml_rate / bs4_rate:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
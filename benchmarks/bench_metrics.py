@@ -0,0 +1,64 @@
+# path: benchmarks/bench_metrics.py
+"""
+Бенчмарк накладных расходов метрик: включённый реестр против no-op.
+
+Печатает стоимость одной операции (нс) для counter.inc и
+histogram.observe, в одном потоке и в нескольких параллельных.
+
+Пример:
+
+    poetry run python benchmarks/bench_metrics.py --ops 1000000 --threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from typing import Callable, Sequence
+
+from dan_max_bids_parser.infrastructure.monitoring.metrics import MetricsRegistry, NoopRegistry
+
+
+def measure(operation: Callable[[], None], ops: int, threads: int) -> float:
+    """Среднее время операции в наносекундах (по всем потокам)."""
+    per_thread = ops // threads
+
+    def work() -> None:
+        for _ in range(per_thread):
+            operation()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - started) / (per_thread * threads) * 1e9
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=4)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    for registry in (MetricsRegistry(), NoopRegistry()):
+        mode = "enabled" if registry.enabled else "no-op"
+        counter = registry.counter("bench_total", "Bench", ["source"]).labels("ATI")
+        histogram = registry.histogram("bench_seconds", "Bench", ["source"]).labels("ATI")
+        for threads in sorted({1, args.threads}):
+            inc = measure(counter.inc, args.ops, threads)
+            observe = measure(lambda: histogram.observe(0.042), args.ops, threads)
+            print(
+                f"{mode:<8} threads={threads:<2} counter.inc {inc:6.1f} ns/op, "
+                f"histogram.observe {observe:6.1f} ns/op"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+# path: benchmarks/bench_normalizer.py
+"""
+Бенчмарк Normalizer.normalize_many на одном ядре.
+
+Генерирует поток словарей полей в стиле ATI/Telegram (веса, цены,
+относительные даты, телефоны; часть строк повторяется, как в реальном
+потоке) и проверяет требование: не менее 100 000 заявок в минуту.
+При недостижении порога скрипт завершается с кодом 1.
+
+Пример:
+
+    poetry run python benchmarks/bench_normalizer.py --bids 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any, Sequence
+
+from dan_max_bids_parser.domain.services.normalizer import Normalizer
+
+_WEIGHTS = ["{} т", "{} тонн", "{}000 кг", "{},5 т", "{}т"]
+_PRICES = ["{} 000 руб", "{} т.р.", "{},5 млн руб", "{}00 руб/т", "договорная", "{}к ₽"]
+_DATES = ["сегодня {:02d}:{:02d}", "вчера в {:02d}:{:02d}", "{} часа назад", "12.03.2025 {:02d}:{:02d}"]
+_DESCRIPTIONS = [
+    "Щебень {} т, Тверь - Москва, {} 000 руб, тел 8 900 {}-11-22",
+    "Нужен самосвал, песок {} т, оплата {} т.р., звонить +7 (916) {}-33-44",
+]
+
+
+def generate_records(count: int, seed: int, unique_ratio: float) -> list[dict[str, Any]]:
+    """
+    Генерирует count записей; доля уникальных строк задаётся unique_ratio
+    (остальные берутся из «горячего» набора, как в реальном потоке).
+    """
+    rng = random.Random(seed)
+    hot_numbers = [rng.randint(5, 40) for _ in range(30)]
+
+    def number() -> int:
+        if rng.random() < unique_ratio:
+            return rng.randint(1, 999)
+        return rng.choice(hot_numbers)
+
+    records: list[dict[str, Any]] = []
+    for idx in range(count):
+        if idx % 5 == 4:
+            records.append(
+                {
+                    "external_id": f"tg-{idx}",
+                    "description": rng.choice(_DESCRIPTIONS).format(number(), number(), rng.randint(100, 999)),
+                }
+            )
+            continue
+        date_tpl = rng.choice(_DATES)
+        date = (
+            date_tpl.format(rng.randint(1, 5))
+            if "назад" in date_tpl
+            else date_tpl.format(rng.randint(0, 23), rng.choice((0, 15, 30, 45)))
+        )
+        records.append(
+            {
+                "external_id": f"ati-{idx}",
+                "title": "Щебень гранитный",
+                "weight_tons": rng.choice(_WEIGHTS).format(number()),
+                "price": rng.choice(_PRICES).format(number()),
+                "published_at": date,
+                "contact": f"8 (9{rng.randint(10, 99)}) {rng.randint(100, 999)}-{rng.randint(10, 99)}-00",
+            }
+        )
+    return records
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bids", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=1_000, help="Размер пакета normalize_many.")
+    parser.add_argument("--unique-ratio", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--min-per-minute",
+        type=float,
+        default=100_000,
+        help="Порог пропускной способности (заявок в минуту).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    records = generate_records(args.bids, args.seed, args.unique_ratio)
+
+    normalizer = Normalizer()
+    started = time.perf_counter()
+    for offset in range(0, len(records), args.batch):
+        normalizer.normalize_many(records[offset : offset + args.batch])
+    elapsed = time.perf_counter() - started
+
+    per_minute = len(records) / elapsed * 60
+    print(f"Normalized {len(records)} bids in {elapsed:.2f}s: {per_minute:,.0f} bids/min")
+    for name, info in normalizer.cache_info().items():
+        total = info.hits + info.misses
+        hit_rate = info.hits / total if total else 0.0
+        print(f"  cache {name:<6} hit rate {hit_rate:6.1%} (size {info.currsize})")
+
+    if per_minute < args.min_per_minute:
+        print(f"FAIL: below required {args.min_per_minute:,.0f} bids/min")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
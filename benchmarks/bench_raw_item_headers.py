@@ -0,0 +1,101 @@
+# path: benchmarks/bench_raw_item_headers.py
+"""
+Бенчмарк чтения метаданных raw_items: полные сущности (с payload)
+против заголовков (list_headers_for_source_since, payload не читается).
+
+База SQLite заполняется N сырыми объектами с payload по --payload-kb КБ.
+Каждый вариант выполняется в отдельном процессе; печатаются время,
+объём прочитанных из БД значений (сумма длин строк) и пиковый RSS.
+
+    poetry run python benchmarks/bench_raw_item_headers.py --rows 20000 --payload-kb 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import resource
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Sequence
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import RawItem, Source
+from dan_max_bids_parser.infrastructure.db.repositories import SqlAlchemyRawItemRepository
+
+SINCE = datetime(2025, 3, 1)
+
+
+def fill_database(db_path: str, rows: int, payload_kb: int) -> None:
+    engine = create_engine(f"sqlite:///{db_path}", future=True)
+    Base.metadata.create_all(bind=engine)
+    body = ("<div class='bid'>Щебень 20 т, Тверь - Москва</div>" * (payload_kb * 20))[: payload_kb * 1024]
+    with engine.begin() as conn:
+        conn.execute(insert(Source), [{"id": 1, "code": "ATI", "name": "ATI", "kind": "html"}])
+        for start in range(0, rows, 1000):
+            conn.execute(insert(RawItem), [
+                {
+                    "source_id": 1,
+                    "external_id": f"raw-{idx}",
+                    "url": f"https://example.test/raw/{idx}",
+                    "payload": body,
+                    "status": "parsed",
+                    "hash": f"{idx:064x}",
+                    "fetched_at": SINCE + timedelta(seconds=idx),
+                    "created_at": SINCE + timedelta(seconds=idx),
+                }
+                for idx in range(start, min(rows, start + 1000))
+            ])
+    engine.dispose()
+
+
+def scan(db_path: str, headers: bool, queue) -> None:
+    engine = create_engine(f"sqlite:///{db_path}", future=True)
+    with sessionmaker(bind=engine)() as session:
+        repo = SqlAlchemyRawItemRepository(session)
+        started = time.perf_counter()
+        if headers:
+            items = repo.list_headers_for_source_since(1, SINCE)
+            size = sum(len(h.url or "") + len(h.hash or "") + len(h.external_id or "") for h in items)
+        else:
+            items = repo.list_for_source_since(1, SINCE)
+            size = sum(len(i.url or "") + len(i.external_id or "") + len(i.payload) for i in items)
+        seconds = time.perf_counter() - started
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((len(items), seconds, size / 2**20, rss))
+
+
+def _run_isolated(*args):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=scan, args=(*args, queue))
+    process.start()
+    stats = queue.get()
+    process.join()
+    return stats
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Raw item header vs full entity scan benchmark")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--payload-kb", type=int, default=100)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="dan_max_raw_") as tmp:
+        db_path = str(Path(tmp) / "bench.sqlite")
+        fill_database(db_path, args.rows, args.payload_kb)
+        print(f"{'rows':>8} {'read':<8} {'seconds':>8} {'MB read':>9} {'peak RSS':>9}")
+        for name, headers in (("entities", False), ("headers", True)):
+            count, seconds, mb, rss = _run_isolated(db_path, headers)
+            print(f"{count:>8,} {name:<8} {seconds:>8.2f} {mb:>9.1f} {rss:>7.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
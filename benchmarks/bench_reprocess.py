@@ -0,0 +1,138 @@
+# path: benchmarks/bench_reprocess.py
+"""
+Бенчмарк масштабирования ReprocessRawItems по числу процессов.
+
+Создаёт временную SQLite-базу с N raw_items (тексты в стиле Telegram)
+и словарём классификатора, затем прогоняет переобработку с разным
+числом воркеров и печатает пропускную способность.
+
+Пример:
+
+    poetry run python benchmarks/bench_reprocess.py --raw-items 50000 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Sequence
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.application.pipeline import BidPipeline
+from dan_max_bids_parser.application.use_cases.reprocess_raw_items import (
+    ReprocessRawItemsCommand,
+)
+from dan_max_bids_parser.application.use_cases.reprocess_raw_items_service import (
+    ReprocessRawItemsService,
+)
+from dan_max_bids_parser.domain.services.bid_filter import BidFilter
+from dan_max_bids_parser.domain.services.classifier import BidClassifier
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import (
+    ConfigClassifier,
+    ConfigFilterRule,
+    RawItem,
+    Source,
+)
+from dan_max_bids_parser.infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+
+_TEMPLATES = [
+    "Щебень гранитный {} т, Тверь - Москва, {} 000 руб, тел 8 900 {}-11-22. Загрузка утром, оплата на карту.",
+    "Нужен самосвал, песок карьерный {} т, оплата {} т.р., звонить +7 (916) {}-33-44, без НДС.",
+    "Отсев {} т из карьера в Подольск, ставка {}00 руб/т, контакт 8-926-{}-55-66.",
+]
+
+
+def pipeline_factory() -> BidPipeline:
+    return BidPipeline(classifier=BidClassifier(), bid_filter=BidFilter())
+
+
+def prepare_database(path: Path, raw_items: int, seed: int) -> sessionmaker:
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    categories = {
+        f"груз-{idx}": [f"{word} марки {idx}" for word in ("щебень", "песок", "отсев")]
+        for idx in range(300)
+    }
+    categories.update({"щебень": ["щебень"], "песок": ["песок"], "отсев": ["отсев"]})
+
+    with factory() as session:
+        source = Source(code="TG", name="Telegram", kind="telegram", is_active=True)
+        session.add(source)
+        session.flush()
+        session.add_all(
+            [
+                ConfigClassifier(
+                    code="cargo", name="cargo", is_active=True,
+                    data={"target": "cargo_type", "categories": categories},
+                    created_at=now, updated_at=now,
+                ),
+                ConfigFilterRule(
+                    code="min-weight", name="min-weight", is_active=True,
+                    data={"kind": "weight", "min": 5, "allow_missing": True},
+                    created_at=now, updated_at=now,
+                ),
+            ]
+        )
+        session.add_all(
+            RawItem(
+                source_id=source.id,
+                external_id=f"m-{idx}",
+                payload=rng.choice(_TEMPLATES).format(
+                    rng.randint(1, 40), rng.randint(10, 90), rng.randint(100, 999)
+                ),
+                fetched_at=now,
+                created_at=now,
+            )
+            for idx in range(raw_items)
+        )
+        session.commit()
+    return factory
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--raw-items", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory = prepare_database(Path(tmp) / "bench.sqlite", args.raw_items, args.seed)
+        baseline = None
+        for workers in args.workers:
+            service = ReprocessRawItemsService(
+                uow_factory=lambda: SqlAlchemyUnitOfWork(session_factory),
+                pipeline_factory=pipeline_factory,
+                max_workers=workers,
+            )
+            started = time.perf_counter()
+            job = service.execute(
+                ReprocessRawItemsCommand(batch_size=args.batch_size, resume=False)
+            )
+            elapsed = time.perf_counter() - started
+            rate = (job.items_total or 0) / elapsed
+            baseline = baseline or rate
+            print(
+                f"workers={workers:<2} {job.items_total} raw_items in {elapsed:.2f}s: "
+                f"{rate:,.0f} items/s (x{rate / baseline:.2f})"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+# path: benchmarks/bench_search.py
+"""
+Бенчмарк полнотекстового поиска заявок (SqlAlchemyBidSearch, SQLite FTS5).
+
+База заполняется N синтетическими заявками (bench_export_xlsx.fill_database,
+create_all ставит FTS5-таблицу и триггеры — индекс строится при вставке).
+Для каждого запроса печатается медиана и p95 времени первой страницы и
+пятой страницы (по курсору), число совпадений на странице.
+
+Синтетика бедная (7 грузов, 9 городов), поэтому одно слово совпадает с
+сотнями тысяч заявок — это худший случай для order="rank"; широкие
+запросы диспетчеру отдаются в order="recent".
+
+    poetry run python benchmarks/bench_search.py --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Sequence
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from bench_export_xlsx import fill_database
+
+from dan_max_bids_parser.infrastructure.db.repositories import SqlAlchemyBidSearch
+
+QUERIES = (
+    ("керамзит ярославль шаланда", "rank"),
+    ("щебень тверь", "rank"),
+    ("щебня", "recent"),
+    ("песок клин", "recent"),
+)
+
+
+def _page(search: SqlAlchemyBidSearch, query: str, order: str, depth: int) -> tuple[float, int]:
+    cursor: Optional[str] = None
+    for _ in range(depth - 1):
+        cursor = search.search(query, limit=20, cursor=cursor, order=order).next_cursor
+    started = time.perf_counter()
+    page = search.search(query, limit=20, cursor=cursor, order=order)
+    return (time.perf_counter() - started) * 1000, len(page.hits)
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Full-text bid search benchmark")
+    parser.add_argument("--rows", type=int, default=200_000, help="Число заявок.")
+    parser.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="dan_max_search_") as tmp:
+        db_path = str(Path(tmp) / "bench.sqlite")
+        started = time.perf_counter()
+        filler = multiprocessing.Process(target=fill_database, args=(db_path, args.rows, 5000))
+        filler.start()
+        filler.join()
+        print(f"filled {args.rows:,} bids (with FTS5 triggers) in {time.perf_counter() - started:.1f}s")
+
+        engine = create_engine(f"sqlite:///{db_path}", future=True)
+        with sessionmaker(bind=engine)() as session:
+            search = SqlAlchemyBidSearch(session)
+            print(f"{'query':<30} {'order':<7} {'page':>4} {'p50 ms':>8} {'p95 ms':>8} {'hits':>5}")
+            for query, order in QUERIES:
+                for depth in (1, 5):
+                    samples = [_page(search, query, order, depth) for _ in range(args.repeat)]
+                    times = sorted(ms for ms, _ in samples)
+                    p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+                    print(f"{query:<30} {order:<7} {depth:>4} {statistics.median(times):>8.1f} "
+                          f"{p95:>8.1f} {samples[0][1]:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# path: benchmarks/bench_sheets_sync.py
+"""
+Бенчмарк синхронизации листа Google Sheets (SheetsSyncWriter) с локальным
+FakeSheetsServer через настоящий HTTP-транспорт.
+
+Три прогона по N строкам в 13 колонок:
+- initial  — пустой лист, пишется всё;
+- noop     — те же строки, запись не нужна;
+- upsert   — изменён 1% строк и добавлен 1% новых.
+
+Печатаются время, число запросов к API и записанные строки/диапазоны.
+
+    poetry run python benchmarks/bench_sheets_sync.py --rows 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Sequence
+
+from datagen import CARGOS, CITIES, TRANSPORT
+
+from dan_max_bids_parser.domain.services.bid_export import DEFAULT_COLUMNS
+from dan_max_bids_parser.infrastructure.export.fake_sheets_server import FakeSheetsServer
+from dan_max_bids_parser.infrastructure.export.sheets_sync import (
+    HttpSheetsTransport,
+    SheetsSyncWriter,
+)
+
+
+def make_rows(count: int, rng: random.Random, start: int = 1) -> list[list[Any]]:
+    now = datetime(2025, 3, 12, 8, 0)
+    return [
+        [
+            idx,
+            now - timedelta(minutes=idx),
+            "ATI.SU",
+            rng.choice(CARGOS),
+            rng.choice(TRANSPORT),
+            rng.choice(CITIES),
+            rng.choice(CITIES),
+            rng.randint(5, 40),
+            rng.randint(10, 90) * 1000,
+            "RUB",
+            f"+79{rng.randint(10**8, 10**9 - 1)}",
+            f"https://example.test/bid/{idx}",
+            "Загрузка утром, оплата на карту",
+        ]
+        for idx in range(start, start + count)
+    ]
+
+
+def sync(server: FakeSheetsServer, index: Path, rows, mode: str, chunk: int) -> dict[str, Any]:
+    before = sum(server.requests.values())
+    writer = SheetsSyncWriter(
+        HttpSheetsTransport("bench", base_url=server.base_url), index_path=index
+    )
+    started = time.perf_counter()
+    writer.begin([c for c in DEFAULT_COLUMNS], mode)
+    for offset in range(0, len(rows), chunk):
+        writer.write_rows(rows[offset: offset + chunk])
+    writer.finish()
+    return {
+        "seconds": time.perf_counter() - started,
+        "calls": sum(server.requests.values()) - before,
+        "rows": writer.stats.rows_written,
+        "ranges": writer.stats.ranges_written,
+    }
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Google Sheets sync benchmark (fake server)")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+    rng = random.Random(args.seed)
+    rows = make_rows(args.rows, rng)
+    changed = [list(row) for row in rows]
+    for row in rng.sample(changed, max(1, args.rows // 100)):
+        row[8] += 500
+    delta = [row for row, old in zip(changed, rows) if row != old]
+    delta += make_rows(max(1, args.rows // 100), rng, start=args.rows + 1)
+
+    print(f"{'run':<8} {'seconds':>8} {'API calls':>10} {'rows':>8} {'ranges':>7}")
+    with FakeSheetsServer() as server, tempfile.TemporaryDirectory() as tmp:
+        index = Path(tmp) / "index.json"
+        for name, data, mode in (
+            ("initial", rows, "replace"),
+            ("noop", rows, "replace"),
+            ("upsert", delta, "upsert"),
+        ):
+            stats = sync(server, index, data, mode, args.chunk_size)
+            print(
+                f"{name:<8} {stats['seconds']:>8.2f} {stats['calls']:>10} "
+                f"{stats['rows']:>8} {stats['ranges']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
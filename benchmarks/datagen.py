@@ -0,0 +1,131 @@
+# path: benchmarks/datagen.py
+"""
+Генераторы синтетических RawItemEntity / BidEntity для бенчмарков.
+
+Всё детерминировано по seed. Размеры payload — как в реальном потоке:
+- html: страница-листинг ATI на 10–60 заявок (≈15–90 КБ);
+- telegram: сообщение 150–600 байт;
+- json: ответ API на 5–30 заявок (≈2–12 КБ).
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Sequence
+
+from bench_html_extraction import generate_ati_like_page
+
+from dan_max_bids_parser.domain.entities import BidEntity, RawItemEntity
+
+CARGOS = ["Щебень гранитный", "Песок мытый", "ПГС", "Гравий", "Отсев", "Керамзит", "Грунт"]
+CITIES = ["Москва", "Тверь", "Клин", "Химки", "Калуга", "Тула", "Рязань", "Ярославль", "Подольск"]
+TRANSPORT = ["самосвал", "тонар", "полуприцеп", "шаланда"]
+
+_TELEGRAM_TEMPLATES = [
+    "{cargo} {weight} т, {src} - {dst}, {price} 000 руб, тел 8 9{p1} {p2}-{p3}-{p4}. {tail}",
+    "Нужен {transport}! {cargo} {weight} тонн из {src} в {dst}. Оплата {price} т.р. "
+    "Звонить +7 ({p1}) {p2}-{p3}-{p4}. {tail}",
+    "Срочно {cargo}, {weight} т. Загрузка {src}, выгрузка {dst}. Ставка {price}00 руб/т. {tail}",
+]
+_TAILS = [
+    "",
+    "Загрузка утром, оплата на карту без НДС.",
+    "Работаем постоянно, нужны машины на неделю, возможна предоплата 50%. Пишите в личку.",
+    "Документы: ТТН, путевой лист. Простой оплачивается. Возможен догруз попутно по маршруту.",
+]
+
+
+def telegram_text(rng: random.Random) -> str:
+    return rng.choice(_TELEGRAM_TEMPLATES).format(
+        cargo=rng.choice(CARGOS),
+        weight=rng.randint(5, 40),
+        src=rng.choice(CITIES),
+        dst=rng.choice(CITIES),
+        price=rng.randint(10, 90),
+        transport=rng.choice(TRANSPORT),
+        p1=rng.randint(10, 99),
+        p2=rng.randint(100, 999),
+        p3=rng.randint(10, 99),
+        p4=rng.randint(10, 99),
+        tail=rng.choice(_TAILS),
+    )
+
+
+def api_json(rng: random.Random, rows: int) -> str:
+    items = [
+        {
+            "id": rng.randint(10**6, 10**7),
+            "cargo": rng.choice(CARGOS),
+            "weight": f"{rng.randint(5, 40)} т",
+            "from": rng.choice(CITIES),
+            "to": rng.choice(CITIES),
+            "price": f"{rng.randint(10, 90)} 000 руб",
+            "comment": rng.choice(_TAILS),
+        }
+        for _ in range(rows)
+    ]
+    return json.dumps({"items": items, "total": rows}, ensure_ascii=False)
+
+
+def generate_raw_items(
+    count: int,
+    seed: int,
+    source_id: int = 1,
+    kinds: Sequence[str] = ("html", "telegram", "json"),
+) -> list[RawItemEntity]:
+    """count сырых объектов; вид payload выбирается по кругу из kinds."""
+    rng = random.Random(seed)
+    now = datetime(2025, 3, 12, 8, 0)
+    items: list[RawItemEntity] = []
+    for idx in range(count):
+        kind = kinds[idx % len(kinds)]
+        if kind == "html":
+            payload = generate_ati_like_page(rng, rows=rng.randint(10, 60))
+        elif kind == "json":
+            payload = api_json(rng, rows=rng.randint(5, 30))
+        else:
+            payload = telegram_text(rng)
+        received = now - timedelta(seconds=idx)
+        items.append(
+            RawItemEntity(
+                source_id=source_id,
+                external_id=f"{kind}-{seed}-{idx}",
+                payload=payload,
+                url=f"https://example.test/{kind}/{idx}",
+                created_at=received,
+                received_at=received,
+            )
+        )
+    return items
+
+
+def generate_bids(count: int, seed: int, source_id: int = 1) -> list[BidEntity]:
+    rng = random.Random(seed)
+    now = datetime(2025, 3, 12, 8, 0)
+    bids: list[BidEntity] = []
+    for idx in range(count):
+        cargo = rng.choice(CARGOS)
+        weight = float(rng.randint(5, 40))
+        created = now - timedelta(seconds=idx)
+        bids.append(
+            BidEntity(
+                source_id=source_id,
+                external_id=f"bid-{seed}-{idx}",
+                title=f"{cargo} {weight:.0f} т",
+                description=telegram_text(rng),
+                cargo_type=cargo.split()[0].lower(),
+                transport_type=rng.choice(TRANSPORT),
+                load_point=rng.choice(CITIES),
+                unload_point=rng.choice(CITIES),
+                weight_tons=weight,
+                price=float(rng.randint(10, 90) * 1000),
+                currency="RUB",
+                contact=f"+79{rng.randint(10**8, 10**9 - 1)}",
+                url=f"https://example.test/bid/{idx}",
+                published_at=created - timedelta(minutes=rng.randint(0, 600)),
+                created_at=created,
+            )
+        )
+    return bids
@@ -0,0 +1,551 @@
+# path: benchmarks/run_suite.py
+"""
+Набор бенчмарков горячих путей ETL с JSON-результатом и сравнением с baseline.
+
+Сценарии:
+- repo.*      — пакетная запись и чтение raw_items / bids через репозитории;
+- harvest.*   — RunSourceHarvestingService.execute целиком (SQLAlchemy UoW);
+- stage.*     — отдельные этапы: парсинг HTML, нормализация, классификация.
+
+Каждый сценарий выполняется --repeat раз на свежей схеме (подготовка не
+входит в замер), в отчёт идёт медиана. Объёмы масштабируются --scale.
+
+БД: SQLite (временный файл) или PostgreSQL (--db postgres --postgres-url
+или BENCH_POSTGRES_URL). ВНИМАНИЕ: в Postgres схема пересоздаётся
+(drop_all/create_all) — используйте отдельную пустую базу.
+
+Примеры:
+
+    poetry run python benchmarks/run_suite.py --output bench.json
+    poetry run python benchmarks/run_suite.py --baseline benchmarks/baselines/sqlite.json --threshold 0.2
+    poetry run python benchmarks/run_suite.py --save-baseline benchmarks/baselines/sqlite.json
+
+Код выхода 1 — если хотя бы один сценарий медленнее baseline больше чем на threshold.
+
+Обновление baseline (--save-baseline поверх существующего файла) не
+затирает регрессии молча: сценарий, ставший медленнее старого baseline,
+сохраняет прежнее значение, а падение больше threshold — отказ с кодом 1.
+Осознанную регрессию (цена новой функциональности) принимают явно:
+
+    poetry run python benchmarks/run_suite.py --save-baseline benchmarks/baselines/sqlite.json \
+        --accept-regression "repo.bids.add_many=FTS-триггер на каждую вставку"
+
+Принятые регрессии копятся в baseline под ключом "accepted_regressions"
+(сценарий, было/стало ops/s, ревизия, причина) — история видна в ревью.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from bench_html_extraction import ATI_LIKE_CONFIG
+from datagen import generate_bids, generate_raw_items
+
+from dan_max_bids_parser.application.use_cases.harvest_source import (
+    RunSourceHarvestingCommand,
+)
+from dan_max_bids_parser.application.use_cases.harvest_source_service import (
+    RunSourceHarvestingService,
+)
+from dan_max_bids_parser.domain.entities import ConfigEntryEntity, SourceEntity
+from dan_max_bids_parser.domain.services.classifier import BidClassifier
+from dan_max_bids_parser.domain.services.normalizer import Normalizer
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import ConfigClassifier, ConfigSource, Source
+from dan_max_bids_parser.infrastructure.db.repositories import (
+    SqlAlchemyBidRepository,
+    SqlAlchemyRawItemRepository,
+)
+from dan_max_bids_parser.infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+from dan_max_bids_parser.infrastructure.parsing.html_extractor import LxmlHtmlParser
+
+SOURCE_CODE = "ATI"
+
+CLASSIFIER_CONFIG = {
+    "target": "cargo_type",
+    "categories": {
+        "щебень": ["щебень", "гранитный щебень"],
+        "песок": ["песок", "пескогрунт"],
+        "пгс": ["пгс", "песчано-гравийная смесь"],
+        "гравий": ["гравий"],
+        "отсев": ["отсев"],
+        "керамзит": ["керамзит"],
+        "грунт": ["грунт", "земля"],
+    },
+}
+
+
+# --- Окружение БД ---
+
+
+@dataclass
+class Database:
+    """Создаёт свежую схему для каждого прогона сценария."""
+
+    kind: str
+    postgres_url: Optional[str] = None
+    _tmp: Optional[tempfile.TemporaryDirectory] = None
+    _engine: Optional[Engine] = None
+    _counter: int = 0
+
+    def fresh(self) -> sessionmaker:
+        if self._engine is not None:
+            self._engine.dispose()
+        if self.kind == "postgres":
+            engine = create_engine(self.postgres_url, future=True)
+            Base.metadata.drop_all(bind=engine)
+        else:
+            if self._tmp is None:
+                self._tmp = tempfile.TemporaryDirectory(prefix="dan_max_bench_")
+            self._counter += 1
+            engine = create_engine(
+                f"sqlite:///{Path(self._tmp.name) / f'bench_{self._counter}.sqlite'}",
+                future=True,
+            )
+        Base.metadata.create_all(bind=engine)
+        self._engine = engine
+        session_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+        _seed_reference_data(session_factory)
+        return session_factory
+
+    def close(self) -> None:
+        if self._engine is not None:
+            self._engine.dispose()
+        if self._tmp is not None:
+            self._tmp.cleanup()
+
+
+def _seed_reference_data(session_factory: sessionmaker) -> None:
+    now = datetime.utcnow()
+    with session_factory() as session:
+        session.add(Source(id=1, code=SOURCE_CODE, name="ATI", kind="html", is_active=True))
+        session.add(
+            ConfigSource(
+                code=SOURCE_CODE, name="ATI", is_active=True, data=ATI_LIKE_CONFIG,
+                created_at=now, updated_at=now,
+            )
+        )
+        session.add(
+            ConfigClassifier(
+                code="cargo", name="cargo", is_active=True, data=CLASSIFIER_CONFIG,
+                created_at=now, updated_at=now,
+            )
+        )
+        session.commit()
+
+
+# --- Сценарии ---
+
+
+@dataclass
+class Context:
+    db: Database
+    scale: float
+    seed: int
+
+    def n(self, base: int) -> int:
+        return max(1, int(base * self.scale))
+
+
+@dataclass
+class Case:
+    """
+    setup(ctx) -> state — не замеряется; run(ctx, state) -> число операций.
+    """
+
+    name: str
+    setup: Callable[[Context], Any]
+    run: Callable[[Context, Any], int]
+
+
+CASES: list[Case] = []
+
+
+def case(name: str, setup: Callable[[Context], Any]):
+    def decorator(run: Callable[[Context, Any], int]) -> Callable[[Context, Any], int]:
+        CASES.append(Case(name=name, setup=setup, run=run))
+        return run
+
+    return decorator
+
+
+def _setup_raw_items(ctx: Context):
+    return ctx.db.fresh(), generate_raw_items(ctx.n(300), ctx.seed)
+
+
+def _setup_bids(ctx: Context):
+    return ctx.db.fresh(), generate_bids(ctx.n(5000), ctx.seed)
+
+
+def _setup_filled_db(ctx: Context):
+    session_factory = ctx.db.fresh()
+    with session_factory() as session:
+        SqlAlchemyRawItemRepository(session).add_many(generate_raw_items(ctx.n(300), ctx.seed))
+        SqlAlchemyBidRepository(session).add_many(generate_bids(ctx.n(5000), ctx.seed))
+        session.commit()
+    return session_factory
+
+
+@case("repo.raw_items.add_many", _setup_raw_items)
+def bench_raw_items_add_many(ctx: Context, state) -> int:
+    session_factory, items = state
+    with session_factory() as session:
+        SqlAlchemyRawItemRepository(session).add_many(items)
+        session.commit()
+    return len(items)
+
+
+@case("repo.bids.add_many", _setup_bids)
+def bench_bids_add_many(ctx: Context, state) -> int:
+    session_factory, bids = state
+    with session_factory() as session:
+        SqlAlchemyBidRepository(session).add_many(bids)
+        session.commit()
+    return len(bids)
+
+
+@case("repo.bids.list_for_source_since", _setup_filled_db)
+def bench_bids_list(ctx: Context, session_factory) -> int:
+    with session_factory() as session:
+        bids = SqlAlchemyBidRepository(session).list_for_source_since(1, datetime(2000, 1, 1))
+    return len(bids)
+
+
+@case("repo.raw_items.list_after_id", _setup_filled_db)
+def bench_raw_items_stream(ctx: Context, session_factory) -> int:
+    total, after_id = 0, 0
+    while True:
+        with session_factory() as session:
+            batch = SqlAlchemyRawItemRepository(session).list_after_id(after_id, 100)
+        if not batch:
+            return total
+        total += len(batch)
+        after_id = batch[-1].id
+
+
+class _ListProvider:
+    def __init__(self, items) -> None:
+        self._items = items
+
+    def fetch_raw_items(self, source):
+        return self._items
+
+
+def _setup_harvest(ctx: Context):
+    session_factory = ctx.db.fresh()
+    items = generate_raw_items(ctx.n(60), ctx.seed, kinds=("html", "telegram"))
+    service = RunSourceHarvestingService(
+        uow_factory=lambda: SqlAlchemyUnitOfWork(session_factory),
+        raw_item_provider=_ListProvider(items),
+        parser=LxmlHtmlParser(),
+        classifier=BidClassifier(),
+    )
+    return service, len(items)
+
+
+@case("harvest.execute", _setup_harvest)
+def bench_harvest(ctx: Context, state) -> int:
+    service, count = state
+    service.execute(RunSourceHarvestingCommand(source_code=SOURCE_CODE))
+    return count
+
+
+def _setup_parse(ctx: Context):
+    parser = LxmlHtmlParser()
+    parser.refresh([ConfigEntryEntity(code=SOURCE_CODE, data=ATI_LIKE_CONFIG)])
+    pages = generate_raw_items(ctx.n(100), ctx.seed, kinds=("html",))
+    return parser, pages
+
+
+@case("stage.parse_html", _setup_parse)
+def bench_parse(ctx: Context, state) -> int:
+    parser, pages = state
+    source = SourceEntity(id=1, code=SOURCE_CODE)
+    for page in pages:
+        parser.parse(source, page)
+    return len(pages)
+
+
+def _setup_records(ctx: Context):
+    parser, pages = _setup_parse(ctx)
+    source = SourceEntity(id=1, code=SOURCE_CODE)
+    records = [fields for page in pages for fields in parser.parse(source, page)]
+    return records
+
+
+@case("stage.normalize", _setup_records)
+def bench_normalize(ctx: Context, records) -> int:
+    # Новый Normalizer на прогон: замер с холодными кэшами
+    Normalizer().normalize_many(records)
+    return len(records)
+
+
+def _setup_classify(ctx: Context):
+    classifier = BidClassifier()
+    classifier.refresh([ConfigEntryEntity(code="cargo", data=CLASSIFIER_CONFIG)])
+    return classifier, generate_bids(ctx.n(5000), ctx.seed)
+
+
+@case("stage.classify", _setup_classify)
+def bench_classify(ctx: Context, state) -> int:
+    classifier, bids = state
+    classifier.classify_many(bids)
+    return len(bids)
+
+
+# --- Запуск и отчёт ---
+
+
+@dataclass
+class CaseResult:
+    ops: int
+    runs_s: list[float] = field(default_factory=list)
+
+    @property
+    def median_s(self) -> float:
+        return statistics.median(self.runs_s)
+
+    @property
+    def ops_per_sec(self) -> float:
+        return self.ops / self.median_s if self.median_s > 0 else float("inf")
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "ops": self.ops,
+            "median_s": round(self.median_s, 6),
+            "ops_per_sec": round(self.ops_per_sec, 2),
+            "runs_s": [round(r, 6) for r in self.runs_s],
+        }
+
+
+def run_case(bench: Case, ctx: Context, repeat: int, warmup: int = 1) -> CaseResult:
+    # Прогрев: импорты, кэши стеммера/парсера, page cache ФС — не в замер
+    for _ in range(warmup):
+        bench.run(ctx, bench.setup(ctx))
+    result = CaseResult(ops=0)
+    for _ in range(repeat):
+        state = bench.setup(ctx)
+        started = time.perf_counter()
+        result.ops = bench.run(ctx, state)
+        result.runs_s.append(time.perf_counter() - started)
+    return result
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+) -> list[str]:
+    """Печатает сравнение и возвращает имена сценариев с регрессией."""
+    regressions: list[str] = []
+    print(f"\n{'case':<34} {'baseline ops/s':>15} {'current ops/s':>15} {'change':>8}")
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"{name:<34} {'—':>15} {result['ops_per_sec']:>15,.1f} {'new':>8}")
+            continue
+        change = result["ops_per_sec"] / base["ops_per_sec"] - 1
+        mark = ""
+        if change < -threshold:
+            regressions.append(name)
+            mark = "  REGRESSION"
+        print(
+            f"{name:<34} {base['ops_per_sec']:>15,.1f} {result['ops_per_sec']:>15,.1f} "
+            f"{change:>+8.1%}{mark}"
+        )
+    if baseline.get("meta", {}).get("scale") != current["meta"]["scale"]:
+        print("WARNING: baseline was recorded with a different --scale")
+    return regressions
+
+
+def merge_baseline(
+    report: dict[str, Any],
+    previous: Optional[dict[str, Any]],
+    threshold: float,
+    accepted: dict[str, str],
+) -> tuple[dict[str, Any], list[str]]:
+    """
+    Новый baseline из отчёта и прежнего baseline.
+
+    Ускорения и новые сценарии берутся из отчёта. Сценарий медленнее
+    прежнего baseline оставляет прежний результат (иначе серия обновлений
+    по «допустимым» −threshold размывает планку), если падение не принято
+    через accepted. Возвращает (baseline, непринятые регрессии > threshold).
+    """
+    if previous is None or previous.get("meta", {}).get("scale") != report["meta"]["scale"]:
+        return report, []
+    old_results = previous.get("results", {})
+    history = list(previous.get("accepted_regressions", []))
+    # Сценарии, не попавшие в прогон (--filter), остаются как были
+    results: dict[str, Any] = dict(old_results)
+    rejected: list[str] = []
+    for name, result in report["results"].items():
+        old = old_results.get(name)
+        if old is None or result["ops_per_sec"] >= old["ops_per_sec"]:
+            results[name] = result
+            continue
+        if name in accepted:
+            results[name] = result
+            history.append(
+                {
+                    "case": name,
+                    "from_ops_per_sec": old["ops_per_sec"],
+                    "to_ops_per_sec": result["ops_per_sec"],
+                    "git_revision": report["meta"]["git_revision"],
+                    "reason": accepted[name],
+                }
+            )
+            continue
+        results[name] = old
+        if result["ops_per_sec"] / old["ops_per_sec"] - 1 < -threshold:
+            rejected.append(name)
+    baseline = {**report, "results": results}
+    if history:
+        baseline["accepted_regressions"] = history
+    return baseline, rejected
+
+
+def _parse_accepted(values: Sequence[str]) -> dict[str, str]:
+    accepted: dict[str, str] = {}
+    for value in values:
+        name, sep, reason = value.partition("=")
+        if not sep or not name.strip() or not reason.strip():
+            raise ValueError(f"--accept-regression expects CASE=REASON, got {value!r}")
+        accepted[name.strip()] = reason.strip()
+    return accepted
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", choices=("sqlite", "postgres"), default="sqlite")
+    parser.add_argument("--postgres-url", default=os.getenv("BENCH_POSTGRES_URL"))
+    parser.add_argument("--scale", type=float, default=1.0, help="Множитель объёмов данных.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1, help="Незамеряемых прогонов на сценарий.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--filter", default=None, help="Только сценарии, содержащие подстроку.")
+    parser.add_argument("--output", default=None, help="Куда записать JSON с результатами.")
+    parser.add_argument("--baseline", default=None, help="JSON baseline для сравнения.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Допустимое падение ops/s относительно baseline (0.2 = 20%%).",
+    )
+    parser.add_argument("--save-baseline", default=None, help="Сохранить результат как baseline.")
+    parser.add_argument(
+        "--accept-regression",
+        action="append",
+        default=[],
+        metavar="CASE=REASON",
+        help="Принять падение сценария при --save-baseline (с причиной; можно повторять).",
+    )
+    return parser.parse_args(argv)
+
+
+def _write_json(path: str | Path, data: dict[str, Any]) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    try:
+        accepted = _parse_accepted(args.accept_regression)
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        return 2
+    if args.db == "postgres" and not args.postgres_url:
+        print("ERROR: --db postgres requires --postgres-url or BENCH_POSTGRES_URL")
+        return 2
+
+    db = Database(kind=args.db, postgres_url=args.postgres_url)
+    ctx = Context(db=db, scale=args.scale, seed=args.seed)
+    results: dict[str, Any] = {}
+    try:
+        for bench in CASES:
+            if args.filter and args.filter not in bench.name:
+                continue
+            result = run_case(bench, ctx, args.repeat, args.warmup)
+            results[bench.name] = result.as_dict()
+            print(
+                f"{bench.name:<34} {result.ops:>7} ops  median {result.median_s * 1000:9.1f} ms  "
+                f"{result.ops_per_sec:>12,.1f} ops/s"
+            )
+    finally:
+        db.close()
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "db": args.db,
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        _write_json(args.output, report)
+
+    if args.save_baseline:
+        path = Path(args.save_baseline)
+        previous = json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+        baseline, rejected = merge_baseline(report, previous, args.threshold, accepted)
+        if rejected:
+            if previous is not None:
+                compare(report, previous, args.threshold)
+            print(
+                f"FAIL: baseline not saved, {len(rejected)} case(s) regressed more than "
+                f"{args.threshold:.0%}: {', '.join(rejected)}; "
+                "fix them or pass --accept-regression CASE=REASON"
+            )
+            return 1
+        _write_json(path, baseline)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"FAIL: {len(regressions)} case(s) regressed more than {args.threshold:.0%}")
+            return 1
+        print("OK: no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
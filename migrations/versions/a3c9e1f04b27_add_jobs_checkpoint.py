@@ -0,0 +1,28 @@
+"""add jobs.checkpoint
+
+Revision ID: a3c9e1f04b27
+Revises: 468e0efd141c
+Create Date: 2026-10-19 09:12:31.408112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c9e1f04b27'
+down_revision: Union[str, Sequence[str], None] = '468e0efd141c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.add_column(sa.Column("checkpoint", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_column("checkpoint")
@@ -0,0 +1,44 @@
+"""add jobs queue columns (attempts, run_after, lease) and queue indexes
+
+Revision ID: a6f04d2c8e17
+Revises: d93a7c41e5b8
+Create Date: 2026-10-19 21:03:44.902118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6f04d2c8e17'
+down_revision: Union[str, Sequence[str], None] = 'd93a7c41e5b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.add_column(sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+        batch_op.add_column(
+            sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="1")
+        )
+        batch_op.add_column(sa.Column("run_after", sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column("leased_by", sa.String(length=128), nullable=True))
+        batch_op.add_column(sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_jobs_queue", "jobs", ["job_type", "status", "id"])
+    op.create_index("ix_jobs_lease", "jobs", ["status", "lease_expires_at"])
+
+
+def downgrade():
+    op.drop_index("ix_jobs_lease", table_name="jobs")
+    op.drop_index("ix_jobs_queue", table_name="jobs")
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_column("heartbeat_at")
+        batch_op.drop_column("lease_expires_at")
+        batch_op.drop_column("leased_by")
+        batch_op.drop_column("run_after")
+        batch_op.drop_column("max_attempts")
+        batch_op.drop_column("attempts")
@@ -0,0 +1,27 @@
+"""add bids (load_region, unload_region, published_at) route index
+
+Revision ID: b5d13e7f0a42
+Revises: f2c8d4a61b97
+Create Date: 2026-10-19 17:42:08.318664
+
+Регионы уже существующих заявок заполняются при переобработке
+(reprocess_raw_items_cli): пайплайн определяет их по справочнику.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d13e7f0a42'
+down_revision: Union[str, Sequence[str], None] = 'f2c8d4a61b97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index("ix_bids_route", "bids", ["load_region", "unload_region", "published_at"])
+
+
+def downgrade():
+    op.drop_index("ix_bids_route", table_name="bids")
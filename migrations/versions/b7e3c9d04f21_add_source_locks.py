@@ -0,0 +1,32 @@
+"""add source_locks table for per-source harvest exclusivity
+
+Revision ID: b7e3c9d04f21
+Revises: a6f04d2c8e17
+Create Date: 2026-10-19 22:41:37.902114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c9d04f21'
+down_revision: Union[str, Sequence[str], None] = 'a6f04d2c8e17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        "source_locks",
+        sa.Column("source_code", sa.String(length=50), primary_key=True),
+        sa.Column("holder", sa.String(length=160), nullable=False),
+        sa.Column("acquired_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("source_locks")
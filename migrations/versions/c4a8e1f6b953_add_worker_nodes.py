@@ -0,0 +1,34 @@
+"""add worker_nodes membership table for source sharding
+
+Revision ID: c4a8e1f6b953
+Revises: b7e3c9d04f21
+Create Date: 2026-10-19 23:58:04.611873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8e1f6b953'
+down_revision: Union[str, Sequence[str], None] = 'b7e3c9d04f21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        "worker_nodes",
+        sa.Column("node_id", sa.String(length=160), primary_key=True),
+        sa.Column("capacity", sa.Float(), nullable=False, server_default="1"),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_worker_nodes_heartbeat_at", "worker_nodes", ["heartbeat_at"])
+
+
+def downgrade():
+    op.drop_index("ix_worker_nodes_heartbeat_at", table_name="worker_nodes")
+    op.drop_table("worker_nodes")
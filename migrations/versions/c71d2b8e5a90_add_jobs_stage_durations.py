@@ -0,0 +1,28 @@
+"""add jobs.stage_durations
+
+Revision ID: c71d2b8e5a90
+Revises: a3c9e1f04b27
+Create Date: 2026-10-19 11:40:07.215384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71d2b8e5a90'
+down_revision: Union[str, Sequence[str], None] = 'a3c9e1f04b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.add_column(sa.Column("stage_durations", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_column("stage_durations")
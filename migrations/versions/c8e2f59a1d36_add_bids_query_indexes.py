@@ -0,0 +1,27 @@
+"""add bids (published_at, id) and (cargo_type, published_at) indexes
+
+Revision ID: c8e2f59a1d36
+Revises: b5d13e7f0a42
+Create Date: 2026-10-19 18:27:51.604129
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2f59a1d36'
+down_revision: Union[str, Sequence[str], None] = 'b5d13e7f0a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_index("ix_bids_published_at_id", "bids", ["published_at", "id"])
+    op.create_index("ix_bids_cargo_type_published_at", "bids", ["cargo_type", "published_at"])
+
+
+def downgrade():
+    op.drop_index("ix_bids_cargo_type_published_at", table_name="bids")
+    op.drop_index("ix_bids_published_at_id", table_name="bids")
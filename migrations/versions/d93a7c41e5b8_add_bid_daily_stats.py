@@ -0,0 +1,49 @@
+"""add bid_daily_stats aggregate and created_at indexes
+
+Revision ID: d93a7c41e5b8
+Revises: c8e2f59a1d36
+Create Date: 2026-10-19 20:12:08.317455
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd93a7c41e5b8'
+down_revision: Union[str, Sequence[str], None] = 'c8e2f59a1d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        "bid_daily_stats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column(
+            "source_id",
+            sa.Integer(),
+            sa.ForeignKey("sources.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("cargo_type", sa.String(length=128), nullable=False, server_default=""),
+        sa.Column("bids_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("duplicates_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("raw_items_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("errors_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("price_sum", sa.Numeric(18, 2), nullable=False, server_default="0"),
+        sa.Column("price_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("day", "source_id", "cargo_type", name="uq_bid_daily_stats_key"),
+    )
+    op.create_index("ix_bids_created_at", "bids", ["created_at"])
+    op.create_index("ix_raw_items_created_at", "raw_items", ["created_at"])
+
+
+def downgrade():
+    op.drop_index("ix_raw_items_created_at", table_name="raw_items")
+    op.drop_index("ix_bids_created_at", table_name="bids")
+    op.drop_table("bid_daily_stats")
@@ -0,0 +1,50 @@
+"""add partial unique index on pending jobs (one per job_type and source)
+
+Revision ID: e1d5a8c3b702
+Revises: c4a8e1f6b953
+Create Date: 2026-10-20 10:12:37.518406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1d5a8c3b702'
+down_revision: Union[str, Sequence[str], None] = 'c4a8e1f6b953'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_PENDING = sa.text("status = 'pending'")
+
+
+def upgrade():
+    # Дубли, успевшие встать в очередь до индекса: ждёт самая ранняя задача,
+    # остальные закрываются (не удаляются — на них могут ссылаться errors)
+    op.execute(
+        """
+        UPDATE jobs
+        SET status = 'failed', error_message = 'duplicate pending job'
+        WHERE status = 'pending'
+          AND source_id IS NOT NULL
+          AND id NOT IN (
+              SELECT MIN(id) FROM jobs
+              WHERE status = 'pending' AND source_id IS NOT NULL
+              GROUP BY job_type, source_id
+          )
+        """
+    )
+    op.create_index(
+        "ux_jobs_pending",
+        "jobs",
+        ["job_type", "source_id"],
+        unique=True,
+        postgresql_where=_PENDING,
+        sqlite_where=_PENDING,
+    )
+
+
+def downgrade():
+    op.drop_index("ux_jobs_pending", table_name="jobs")
@@ -0,0 +1,36 @@
+"""add export_cursors and bids (updated_at, id) index
+
+Revision ID: e4b7a1c9d302
+Revises: c71d2b8e5a90
+Create Date: 2026-10-19 14:05:31.540217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7a1c9d302'
+down_revision: Union[str, Sequence[str], None] = 'c71d2b8e5a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        "export_cursors",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("export_code", sa.String(length=128), nullable=False, unique=True),
+        sa.Column("last_updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_bid_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rows_exported", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("exported_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_bids_updated_at_id", "bids", ["updated_at", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_bids_updated_at_id", table_name="bids")
+    op.drop_table("export_cursors")
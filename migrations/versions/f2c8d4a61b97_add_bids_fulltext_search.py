@@ -0,0 +1,70 @@
+"""add bids full-text search index (tsvector + GIN / FTS5)
+
+Revision ID: f2c8d4a61b97
+Revises: e4b7a1c9d302
+Create Date: 2026-10-19 16:20:44.913502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8d4a61b97'
+down_revision: Union[str, Sequence[str], None] = 'e4b7a1c9d302'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_FTS_COLUMNS = "title, cargo_type, load_location, unload_location, description"
+_NEW = "new.title, new.cargo_type, new.load_location, new.unload_location, new.description"
+_OLD = "old.title, old.cargo_type, old.load_location, old.unload_location, old.description"
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            "ALTER TABLE bids ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('russian', coalesce(title, '') || ' ' || "
+            "coalesce(cargo_type, '') || ' ' || coalesce(load_location, '') || ' ' || "
+            "coalesce(unload_location, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+            ") STORED"
+        )
+        op.execute("CREATE INDEX ix_bids_search_vector ON bids USING gin (search_vector)")
+    elif dialect == "sqlite":
+        op.execute(
+            f"CREATE VIRTUAL TABLE bids_fts USING fts5({_FTS_COLUMNS}, "
+            "content='bids', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        op.execute(
+            "CREATE TRIGGER bids_fts_ai AFTER INSERT ON bids BEGIN "
+            f"INSERT INTO bids_fts(rowid, {_FTS_COLUMNS}) VALUES (new.id, {_NEW}); END"
+        )
+        op.execute(
+            "CREATE TRIGGER bids_fts_ad AFTER DELETE ON bids BEGIN "
+            f"INSERT INTO bids_fts(bids_fts, rowid, {_FTS_COLUMNS}) "
+            f"VALUES ('delete', old.id, {_OLD}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER bids_fts_au AFTER UPDATE OF {_FTS_COLUMNS} ON bids BEGIN "
+            f"INSERT INTO bids_fts(bids_fts, rowid, {_FTS_COLUMNS}) "
+            f"VALUES ('delete', old.id, {_OLD}); "
+            f"INSERT INTO bids_fts(rowid, {_FTS_COLUMNS}) VALUES (new.id, {_NEW}); END"
+        )
+        # Индексируем уже существующие заявки
+        op.execute("INSERT INTO bids_fts(bids_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_bids_search_vector")
+        op.execute("ALTER TABLE bids DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS bids_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS bids_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS bids_fts_ai")
+        op.execute("DROP TABLE IF EXISTS bids_fts")
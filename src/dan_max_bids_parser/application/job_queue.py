@@ -0,0 +1,224 @@
+# path: src/dan_max_bids_parser/application/job_queue.py
+"""
+Сбор через очередь задач (таблица jobs, JobQueuePort) для воркеров
+на нескольких узлах.
+
+- EnqueueHarvestService — производитель: вместо запуска ставит задачу
+  harvest_source в очередь (тот же контракт RunSourceHarvestingUseCase,
+  поэтому подключается к HarvestScheduler без изменений).
+- HarvestQueueWorker — потребитель: забирает задачи (claim), пока
+  задача выполняется, продлевает аренду из фонового потока (heartbeat),
+  по итогам снимает аренду (complete) или возвращает задачу в очередь
+  с задержкой (fail). Источник, занятый другим запуском
+  (SourceBusyError), — не ошибка: задача возвращается в очередь без
+  траты попытки (release). Периодически возвращает в очередь задачи
+  умерших воркеров (reclaim_expired).
+
+Каждая операция с очередью — отдельная короткая транзакция: блокировки
+не держатся на время сбора.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Optional
+
+from dan_max_bids_parser.application.source_lock import SourceBusyError
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.application.use_cases.harvest_source import (
+    RunSourceHarvestingCommand,
+    RunSourceHarvestingUseCase,
+)
+from dan_max_bids_parser.application.use_cases.harvest_source_service import JOB_TYPE
+from dan_max_bids_parser.domain.entities import JobEntity
+
+logger = logging.getLogger(__name__)
+
+UnitOfWorkFactory = Callable[[], UnitOfWork]
+
+
+def default_worker_id() -> str:
+    """Уникальный id воркера: узел, процесс и случайный суффикс."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class EnqueueHarvestService(RunSourceHarvestingUseCase):
+    """
+    Производитель задач сбора.
+
+    Повторная постановка источника, задача которого ещё ждёт или
+    выполняется, пропускается (см. JobQueuePort.enqueue).
+    """
+
+    def __init__(self, uow_factory: UnitOfWorkFactory, max_attempts: int = 3) -> None:
+        self._uow_factory = uow_factory
+        self._max_attempts = max_attempts
+
+    def execute(self, command: RunSourceHarvestingCommand) -> Optional[JobEntity]:
+        with self._uow_factory() as uow:
+            source = uow.sources.get_by_code(command.source_code)
+            if source is None:
+                raise ValueError(f"Source with code='{command.source_code}' not found")
+            job = uow.job_queue.enqueue(JOB_TYPE, source.id, max_attempts=self._max_attempts)
+            uow.commit()
+        if job is None:
+            logger.info("Harvest of %s is already queued", command.source_code)
+        return job
+
+
+class _Heartbeat:
+    """Фоновое продление аренды задачи, пока она выполняется."""
+
+    def __init__(self, worker: "HarvestQueueWorker", job_id: int) -> None:
+        self._worker = worker
+        self._job_id = job_id
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name=f"heartbeat-{job_id}", daemon=True)
+        self.lost = False
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _loop(self) -> None:
+        worker = self._worker
+        while not self._stop.wait(worker.heartbeat_interval.total_seconds()):
+            try:
+                with worker.uow_factory() as uow:
+                    alive = uow.job_queue.heartbeat(self._job_id, worker.worker_id, worker.lease)
+                    uow.commit()
+            except Exception:
+                # Разовый сбой БД не страшен: аренда длиннее интервала
+                logger.exception("Heartbeat of job %s failed", self._job_id)
+                continue
+            if not alive:
+                self.lost = True
+                logger.warning("Job %s: lease lost by %s", self._job_id, self._worker.worker_id)
+                return
+
+
+class HarvestQueueWorker:
+    """
+    Использование:
+        worker = HarvestQueueWorker(uow_factory, service)
+        worker.run()                       # до stop()
+        worker.run(until_idle=True)        # пока есть готовые задачи
+
+    :param service: исполнитель сбора; получает команду с job_id и пишет
+        итоги запуска в ту же строку jobs.
+    :param lease: срок аренды; heartbeat_interval (по умолчанию треть
+        аренды) должен быть заметно меньше него.
+    :param retry_delay: через сколько повторить упавшую задачу или задачу
+        занятого источника.
+    """
+
+    def __init__(
+        self,
+        uow_factory: UnitOfWorkFactory,
+        service: RunSourceHarvestingUseCase,
+        worker_id: Optional[str] = None,
+        lease: timedelta = timedelta(minutes=5),
+        heartbeat_interval: Optional[timedelta] = None,
+        poll_interval: float = 1.0,
+        retry_delay: timedelta = timedelta(minutes=1),
+        reclaim_interval: timedelta = timedelta(seconds=30),
+    ) -> None:
+        self.uow_factory = uow_factory
+        self.worker_id = worker_id or default_worker_id()
+        self.lease = lease
+        self.heartbeat_interval = heartbeat_interval or lease / 3
+        if self.heartbeat_interval >= lease:
+            raise ValueError("heartbeat_interval must be shorter than lease")
+        self._service = service
+        self._poll_interval = poll_interval
+        self._retry_delay = retry_delay
+        self._reclaim_interval = reclaim_interval
+        self._next_reclaim = datetime.min
+        self._stopping = threading.Event()
+        self.processed = 0
+        self.failed = 0
+        self.requeued = 0
+
+    def run(self, until_idle: bool = False, max_jobs: Optional[int] = None) -> None:
+        while not self._stopping.is_set():
+            if max_jobs is not None and self.processed + self.failed + self.requeued >= max_jobs:
+                return
+            if self.run_once() is None:
+                if until_idle:
+                    return
+                self._stopping.wait(self._poll_interval)
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def run_once(self) -> Optional[JobEntity]:
+        """Забирает и выполняет одну задачу; None — готовых задач нет."""
+        self._reclaim()
+        with self.uow_factory() as uow:
+            jobs = uow.job_queue.claim(self.worker_id, [JOB_TYPE], limit=1, lease=self.lease)
+            source = uow.sources.get_by_id(jobs[0].source_id) if jobs and jobs[0].source_id else None
+            uow.commit()
+        if not jobs:
+            return None
+
+        job = jobs[0]
+        error: Optional[str] = None
+        busy = False
+        lost = False
+        if source is None:
+            error = f"Source id={job.source_id} not found"
+        else:
+            logger.info("Worker %s took job %s (%s)", self.worker_id, job.id, source.code)
+            with _Heartbeat(self, job.id) as heartbeat:
+                try:
+                    self._service.execute(
+                        RunSourceHarvestingCommand(source_code=source.code, job_id=job.id)
+                    )
+                except SourceBusyError as exc:
+                    logger.info("Job %s: %s, requeued", job.id, exc)
+                    busy = True
+                except Exception as exc:
+                    logger.exception("Job %s failed", job.id)
+                    error = repr(exc)
+            lost = heartbeat.lost
+
+        with self.uow_factory() as uow:
+            if busy:
+                released = uow.job_queue.release(
+                    job.id, self.worker_id, run_after=datetime.utcnow() + self._retry_delay
+                )
+            elif error is None:
+                released = uow.job_queue.complete(job.id, self.worker_id)
+            else:
+                released = uow.job_queue.fail(job.id, self.worker_id, error, self._retry_delay)
+            uow.commit()
+        if lost or not released:
+            logger.warning("Job %s finished by %s after its lease was lost", job.id, self.worker_id)
+        if busy:
+            self.requeued += 1
+        elif error is None:
+            self.processed += 1
+        else:
+            self.failed += 1
+        return job
+
+    def _reclaim(self) -> None:
+        now = datetime.utcnow()
+        if now < self._next_reclaim:
+            return
+        self._next_reclaim = now + self._reclaim_interval
+        with self.uow_factory() as uow:
+            reclaimed = uow.job_queue.reclaim_expired(now)
+            uow.commit()
+        if reclaimed:
+            logger.warning("Reclaimed %d jobs with expired leases", reclaimed)
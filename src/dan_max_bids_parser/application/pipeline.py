@@ -0,0 +1,195 @@
+# path: src/dan_max_bids_parser/application/pipeline.py
+"""
+BidPipeline: преобразование RawItemEntity -> BidEntity.
+
+Шаги: парсинг (ParserPort) -> нормализация (Normalizer) ->
+регионы пунктов (Gazetteer) -> классификация (BidClassifier) ->
+фильтрация (BidFilter).
+
+Пайплайн не работает с БД: конфигурация передаётся снимком
+{секция: записи}, поэтому один и тот же пайплайн используется и в
+RunSourceHarvesting, и в воркерах ReprocessRawItems (в других процессах).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.domain.entities import (
+    BidEntity,
+    ConfigEntryEntity,
+    RawItemEntity,
+    SourceEntity,
+)
+from dan_max_bids_parser.domain.ports import ParserPort
+from dan_max_bids_parser.domain.services.bid_filter import BidFilter, FilterResult
+from dan_max_bids_parser.domain.services.classifier import BidClassifier
+from dan_max_bids_parser.domain.services.gazetteer import Gazetteer
+from dan_max_bids_parser.domain.services.normalizer import Normalizer
+
+# Снимок конфигурации: секция config_* -> активные записи
+ConfigSnapshot = Mapping[str, Sequence[ConfigEntryEntity]]
+
+# Поля BidEntity, которые переносятся из нормализованного словаря полей.
+_BID_FIELDS = (
+    "external_id",
+    "title",
+    "description",
+    "cargo_type",
+    "transport_type",
+    "load_point",
+    "unload_point",
+    "weight_tons",
+    "price",
+    "currency",
+    "contact",
+    "url",
+    "published_at",
+)
+
+
+@dataclass
+class BidPipeline:
+    """
+    Набор шагов построения заявок. Все шаги, кроме нормализации,
+    необязательны.
+    """
+
+    parser: Optional[ParserPort] = None
+    normalizer: Normalizer = field(default_factory=Normalizer)
+    classifier: Optional[BidClassifier] = None
+    bid_filter: Optional[BidFilter] = None
+    gazetteer: Optional[Gazetteer] = None
+
+    # --- Конфигурация ---
+
+    def config_sections(self) -> list[str]:
+        """Секции config_*, которые нужны подключённым шагам."""
+        sections = []
+        if self.parser is not None:
+            sections.append("source")
+        if self.classifier is not None:
+            sections.append("classifier")
+        if self.bid_filter is not None:
+            sections.append("filter_rule")
+        return sections
+
+    def load_configs(self, uow: UnitOfWork) -> dict[str, list[ConfigEntryEntity]]:
+        """Один запрос на секцию; шаги без конфигурации БД не трогают."""
+        return {
+            section: list(uow.configs.list_active(section))
+            for section in self.config_sections()
+        }
+
+    def refresh(self, configs: ConfigSnapshot) -> None:
+        """Перекомпилирует шаги, у которых изменилась версия конфигурации."""
+        if self.parser is not None:
+            self.parser.refresh(configs.get("source", ()))
+        if self.classifier is not None:
+            self.classifier.refresh(configs.get("classifier", ()))
+        if self.bid_filter is not None:
+            self.bid_filter.refresh(configs.get("filter_rule", ()))
+
+    # --- Обработка ---
+
+    def process(
+        self,
+        source: SourceEntity,
+        raw_items: Iterable[RawItemEntity],
+    ) -> FilterResult:
+        """Строит, классифицирует и фильтрует заявки из пачки raw_items."""
+        return self.classify_and_filter(self.build_bids(source, raw_items))
+
+    def classify_and_filter(self, bids: list[BidEntity]) -> FilterResult:
+        """Заполняет регионы и тип груза/транспорта, отсеивает заявки по правилам."""
+        if self.gazetteer is not None and bids:
+            self.gazetteer.fill_regions(bids)
+        if self.classifier is not None and bids:
+            self.classifier.classify_many(bids)
+
+        if self.bid_filter is not None and bids:
+            return self.bid_filter.filter_many(bids)
+        return FilterResult(accepted=bids)
+
+    def build_bids(
+        self,
+        source: SourceEntity,
+        raw_items: Iterable[RawItemEntity],
+    ) -> list[BidEntity]:
+        """
+        Построение BidEntity из RawItemEntity.
+
+        Если для источника настроен парсер — одна страница даёт столько
+        заявок, сколько строк нашёл парсер. Иначе — одна заявка на RawItem
+        с сырым содержимым в description. Словари полей нормализуются
+        одним пакетом.
+        """
+        return [bid for _, bid in self.build_bid_pairs(source, raw_items)]
+
+    def build_bid_pairs(
+        self,
+        source: SourceEntity,
+        raw_items: Iterable[RawItemEntity],
+    ) -> list[tuple[RawItemEntity, BidEntity]]:
+        """
+        То же, что build_bids, но с исходным RawItem каждой заявки — для
+        сырья, которое ещё не сохранено: raw_item_id проставляется после
+        вставки raw_items.
+        """
+        use_parser = self.parser is not None and self.parser.supports(source)
+
+        origins: list[RawItemEntity] = []
+        records: list[Mapping[str, Any]] = []
+        for raw in raw_items:
+            if use_parser:
+                for fields in self.parser.parse(source, raw):
+                    origins.append(raw)
+                    records.append(fields)
+                continue
+
+            origins.append(raw)
+            records.append(
+                {
+                    "external_id": raw.external_id,
+                    "description": raw.payload,
+                    "url": raw.url,
+                }
+            )
+
+        normalized = self.normalizer.normalize_many(records)
+        return [
+            (raw, self._build_bid_from_fields(source, raw, fields))
+            for raw, fields in zip(origins, normalized)
+        ]
+
+    @staticmethod
+    def _build_bid_from_fields(
+        source: SourceEntity,
+        raw: RawItemEntity,
+        fields: Mapping[str, Any],
+    ) -> BidEntity:
+        """Создаёт BidEntity из нормализованного словаря полей."""
+        bid = BidEntity(
+            source_id=raw.source_id,
+            raw_item_id=raw.id,
+            url=raw.url,
+        )
+        for name in _BID_FIELDS:
+            value = fields.get(name)
+            if value is not None:
+                setattr(bid, name, value)
+
+        if not bid.title:
+            bid.title = (
+                f"{source.name or source.code}: заявка "
+                f"{bid.external_id or raw.id or ''}"
+            ).strip()
+        return bid
+
+
+# Фабрика пайплайна. Для process pool должна быть функцией уровня модуля,
+# чтобы её можно было передать в дочерний процесс.
+PipelineFactory = Callable[[], BidPipeline]
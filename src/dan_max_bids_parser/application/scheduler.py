@@ -0,0 +1,279 @@
+# path: src/dan_max_bids_parser/application/scheduler.py
+"""
+HarvestScheduler: долгоживущий планировщик сбора по config_schedule.
+
+Вместо запуска процесса на каждый тик cron один процесс держит:
+- кучу таймеров (heapq) — ближайшее срабатывание за O(log n);
+- пул потоков-воркеров с глобальным лимитом (max_workers) и лимитом
+  одновременных запусков на источник (ScheduleSpec.max_instances);
+- «тёплые» сервисы: service_factory вызывается один раз на поток пула,
+  и RunSourceHarvestingService переиспользует между запусками engine
+  (пул соединений), скомпилированный снимок конфигурации (BidPipeline
+  перекомпилирует шаги только при смене версии) и провайдер сырья
+  (его HTTP-пулы).
+
+Срабатывание попадает в очередь ожидания (не больше одного на
+расписание — лишние схлопываются) и запускается, как только есть
+свободный воркер и лимит источника не исчерпан. Опоздавшее дольше
+misfire_grace срабатывание обрабатывается по политике misfire
+(см. domain.services.schedule). config_schedule перечитывается раз в
+refresh_interval; изменённые расписания перепланируются, удалённые
+снимаются (записи кучи с устаревшим поколением пропускаются).
+
+С owns (например, SourceSharding.owns) планировщик запускает только
+источники своего узла: срабатывания чужих пропускаются, расписание
+идёт дальше — источник вернётся к узлу при перераспределении.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import random
+import threading
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.application.use_cases.harvest_source import (
+    RunSourceHarvestingCommand,
+    RunSourceHarvestingUseCase,
+)
+from dan_max_bids_parser.domain.services.schedule import ScheduleSpec, parse_schedule
+
+logger = logging.getLogger(__name__)
+
+UnitOfWorkFactory = Callable[[], UnitOfWork]
+ServiceFactory = Callable[[], RunSourceHarvestingUseCase]
+Clock = Callable[[], datetime]
+
+# Дольше не спим, даже если ближайшее срабатывание далеко (на случай
+# перевода системных часов)
+_MAX_SLEEP_SECONDS = 30.0
+
+
+@dataclass(slots=True)
+class SchedulerStats:
+    """Счётчики планировщика с момента старта."""
+    dispatched: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    misfired: int = 0  # пропущены по политике "skip"
+    coalesced: int = 0  # схлопнуты с уже ожидающим запуском
+    not_owned: int = 0  # источник закреплён за другим узлом
+
+
+class HarvestScheduler:
+    """
+    Использование:
+        scheduler = HarvestScheduler(uow_factory, service_factory, max_workers=4)
+        scheduler.run()        # до stop() из другого потока / обработчика сигнала
+
+    :param uow_factory: фабрика UnitOfWork для чтения config_schedule.
+    :param service_factory: сборка RunSourceHarvesting; вызывается один раз
+        на поток пула, сервис переиспользуется во всех запусках этого потока.
+    :param max_workers: глобальный лимит одновременных запусков.
+    :param refresh_interval: период перечитывания config_schedule.
+    :param clock: текущее время UTC (наивное), подменяется в тестах.
+    :param owns: фильтр источников узла по коду; None — все источники.
+    """
+
+    def __init__(
+        self,
+        uow_factory: UnitOfWorkFactory,
+        service_factory: ServiceFactory,
+        max_workers: int = 4,
+        refresh_interval: timedelta = timedelta(minutes=1),
+        clock: Clock = datetime.utcnow,
+        rng: Optional[random.Random] = None,
+        owns: Optional[Callable[[str], bool]] = None,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be positive")
+        self._uow_factory = uow_factory
+        self._service_factory = service_factory
+        self._max_workers = max_workers
+        self._refresh_interval = refresh_interval
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._owns = owns
+
+        # (момент запуска с джиттером, порядковый номер, code, поколение, номинал)
+        self._heap: list[tuple[datetime, int, str, int, datetime]] = []
+        self._seq = 0
+        self._specs: dict[str, tuple[ScheduleSpec, int]] = {}
+        # code -> момент срабатывания, ждущего свободного воркера (порядок — FIFO)
+        self._pending: dict[str, datetime] = {}
+        self._running: Counter[str] = Counter()
+        self._in_flight = 0
+
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="harvest")
+        self.stats = SchedulerStats()
+
+    # --- Расписания ---
+
+    def reload(self, now: Optional[datetime] = None) -> None:
+        """Перечитывает config_schedule; некорректные записи пропускаются с ошибкой в логе."""
+        now = now or self._clock()
+        with self._uow_factory() as uow:
+            entries = list(uow.configs.list_active("schedule"))
+
+        specs: dict[str, ScheduleSpec] = {}
+        for entry in entries:
+            try:
+                specs[entry.code] = parse_schedule(entry)
+            except ValueError as exc:
+                logger.error("Skipping schedule %s: %s", entry.code, exc)
+
+        with self._lock:
+            for code in set(self._specs) - set(specs):
+                del self._specs[code]
+                self._pending.pop(code, None)
+                logger.info("Schedule %s removed", code)
+            for code, spec in specs.items():
+                current = self._specs.get(code)
+                if current is not None and current[0].version == spec.version:
+                    continue
+                generation = current[1] + 1 if current else 0
+                self._specs[code] = (spec, generation)
+                self._push(spec, generation, spec.next_fire(now))
+                logger.info("Schedule %s (%s) loaded", code, spec.source_code)
+        self._wake.set()
+
+    def next_fire_at(self) -> Optional[datetime]:
+        """Ближайшее срабатывание (с джиттером) или None, если расписаний нет."""
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    # --- Цикл ---
+
+    def tick(self, now: Optional[datetime] = None) -> int:
+        """Ставит наступившие срабатывания в очередь и запускает, что позволяют лимиты."""
+        now = now or self._clock()
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, _, code, generation, nominal = heapq.heappop(self._heap)
+                current = self._specs.get(code)
+                if current is None or current[1] != generation:
+                    continue
+                spec = current[0]
+                if self._owns is not None and not self._owns(spec.source_code):
+                    self.stats.not_owned += 1
+                elif code in self._pending:
+                    self.stats.coalesced += 1
+                else:
+                    self._pending[code] = fire_at
+                # Сильно опоздали — пропущенные слоты схлопываются, расписание от now
+                base = now if now - fire_at > spec.misfire_grace else nominal
+                self._push(spec, generation, spec.next_fire(base))
+            return self._dispatch(now)
+
+    def run(self) -> None:
+        """Работает до stop(); по выходу дожидается идущих запусков."""
+        next_reload = self._clock()
+        try:
+            while not self._stopping.is_set():
+                now = self._clock()
+                if now >= next_reload:
+                    try:
+                        self.reload(now)
+                    except Exception:
+                        logger.exception("Failed to reload config_schedule")
+                    next_reload = now + self._refresh_interval
+                self.tick(now)
+
+                wake_at = next_reload
+                next_fire = self.next_fire_at()
+                if next_fire is not None:
+                    wake_at = min(wake_at, next_fire)
+                timeout = min(max((wake_at - self._clock()).total_seconds(), 0.0), _MAX_SLEEP_SECONDS)
+                self._wake.wait(timeout)
+                self._wake.clear()
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Ждёт, пока не останется идущих запусков (для тестов и остановки)."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    # --- Внутреннее ---
+
+    def _push(self, spec: ScheduleSpec, generation: int, nominal: datetime) -> None:
+        self._seq += 1
+        fire_at = spec.jittered(nominal, self._rng)
+        heapq.heappush(self._heap, (fire_at, self._seq, spec.code, generation, nominal))
+
+    def _drop_stale(self) -> None:
+        while self._heap:
+            _, _, code, generation, _ = self._heap[0]
+            current = self._specs.get(code)
+            if current is not None and current[1] == generation:
+                return
+            heapq.heappop(self._heap)
+
+    def _dispatch(self, now: datetime) -> int:
+        """Вызывается под self._lock."""
+        started = 0
+        for code, fire_at in list(self._pending.items()):
+            spec = self._specs[code][0]
+            if spec.misfire == "skip" and now - fire_at > spec.misfire_grace:
+                del self._pending[code]
+                self.stats.misfired += 1
+                logger.warning(
+                    "Schedule %s misfired by %s, skipped", code, now - fire_at
+                )
+                continue
+            if self._in_flight >= self._max_workers:
+                break
+            if self._running[spec.source_code] >= spec.max_instances:
+                continue
+            del self._pending[code]
+            self._in_flight += 1
+            self._running[spec.source_code] += 1
+            self.stats.dispatched += 1
+            self._executor.submit(self._run, spec)
+            started += 1
+        return started
+
+    def _service(self) -> RunSourceHarvestingUseCase:
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._local.service = self._service_factory()
+        return service
+
+    def _run(self, spec: ScheduleSpec) -> None:
+        ok = False
+        try:
+            self._service().execute(RunSourceHarvestingCommand(source_code=spec.source_code))
+            ok = True
+        except Exception:
+            logger.exception("Scheduled harvest %s (%s) failed", spec.code, spec.source_code)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._running[spec.source_code] -= 1
+                if ok:
+                    self.stats.succeeded += 1
+                else:
+                    self.stats.failed += 1
+                self._idle.notify_all()
+            # Освободился слот — ожидающие запуски разбираются без ожидания таймера
+            self._wake.set()
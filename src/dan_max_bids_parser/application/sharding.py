@@ -0,0 +1,159 @@
+# path: src/dan_max_bids_parser/application/sharding.py
+"""
+SourceSharding: за узлом закреплено стабильное подмножество активных
+источников — его HTTP-пулы, кэши и водяные знаки остаются «тёплыми».
+
+Узел раз в refresh_interval (фоновым потоком после start()):
+1. отмечается в worker_nodes (heartbeat);
+2. читает живые узлы (отметка не старше ttl), активные источники и их
+   стоимость — среднюю длительность успешных запусков за cost_window;
+3. пересчитывает распределение (domain.services.sharding.assign).
+
+Все узлы считают распределение одинаково и без координации — если
+входы у них одинаковые. Поэтому стоимость считается не по скользящему
+окну от now (его сдвигает каждый завершённый сбор, а узлы пересчитывают
+в разные моменты), а по окну, выровненному по cost_epoch: запуски,
+завершённые до начала текущей эпохи (по умолчанию — часа). Веса ещё и
+огрубляются (sharding.quantize_costs): запуск, попавший в базу на
+границе эпохи, не двигает распределение.
+
+Расхождения остаются, пока узлы видят разный состав (в пределах ttl
+после входа или ухода узла) или пересекают границу эпохи. Тогда
+источник может считаться своим на двух узлах сразу — одновременный
+сбор исключает блокировка источника (application.source_lock) — или
+ни на одном: срабатывание пропускается (HarvestScheduler, not_owned)
+до ближайшего пересчёта.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Optional
+
+from dan_max_bids_parser.application.job_queue import default_worker_id
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.application.use_cases.harvest_source_service import JOB_TYPE
+from dan_max_bids_parser.domain.services import sharding
+
+logger = logging.getLogger(__name__)
+
+UnitOfWorkFactory = Callable[[], UnitOfWork]
+Clock = Callable[[], datetime]
+
+# Строки давно умерших узлов удаляются при пересчёте
+_FORGET_AFTER = timedelta(days=1)
+
+
+class SourceSharding:
+    """
+    Использование:
+        shard = SourceSharding(uow_factory, capacity=2.0)
+        shard.start()                       # первый пересчёт сразу
+        HarvestScheduler(..., owns=shard.owns)
+        ...
+        shard.stop()                        # уход без ожидания ttl
+
+    :param capacity: относительная мощность узла.
+    :param ttl: узел без отметки дольше ttl считается ушедшим; должен быть
+        в несколько раз больше refresh_interval.
+    :param cost_epoch: шаг выравнивания окна стоимости (cost_window
+        заканчивается началом текущей эпохи).
+    """
+
+    def __init__(
+        self,
+        uow_factory: UnitOfWorkFactory,
+        node_id: Optional[str] = None,
+        capacity: float = 1.0,
+        ttl: timedelta = timedelta(seconds=90),
+        refresh_interval: timedelta = timedelta(seconds=20),
+        cost_window: timedelta = timedelta(days=7),
+        cost_epoch: timedelta = timedelta(hours=1),
+        load_factor: float = sharding.DEFAULT_LOAD_FACTOR,
+        clock: Clock = datetime.utcnow,
+    ) -> None:
+        if refresh_interval >= ttl:
+            raise ValueError("refresh_interval must be shorter than ttl")
+        if cost_epoch <= timedelta(0):
+            raise ValueError("cost_epoch must be positive")
+        self.node_id = node_id or default_worker_id()
+        self._uow_factory = uow_factory
+        self._capacity = capacity
+        self._ttl = ttl
+        self._refresh_interval = refresh_interval
+        self._cost_window = cost_window
+        self._cost_epoch = cost_epoch
+        self._load_factor = load_factor
+        self._clock = clock
+        self._assignment: dict[str, str] = {}
+        self._guard = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Распределение ---
+
+    def refresh(self, now: Optional[datetime] = None) -> dict[str, str]:
+        """Отметка узла и пересчёт; возвращает {код источника: node_id}."""
+        now = now or self._clock()
+        with self._uow_factory() as uow:
+            uow.worker_nodes.heartbeat(self.node_id, self._capacity, now)
+            uow.worker_nodes.purge(now - _FORGET_AFTER)
+            uow.commit()
+            nodes = {n.node_id: n.capacity for n in uow.worker_nodes.list_alive(self._ttl, now)}
+            sources = list(uow.sources.list_active())
+            epoch = self._epoch_start(now)
+            durations = uow.jobs.mean_durations(JOB_TYPE, epoch - self._cost_window, epoch)
+        # Своя отметка только что записана, но часы узлов могут расходиться
+        nodes.setdefault(self.node_id, self._capacity)
+
+        costs = sharding.quantize_costs(sharding.source_costs(sources, durations))
+        assignment = sharding.assign(costs, nodes, self._load_factor)
+        with self._guard:
+            previous, self._assignment = self._assignment, assignment
+        moved = sum(1 for code, node in assignment.items() if previous.get(code) != node)
+        if moved and previous:
+            logger.info(
+                "Sharding: %d of %d sources moved across %d nodes", moved, len(assignment), len(nodes)
+            )
+        return assignment
+
+    def _epoch_start(self, now: datetime) -> datetime:
+        """Начало эпохи стоимости: одинаково на всех узлах в её пределах."""
+        return datetime.min + (now - datetime.min) // self._cost_epoch * self._cost_epoch
+
+    def owns(self, source_code: str) -> bool:
+        """Закреплён ли источник за этим узлом (по последнему пересчёту)."""
+        with self._guard:
+            return self._assignment.get(source_code) == self.node_id
+
+    def owned(self) -> list[str]:
+        with self._guard:
+            return sorted(code for code, node in self._assignment.items() if node == self.node_id)
+
+    # --- Фоновый поток ---
+
+    def start(self) -> None:
+        self.refresh()
+        self._thread = threading.Thread(target=self._loop, name="sharding", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает поток и снимает узел с учёта: его источники сразу переходят к другим."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._uow_factory() as uow:
+            uow.worker_nodes.remove(self.node_id)
+            uow.commit()
+
+    def _loop(self) -> None:
+        while not self._stopping.wait(self._refresh_interval.total_seconds()):
+            try:
+                self.refresh()
+            except Exception:
+                # Распределение остаётся прежним; узел «уйдёт», только если
+                # сбои продлятся дольше ttl
+                logger.exception("Sharding refresh failed")
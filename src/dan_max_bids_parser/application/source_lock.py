@@ -0,0 +1,107 @@
+# path: src/dan_max_bids_parser/application/source_lock.py
+"""
+Не больше одного запуска сбора источника одновременно — между тиками
+планировщика, процессами и узлами.
+
+ExclusiveHarvestService оборачивает RunSourceHarvestingUseCase и держит
+блокировку источника (SourceLockPort) на всё время execute. Если
+источник уже собирается, поведение задаёт on_busy:
+
+- "skip" — запуск пропускается (в логе и в счётчике skipped);
+- "wait" — ждать освобождения не дольше wait, затем SourceBusyError;
+- "queue" — поставить сбор в очередь jobs с задержкой requeue_delay
+  (JobQueuePort.enqueue, повтор не ставится, если задача уже ждёт).
+
+Запуск, который сам пришёл из очереди (command.job_id), при любой
+политике завершается SourceBusyError: пропуск закрыл бы задачу как
+выполненную без сбора, а новая задача задублировала бы её. Воркер вернёт
+свою задачу в очередь, не тратя попытку (JobQueuePort.release).
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.application.use_cases.harvest_source import (
+    RunSourceHarvestingCommand,
+    RunSourceHarvestingUseCase,
+)
+from dan_max_bids_parser.application.use_cases.harvest_source_service import JOB_TYPE
+from dan_max_bids_parser.domain.ports import SourceLockPort
+
+logger = logging.getLogger(__name__)
+
+UnitOfWorkFactory = Callable[[], UnitOfWork]
+
+ON_BUSY_POLICIES = ("skip", "wait", "queue")
+
+
+class SourceBusyError(RuntimeError):
+    """Источник собирается другим запуском, а ждать или пропускать нельзя."""
+
+
+class ExclusiveHarvestService(RunSourceHarvestingUseCase):
+    """
+    Использование:
+        service = ExclusiveHarvestService(inner, locks, uow_factory, on_busy="queue")
+
+    :param uow_factory: нужна только политике "queue".
+    """
+
+    def __init__(
+        self,
+        inner: RunSourceHarvestingUseCase,
+        locks: SourceLockPort,
+        uow_factory: UnitOfWorkFactory,
+        on_busy: str = "skip",
+        wait: timedelta = timedelta(minutes=1),
+        requeue_delay: timedelta = timedelta(minutes=1),
+    ) -> None:
+        if on_busy not in ON_BUSY_POLICIES:
+            raise ValueError(f"Unknown on_busy policy {on_busy!r}, expected one of {ON_BUSY_POLICIES}")
+        self._inner = inner
+        self._locks = locks
+        self._uow_factory = uow_factory
+        self._on_busy = on_busy
+        self._wait = wait
+        self._requeue_delay = requeue_delay
+        self.skipped = 0
+        self.queued = 0
+
+    def execute(self, command: RunSourceHarvestingCommand) -> None:
+        code = command.source_code
+        timeout = self._wait.total_seconds() if self._on_busy == "wait" else 0.0
+        if not self._locks.acquire(code, timeout):
+            self._busy(command)
+            return
+        try:
+            self._inner.execute(command)
+        finally:
+            self._locks.release(code)
+
+    def _busy(self, command: RunSourceHarvestingCommand) -> None:
+        code = command.source_code
+        if self._on_busy == "wait" or command.job_id is not None:
+            raise SourceBusyError(f"Source '{code}' is being harvested by another run")
+        if self._on_busy == "skip":
+            self.skipped += 1
+            logger.info("Source %s is being harvested elsewhere, run skipped", code)
+            return
+
+        with self._uow_factory() as uow:
+            source = uow.sources.get_by_code(code)
+            if source is None:
+                raise ValueError(f"Source with code='{code}' not found")
+            job = uow.job_queue.enqueue(
+                JOB_TYPE, source.id, run_after=datetime.utcnow() + self._requeue_delay
+            )
+            uow.commit()
+        self.queued += 1
+        logger.info(
+            "Source %s is busy, harvest %s",
+            code,
+            f"queued as job {job.id}" if job is not None else "is already queued",
+        )
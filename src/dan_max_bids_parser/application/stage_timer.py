@@ -0,0 +1,76 @@
+# path: src/dan_max_bids_parser/application/stage_timer.py
+"""
+StageTimer: замер длительности этапов use-case.
+
+    timer = StageTimer()
+    with timer.stage("fetch"):
+        ...
+    job.stage_durations = timer.durations
+
+Повторный вход в этап с тем же именем суммирует время.
+
+Слушатели этапов (add_stage_listener) получают начало/конец каждого этапа
+любого StageTimer процесса — так профилировщики (память, SQL) привязывают
+свои замеры к этапам, не меняя use-case.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Protocol
+
+
+class StageListener(Protocol):
+    def on_stage_start(self, name: str) -> None:
+        ...
+
+    def on_stage_end(self, name: str, elapsed: float) -> None:
+        ...
+
+
+_listeners: list[StageListener] = []
+
+
+def add_stage_listener(listener: StageListener) -> None:
+    _listeners.append(listener)
+
+
+def remove_stage_listener(listener: StageListener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+class StageTimer:
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._durations: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Засекает время блока; учитывается и при исключении внутри блока."""
+        listeners = tuple(_listeners)
+        for listener in listeners:
+            listener.on_stage_start(name)
+        started = self._clock()
+        try:
+            yield
+        finally:
+            elapsed = self._clock() - started
+            self._durations[name] = self._durations.get(name, 0.0) + elapsed
+            for listener in listeners:
+                listener.on_stage_end(name, elapsed)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Добавляет время, измеренное вне stage() (этап шёл в других потоках)."""
+        self._durations[name] = self._durations.get(name, 0.0) + seconds
+
+    @property
+    def durations(self) -> dict[str, float]:
+        """Длительности этапов в секундах (с точностью до микросекунды)."""
+        return {name: round(value, 6) for name, value in self._durations.items()}
+
+    @property
+    def total(self) -> float:
+        return round(sum(self._durations.values()), 6)
@@ -0,0 +1,297 @@
+# path: src/dan_max_bids_parser/application/stages.py
+"""
+Конвейер этапов на потоках с ограниченными очередями между ними.
+
+    result = run_stages(
+        batches,                                   # источник: итератор порций
+        [Stage("parse", parse, workers=2), Stage("store", store)],
+        source_name="fetch",
+    )
+
+- Источник читается одним потоком; время внутри next() — работа этапа
+  source_name.
+- У каждого этапа своя входная очередь на queue_size порций и workers
+  потоков. Обработчик возвращает порцию для следующего этапа или None
+  (порция отброшена); результаты последнего этапа собираются в
+  StagesResult.outputs (порядок не гарантирован) — или, если задан
+  on_output, передаются ему по одному и не накапливаются.
+- Обратное давление: заполненная очередь блокирует предыдущий этап,
+  поэтому в работе не больше sum(queue_size) + число потоков порций,
+  сколько бы ни отдал источник. Накопленные outputs в эту оценку не
+  входят: для длинных прогонов — on_output или небольшой результат
+  последнего этапа.
+- Потоки работают в копии контекста (contextvars) вызывающего: учёт
+  SQL-запросов (query_scope) видит и запросы этапов.
+- Первая ошибка любого этапа останавливает конвейер и пробрасывается
+  из run_stages после остановки всех потоков.
+
+По StageStats видно узкое место: у него utilization близка к 1, а у
+этапов до него растёт blocked_seconds (ждут места в его очереди).
+"""
+
+from __future__ import annotations
+
+import contextvars
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+# Как часто заблокированный поток проверяет, не остановлен ли конвейер
+_POLL_SECONDS = 0.1
+
+# Конец потока порций: каждый поток этапа получает свой маркер
+_DONE = object()
+
+DepthListener = Callable[[str, int], None]
+OutputListener = Callable[[Any], None]
+
+
+@dataclass(frozen=True, slots=True)
+class Stage:
+    """
+    :param handler: порция -> порция для следующего этапа (None — отбросить);
+        вызывается одновременно из workers потоков.
+    :param queue_size: ёмкость входной очереди этапа, в порциях.
+    """
+
+    name: str
+    handler: Callable[[Any], Optional[Any]]
+    workers: int = 1
+    queue_size: int = 4
+
+
+@dataclass(slots=True)
+class StageStats:
+    """
+    Счётчики этапа за прогон (секунды — суммарно по потокам этапа).
+
+    busy — в обработчике; idle — в ожидании входной порции; blocked —
+    в ожидании места в очереди следующего этапа.
+    """
+
+    name: str
+    workers: int = 1
+    items: int = 0
+    busy_seconds: float = 0.0
+    idle_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    max_depth: int = 0  # наибольшая глубина входной очереди
+    wall_seconds: float = 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Доля времени прогона, которую потоки этапа были заняты работой."""
+        capacity = self.wall_seconds * self.workers
+        return min(self.busy_seconds / capacity, 1.0) if capacity else 0.0
+
+
+@dataclass(slots=True)
+class StagesResult:
+    outputs: list[Any] = field(default_factory=list)
+    stages: list[StageStats] = field(default_factory=list)
+
+    def stage(self, name: str) -> StageStats:
+        return next(s for s in self.stages if s.name == name)
+
+
+class _Runner:
+    def __init__(
+        self,
+        source: Iterable[Any],
+        stages: list[Stage],
+        source_name: str,
+        on_depth: Optional[DepthListener],
+        on_output: Optional[OutputListener],
+    ) -> None:
+        self._source = source
+        self._stages = stages
+        self._on_depth = on_depth or (lambda name, depth: None)
+        self._on_output = on_output
+        self._queues = [queue.Queue(maxsize=s.queue_size) for s in stages]
+        self._stats = [StageStats(name=source_name)] + [
+            StageStats(name=s.name, workers=s.workers) for s in stages
+        ]
+        # Сколько потоков этапа ещё работают: последний закрывает очередь дальше
+        self._alive = [1] + [s.workers for s in stages]
+        self._guard = threading.Lock()
+        self._abort = threading.Event()
+        self._error: Optional[BaseException] = None
+        self.outputs: list[Any] = []
+
+    def run(self) -> StagesResult:
+        started = time.perf_counter()
+        threads = [self._thread(f"{self._stats[0].name}-0", self._produce)]
+        for index, stage in enumerate(self._stages):
+            threads += [
+                self._thread(f"{stage.name}-{n}", self._work, index) for n in range(stage.workers)
+            ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        wall = time.perf_counter() - started
+        for stats in self._stats:
+            stats.wall_seconds = wall
+        if self._error is not None:
+            raise self._error
+        return StagesResult(outputs=self.outputs, stages=self._stats)
+
+    # --- Потоки ---
+
+    @staticmethod
+    def _thread(name: str, target: Callable[..., None], *args: Any) -> threading.Thread:
+        # Один Context нельзя войти из двух потоков — копия на каждый поток
+        context = contextvars.copy_context()
+        return threading.Thread(target=context.run, args=(target, *args), name=name)
+
+    def _produce(self) -> None:
+        stats = self._stats[0]
+        try:
+            iterator: Iterator[Any] = iter(self._source)
+            while not self._abort.is_set():
+                started = time.perf_counter()
+                item = next(iterator, _DONE)
+                self._add(stats, busy=time.perf_counter() - started)
+                if item is _DONE:
+                    break
+                self._add(stats, items=1)
+                if not self._put(0, item, stats):
+                    return
+        except BaseException as exc:  # noqa: BLE001
+            self._fail(exc)
+        finally:
+            self._finish(0)
+
+    def _work(self, index: int) -> None:
+        stage, stats = self._stages[index], self._stats[index + 1]
+        try:
+            while True:
+                item = self._get(index, stats)
+                if item is _DONE:
+                    return
+                started = time.perf_counter()
+                output = stage.handler(item)
+                self._add(stats, items=1, busy=time.perf_counter() - started)
+                if output is None:
+                    continue
+                if index + 1 == len(self._stages):
+                    self._emit(output)
+                elif not self._put(index + 1, output, stats):
+                    return
+        except BaseException as exc:  # noqa: BLE001
+            self._fail(exc)
+        finally:
+            self._finish(index + 1)
+
+    # --- Очереди ---
+
+    def _put(self, index: int, item: Any, stats: StageStats) -> bool:
+        """Кладёт порцию во вход этапа index; False — конвейер остановлен."""
+        target, downstream = self._queues[index], self._stats[index + 1]
+        started = time.perf_counter()
+        while True:
+            try:
+                target.put(item, timeout=_POLL_SECONDS)
+                break
+            except queue.Full:
+                if self._abort.is_set():
+                    return False
+        self._add(stats, blocked=time.perf_counter() - started)
+        depth = target.qsize()
+        with self._guard:
+            downstream.max_depth = max(downstream.max_depth, depth)
+        self._on_depth(downstream.name, depth)
+        return True
+
+    def _get(self, index: int, stats: StageStats) -> Any:
+        source = self._queues[index]
+        started = time.perf_counter()
+        while True:
+            try:
+                item = source.get(timeout=_POLL_SECONDS)
+                break
+            except queue.Empty:
+                if self._abort.is_set():
+                    return _DONE
+        self._add(stats, idle=time.perf_counter() - started)
+        if item is not _DONE:
+            self._on_depth(stats.name, source.qsize())
+        return item
+
+    def _finish(self, position: int) -> None:
+        """Поток этапа position завершился; последний закрывает вход следующего."""
+        with self._guard:
+            self._alive[position] -= 1
+            last = self._alive[position] == 0
+        if not last or position == len(self._stages):
+            return
+        for _ in range(self._stages[position].workers):
+            if not self._put_done(position):
+                return
+
+    def _put_done(self, index: int) -> bool:
+        while True:
+            try:
+                self._queues[index].put(_DONE, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                if self._abort.is_set():
+                    return False
+
+    def _emit(self, output: Any) -> None:
+        # Под блокировкой: слушатель может копить итоги без своей синхронизации
+        with self._guard:
+            if self._on_output is None:
+                self.outputs.append(output)
+            else:
+                self._on_output(output)
+
+    def _fail(self, exc: BaseException) -> None:
+        with self._guard:
+            if self._error is None:
+                self._error = exc
+        self._abort.set()
+
+    def _add(
+        self,
+        stats: StageStats,
+        items: int = 0,
+        busy: float = 0.0,
+        idle: float = 0.0,
+        blocked: float = 0.0,
+    ) -> None:
+        with self._guard:
+            stats.items += items
+            stats.busy_seconds += busy
+            stats.idle_seconds += idle
+            stats.blocked_seconds += blocked
+
+
+def run_stages(
+    source: Iterable[Any],
+    stages: Iterable[Stage],
+    source_name: str = "source",
+    on_depth: Optional[DepthListener] = None,
+    on_output: Optional[OutputListener] = None,
+) -> StagesResult:
+    """
+    Прогоняет порции source через этапы; возвращает результаты последнего
+    этапа и статистику (первым — этап-источник).
+
+    :param on_depth: вызывается с (имя этапа, глубина его входной очереди)
+        при каждом изменении — для метрики глубины очередей.
+    :param on_output: получает каждый результат последнего этапа (вызовы
+        не пересекаются); тогда StagesResult.outputs остаётся пустым, а
+        результат освобождается сразу после вызова.
+    """
+    stages = list(stages)
+    if not stages:
+        raise ValueError("At least one stage is required")
+    for stage in stages:
+        if stage.workers < 1 or stage.queue_size < 1:
+            raise ValueError(f"Stage {stage.name!r}: workers and queue_size must be positive")
+    return _Runner(source, stages, source_name, on_depth, on_output).run()
@@ -5,8 +5,15 @@ from typing import Protocol, TypeVar
 
 from dan_max_bids_parser.domain.ports import (
     BidRepositoryPort,
+    BidSearchPort,
+    ConfigRepositoryPort,
+    DailyStatsRepositoryPort,
+    ExportCursorRepositoryPort,
+    JobQueuePort,
+    JobRepositoryPort,
     RawItemRepositoryPort,
     SourceRepositoryPort,
+    WorkerNodeRepositoryPort,
 )
 
 TUnitOfWork = TypeVar("TUnitOfWork", bound="UnitOfWork")
@@ -23,6 +30,13 @@ class UnitOfWork(Protocol):
     sources: SourceRepositoryPort
     raw_items: RawItemRepositoryPort
     bids: BidRepositoryPort
+    configs: ConfigRepositoryPort
+    jobs: JobRepositoryPort
+    job_queue: JobQueuePort
+    export_cursors: ExportCursorRepositoryPort
+    bid_search: BidSearchPort
+    daily_stats: DailyStatsRepositoryPort
+    worker_nodes: WorkerNodeRepositoryPort
 
     def commit(self) -> None:
         """Зафиксировать текущую транзакцию."""
@@ -0,0 +1,39 @@
+# path: src/dan_max_bids_parser/application/use_cases/export_analytics.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional, Protocol
+
+from dan_max_bids_parser.domain.entities import DatasetExportStats
+
+
+@dataclass(slots=True)
+class ExportAnalyticsCommand:
+    """
+    Команда колоночной выгрузки для аналитики.
+
+    since_days — только записи, созданные с полуночи (UTC) дня
+                 today - since_days; None — вся история.
+    source_codes — пусто = все источники.
+    include_raw_items — дополнительно выгрузить метаданные raw_items.
+    """
+    since_days: Optional[int] = None
+    source_codes: tuple[str, ...] = ()
+    include_raw_items: bool = False
+    batch_size: int = 10_000
+
+
+@dataclass(slots=True)
+class ExportAnalyticsResult:
+    """Итог выгрузки: задача в jobs и статистика по наборам данных."""
+    job_id: Optional[int]
+    datasets: list[DatasetExportStats] = field(default_factory=list)
+
+
+class ExportAnalyticsUseCase(Protocol):
+    """
+    Контракт для use-case "ExportAnalytics".
+    """
+
+    def execute(self, command: ExportAnalyticsCommand) -> ExportAnalyticsResult:
+        ...
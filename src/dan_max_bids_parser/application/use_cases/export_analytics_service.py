@@ -0,0 +1,152 @@
+# path: src/dan_max_bids_parser/application/use_cases/export_analytics_service.py
+"""
+Реализация use-case ExportAnalytics.
+
+Каждый набор данных читается одним запросом через серверный курсор
+(iter_batches / iter_header_batches) внутри одного UoW и порциями
+передаётся в ColumnarExportPort — в памяти одна порция плюс буферы
+адаптера, независимо от глубины истории.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterator, Mapping
+from datetime import datetime, time, timedelta
+from typing import Any, Optional, Sequence
+
+from dan_max_bids_parser.application.stage_timer import StageTimer
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.domain.entities import DatasetExportStats, JobEntity
+from dan_max_bids_parser.domain.ports import ColumnarExportPort
+from dan_max_bids_parser.domain.services import analytics_export
+from .export_analytics import (
+    ExportAnalyticsCommand,
+    ExportAnalyticsResult,
+    ExportAnalyticsUseCase,
+)
+
+logger = logging.getLogger(__name__)
+
+UnitOfWorkFactory = Callable[[], UnitOfWork]
+
+JOB_TYPE = "export_analytics"
+
+
+class ExportAnalyticsService(ExportAnalyticsUseCase):
+    def __init__(self, uow_factory: UnitOfWorkFactory, exporter: ColumnarExportPort) -> None:
+        self._uow_factory = uow_factory
+        self._exporter = exporter
+
+    def execute(self, command: ExportAnalyticsCommand) -> ExportAnalyticsResult:
+        if command.batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        source_codes, source_ids, job = self._prepare(command)
+        created_since = None
+        if command.since_days is not None:
+            # С начала дня: перевыгружаемые партиции date=... заменяются целиком
+            start = (datetime.utcnow() - timedelta(days=command.since_days)).date()
+            created_since = datetime.combine(start, time.min)
+
+        result = ExportAnalyticsResult(job_id=job.id)
+        timer = StageTimer()
+        try:
+            with timer.stage("bids"), self._uow_factory() as uow:
+                batches = uow.bids.iter_batches(
+                    command.batch_size, source_ids=source_ids, created_since=created_since
+                )
+                result.datasets.append(
+                    self._write("bids", analytics_export.BID_COLUMNS, batches, source_codes)
+                )
+            if command.include_raw_items:
+                with timer.stage("raw_items"), self._uow_factory() as uow:
+                    batches = uow.raw_items.iter_header_batches(
+                        command.batch_size, source_ids=source_ids, created_since=created_since
+                    )
+                    result.datasets.append(
+                        self._write(
+                            "raw_items", analytics_export.RAW_ITEM_COLUMNS, batches, source_codes
+                        )
+                    )
+        except Exception as exc:
+            self._finish_job(job, timer, result, status="failed", error=repr(exc))
+            raise
+        self._finish_job(job, timer, result, status="success")
+        return result
+
+    def _write(
+        self,
+        name: str,
+        columns: Sequence[Any],
+        batches: Iterator[Sequence[Any]],
+        source_codes: Mapping[int, str],
+    ) -> DatasetExportStats:
+        return self._exporter.write_dataset(
+            name,
+            analytics_export.schema(columns),
+            (analytics_export.to_columns(columns, batch, source_codes) for batch in batches),
+            partition_by=analytics_export.PARTITION_BY,
+        )
+
+    def _prepare(
+        self, command: ExportAnalyticsCommand
+    ) -> tuple[dict[int, str], Optional[list[int]], JobEntity]:
+        """Короткая транзакция: справочник источников и запись задачи."""
+        with self._uow_factory() as uow:
+            sources = list(uow.sources.list_all())
+            source_ids: Optional[list[int]] = None
+            if command.source_codes:
+                by_code = {s.code: s.id for s in sources}
+                missing = [code for code in command.source_codes if code not in by_code]
+                if missing:
+                    raise ValueError(f"Unknown sources {missing}")
+                source_ids = [by_code[code] for code in command.source_codes]
+
+            job = JobEntity(
+                job_type=JOB_TYPE,
+                status="running",
+                started_at=datetime.utcnow(),
+                items_total=0,
+                checkpoint={
+                    "since_days": command.since_days,
+                    "source_codes": list(command.source_codes),
+                    "include_raw_items": command.include_raw_items,
+                },
+            )
+            uow.jobs.add(job)
+            uow.commit()
+        return {s.id: s.code for s in sources if s.id is not None}, source_ids, job
+
+    def _finish_job(
+        self,
+        job: JobEntity,
+        timer: StageTimer,
+        result: ExportAnalyticsResult,
+        status: str,
+        error: Optional[str] = None,
+    ) -> None:
+        """Итоги выгрузки; ошибка записи статистики только логируется."""
+        job.status = status
+        job.error_message = error
+        job.finished_at = datetime.utcnow()
+        job.items_total = sum(d.rows for d in result.datasets)
+        job.items_created = job.items_total if status == "success" else 0
+        job.stage_durations = timer.durations
+        try:
+            with self._uow_factory() as uow:
+                uow.jobs.save(job)
+                uow.commit()
+        except Exception:
+            logger.exception("Failed to record analytics export job %s", job.id)
+            return
+
+        logger.info(
+            "Analytics export job %s %s in %.3fs: %s",
+            job.id,
+            status,
+            timer.total,
+            ", ".join(
+                f"{d.name}={d.rows} rows/{d.files} files/{d.bytes / 2**20:.1f}MB"
+                for d in result.datasets
+            ),
+        )
@@ -0,0 +1,37 @@
+# path: src/dan_max_bids_parser/application/use_cases/export_bids_to_xlsx.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Protocol
+
+
+@dataclass(slots=True)
+class ExportBidsToXlsxCommand:
+    """
+    Команда выгрузки заявок по записи config_export.
+
+    export_code — код записи config_export (отбор, колонки, путь).
+    output_path — переопределяет путь из конфигурации.
+    full — для инкрементальных выгрузок (append/upsert): игнорировать курсор,
+           перезаписать результат всем отбором и сдвинуть курсор на его конец.
+    """
+    export_code: str
+    output_path: Optional[str] = None
+    full: bool = False
+
+
+@dataclass(slots=True)
+class ExportBidsResult:
+    """Итог выгрузки: задача в jobs, число строк и расположение результата."""
+    job_id: Optional[int]
+    rows: int
+    location: str
+
+
+class ExportBidsToXlsxUseCase(Protocol):
+    """
+    Контракт для use-case "ExportBidsToXlsx".
+    """
+
+    def execute(self, command: ExportBidsToXlsxCommand) -> ExportBidsResult:
+        ...
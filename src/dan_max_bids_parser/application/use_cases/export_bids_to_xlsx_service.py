@@ -0,0 +1,247 @@
+# path: src/dan_max_bids_parser/application/use_cases/export_bids_to_xlsx_service.py
+"""
+Реализация use-case ExportBidsToXlsx.
+
+Заявки читаются порциями по возрастанию id (keyset, без OFFSET), каждая
+порция — в своей короткой транзакции, и сразу отдаются в ExportPort.
+В памяти одновременно только одна порция, поэтому выгрузка месяца и
+выгрузка дня отличаются временем, а не потреблением памяти.
+
+Инкрементальные режимы (append/upsert, см. bid_export) читают порции по
+(updated_at, id) от курсора export_cursors до границы, которую не
+пересекают незакоммиченные строки идущих сборов и переобработок. Курсор сохраняется отдельной
+транзакцией только после finish() адаптера; если новых заявок нет,
+адаптер не открывается и результат не переписывается.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from datetime import datetime
+from typing import Optional
+
+from dan_max_bids_parser.application.stage_timer import StageTimer
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.domain.entities import ExportCursorEntity, JobEntity
+from dan_max_bids_parser.domain.ports import ExportPort
+from dan_max_bids_parser.domain.services.bid_export import (
+    BidRowFormatter,
+    ExportSpec,
+    parse_export_config,
+)
+from .export_bids_to_xlsx import (
+    ExportBidsResult,
+    ExportBidsToXlsxCommand,
+    ExportBidsToXlsxUseCase,
+)
+from .harvest_source_service import JOB_TYPE as HARVEST_JOB_TYPE
+from .reprocess_raw_items_service import JOB_TYPE as REPROCESS_JOB_TYPE
+
+logger = logging.getLogger(__name__)
+
+UnitOfWorkFactory = Callable[[], UnitOfWork]
+
+# (спецификация выгрузки, итоговый путь) -> адаптер
+ExportWriterFactory = Callable[[ExportSpec, str], ExportPort]
+
+JOB_TYPE = "export_bids"
+
+# режим выгрузки -> режим ExportPort.begin
+_WRITER_MODES = {"full": "replace", "append": "append", "upsert": "upsert"}
+
+# Задачи, пишущие заявки: их открытые транзакции держат границу курсора
+_BID_WRITER_JOB_TYPES = (HARVEST_JOB_TYPE, REPROCESS_JOB_TYPE)
+
+
+class ExportBidsToXlsxService(ExportBidsToXlsxUseCase):
+    def __init__(
+        self,
+        uow_factory: UnitOfWorkFactory,
+        writer_factory: ExportWriterFactory,
+    ) -> None:
+        self._uow_factory = uow_factory
+        self._writer_factory = writer_factory
+
+    def execute(self, command: ExportBidsToXlsxCommand) -> ExportBidsResult:
+        spec, formatter, source_ids, job, cursor = self._prepare(command.export_code)
+        path = command.output_path or spec.resolve_path()
+        writer = self._writer_factory(spec, path)
+        timer = StageTimer()
+        try:
+            if spec.incremental:
+                location = self._export_delta(
+                    spec, formatter, source_ids, writer, job, timer, cursor, command.full, path
+                )
+            else:
+                location = self._export(spec, formatter, source_ids, writer, job, timer)
+        except Exception as exc:
+            writer.abort()
+            self._finish_job(job, timer, status="failed", error=repr(exc))
+            raise
+        self._finish_job(job, timer, status="success")
+        return ExportBidsResult(job_id=job.id, rows=job.items_total, location=location)
+
+    def _export(
+        self,
+        spec: ExportSpec,
+        formatter: BidRowFormatter,
+        source_ids: Optional[list[int]],
+        writer: ExportPort,
+        job: JobEntity,
+        timer: StageTimer,
+    ) -> str:
+        created_since = spec.created_since()
+        writer.begin(formatter.headers)
+        after_id = 0
+        while True:
+            with timer.stage("read"), self._uow_factory() as uow:
+                bids = uow.bids.list_after_id(
+                    after_id,
+                    spec.chunk_size,
+                    source_ids=source_ids,
+                    created_since=created_since,
+                )
+            if not bids:
+                break
+            with timer.stage("write"):
+                writer.write_rows(formatter.rows(bids))
+            job.items_total += len(bids)
+            after_id = bids[-1].id
+        with timer.stage("finish"):
+            return writer.finish()
+
+    def _export_delta(
+        self,
+        spec: ExportSpec,
+        formatter: BidRowFormatter,
+        source_ids: Optional[list[int]],
+        writer: ExportPort,
+        job: JobEntity,
+        timer: StageTimer,
+        cursor: ExportCursorEntity,
+        full: bool,
+        path: str,
+    ) -> str:
+        now = datetime.utcnow()
+        with self._uow_factory() as uow:
+            oldest_open_job = uow.jobs.oldest_running_started_at(
+                _BID_WRITER_JOB_TYPES, spec.open_jobs_since(now)
+            )
+        until = spec.cursor_until(now, oldest_open_job)
+        if oldest_open_job is not None:
+            logger.info(
+                "Export '%s': cursor held at %s by a running job started at %s",
+                spec.code,
+                until,
+                oldest_open_job,
+            )
+        updated_at = None if full else cursor.last_updated_at
+        after_id = 0 if full else cursor.last_bid_id
+        started = False
+        while True:
+            with timer.stage("read"), self._uow_factory() as uow:
+                bids = uow.bids.list_changed_after(
+                    updated_at,
+                    after_id,
+                    spec.chunk_size,
+                    source_ids=source_ids,
+                    until=until,
+                )
+            if not bids:
+                break
+            with timer.stage("write"):
+                if not started:
+                    writer.begin(formatter.headers, "replace" if full else _WRITER_MODES[spec.mode])
+                    started = True
+                writer.write_rows(formatter.rows(bids))
+            job.items_total += len(bids)
+            updated_at, after_id = bids[-1].updated_at, bids[-1].id
+
+        if not started:
+            if not full:
+                logger.info("Export '%s': no changes since the cursor", spec.code)
+                return path
+            # полная перевыгрузка пустого отбора — файл только с заголовком
+            writer.begin(formatter.headers, "replace")
+        with timer.stage("finish"):
+            location = writer.finish()
+
+        cursor.last_updated_at = updated_at
+        cursor.last_bid_id = after_id
+        cursor.rows_exported += job.items_total
+        cursor.exported_at = datetime.utcnow()
+        with self._uow_factory() as uow:
+            uow.export_cursors.save(cursor)
+            uow.commit()
+        return location
+
+    def _prepare(
+        self, export_code: str
+    ) -> tuple[
+        ExportSpec, BidRowFormatter, Optional[list[int]], JobEntity, Optional[ExportCursorEntity]
+    ]:
+        """Короткая транзакция: конфигурация, справочник источников, курсор, запись задачи."""
+        with self._uow_factory() as uow:
+            entry = uow.configs.get_by_code("export", export_code)
+            if entry is None:
+                raise ValueError(f"Export config with code='{export_code}' not found")
+            spec = parse_export_config(entry)
+
+            sources = list(uow.sources.list_all())
+            source_ids: Optional[list[int]] = None
+            if spec.source_codes:
+                by_code = {s.code: s.id for s in sources}
+                missing = [code for code in spec.source_codes if code not in by_code]
+                if missing:
+                    raise ValueError(f"Export '{export_code}': unknown sources {missing}")
+                source_ids = [by_code[code] for code in spec.source_codes]
+            formatter = BidRowFormatter(
+                spec.columns, {s.id: s.name or s.code for s in sources if s.id is not None}
+            )
+            cursor = None
+            if spec.incremental:
+                cursor = uow.export_cursors.get(export_code) or ExportCursorEntity(
+                    export_code=export_code
+                )
+
+            job = JobEntity(
+                job_type=JOB_TYPE,
+                status="running",
+                started_at=datetime.utcnow(),
+                items_total=0,
+                checkpoint={"export_code": export_code},
+            )
+            uow.jobs.add(job)
+            uow.commit()
+        return spec, formatter, source_ids, job, cursor
+
+    def _finish_job(
+        self,
+        job: JobEntity,
+        timer: StageTimer,
+        status: str,
+        error: Optional[str] = None,
+    ) -> None:
+        """Итоги выгрузки; ошибка записи статистики только логируется."""
+        job.status = status
+        job.error_message = error
+        job.finished_at = datetime.utcnow()
+        job.items_created = job.items_total if status == "success" else 0
+        job.stage_durations = timer.durations
+        try:
+            with self._uow_factory() as uow:
+                uow.jobs.save(job)
+                uow.commit()
+        except Exception:
+            logger.exception("Failed to record export job %s", job.id)
+            return
+
+        logger.info(
+            "Export job %s %s: %d rows in %.3fs (%s)",
+            job.id,
+            status,
+            job.items_total,
+            timer.total,
+            ", ".join(f"{name}={value:.3f}s" for name, value in job.stage_durations.items()),
+        )
@@ -0,0 +1,34 @@
+# path: src/dan_max_bids_parser/application/use_cases/generate_daily_health_report.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional, Protocol
+
+from dan_max_bids_parser.domain.entities import DailyHealthReport
+
+
+@dataclass(slots=True)
+class GenerateDailyHealthReportCommand:
+    """
+    Команда отчёта о состоянии сбора за последние days суток (UTC).
+
+    day_to — последний день отчёта (None = сегодня).
+    rollup — перед отчётом пересчитать агрегаты окна из bids / raw_items /
+    errors (после переобработки, пометки дублей; так же работает
+    периодическая задача пересчёта).
+    source_codes — пусто = все активные источники.
+    """
+    day_to: Optional[date] = None
+    days: int = 1
+    rollup: bool = False
+    source_codes: tuple[str, ...] = ()
+
+
+class GenerateDailyHealthReportUseCase(Protocol):
+    """
+    Контракт для use-case "GenerateDailyHealthReport".
+    """
+
+    def execute(self, command: GenerateDailyHealthReportCommand) -> DailyHealthReport:
+        ...
@@ -0,0 +1,66 @@
+# path: src/dan_max_bids_parser/application/use_cases/generate_daily_health_report_service.py
+"""
+Реализация use-case GenerateDailyHealthReport.
+
+Отчёт читает только дневные агрегаты (bid_daily_stats): стоимость
+O(дни × источники × типы груза), а не сканирование bids и raw_items.
+Пересчёт окна (rollup) — отдельная транзакция перед чтением.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Optional
+
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.domain.entities import DailyHealthReport, SourceEntity
+from dan_max_bids_parser.domain.services import daily_stats
+from .generate_daily_health_report import (
+    GenerateDailyHealthReportCommand,
+    GenerateDailyHealthReportUseCase,
+)
+
+UnitOfWorkFactory = Callable[[], UnitOfWork]
+
+
+class GenerateDailyHealthReportService(GenerateDailyHealthReportUseCase):
+    def __init__(self, uow_factory: UnitOfWorkFactory) -> None:
+        self._uow_factory = uow_factory
+
+    def execute(self, command: GenerateDailyHealthReportCommand) -> DailyHealthReport:
+        if command.days < 1:
+            raise ValueError("days must be positive")
+        day_to = command.day_to or datetime.utcnow().date()
+        day_from = day_to - timedelta(days=command.days - 1)
+        daily_stats.validate_range(day_from, day_to)
+
+        if command.rollup:
+            with self._uow_factory() as uow:
+                uow.daily_stats.rollup(day_from, day_to)
+                uow.commit()
+
+        with self._uow_factory() as uow:
+            sources = self._sources(uow, command.source_codes)
+            source_ids: Optional[list[int]] = (
+                [s.id for s in sources] if command.source_codes else None
+            )
+            stats = uow.daily_stats.list_range(day_from, day_to, source_ids)
+            if source_ids is None:
+                # Неактивные источники попадают в отчёт, только если у них есть данные
+                known = {s.id for s in sources}
+                missing = {row.source_id for row in stats} - known
+                sources += [s for s in uow.sources.list_all() if s.id in missing]
+        return daily_stats.build_health_report(day_from, day_to, sources, stats)
+
+    @staticmethod
+    def _sources(uow: UnitOfWork, codes: tuple[str, ...]) -> list[SourceEntity]:
+        if not codes:
+            return list(uow.sources.list_active())
+        sources = []
+        for code in codes:
+            source = uow.sources.get_by_code(code)
+            if source is None:
+                raise ValueError(f"Source with code='{code}' not found")
+            sources.append(source)
+        return sources
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Optional, Protocol
 
 
 @dataclass(slots=True)
@@ -14,8 +14,12 @@ class RunSourceHarvestingCommand:
     через code (человеко-читаемый идентификатор, уникальный).
     При необходимости позже расширим полями (ограничения по времени,
     режим dry-run и т.п.).
+
+    job_id — задача из очереди (JobQueuePort.claim): запуск пишет итоги
+    в неё, а не регистрирует новую строку jobs.
     """
     source_code: str
+    job_id: Optional[int] = None
 
 
 class RunSourceHarvestingUseCase(Protocol):
@@ -1,16 +1,30 @@
 # path: src/dan_max_bids_parser/application/use_cases/harvest_source_service.py
 from __future__ import annotations
 
-from collections.abc import Callable, Iterable
+import logging
+from collections.abc import Callable
+from datetime import datetime
+from typing import Optional
 
+from dan_max_bids_parser.application.pipeline import BidPipeline
+from dan_max_bids_parser.application.stage_timer import StageTimer
 from dan_max_bids_parser.application.unit_of_work import UnitOfWork
-from dan_max_bids_parser.domain.entities import BidEntity, RawItemEntity, SourceEntity
-from dan_max_bids_parser.domain.ports import RawItemProviderPort
+from dan_max_bids_parser.domain.entities import JobEntity, RawItemEntity, SourceEntity
+from dan_max_bids_parser.domain.ports import ParserPort, RawItemProviderPort
+from dan_max_bids_parser.domain.services.bid_filter import BidFilter
+from dan_max_bids_parser.domain.services import daily_stats
+from dan_max_bids_parser.domain.services.classifier import BidClassifier
+from dan_max_bids_parser.domain.services.gazetteer import Gazetteer
+from dan_max_bids_parser.domain.services.normalizer import Normalizer
 from .harvest_source import RunSourceHarvestingCommand, RunSourceHarvestingUseCase
 
 
+logger = logging.getLogger(__name__)
+
 UnitOfWorkFactory = Callable[[], UnitOfWork]
 
+JOB_TYPE = "harvest_source"
+
 
 class RunSourceHarvestingService(RunSourceHarvestingUseCase):
     """
@@ -20,48 +34,109 @@ class RunSourceHarvestingService(RunSourceHarvestingUseCase):
     1. Найти Source по коду.
     2. Получить сырые объекты через RawItemProviderPort.
     3. Сохранить RawItemEntity через RawItemRepositoryPort.
-    4. На основе сохранённых raw_items создать простые BidEntity и сохранить их.
+    4. На основе сохранённых raw_items создать BidEntity и сохранить их
+       (через ParserPort, если для источника есть правила разбора);
+       вес, цена, дата и телефон приводятся к типам через Normalizer,
+       тип груза и транспорта определяются BidClassifier;
+       заявки, отклонённые BidFilter, в БД не пишутся.
+    5. В той же транзакции прибавить сырьё и заявки к дневным агрегатам
+       (bid_daily_stats, см. domain.services.daily_stats).
+
+    Каждый запуск фиксируется строкой jobs (статус, счётчики, длительность
+    этапов fetch / persist_raw_items / load_config / parse_normalize /
+    classify_filter / persist_bids / commit). Запись задачи идёт отдельными короткими транзакциями до и
+    после основной, чтобы не удлинять её и не держать блокировки.
     """
 
     def __init__(
         self,
         uow_factory: UnitOfWorkFactory,
         raw_item_provider: RawItemProviderPort,
+        parser: Optional[ParserPort] = None,
+        normalizer: Optional[Normalizer] = None,
+        classifier: Optional[BidClassifier] = None,
+        bid_filter: Optional[BidFilter] = None,
+        gazetteer: Optional[Gazetteer] = None,
     ) -> None:
         """
         :param uow_factory: фабрика UnitOfWork (новый UoW на каждый вызов execute).
         :param raw_item_provider: порт внешнего провайдера сырых объектов.
+        :param parser: парсер RawItem -> поля заявок (конфиг из config_source).
+        :param normalizer: нормализатор полей (по умолчанию — Normalizer()).
+        :param classifier: классификатор груза/транспорта (словари из config_classifier).
+        :param bid_filter: фильтр заявок (правила из config_filter_rule).
+        :param gazetteer: справочник регионов для load_region / unload_region.
         """
         self._uow_factory = uow_factory
         self._raw_item_provider = raw_item_provider
+        self._pipeline = BidPipeline(
+            parser=parser,
+            normalizer=normalizer or Normalizer(),
+            classifier=classifier,
+            bid_filter=bid_filter,
+            gazetteer=gazetteer,
+        )
 
     def execute(self, command: RunSourceHarvestingCommand) -> None:
         """
         Запускает минимальный ETL-поток для одного источника.
 
         На данном этапе:
-        - нет нормализации, фильтрации и дедупликации;
-        - BidEntity создаются в простейшей форме из RawItemEntity.
+        - нет дедупликации;
+        - BidEntity создаются парсером либо в простейшей форме из RawItemEntity.
         """
+        source, job = self._start_job(command.source_code, command.job_id)
+        timer = StageTimer()
+        try:
+            self._harvest(source, job, timer)
+        except Exception as exc:
+            self._finish_job(job, timer, status="failed", error=repr(exc))
+            raise
+        self._finish_job(job, timer, status="success")
+
+    def _harvest(self, source: SourceEntity, job: JobEntity, timer: StageTimer) -> None:
+        """Основная транзакция: raw_items и заявки фиксируются вместе."""
         with self._uow_factory() as uow:
-            source = uow.sources.get_by_code(command.source_code)
-            if source is None:
-                raise ValueError(
-                    f"Source with code='{command.source_code}' not found"
-                )
-
-            raw_items = self._load_raw_items(source)
+            with timer.stage("fetch"):
+                raw_items = self._load_raw_items(source)
+            job.items_total = len(raw_items)
             if not raw_items:
                 # Нечего сохранять — выходим без ошибок.
                 return
 
-            saved_raw_items = list(uow.raw_items.add_many(raw_items))
-            bids = list(self._build_bids_from_raw_items(source, saved_raw_items))
+            with timer.stage("persist_raw_items"):
+                saved_raw_items = list(uow.raw_items.add_many(raw_items))
+
+            with timer.stage("load_config"):
+                # Один запрос к конфигу на секцию за запуск; перекомпиляция
+                # правил — только если версия конфига изменилась.
+                self._pipeline.refresh(self._pipeline.load_configs(uow))
+
+            with timer.stage("parse_normalize"):
+                bids = self._pipeline.build_bids(source, saved_raw_items)
+
+            with timer.stage("classify_filter"):
+                result = self._pipeline.classify_and_filter(bids)
+            if result.rejected:
+                logger.info(
+                    "Source %s: %d of %d bids rejected by filter rules",
+                    source.code,
+                    len(result.rejected),
+                    len(bids),
+                )
+            bids = result.accepted
+
+            with timer.stage("persist_bids"):
+                if bids:
+                    uow.bids.add_many(bids)
+                # Дневные агрегаты — в той же транзакции, что и заявки
+                uow.daily_stats.apply(
+                    daily_stats.from_raw_items(saved_raw_items) + daily_stats.from_bids(bids)
+                )
 
-            if bids:
-                uow.bids.add_many(bids)
-
-            uow.commit()
+            with timer.stage("commit"):
+                uow.commit()
+            job.items_created = len(bids)
 
     # --- Вспомогательные методы ---
 
@@ -79,24 +154,67 @@ class RunSourceHarvestingService(RunSourceHarvestingUseCase):
 
         return raw_items
 
-    def _build_bids_from_raw_items(
+    def _start_job(
         self,
-        source: SourceEntity,
-        raw_items: Iterable[RawItemEntity],
-    ) -> Iterable[BidEntity]:
+        source_code: str,
+        job_id: Optional[int] = None,
+    ) -> tuple[SourceEntity, JobEntity]:
         """
-        Простейшее построение BidEntity из RawItemEntity.
-
-        Здесь пока нет реальной логики нормализации/классификации —
-        только демонстрация end-to-end потока.
+        Отдельная короткая транзакция: находит источник и регистрирует запуск
+        (или берёт задачу job_id, уже выданную воркеру очередью).
         """
-        for raw in raw_items:
-            yield BidEntity(
-                source_id=raw.source_id,
-                raw_item_id=raw.id,
-                external_id=raw.external_id,
-                title=f"{source.name or source.code}: заявка "
-                f"{raw.external_id or raw.id or ''}".strip(),
-                description=raw.payload,
-                url=raw.url,
+        with self._uow_factory() as uow:
+            source = uow.sources.get_by_code(source_code)
+            if source is None:
+                raise ValueError(f"Source with code='{source_code}' not found")
+
+            if job_id is not None:
+                job = uow.jobs.get_by_id(job_id)
+                if job is None or job.job_type != JOB_TYPE or job.source_id != source.id:
+                    raise ValueError(f"Job {job_id} is not a harvest job of source '{source_code}'")
+                return source, job
+
+            job = JobEntity(
+                job_type=JOB_TYPE,
+                source_id=source.id,
+                status="running",
+                started_at=datetime.utcnow(),
             )
+            uow.jobs.add(job)
+            uow.commit()
+        return source, job
+
+    def _finish_job(
+        self,
+        job: JobEntity,
+        timer: StageTimer,
+        status: str,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Отдельная короткая транзакция с итогами запуска.
+
+        Ошибка записи статистики не должна маскировать результат сбора,
+        поэтому она только логируется.
+        """
+        job.status = status
+        job.error_message = error
+        job.finished_at = datetime.utcnow()
+        job.items_updated = 0
+        job.stage_durations = timer.durations
+        try:
+            with self._uow_factory() as uow:
+                uow.jobs.save(job)
+                uow.commit()
+        except Exception:
+            logger.exception("Failed to record job %s for source_id=%s", job.id, job.source_id)
+            return
+
+        logger.info(
+            "Harvest job %s (source_id=%s) %s in %.3fs: %s",
+            job.id,
+            job.source_id,
+            status,
+            timer.total,
+            ", ".join(f"{name}={value:.3f}s" for name, value in job.stage_durations.items()),
+        )
@@ -0,0 +1,33 @@
+# path: src/dan_max_bids_parser/application/use_cases/reprocess_raw_items.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Protocol
+
+from dan_max_bids_parser.domain.entities import JobEntity
+
+
+@dataclass(slots=True)
+class ReprocessRawItemsCommand:
+    """
+    Команда переобработки сохранённых raw_items текущей конфигурацией
+    (парсинг, нормализация, классификация, фильтрация).
+
+    source_code=None — переобработать все источники.
+    resume=True — продолжить последнюю незавершённую задачу с её checkpoint.
+    """
+    source_code: Optional[str] = None
+    batch_size: int = 500
+    resume: bool = True
+
+
+class ReprocessRawItemsUseCase(Protocol):
+    """
+    Контракт для use-case "ReprocessRawItems".
+    """
+
+    def execute(self, command: ReprocessRawItemsCommand) -> JobEntity:
+        """
+        Пересобирает заявки из raw_items и возвращает итоговое состояние задачи.
+        """
+        ...
@@ -0,0 +1,285 @@
+# path: src/dan_max_bids_parser/application/use_cases/reprocess_raw_items_service.py
+"""
+Реализация use-case ReprocessRawItems.
+
+raw_items читаются порциями по возрастанию id (keyset, без OFFSET),
+CPU-нагрузка (парсинг/нормализация/классификация/фильтрация) уходит
+в пул процессов, а результаты записываются обратно строго по порядку
+порций: замена заявок порции и сдвиг checkpoint задачи фиксируются
+одной транзакцией. Поэтому прерванный запуск продолжается с первой
+незаписанной порции без потерь и дублей.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from dan_max_bids_parser.application.pipeline import (
+    BidPipeline,
+    ConfigSnapshot,
+    PipelineFactory,
+)
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.domain.entities import (
+    BidEntity,
+    JobEntity,
+    RawItemEntity,
+    SourceEntity,
+)
+from .reprocess_raw_items import ReprocessRawItemsCommand, ReprocessRawItemsUseCase
+
+logger = logging.getLogger(__name__)
+
+UnitOfWorkFactory = Callable[[], UnitOfWork]
+
+JOB_TYPE = "reprocess_raw_items"
+
+
+@dataclass(slots=True)
+class _BatchResult:
+    raw_item_ids: list[int]
+    bids: list[BidEntity]
+    rejected: int
+
+
+class _BatchProcessor:
+    """Пайплайн с применённой конфигурацией и справочником источников."""
+
+    def __init__(
+        self,
+        factory: PipelineFactory,
+        configs: ConfigSnapshot,
+        sources: Mapping[int, SourceEntity],
+    ) -> None:
+        self._pipeline: BidPipeline = factory()
+        self._pipeline.refresh(configs)
+        self._sources = sources
+
+    def __call__(self, raw_items: Sequence[RawItemEntity]) -> _BatchResult:
+        by_source: dict[int, list[RawItemEntity]] = {}
+        for raw in raw_items:
+            by_source.setdefault(raw.source_id, []).append(raw)
+
+        bids: list[BidEntity] = []
+        rejected = 0
+        for source_id, items in by_source.items():
+            source = self._sources.get(source_id) or SourceEntity(id=source_id)
+            result = self._pipeline.process(source, items)
+            bids.extend(result.accepted)
+            rejected += len(result.rejected)
+
+        return _BatchResult(
+            raw_item_ids=[raw.id for raw in raw_items if raw.id is not None],
+            bids=bids,
+            rejected=rejected,
+        )
+
+
+# Процессор воркера: создаётся один раз на процесс в initializer пула,
+# чтобы правила компилировались не на каждую порцию.
+_worker_processor: Optional[_BatchProcessor] = None
+
+
+def _init_worker(
+    factory: PipelineFactory,
+    configs: ConfigSnapshot,
+    sources: Mapping[int, SourceEntity],
+) -> None:
+    global _worker_processor
+    _worker_processor = _BatchProcessor(factory, configs, sources)
+
+
+def _process_in_worker(raw_items: Sequence[RawItemEntity]) -> _BatchResult:
+    assert _worker_processor is not None, "worker is not initialized"
+    return _worker_processor(raw_items)
+
+
+class ReprocessRawItemsService(ReprocessRawItemsUseCase):
+    """
+    Переобработка raw_items с checkpoint в таблице jobs.
+
+    checkpoint задачи:
+        {"last_raw_item_id": <последний обработанный id>,
+         "max_raw_item_id": <верхняя граница на момент старта>}
+    """
+
+    def __init__(
+        self,
+        uow_factory: UnitOfWorkFactory,
+        pipeline_factory: PipelineFactory,
+        max_workers: Optional[int] = None,
+        on_queue_depth: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """
+        :param uow_factory: фабрика UnitOfWork.
+        :param pipeline_factory: функция уровня модуля, собирающая BidPipeline
+            (вызывается в каждом процессе пула).
+        :param max_workers: число процессов; None — по числу ядер,
+            0 или 1 — обработка в текущем процессе.
+        :param on_queue_depth: вызывается с числом порций в работе
+            (для метрики глубины очереди).
+        """
+        self._uow_factory = uow_factory
+        self._pipeline_factory = pipeline_factory
+        self._max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self._on_queue_depth = on_queue_depth or (lambda depth: None)
+
+    def execute(self, command: ReprocessRawItemsCommand) -> JobEntity:
+        if command.batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        job, source_id, configs, sources = self._start_job(command)
+        logger.info(
+            "Reprocess job %s: raw_items (%s, %s], workers=%s",
+            job.id,
+            job.checkpoint["last_raw_item_id"],
+            job.checkpoint["max_raw_item_id"],
+            self._max_workers,
+        )
+
+        try:
+            with self._submitter(configs, sources) as submit:
+                in_flight: deque[Future[_BatchResult]] = deque()
+                batches = self._iter_batches(job, source_id, command.batch_size)
+                # Держим в работе не больше 2 порций на процесс: память
+                # ограничена, а пул не простаивает, пока пишем в БД.
+                # Без пула порция готова сразу — пишем её немедленно.
+                window = self._max_workers * 2 if self._max_workers > 1 else 1
+
+                for batch in batches:
+                    in_flight.append(submit(batch))
+                    self._on_queue_depth(len(in_flight))
+                    if len(in_flight) >= window:
+                        self._write_batch(job, in_flight.popleft().result())
+                while in_flight:
+                    self._write_batch(job, in_flight.popleft().result())
+                    self._on_queue_depth(len(in_flight))
+        except BaseException as exc:
+            self._finish_job(job, status="failed", error=repr(exc))
+            raise
+
+        self._finish_job(job, status="success")
+        return job
+
+    # --- Вспомогательные методы ---
+
+    def _start_job(
+        self,
+        command: ReprocessRawItemsCommand,
+    ) -> tuple[JobEntity, Optional[int], ConfigSnapshot, dict[int, SourceEntity]]:
+        """Находит задачу для продолжения или создаёт новую; снимает конфигурацию."""
+        with self._uow_factory() as uow:
+            source_id: Optional[int] = None
+            if command.source_code is not None:
+                source = uow.sources.get_by_code(command.source_code)
+                if source is None:
+                    raise ValueError(
+                        f"Source with code='{command.source_code}' not found"
+                    )
+                source_id = source.id
+
+            job = uow.jobs.find_unfinished(JOB_TYPE, source_id) if command.resume else None
+            if job is None:
+                job = JobEntity(
+                    job_type=JOB_TYPE,
+                    source_id=source_id,
+                    items_total=0,
+                    items_created=0,
+                    checkpoint={
+                        "last_raw_item_id": 0,
+                        "max_raw_item_id": uow.raw_items.max_id(source_id),
+                    },
+                )
+            job.status = "running"
+            job.started_at = job.started_at or datetime.utcnow()
+            job.error_message = None
+            uow.jobs.save(job)
+
+            configs = self._pipeline_factory().load_configs(uow)
+            sources = {s.id: s for s in uow.sources.list_all() if s.id is not None}
+            uow.commit()
+        return job, source_id, configs, sources
+
+    def _iter_batches(
+        self,
+        job: JobEntity,
+        source_id: Optional[int],
+        batch_size: int,
+    ) -> Iterator[list[RawItemEntity]]:
+        """Порции raw_items после checkpoint; каждая читается своей короткой транзакцией."""
+        after_id = job.checkpoint["last_raw_item_id"]
+        max_id = job.checkpoint["max_raw_item_id"]
+        while True:
+            with self._uow_factory() as uow:
+                batch = list(
+                    uow.raw_items.list_after_id(after_id, batch_size, source_id, max_id)
+                )
+            if not batch:
+                return
+            after_id = batch[-1].id
+            yield batch
+
+    def _write_batch(self, job: JobEntity, result: _BatchResult) -> None:
+        """Заменяет заявки порции и сдвигает checkpoint в одной транзакции."""
+        with self._uow_factory() as uow:
+            uow.bids.replace_for_raw_items(result.raw_item_ids, result.bids)
+            job.checkpoint = {
+                **job.checkpoint,
+                "last_raw_item_id": max(result.raw_item_ids),
+            }
+            job.items_total = (job.items_total or 0) + len(result.raw_item_ids)
+            job.items_created = (job.items_created or 0) + len(result.bids)
+            uow.jobs.save(job)
+            uow.commit()
+        if result.rejected:
+            logger.debug("Reprocess job %s: %d bids rejected", job.id, result.rejected)
+
+    def _finish_job(self, job: JobEntity, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error_message = error
+        job.finished_at = datetime.utcnow()
+        with self._uow_factory() as uow:
+            uow.jobs.save(job)
+            uow.commit()
+
+    @contextmanager
+    def _submitter(
+        self,
+        configs: ConfigSnapshot,
+        sources: Mapping[int, SourceEntity],
+    ) -> Iterator[Callable[[list[RawItemEntity]], Future[_BatchResult]]]:
+        """
+        submit(batch) -> Future: пул процессов либо обработка в текущем
+        процессе (max_workers <= 1 — тесты, отладка).
+        """
+        if self._max_workers <= 1:
+            processor = _BatchProcessor(self._pipeline_factory, configs, sources)
+
+            def submit_inline(batch: list[RawItemEntity]) -> Future[_BatchResult]:
+                future: Future[_BatchResult] = Future()
+                future.set_result(processor(batch))
+                return future
+
+            yield submit_inline
+            return
+
+        executor = ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            initializer=_init_worker,
+            initargs=(self._pipeline_factory, configs, sources),
+        )
+        try:
+            yield lambda batch: executor.submit(_process_in_worker, batch)
+        except BaseException:
+            # При ошибке не ждём уже поставленные порции
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown(wait=True)
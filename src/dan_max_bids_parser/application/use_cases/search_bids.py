@@ -0,0 +1,33 @@
+# path: src/dan_max_bids_parser/application/use_cases/search_bids.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Protocol
+
+from dan_max_bids_parser.domain.entities import BidSearchPage
+
+
+@dataclass(slots=True)
+class SearchBidsCommand:
+    """
+    Команда полнотекстового поиска заявок.
+
+    text — слова запроса («щебень Тверь»), все обязательны.
+    order — "rank" (по релевантности) или "recent" (свежие первыми).
+    cursor — next_cursor предыдущей страницы.
+    source_codes — пусто = все источники.
+    """
+    text: str
+    limit: int = 20
+    cursor: Optional[str] = None
+    order: str = "rank"
+    source_codes: tuple[str, ...] = ()
+
+
+class SearchBidsUseCase(Protocol):
+    """
+    Контракт для use-case "SearchBids".
+    """
+
+    def execute(self, command: SearchBidsCommand) -> BidSearchPage:
+        ...
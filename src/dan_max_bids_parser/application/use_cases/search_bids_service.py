@@ -0,0 +1,38 @@
+# path: src/dan_max_bids_parser/application/use_cases/search_bids_service.py
+"""
+Реализация use-case SearchBids: одна короткая транзакция на страницу.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Optional
+
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.domain.entities import BidSearchPage
+from .search_bids import SearchBidsCommand, SearchBidsUseCase
+
+UnitOfWorkFactory = Callable[[], UnitOfWork]
+
+
+class SearchBidsService(SearchBidsUseCase):
+    def __init__(self, uow_factory: UnitOfWorkFactory) -> None:
+        self._uow_factory = uow_factory
+
+    def execute(self, command: SearchBidsCommand) -> BidSearchPage:
+        with self._uow_factory() as uow:
+            source_ids: Optional[list[int]] = None
+            if command.source_codes:
+                source_ids = []
+                for code in command.source_codes:
+                    source = uow.sources.get_by_code(code)
+                    if source is None:
+                        raise ValueError(f"Source with code='{code}' not found")
+                    source_ids.append(source.id)
+            return uow.bid_search.search(
+                command.text,
+                limit=command.limit,
+                cursor=command.cursor,
+                order=command.order,
+                source_ids=source_ids,
+            )
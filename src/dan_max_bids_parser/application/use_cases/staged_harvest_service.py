@@ -0,0 +1,230 @@
+# path: src/dan_max_bids_parser/application/use_cases/staged_harvest_service.py
+"""
+StagedHarvestService: сбор источника конвейером этапов с ограниченными
+очередями (application.stages) вместо последовательного execute.
+
+    fetch -> parse_normalize -> classify_filter -> store
+
+Имена этапов в jobs.stage_durations — те же, что у RunSourceHarvestingService:
+- load_config: снимок config_* на запуск (до конвейера);
+- fetch: провайдер читается порциями по batch_size (ленивые провайдеры
+  отдают страницы по мере загрузки — сеть работает, пока идёт запись);
+- parse_normalize: парсинг и нормализация (BidPipeline.build_bid_pairs);
+- classify_filter: регионы, классификация, правила фильтра и отсев
+  повторов заявок внутри запуска (тот же source_id + external_id);
+- store: порция raw_items, её заявки и дневные агрегаты — одной
+  транзакцией (сырьё и заявки порции фиксируются вместе).
+
+Число потоков и ёмкость очереди задаются для каждого этапа; память
+ограничена queue_size порциями на очередь. Записанная порция не
+копится до конца запуска: store отдаёт только её счётчики (_StoreCounts),
+и они сразу складываются в итог запуска. Порцию parse_normalize /
+classify_filter обрабатывает один BidPipeline из пула сервиса
+(pipeline_factory): скомпилированные правила не делятся между потоками
+одновременно и переиспользуются между запусками.
+
+Отличие от RunSourceHarvestingService: запуск фиксируется порциями.
+Если запуск упал, уже записанные порции остаются (задача — failed).
+Строка jobs та же: статус, счётчики и время этапов (суммарная занятость
+потоков этапа).
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from dan_max_bids_parser.application.pipeline import BidPipeline, ConfigSnapshot, PipelineFactory
+from dan_max_bids_parser.application.stage_timer import StageTimer
+from dan_max_bids_parser.application.stages import Stage, StageStats, run_stages
+from dan_max_bids_parser.domain.entities import BidEntity, JobEntity, RawItemEntity, SourceEntity
+from dan_max_bids_parser.domain.ports import RawItemProviderPort
+from dan_max_bids_parser.domain.services import daily_stats
+from .harvest_source_service import RunSourceHarvestingService, UnitOfWorkFactory
+
+logger = logging.getLogger(__name__)
+
+StageStatsListener = Callable[[list[StageStats]], None]
+DepthListener = Callable[[str, int], None]
+
+
+@dataclass(frozen=True, slots=True)
+class StageSettings:
+    """Потоки и ёмкость входной очереди (в порциях) одного этапа."""
+
+    workers: int = 1
+    queue_size: int = 4
+
+
+@dataclass(slots=True)
+class _Batch:
+    raw_items: list[RawItemEntity]
+    pairs: list[tuple[RawItemEntity, BidEntity]]
+    rejected: int = 0
+    repeated: int = 0
+
+
+@dataclass(slots=True)
+class _StoreCounts:
+    """Итог записанной порции (или суммы порций) — без самих данных."""
+
+    total: int = 0
+    created: int = 0
+    rejected: int = 0
+    repeated: int = 0
+
+    def add(self, other: "_StoreCounts") -> None:
+        self.total += other.total
+        self.created += other.created
+        self.rejected += other.rejected
+        self.repeated += other.repeated
+
+
+class StagedHarvestService(RunSourceHarvestingService):
+    """
+    Использование:
+        service = StagedHarvestService(
+            uow_factory, provider, pipeline_factory,
+            batch_size=200, parse_stage=StageSettings(workers=2),
+        )
+        service.execute(RunSourceHarvestingCommand(source_code="ATI"))
+
+    :param pipeline_factory: сборка BidPipeline; пул растёт до числа
+        одновременно работающих потоков parse и filter.
+    :param batch_size: raw_items в порции.
+    :param on_stage_stats: получает статистику этапов после каждого запуска.
+    :param on_queue_depth: (этап, глубина входной очереди) — при изменении.
+    """
+
+    def __init__(
+        self,
+        uow_factory: UnitOfWorkFactory,
+        raw_item_provider: RawItemProviderPort,
+        pipeline_factory: PipelineFactory,
+        batch_size: int = 200,
+        parse_stage: StageSettings = StageSettings(workers=2),
+        filter_stage: StageSettings = StageSettings(),
+        store_stage: StageSettings = StageSettings(),
+        on_stage_stats: Optional[StageStatsListener] = None,
+        on_queue_depth: Optional[DepthListener] = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        super().__init__(uow_factory, raw_item_provider)
+        self._pipeline = pipeline_factory()
+        self._pipeline_factory = pipeline_factory
+        self._batch_size = batch_size
+        self._settings = {"parse": parse_stage, "filter": filter_stage, "store": store_stage}
+        self._on_stage_stats = on_stage_stats
+        self._on_queue_depth = on_queue_depth
+        self._pipelines: queue.SimpleQueue[BidPipeline] = queue.SimpleQueue()
+
+    def _harvest(self, source: SourceEntity, job: JobEntity, timer: StageTimer) -> None:
+        with timer.stage("load_config"), self._uow_factory() as uow:
+            configs = self._pipeline.load_configs(uow)
+        seen: set[str] = set()
+        seen_guard = threading.Lock()
+
+        def parse(raw_items: list[RawItemEntity]) -> _Batch:
+            with self._borrow_pipeline(configs) as pipeline:
+                return _Batch(raw_items, pipeline.build_bid_pairs(source, raw_items))
+
+        def filter_(batch: _Batch) -> _Batch:
+            with self._borrow_pipeline(configs) as pipeline:
+                result = pipeline.classify_and_filter([bid for _, bid in batch.pairs])
+            accepted = {id(bid) for bid in result.accepted}
+            pairs = []
+            with seen_guard:
+                for raw, bid in batch.pairs:
+                    if id(bid) not in accepted:
+                        continue
+                    if bid.external_id:
+                        if bid.external_id in seen:
+                            batch.repeated += 1
+                            continue
+                        seen.add(bid.external_id)
+                    pairs.append((raw, bid))
+            batch.rejected = len(batch.pairs) - len(accepted)
+            batch.pairs = pairs
+            return batch
+
+        stages = [
+            Stage("parse_normalize", parse, **self._stage_kwargs("parse")),
+            Stage("classify_filter", filter_, **self._stage_kwargs("filter")),
+            Stage("store", self._store, **self._stage_kwargs("store")),
+        ]
+        counts = _StoreCounts()
+        result = run_stages(
+            self._batches(source),
+            stages,
+            source_name="fetch",
+            on_depth=self._on_queue_depth,
+            on_output=counts.add,
+        )
+
+        for stats in result.stages:
+            timer.add(stats.name, stats.busy_seconds)
+        job.items_total = counts.total
+        job.items_created = counts.created
+        if counts.rejected or counts.repeated:
+            logger.info(
+                "Source %s: %d bids rejected by filter rules, %d repeated within the run",
+                source.code,
+                counts.rejected,
+                counts.repeated,
+            )
+        logger.info(
+            "Source %s stages: %s",
+            source.code,
+            ", ".join(
+                f"{s.name} {s.utilization:.0%} busy (max queue {s.max_depth})" for s in result.stages
+            ),
+        )
+        if self._on_stage_stats is not None:
+            self._on_stage_stats(result.stages)
+
+    # --- Этапы ---
+
+    def _batches(self, source: SourceEntity) -> Iterator[list[RawItemEntity]]:
+        items = iter(self._raw_item_provider.fetch_raw_items(source))
+        while batch := list(itertools.islice(items, self._batch_size)):
+            for item in batch:
+                if item.source_id == 0 and source.id is not None:
+                    item.source_id = source.id
+            yield batch
+
+    def _store(self, batch: _Batch) -> _StoreCounts:
+        with self._uow_factory() as uow:
+            saved = list(uow.raw_items.add_many(batch.raw_items))
+            bids = []
+            for raw, bid in batch.pairs:
+                bid.raw_item_id = raw.id
+                bids.append(bid)
+            if bids:
+                uow.bids.add_many(bids)
+            uow.daily_stats.apply(daily_stats.from_raw_items(saved) + daily_stats.from_bids(bids))
+            uow.commit()
+        return _StoreCounts(len(batch.raw_items), len(bids), batch.rejected, batch.repeated)
+
+    @contextmanager
+    def _borrow_pipeline(self, configs: ConfigSnapshot) -> Iterator[BidPipeline]:
+        """Пайплайн из пула на одну порцию; перекомпилируется только при смене конфигурации."""
+        try:
+            pipeline = self._pipelines.get_nowait()
+        except queue.Empty:
+            pipeline = self._pipeline_factory()
+        try:
+            pipeline.refresh(configs)
+            yield pipeline
+        finally:
+            self._pipelines.put(pipeline)
+
+    def _stage_kwargs(self, name: str) -> dict[str, int]:
+        settings = self._settings[name]
+        return {"workers": settings.workers, "queue_size": settings.queue_size}
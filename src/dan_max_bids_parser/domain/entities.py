@@ -1,9 +1,11 @@
 # path: src/dan_max_bids_parser/domain/entities.py
 from __future__ import annotations
 
+import hashlib
+import json
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Any, Optional
 
 
 @dataclass(slots=True)
@@ -39,6 +41,22 @@ class RawItemEntity:
     received_at: datetime = field(default_factory=datetime.utcnow)
 
 
+@dataclass(slots=True)
+class RawItemHeaderEntity:
+    """
+    Метаданные сырого объекта без payload (для аналитики и отчётов,
+    где тело HTML/JSON не нужно, а его чтение — основная стоимость).
+    """
+    id: int
+    source_id: int
+    external_id: Optional[str] = None
+    url: Optional[str] = None
+    status: str = "new"
+    hash: Optional[str] = None
+    created_at: Optional[datetime] = None
+    received_at: Optional[datetime] = None
+
+
 @dataclass(slots=True)
 class BidEntity:
     """
@@ -60,6 +78,9 @@ class BidEntity:
 
     load_point: Optional[str] = None
     unload_point: Optional[str] = None
+    # Коды регионов пунктов (ISO 3166-2:RU, например RU-TVE) — заполняет Gazetteer
+    load_region: Optional[str] = None
+    unload_region: Optional[str] = None
 
     weight_tons: Optional[float] = None
     price: Optional[float] = None
@@ -70,3 +91,211 @@ class BidEntity:
 
     published_at: Optional[datetime] = None
     created_at: datetime = field(default_factory=datetime.utcnow)
+    # None у новой заявки — репозиторий подставит created_at
+    updated_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class ConfigEntryEntity:
+    """
+    Запись конфигурационной таблицы (config_source, config_classifier и т.п.).
+
+    Содержимое data — произвольный JSON, интерпретацию выполняет
+    конкретный компонент (парсер, классификатор, фильтр).
+    """
+    id: Optional[int] = None
+    code: str = ""
+    name: str = ""
+    is_active: bool = True
+    data: dict[str, Any] = field(default_factory=dict)
+    updated_at: Optional[datetime] = None
+
+    @property
+    def version(self) -> str:
+        """
+        Версия конфигурации — хеш содержимого data.
+
+        Считаем по данным, а не по updated_at: конфиги правятся вручную,
+        и updated_at при этом легко забыть обновить.
+        """
+        raw = json.dumps(self.data, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class JobEntity:
+    """
+    Запуск фоновой задачи (сбор, переобработка, экспорт и т.п.).
+
+    checkpoint — произвольное JSON-состояние прогресса, по которому
+    прерванная задача продолжается с места остановки.
+    stage_durations — длительность этапов запуска в секундах
+    ({"fetch": 1.234, "parse_normalize": 0.051, ...}).
+
+    Поля очереди (attempts ... heartbeat_at) пишет только JobQueuePort:
+    JobRepositoryPort.save их не меняет.
+    """
+    id: Optional[int] = None
+    job_type: str = ""
+    source_id: Optional[int] = None
+    status: str = "pending"  # pending / running / success / failed
+
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    items_total: Optional[int] = None
+    items_created: Optional[int] = None
+    items_updated: Optional[int] = None
+    error_message: Optional[str] = None
+
+    checkpoint: dict[str, Any] = field(default_factory=dict)
+    stage_durations: dict[str, float] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    attempts: int = 0
+    max_attempts: int = 1
+    run_after: Optional[datetime] = None
+    leased_by: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class ExportCursorEntity:
+    """
+    Курсор инкрементальной выгрузки (одна запись на config_export.code).
+
+    (last_updated_at, last_bid_id) — водяной знак: последняя выгруженная
+    заявка в порядке (updated_at, id); следующий запуск берёт строго после неё.
+    """
+    export_code: str
+    last_updated_at: Optional[datetime] = None
+    last_bid_id: int = 0
+    rows_exported: int = 0
+    exported_at: Optional[datetime] = None
+    id: Optional[int] = None
+
+
+@dataclass(slots=True)
+class DatasetExportStats:
+    """Итог колоночной выгрузки одного набора данных."""
+    name: str
+    location: str
+    rows: int = 0
+    files: int = 0
+    bytes: int = 0
+
+
+@dataclass(slots=True)
+class BidSearchHit:
+    """Заявка в выдаче поиска; score — релевантность (больше — лучше)."""
+    bid: BidEntity
+    score: float = 0.0
+
+
+@dataclass(slots=True)
+class BidSearchPage:
+    """Страница выдачи; next_cursor=None — страница последняя."""
+    hits: list[BidSearchHit] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+@dataclass(slots=True)
+class BidQuery:
+    """
+    Критерии выборки заявок (BidRepositoryPort.query / count / exists).
+
+    None или пустой кортеж — без ограничения; диапазоны включительные.
+    order: "published" — по published_at (заявки без даты не попадают),
+    "id" — по id; свежие первыми.
+    """
+    source_ids: tuple[int, ...] = ()
+    cargo_types: tuple[str, ...] = ()
+    load_region: Optional[str] = None
+    unload_region: Optional[str] = None
+    price_min: Optional[float] = None
+    price_max: Optional[float] = None
+    weight_min: Optional[float] = None
+    weight_max: Optional[float] = None
+    published_from: Optional[datetime] = None
+    published_to: Optional[datetime] = None
+    is_duplicate: Optional[bool] = None
+    order: str = "published"
+
+
+@dataclass(slots=True)
+class BidPage:
+    """
+    Страница выборки: строки {поле BidEntity: значение} только
+    с запрошенными полями (плюс id); next_cursor=None — страница последняя.
+    """
+    rows: list[dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+@dataclass(slots=True)
+class DailyStatsEntity:
+    """
+    Дневной агрегат заявок (bid_daily_stats): сутки (UTC) × источник × тип груза.
+
+    cargo_type="" — заявки без типа груза; в этой же строке копятся
+    счётчики уровня источника: raw_items (сырьё) и errors (таблица errors).
+    Средняя цена — price_sum / price_count (заявки без цены не учитываются).
+    """
+    day: date
+    source_id: int
+    cargo_type: str = ""
+    bids: int = 0
+    duplicates: int = 0
+    raw_items: int = 0
+    errors: int = 0
+    price_sum: float = 0.0
+    price_count: int = 0
+
+    @property
+    def avg_price(self) -> Optional[float]:
+        return self.price_sum / self.price_count if self.price_count else None
+
+
+@dataclass(slots=True)
+class WorkerNodeEntity:
+    """
+    Узел-воркер сбора (worker_nodes). Жив, пока heartbeat_at не старше
+    ttl; capacity — относительная мощность узла (доля источников на
+    узле ей пропорциональна).
+    """
+    node_id: str
+    capacity: float = 1.0
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    heartbeat_at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass(slots=True)
+class SourceHealth:
+    """Строка отчёта о состоянии: источник за период отчёта."""
+    source_id: int
+    source_code: str
+    bids: int = 0
+    duplicates: int = 0
+    raw_items: int = 0
+    errors: int = 0
+    avg_price: Optional[float] = None
+    # {тип груза ("" — без типа): число заявок}
+    cargo_types: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def is_silent(self) -> bool:
+        """Источник за период не дал ни сырья, ни заявок."""
+        return self.raw_items == 0 and self.bids == 0
+
+
+@dataclass(slots=True)
+class DailyHealthReport:
+    """Отчёт о состоянии сбора за дни [day_from, day_to] (включительно)."""
+    day_from: date
+    day_to: date
+    sources: list[SourceHealth] = field(default_factory=list)
+
+    @property
+    def silent_sources(self) -> list[SourceHealth]:
+        return [s for s in self.sources if s.is_silent]
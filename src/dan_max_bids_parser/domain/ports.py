@@ -2,10 +2,24 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Iterable, Optional, Protocol, Sequence
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable, Iterator, Mapping, Optional, Protocol, Sequence
 
-from .entities import BidEntity, RawItemEntity, SourceEntity
+from .entities import (
+    BidEntity,
+    BidPage,
+    BidQuery,
+    BidSearchPage,
+    ConfigEntryEntity,
+    DailyStatsEntity,
+    DatasetExportStats,
+    ExportCursorEntity,
+    JobEntity,
+    RawItemEntity,
+    RawItemHeaderEntity,
+    SourceEntity,
+    WorkerNodeEntity,
+)
 
 
 class SourceRepositoryPort(Protocol):
@@ -50,6 +64,36 @@ class RawItemProviderPort(Protocol):
         ...
 
 
+class ParserPort(Protocol):
+    """
+    Порт парсера: превращает RawItemEntity в набор словарей полей заявки.
+
+    Ключи словарей совпадают с именами полей BidEntity, значения — строки
+    «как на странице» (нормализация выполняется отдельным шагом).
+    Одна страница-листинг может дать несколько заявок.
+    """
+
+    def refresh(self, entries: Sequence[ConfigEntryEntity]) -> None:
+        """
+        Обновить конфигурацию парсера (записи config_source).
+
+        Реализация должна перекомпилировать правила только для тех
+        записей, у которых изменилась версия.
+        """
+        ...
+
+    def supports(self, source: SourceEntity) -> bool:
+        """Есть ли для источника правила разбора."""
+        ...
+
+    def parse(
+        self,
+        source: SourceEntity,
+        raw_item: RawItemEntity,
+    ) -> Sequence[Mapping[str, Any]]:
+        ...
+
+
 class RawItemRepositoryPort(Protocol):
     """
     Порт для работы с сырыми объектами (RawItemEntity).
@@ -71,6 +115,70 @@ class RawItemRepositoryPort(Protocol):
     ) -> Sequence[RawItemEntity]:
         ...
 
+    def list_after_id(
+        self,
+        after_id: int,
+        limit: int,
+        source_id: Optional[int] = None,
+        max_id: Optional[int] = None,
+    ) -> Sequence[RawItemEntity]:
+        """
+        Следующая порция raw_items с id > after_id (и id <= max_id),
+        упорядоченная по id. Используется для потоковой обработки
+        без OFFSET.
+        """
+        ...
+
+    def max_id(self, source_id: Optional[int] = None) -> int:
+        """Наибольший id raw_items (0, если записей нет)."""
+        ...
+
+    def iter_header_batches(
+        self,
+        batch_size: int,
+        source_ids: Optional[Sequence[int]] = None,
+        created_since: Optional[datetime] = None,
+    ) -> Iterator[Sequence[RawItemHeaderEntity]]:
+        """
+        Метаданные raw_items без payload порциями по batch_size, по
+        возрастанию id, одним запросом через серверный курсор.
+        Итератор действителен, пока открыт UoW.
+        """
+        ...
+
+    def list_headers_for_source_since(
+        self,
+        source_id: int,
+        since: datetime,
+    ) -> Sequence[RawItemHeaderEntity]:
+        """Как list_for_source_since, но без payload (только метаданные)."""
+        ...
+
+    def list_headers_after_id(
+        self,
+        after_id: int,
+        limit: int,
+        source_id: Optional[int] = None,
+        max_id: Optional[int] = None,
+    ) -> Sequence[RawItemHeaderEntity]:
+        """Как list_after_id, но без payload (только метаданные)."""
+        ...
+
+    def find_headers_by_hash(self, hashes: Sequence[str]) -> Sequence[RawItemHeaderEntity]:
+        """Метаданные raw_items с указанными hash (проверка дублей)."""
+        ...
+
+    def get_payload(self, raw_item_id: int) -> Optional[str]:
+        """payload одного raw_item (None, если записи нет)."""
+        ...
+
+    def get_payloads(self, raw_item_ids: Sequence[int]) -> dict[int, str]:
+        """
+        payload пачки raw_items: {id: payload}, несколько запросов
+        по id IN (...) порциями; отсутствующих id в результате нет.
+        """
+        ...
+
 
 class BidRepositoryPort(Protocol):
     """
@@ -99,3 +207,393 @@ class BidRepositoryPort(Protocol):
         Конкретная стратегия будет определяться в реализации.
         """
         ...
+
+    def replace_for_raw_items(
+        self,
+        raw_item_ids: Sequence[int],
+        bids: Sequence[BidEntity],
+    ) -> Sequence[BidEntity]:
+        """
+        Заменяет заявки, построенные из указанных raw_items, новым набором.
+        Используется при переобработке.
+
+        id заявок сохраняются: i-я новая заявка raw_item обновляет его i-ю
+        старую (по возрастанию id) на месте, лишние старые удаляются,
+        недостающие вставляются. У всех новых заявок updated_at — момент
+        замены, чтобы инкрементальные выгрузки их увидели.
+        """
+        ...
+
+    def list_after_id(
+        self,
+        after_id: int,
+        limit: int,
+        source_ids: Optional[Sequence[int]] = None,
+        created_since: Optional[datetime] = None,
+    ) -> Sequence[BidEntity]:
+        """
+        Следующая страница заявок по возрастанию id (keyset-пагинация):
+        id > after_id, не больше limit записей. Используется выгрузками.
+        """
+        ...
+
+    def list_changed_after(
+        self,
+        updated_at: Optional[datetime],
+        after_id: int,
+        limit: int,
+        source_ids: Optional[Sequence[int]] = None,
+        until: Optional[datetime] = None,
+    ) -> Sequence[BidEntity]:
+        """
+        Заявки, созданные/изменённые после водяного знака (updated_at, after_id),
+        по возрастанию (updated_at, id); updated_at=None — с начала.
+        until ограничивает updated_at сверху (включительно).
+        """
+        ...
+
+    def iter_batches(
+        self,
+        batch_size: int,
+        source_ids: Optional[Sequence[int]] = None,
+        created_since: Optional[datetime] = None,
+    ) -> Iterator[Sequence[BidEntity]]:
+        """
+        Заявки порциями по batch_size, по возрастанию id, одним запросом
+        через серверный курсор (в памяти — одна порция).
+        Итератор действителен, пока открыт UoW.
+        """
+        ...
+
+    def list_for_route(
+        self,
+        load_region: str,
+        unload_region: Optional[str] = None,
+        published_since: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> Sequence[BidEntity]:
+        """
+        Свежие заявки по маршруту (коды регионов, см. Gazetteer) по убыванию
+        published_at; unload_region=None — все направления из load_region.
+        Заявки без даты публикации не возвращаются.
+        """
+        ...
+
+    def query(
+        self,
+        query: BidQuery,
+        fields: Optional[Sequence[str]] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> BidPage:
+        """
+        Страница заявок по критериям одним SQL-запросом (см.
+        domain.services.bid_query): читаются только колонки полей fields
+        (по умолчанию — всё, кроме description). cursor — next_cursor
+        предыдущей страницы с тем же query. ValueError — неизвестные поля,
+        некорректный курсор или параметры.
+        """
+        ...
+
+    def count(self, query: BidQuery) -> int:
+        """Число заявок, которые вернёт query() (без limit и курсора)."""
+        ...
+
+    def exists(self, query: BidQuery) -> bool:
+        """Есть ли хотя бы одна заявка по критериям."""
+        ...
+
+
+class ConfigRepositoryPort(Protocol):
+    """
+    Порт чтения конфигурационных таблиц config_*.
+
+    section — имя таблицы без префикса config_
+    (source, filter_rule, classifier, dedup, schedule, antibot, export).
+    """
+
+    def list_active(self, section: str) -> Sequence[ConfigEntryEntity]:
+        ...
+
+    def get_by_code(self, section: str, code: str) -> Optional[ConfigEntryEntity]:
+        ...
+
+
+class JobRepositoryPort(Protocol):
+    """
+    Порт для работы с запусками фоновых задач (JobEntity).
+    """
+
+    def add(self, job: JobEntity) -> JobEntity:
+        ...
+
+    def get_by_id(self, job_id: int) -> Optional[JobEntity]:
+        ...
+
+    def save(self, job: JobEntity) -> JobEntity:
+        """Сохраняет статус, счётчики и checkpoint существующей задачи."""
+        ...
+
+    def find_unfinished(
+        self,
+        job_type: str,
+        source_id: Optional[int] = None,
+    ) -> Optional[JobEntity]:
+        """Последняя незавершённая (running/failed) задача данного типа."""
+        ...
+
+    def mean_durations(
+        self,
+        job_type: str,
+        since: datetime,
+        until: Optional[datetime] = None,
+    ) -> Mapping[int, float]:
+        """
+        {source_id: средняя длительность успешного запуска, сек} по задачам,
+        начатым не раньше since и (если задан until) завершённым раньше
+        until; источники без таких запусков не попадают.
+        """
+        ...
+
+    def oldest_running_started_at(
+        self,
+        job_types: Sequence[str],
+        since: datetime,
+    ) -> Optional[datetime]:
+        """
+        Самый ранний started_at (наивное UTC) задач job_types в статусе
+        running, начатых не раньше since; более старые считаются брошенными.
+        """
+        ...
+
+
+class JobQueuePort(Protocol):
+    """
+    Таблица jobs как очередь задач для воркеров на нескольких узлах.
+
+    Жизненный цикл: enqueue() -> pending; claim() -> running с арендой
+    (leased_by, lease_expires_at) на lease; воркер продлевает аренду
+    heartbeat() и снимает её complete() / fail() / release(). Аренды
+    умерших воркеров возвращает в очередь reclaim_expired(). Каждую
+    задачу одновременно держит не больше одного воркера; heartbeat /
+    complete / fail / release чужой (переданной другому) аренды
+    возвращают False.
+
+    now — текущее время UTC (по умолчанию datetime.utcnow), для тестов.
+    """
+
+    def enqueue(
+        self,
+        job_type: str,
+        source_id: Optional[int] = None,
+        run_after: Optional[datetime] = None,
+        max_attempts: int = 3,
+    ) -> Optional[JobEntity]:
+        """
+        Ставит задачу в очередь. Если такая же задача (тип + источник) уже
+        ждёт или выполняется, новая не ставится и возвращается None.
+        """
+        ...
+
+    def claim(
+        self,
+        worker_id: str,
+        job_types: Sequence[str],
+        limit: int = 1,
+        lease: timedelta = timedelta(minutes=5),
+        now: Optional[datetime] = None,
+    ) -> Sequence[JobEntity]:
+        """Забирает до limit готовых задач (старые первыми) и выдаёт их воркеру."""
+        ...
+
+    def heartbeat(
+        self,
+        job_id: int,
+        worker_id: str,
+        lease: timedelta = timedelta(minutes=5),
+        now: Optional[datetime] = None,
+    ) -> bool:
+        ...
+
+    def complete(self, job_id: int, worker_id: str) -> bool:
+        """Снимает аренду успешно выполненной задачи (статус пишет исполнитель)."""
+        ...
+
+    def fail(
+        self,
+        job_id: int,
+        worker_id: str,
+        error: str,
+        retry_delay: timedelta = timedelta(minutes=1),
+        now: Optional[datetime] = None,
+    ) -> bool:
+        """Возвращает задачу в очередь через retry_delay или, если попытки кончились, — failed."""
+        ...
+
+    def release(self, job_id: int, worker_id: str, run_after: Optional[datetime] = None) -> bool:
+        """
+        Возвращает задачу в очередь (pending с run_after), не тратя попытку:
+        воркер её не выполнял (например, источник собирается другим запуском).
+        """
+        ...
+
+    def reclaim_expired(self, now: Optional[datetime] = None) -> int:
+        """Возвращает в очередь задачи с истёкшей арендой; число таких задач."""
+        ...
+
+
+class SourceLockPort(Protocol):
+    """
+    Межпроцессная блокировка запуска сбора источника (между потоками,
+    процессами и узлами, работающими с одной БД).
+
+    Блокировка живёт дольше одной транзакции UnitOfWork — весь запуск,
+    поэтому реализация держит её вне UoW. acquire() и release()
+    вызываются из одного потока.
+    """
+
+    def acquire(self, source_code: str, timeout: float = 0.0) -> bool:
+        """
+        Захватывает блокировку источника; ждёт не дольше timeout секунд
+        (0 — одна попытка). False — источник занят.
+        """
+        ...
+
+    def release(self, source_code: str) -> None:
+        """Снимает блокировку, захваченную этим объектом."""
+        ...
+
+
+class WorkerNodeRepositoryPort(Protocol):
+    """
+    Состав узлов-воркеров (worker_nodes): каждый узел периодически
+    отмечается heartbeat(); узел без отметки дольше ttl считается ушедшим.
+    now — текущее время UTC (по умолчанию datetime.utcnow), для тестов.
+    """
+
+    def heartbeat(
+        self,
+        node_id: str,
+        capacity: float = 1.0,
+        now: Optional[datetime] = None,
+    ) -> WorkerNodeEntity:
+        """Регистрирует узел или продлевает его отметку."""
+        ...
+
+    def list_alive(self, ttl: timedelta, now: Optional[datetime] = None) -> Sequence[WorkerNodeEntity]:
+        """Живые узлы, по node_id."""
+        ...
+
+    def remove(self, node_id: str) -> None:
+        """Штатный уход узла — без ожидания ttl."""
+        ...
+
+    def purge(self, before: datetime) -> int:
+        """Удаляет узлы с отметкой старше before; число удалённых."""
+        ...
+
+
+class BidSearchPort(Protocol):
+    """
+    Порт полнотекстового поиска заявок (см. domain.services.bid_search).
+
+    Все слова запроса обязательны; order — "rank" или "recent";
+    cursor — next_cursor предыдущей страницы того же запроса и порядка.
+    ValueError — пустой запрос, некорректный курсор или параметры.
+    """
+
+    def search(
+        self,
+        text: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        order: str = "rank",
+        source_ids: Optional[Sequence[int]] = None,
+    ) -> BidSearchPage:
+        ...
+
+
+class ExportCursorRepositoryPort(Protocol):
+    """
+    Порт курсоров инкрементальных выгрузок (водяной знак на config_export).
+    """
+
+    def get(self, export_code: str) -> Optional[ExportCursorEntity]:
+        ...
+
+    def save(self, cursor: ExportCursorEntity) -> ExportCursorEntity:
+        ...
+
+
+class DailyStatsRepositoryPort(Protocol):
+    """
+    Порт дневных агрегатов заявок (см. domain.services.daily_stats).
+
+    apply() прибавляет приращения к строкам (день, источник, тип груза)
+    в текущей транзакции; rollup() пересчитывает дни из bids / raw_items /
+    errors заново — после переобработки, пометки дублей и для ошибок.
+    """
+
+    def apply(self, deltas: Iterable[DailyStatsEntity]) -> None:
+        ...
+
+    def rollup(self, day_from: date, day_to: date) -> int:
+        """Пересчитывает дни [day_from, day_to]; возвращает число строк агрегата."""
+        ...
+
+    def list_range(
+        self,
+        day_from: date,
+        day_to: date,
+        source_ids: Optional[Sequence[int]] = None,
+    ) -> Sequence[DailyStatsEntity]:
+        ...
+
+
+class ExportPort(Protocol):
+    """
+    Приёмник выгрузки заявок (XLSX, CSV, Google Sheets).
+
+    Строки передаются пачками по мере чтения из БД; адаптер не должен
+    держать в памяти всю выгрузку. finish() фиксирует результат и
+    возвращает его расположение (путь, URL), abort() — отменяет.
+
+    mode:
+    - replace — результат содержит только переданные строки;
+    - append  — строки дописываются к уже выгруженным;
+    - upsert  — строки с тем же ключом (первая колонка) заменяются,
+                новые дописываются.
+    """
+
+    def begin(self, headers: Sequence[str], mode: str = "replace") -> None:
+        ...
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        ...
+
+    def finish(self) -> str:
+        ...
+
+    def abort(self) -> None:
+        ...
+
+
+class ColumnarExportPort(Protocol):
+    """
+    Порт колоночной выгрузки (Parquet и т.п.) для аналитики.
+
+    columns — [(имя, логический тип)], типы: int, float, str, bool,
+    date, datetime. batches — итератор порций {колонка: список значений};
+    адаптер читает их по одной, поэтому память не зависит от объёма.
+    partition_by — колонки, по значениям которых данные раскладываются
+    в подкаталоги (в сами файлы они не пишутся).
+    """
+
+    def write_dataset(
+        self,
+        name: str,
+        columns: Sequence[tuple[str, str]],
+        batches: Iterable[Mapping[str, Sequence[Any]]],
+        partition_by: Sequence[str] = (),
+    ) -> DatasetExportStats:
+        ...
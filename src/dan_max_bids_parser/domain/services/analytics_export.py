@@ -0,0 +1,86 @@
+# path: src/dan_max_bids_parser/domain/services/analytics_export.py
+"""
+Наборы данных колоночной выгрузки для аналитиков (ColumnarExportPort).
+
+- bids      — все поля заявки;
+- raw_items — метаданные сырых объектов без payload.
+
+Оба набора разбиваются по date (день created_at, UTC) и source (код
+источника). Значения приводятся к типам колонок: Numeric -> float,
+даты — без часового пояса (все метки в БД — UTC).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+from dan_max_bids_parser.domain.entities import BidEntity, RawItemHeaderEntity
+
+PARTITION_BY = ("date", "source")
+
+
+def _naive(value: Optional[datetime]) -> Optional[datetime]:
+    return value.replace(tzinfo=None) if value is not None and value.tzinfo else value
+
+
+def _float(value: Any) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+# (колонка, логический тип, значение из сущности; второй аргумент — коды источников по id)
+_Column = tuple[str, str, Callable[[Any, Mapping[int, str]], Any]]
+
+_PARTITIONS: tuple[_Column, ...] = (
+    ("date", "date", lambda e, _: e.created_at.date() if e.created_at else None),
+    ("source", "str", lambda e, codes: codes.get(e.source_id, str(e.source_id))),
+)
+
+BID_COLUMNS: tuple[_Column, ...] = (
+    ("id", "int", lambda b, _: b.id),
+    ("source_id", "int", lambda b, _: b.source_id),
+    ("raw_item_id", "int", lambda b, _: b.raw_item_id),
+    ("external_id", "str", lambda b, _: b.external_id),
+    ("title", "str", lambda b, _: b.title),
+    ("description", "str", lambda b, _: b.description or None),
+    ("cargo_type", "str", lambda b, _: b.cargo_type),
+    ("transport_type", "str", lambda b, _: b.transport_type),
+    ("load_point", "str", lambda b, _: b.load_point),
+    ("unload_point", "str", lambda b, _: b.unload_point),
+    ("weight_tons", "float", lambda b, _: _float(b.weight_tons)),
+    ("price", "float", lambda b, _: _float(b.price)),
+    ("currency", "str", lambda b, _: b.currency),
+    ("contact", "str", lambda b, _: b.contact),
+    ("url", "str", lambda b, _: b.url),
+    ("published_at", "datetime", lambda b, _: _naive(b.published_at)),
+    ("created_at", "datetime", lambda b, _: _naive(b.created_at)),
+    ("updated_at", "datetime", lambda b, _: _naive(b.updated_at)),
+) + _PARTITIONS
+
+RAW_ITEM_COLUMNS: tuple[_Column, ...] = (
+    ("id", "int", lambda r, _: r.id),
+    ("source_id", "int", lambda r, _: r.source_id),
+    ("external_id", "str", lambda r, _: r.external_id),
+    ("url", "str", lambda r, _: r.url),
+    ("status", "str", lambda r, _: r.status),
+    ("hash", "str", lambda r, _: r.hash),
+    ("created_at", "datetime", lambda r, _: _naive(r.created_at)),
+    ("received_at", "datetime", lambda r, _: _naive(r.received_at)),
+) + _PARTITIONS
+
+
+def schema(columns: Sequence[_Column]) -> list[tuple[str, str]]:
+    """[(колонка, тип)] для ColumnarExportPort."""
+    return [(name, kind) for name, kind, _ in columns]
+
+
+def to_columns(
+    columns: Sequence[_Column],
+    entities: Sequence[BidEntity] | Sequence[RawItemHeaderEntity],
+    source_codes: Mapping[int, str],
+) -> dict[str, list[Any]]:
+    """Порция сущностей -> {колонка: значения}."""
+    return {
+        name: [get(entity, source_codes) for entity in entities]
+        for name, _, get in columns
+    }
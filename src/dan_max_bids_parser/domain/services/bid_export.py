@@ -0,0 +1,223 @@
+# path: src/dan_max_bids_parser/domain/services/bid_export.py
+"""
+Формат выгрузки заявок: набор колонок и параметры из config_export.
+
+Одна запись config_export — одна выгрузка:
+
+    {
+        "target": "xlsx",
+        "path": "exports/{code}_{date}.xlsx",
+        "sheet": "Заявки",
+        "source_codes": ["ATI"],          # по умолчанию — все источники
+        "since_days": 30,                 # по умолчанию — без ограничения
+        "columns": ["id", "published_at", ...],  # по умолчанию — 13 колонок ТЗ
+        "chunk_size": 5000,
+        "mode": "full",                   # full | append | upsert
+        "cursor_lag_seconds": 60,
+        "cursor_job_timeout_seconds": 21600
+    }
+
+Для "target": "sheets" обязателен "spreadsheet_id", а "path" — локальный
+файл индекса синхронизации листа (по умолчанию exports/.sheets/{code}.json).
+
+Режимы:
+- full   — каждый запуск выгружает весь отбор и перезаписывает результат;
+- append — выгружаются только заявки, созданные/изменённые после курсора
+           (export_cursors), и дописываются к результату. Если запуск упал
+           между записью и сохранением курсора, порция выгрузится повторно —
+           доставка «хотя бы один раз», возможны дубликаты строк;
+- upsert — как append, но строка с тем же ID заменяется на месте, поэтому
+           повтор порции идемпотентен. Требует "id" первой колонкой.
+
+Курсор — (updated_at, id) последней выгруженной заявки. updated_at
+ставится до коммита, поэтому транзакция, ещё не закоммиченная к моменту
+выгрузки, может позже записать строку с updated_at меньше уже выданного
+водяного знака — такая строка была бы пропущена навсегда. Поэтому
+верхняя граница запуска — раньше и now - cursor_lag_seconds, и начала
+самой старой идущей задачи, пишущей заявки (сбор, переобработка), с тем
+же запасом: строки таких задач не старше их started_at. Задачи, идущие
+дольше cursor_job_timeout_seconds, считаются брошенными (упавший процесс
+оставляет статус running) и границу не держат. since_days действует
+только в режиме full.
+
+Переобработка сохраняет id заявок (BidRepositoryPort.replace_for_raw_items),
+поэтому upsert заменяет строки на месте; заявки, удалённые переобработкой
+(парсер стал выдавать меньше заявок на raw_item), из уже выгруженного
+результата не удаляются.
+
+Строка выгрузки строится из BidEntity; даты отдаются без часового пояса
+(Excel и Google Sheets не хранят tz).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+from dan_max_bids_parser.domain.entities import BidEntity, ConfigEntryEntity
+
+EXPORT_TARGETS = ("xlsx", "sheets")
+EXPORT_MODES = ("full", "append", "upsert")
+
+DEFAULT_PATH = "exports/{code}_{date}.xlsx"
+DEFAULT_SHEETS_INDEX_PATH = "exports/.sheets/{code}.json"
+DEFAULT_SHEET = "Заявки"
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_CURSOR_LAG_SECONDS = 60
+DEFAULT_CURSOR_JOB_TIMEOUT_SECONDS = 6 * 3600
+
+
+def _naive(value: Optional[datetime]) -> Optional[datetime]:
+    return value.replace(tzinfo=None) if value is not None and value.tzinfo else value
+
+
+# ключ -> (заголовок, значение из заявки; второй аргумент — имена источников по id)
+_COLUMNS: dict[str, tuple[str, Callable[[BidEntity, Mapping[int, str]], Any]]] = {
+    "id": ("ID", lambda b, _: b.id),
+    "published_at": ("Дата публикации", lambda b, _: _naive(b.published_at or b.created_at)),
+    "source": ("Источник", lambda b, names: names.get(b.source_id, str(b.source_id))),
+    "cargo_type": ("Груз", lambda b, _: b.cargo_type or b.title),
+    "transport_type": ("Тип транспорта", lambda b, _: b.transport_type),
+    "load_point": ("Откуда", lambda b, _: b.load_point),
+    "unload_point": ("Куда", lambda b, _: b.unload_point),
+    "weight_tons": ("Вес, т", lambda b, _: b.weight_tons),
+    "price": ("Цена", lambda b, _: b.price),
+    "currency": ("Валюта", lambda b, _: b.currency),
+    "contact": ("Контакт", lambda b, _: b.contact),
+    "url": ("Ссылка", lambda b, _: b.url),
+    "description": ("Описание", lambda b, _: b.description or None),
+    "title": ("Заголовок", lambda b, _: b.title),
+    "external_id": ("ID на площадке", lambda b, _: b.external_id),
+    "created_at": ("Добавлена", lambda b, _: _naive(b.created_at)),
+}
+
+# 13 колонок клиентского формата (ТЗ)
+DEFAULT_COLUMNS = (
+    "id",
+    "published_at",
+    "source",
+    "cargo_type",
+    "transport_type",
+    "load_point",
+    "unload_point",
+    "weight_tons",
+    "price",
+    "currency",
+    "contact",
+    "url",
+    "description",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ExportSpec:
+    """Разобранная запись config_export."""
+
+    code: str
+    target: str = "xlsx"
+    path: str = DEFAULT_PATH
+    sheet: str = DEFAULT_SHEET
+    source_codes: tuple[str, ...] = ()
+    since_days: Optional[int] = None
+    columns: tuple[str, ...] = DEFAULT_COLUMNS
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    mode: str = "full"
+    cursor_lag_seconds: int = DEFAULT_CURSOR_LAG_SECONDS
+    cursor_job_timeout_seconds: int = DEFAULT_CURSOR_JOB_TIMEOUT_SECONDS
+    spreadsheet_id: Optional[str] = None
+
+    @property
+    def incremental(self) -> bool:
+        return self.mode != "full"
+
+    def resolve_path(self, today: Optional[date] = None) -> str:
+        today = today or date.today()
+        return self.path.format(code=self.code, date=today.isoformat())
+
+    def created_since(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        if self.since_days is None:
+            return None
+        return (now or datetime.utcnow()) - timedelta(days=self.since_days)
+
+    def open_jobs_since(self, now: Optional[datetime] = None) -> datetime:
+        """Идущие задачи, начатые раньше этого момента, считаются брошенными."""
+        return (now or datetime.utcnow()) - timedelta(seconds=self.cursor_job_timeout_seconds)
+
+    def cursor_until(
+        self,
+        now: Optional[datetime] = None,
+        oldest_open_job: Optional[datetime] = None,
+    ) -> datetime:
+        """
+        Верхняя граница updated_at для инкрементального запуска.
+
+        :param oldest_open_job: started_at самой старой идущей задачи,
+            пишущей заявки: её незакоммиченные строки не старше этого момента.
+        """
+        lag = timedelta(seconds=self.cursor_lag_seconds)
+        until = (now or datetime.utcnow()) - lag
+        if oldest_open_job is not None:
+            until = min(until, oldest_open_job - lag)
+        return until
+
+
+def parse_export_config(entry: ConfigEntryEntity) -> ExportSpec:
+    """config_export -> ExportSpec; ValueError при некорректной записи."""
+    data = entry.data or {}
+    target = data.get("target", "xlsx")
+    if target not in EXPORT_TARGETS:
+        raise ValueError(f"Export '{entry.code}': unknown target {target!r}")
+    columns = tuple(data.get("columns") or DEFAULT_COLUMNS)
+    unknown = [c for c in columns if c not in _COLUMNS]
+    if unknown:
+        raise ValueError(f"Export '{entry.code}': unknown columns {unknown}")
+    chunk_size = int(data.get("chunk_size", DEFAULT_CHUNK_SIZE))
+    if chunk_size < 1:
+        raise ValueError(f"Export '{entry.code}': chunk_size must be >= 1")
+    mode = data.get("mode", "full")
+    if mode not in EXPORT_MODES:
+        raise ValueError(f"Export '{entry.code}': unknown mode {mode!r}")
+    if mode == "upsert" and columns[0] != "id":
+        raise ValueError(f"Export '{entry.code}': upsert mode requires 'id' as the first column")
+    cursor_lag_seconds = int(data.get("cursor_lag_seconds", DEFAULT_CURSOR_LAG_SECONDS))
+    if cursor_lag_seconds < 0:
+        raise ValueError(f"Export '{entry.code}': cursor_lag_seconds must be >= 0")
+    cursor_job_timeout_seconds = int(
+        data.get("cursor_job_timeout_seconds", DEFAULT_CURSOR_JOB_TIMEOUT_SECONDS)
+    )
+    if cursor_job_timeout_seconds < 0:
+        raise ValueError(f"Export '{entry.code}': cursor_job_timeout_seconds must be >= 0")
+    spreadsheet_id = data.get("spreadsheet_id")
+    if target == "sheets" and not spreadsheet_id:
+        raise ValueError(f"Export '{entry.code}': sheets target requires spreadsheet_id")
+    default_path = DEFAULT_SHEETS_INDEX_PATH if target == "sheets" else DEFAULT_PATH
+    since_days = data.get("since_days")
+    return ExportSpec(
+        code=entry.code,
+        target=target,
+        path=data.get("path", default_path),
+        sheet=data.get("sheet", DEFAULT_SHEET),
+        source_codes=tuple(data.get("source_codes") or ()),
+        since_days=int(since_days) if since_days is not None else None,
+        columns=columns,
+        chunk_size=chunk_size,
+        mode=mode,
+        cursor_lag_seconds=cursor_lag_seconds,
+        cursor_job_timeout_seconds=cursor_job_timeout_seconds,
+        spreadsheet_id=spreadsheet_id,
+    )
+
+
+class BidRowFormatter:
+    """Превращает заявки в строки выгрузки по списку колонок."""
+
+    def __init__(self, columns: Sequence[str], source_names: Mapping[int, str]) -> None:
+        self._getters = [_COLUMNS[c][1] for c in columns]
+        self._source_names = source_names
+        self.headers = [_COLUMNS[c][0] for c in columns]
+
+    def rows(self, bids: Sequence[BidEntity]) -> list[list[Any]]:
+        names = self._source_names
+        getters = self._getters
+        return [[get(bid, names) for get in getters] for bid in bids]
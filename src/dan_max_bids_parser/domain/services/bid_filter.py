@@ -0,0 +1,321 @@
+# path: src/dan_max_bids_parser/domain/services/bid_filter.py
+"""
+Доменный сервис BidFilter: фильтрация заявок по правилам config_filter_rule.
+
+Одна запись config_filter_rule — одно правило:
+
+    {"kind": "cargo", "mode": "include", "values": ["щебень", "песок"]}
+    {"kind": "transport", "mode": "exclude", "values": ["трал"]}
+    {"kind": "route", "from": ["тверь"], "to": ["москва"]}
+    {"kind": "region", "values": ["московская"]}
+    {"kind": "price", "min": 10000, "max": 500000, "allow_missing": true}
+    {"kind": "weight", "min": 5}
+    {"kind": "keywords", "mode": "exclude", "values": ["металлолом", "негабарит"]}
+
+mode: include — заявка должна удовлетворять правилу, exclude — не должна.
+
+Правила компилируются в план: сначала дешёвые проверки (множества,
+числовые диапазоны), затем подстроки и в конце ключевые слова; внутри
+одной стоимости — по наблюдаемой доле отсева (самые «отсекающие» раньше).
+Все keyword-правила используют один общий автомат Ахо–Корасик,
+числовые диапазоны считаются по колонке значений всего пакета.
+Заявка отклоняется первым сработавшим по плану правилом.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence
+
+from dan_max_bids_parser.domain.entities import BidEntity, ConfigEntryEntity
+from .text_matching import AhoCorasick, keyword_patterns, stem_tokens
+
+logger = logging.getLogger(__name__)
+
+FILTER_KINDS = ("cargo", "transport", "price", "weight", "route", "region", "keywords")
+
+# Относительная стоимость проверки одной заявки
+_COST_SET = 1
+_COST_RANGE = 1
+_COST_SUBSTRING = 2
+_COST_KEYWORDS = 3
+
+# Поля, по тексту которых проверяются keyword-правила
+_KEYWORD_FIELDS = ("title", "description")
+
+
+@dataclass(slots=True)
+class FilterResult:
+    """Результат фильтрации пакета: принятые заявки и (заявка, код правила) отклонённых."""
+
+    accepted: list[BidEntity] = field(default_factory=list)
+    rejected: list[tuple[BidEntity, str]] = field(default_factory=list)
+
+
+# Проверка по пакету: (заявки, индексы живых заявок, контекст) -> индексы, удовлетворяющие правилу
+BatchPredicate = Callable[[Sequence[BidEntity], list[int], "_BatchContext"], list[int]]
+
+
+@dataclass(slots=True)
+class _CompiledRule:
+    code: str
+    kind: str
+    exclude: bool
+    cost: int
+    predicate: BatchPredicate
+    evaluated: int = 0
+    rejected: int = 0
+
+    @property
+    def rejection_rate(self) -> float:
+        # Для ещё не работавших правил — нейтральная оценка
+        return self.rejected / self.evaluated if self.evaluated else 0.5
+
+
+@dataclass(slots=True)
+class _BatchContext:
+    """Ленивые вычисления, общие для всех правил одного пакета."""
+
+    automaton: Optional[AhoCorasick[str]]
+    columns: dict[str, list[Any]] = field(default_factory=dict)
+    keyword_hits: dict[int, frozenset[str]] = field(default_factory=dict)
+
+    def column(self, bids: Sequence[BidEntity], name: str) -> list[Any]:
+        values = self.columns.get(name)
+        if values is None:
+            values = self.columns[name] = [getattr(bid, name) for bid in bids]
+        return values
+
+    def hits(self, bids: Sequence[BidEntity], alive: list[int]) -> dict[int, frozenset[str]]:
+        """Коды keyword-правил, совпавших с текстом заявки (один проход автомата)."""
+        automaton = self.automaton
+        for idx in alive:
+            if idx in self.keyword_hits or automaton is None:
+                continue
+            bid = bids[idx]
+            text = " ".join(v for v in (getattr(bid, f) for f in _KEYWORD_FIELDS) if v)
+            self.keyword_hits[idx] = frozenset(
+                code for _, _, code in automaton.iter_matches(stem_tokens(text))
+            )
+        return self.keyword_hits
+
+
+# --- Компиляция отдельных видов правил ---
+
+
+def _lower_set(values: Iterable[Any]) -> frozenset[str]:
+    return frozenset(str(v).strip().lower() for v in values if str(v).strip())
+
+
+def _compile_set(field_name: str, values: frozenset[str]) -> BatchPredicate:
+    def predicate(bids, alive, ctx):
+        column = ctx.column(bids, field_name)
+        return [i for i in alive if column[i] is not None and column[i].lower() in values]
+
+    return predicate
+
+
+def _compile_range(
+    field_name: str,
+    low: Optional[float],
+    high: Optional[float],
+    allow_missing: bool,
+) -> BatchPredicate:
+    low_value = float("-inf") if low is None else float(low)
+    high_value = float("inf") if high is None else float(high)
+
+    def predicate(bids, alive, ctx):
+        column = ctx.column(bids, field_name)
+        return [
+            i
+            for i in alive
+            if (allow_missing if column[i] is None else low_value <= column[i] <= high_value)
+        ]
+
+    return predicate
+
+
+def _compile_substrings(field_names: Sequence[str], needles: frozenset[str]) -> BatchPredicate:
+    def predicate(bids, alive, ctx):
+        columns = [ctx.column(bids, name) for name in field_names]
+        result = []
+        for i in alive:
+            for column in columns:
+                value = column[i]
+                if value and any(needle in value.lower() for needle in needles):
+                    result.append(i)
+                    break
+        return result
+
+    return predicate
+
+
+def _compile_route(origins: frozenset[str], destinations: frozenset[str]) -> BatchPredicate:
+    checks = []
+    if origins:
+        checks.append(_compile_substrings(("load_point",), origins))
+    if destinations:
+        checks.append(_compile_substrings(("unload_point",), destinations))
+
+    def predicate(bids, alive, ctx):
+        for check in checks:
+            alive = check(bids, alive, ctx)
+        return alive
+
+    return predicate
+
+
+def _compile_keywords(code: str) -> BatchPredicate:
+    def predicate(bids, alive, ctx):
+        hits = ctx.hits(bids, alive)
+        return [i for i in alive if code in hits.get(i, ())]
+
+    return predicate
+
+
+def _compile_rule(
+    entry: ConfigEntryEntity,
+    automaton: AhoCorasick[str],
+) -> _CompiledRule:
+    data = entry.data
+    kind = data.get("kind")
+    if kind not in FILTER_KINDS:
+        raise ValueError(f"config_filter_rule '{entry.code}': unknown kind '{kind}'")
+    mode = data.get("mode", "include")
+    if mode not in ("include", "exclude"):
+        raise ValueError(f"config_filter_rule '{entry.code}': unknown mode '{mode}'")
+
+    if kind in ("cargo", "transport"):
+        values = _lower_set(data.get("values", []))
+        if not values:
+            raise ValueError(f"config_filter_rule '{entry.code}': 'values' is empty")
+        predicate = _compile_set(f"{kind}_type", values)
+        cost = _COST_SET
+    elif kind in ("price", "weight"):
+        low, high = data.get("min"), data.get("max")
+        if low is None and high is None:
+            raise ValueError(f"config_filter_rule '{entry.code}': 'min' or 'max' is required")
+        predicate = _compile_range(
+            "price" if kind == "price" else "weight_tons",
+            low,
+            high,
+            bool(data.get("allow_missing", False)),
+        )
+        cost = _COST_RANGE
+    elif kind == "route":
+        origins = _lower_set(data.get("from", []))
+        destinations = _lower_set(data.get("to", []))
+        if not origins and not destinations:
+            raise ValueError(f"config_filter_rule '{entry.code}': 'from' or 'to' is required")
+        predicate = _compile_route(origins, destinations)
+        cost = _COST_SUBSTRING
+    elif kind == "region":
+        values = _lower_set(data.get("values", []))
+        if not values:
+            raise ValueError(f"config_filter_rule '{entry.code}': 'values' is empty")
+        predicate = _compile_substrings(("load_point", "unload_point"), values)
+        cost = _COST_SUBSTRING
+    else:
+        patterns = [p for v in data.get("values", []) for p in keyword_patterns(str(v))]
+        if not patterns:
+            raise ValueError(f"config_filter_rule '{entry.code}': 'values' is empty")
+        for pattern in patterns:
+            automaton.add(pattern, entry.code)
+        predicate = _compile_keywords(entry.code)
+        cost = _COST_KEYWORDS
+
+    return _CompiledRule(
+        code=entry.code,
+        kind=kind,
+        exclude=mode == "exclude",
+        cost=cost,
+        predicate=predicate,
+    )
+
+
+class BidFilter:
+    """
+    Скомпилированный набор правил фильтрации.
+
+    План пересобирается только при смене набора/версий правил;
+    статистика отсева сохраняется между пакетами и влияет на порядок.
+    """
+
+    def __init__(self) -> None:
+        self._rules: list[_CompiledRule] = []
+        self._automaton: Optional[AhoCorasick[str]] = None
+        self._versions: Optional[tuple[tuple[str, str], ...]] = None
+
+    @property
+    def plan(self) -> list[str]:
+        """Коды правил в порядке выполнения."""
+        return [rule.code for rule in self._ordered_rules()]
+
+    def refresh(self, entries: Sequence[ConfigEntryEntity]) -> bool:
+        """
+        Компилирует правила, если набор записей или их версии изменились.
+
+        :return: True, если план был перекомпилирован.
+        """
+        versions = tuple(sorted((e.code, e.version) for e in entries))
+        if versions == self._versions:
+            return False
+
+        automaton: AhoCorasick[str] = AhoCorasick()
+        rules: list[_CompiledRule] = []
+        for entry in entries:
+            try:
+                rules.append(_compile_rule(entry, automaton))
+            except (ValueError, TypeError):
+                logger.exception("Invalid filter rule '%s'", entry.code)
+
+        self._rules = rules
+        self._automaton = automaton.build() if any(r.kind == "keywords" for r in rules) else None
+        self._versions = versions
+        logger.info("Compiled filter plan: %s", ", ".join(self.plan) or "<empty>")
+        return True
+
+    def _ordered_rules(self) -> list[_CompiledRule]:
+        return sorted(self._rules, key=lambda r: (r.cost, -r.rejection_rate))
+
+    def filter_many(self, bids: Sequence[BidEntity]) -> FilterResult:
+        """Прогоняет пакет заявок через план правил."""
+        bids = list(bids)
+        if not self._rules:
+            return FilterResult(accepted=bids)
+
+        ctx = _BatchContext(automaton=self._automaton)
+        alive = list(range(len(bids)))
+        rejected_by: dict[int, str] = {}
+
+        for rule in self._ordered_rules():
+            if not alive:
+                break
+            matched = rule.predicate(bids, alive, ctx)
+            if rule.exclude:
+                matched_set = set(matched)
+                passed = [i for i in alive if i not in matched_set]
+            else:
+                passed = matched
+            if len(passed) != len(alive):
+                passed_set = set(passed)
+                for i in alive:
+                    if i not in passed_set:
+                        rejected_by[i] = rule.code
+            rule.evaluated += len(alive)
+            rule.rejected += len(alive) - len(passed)
+            alive = passed
+
+        result = FilterResult()
+        for idx, bid in enumerate(bids):
+            code = rejected_by.get(idx)
+            if code is None:
+                result.accepted.append(bid)
+            else:
+                result.rejected.append((bid, code))
+        return result
+
+    def stats(self) -> Mapping[str, tuple[int, int]]:
+        """{код правила: (проверено заявок, отклонено)} с момента компиляции."""
+        return {rule.code: (rule.evaluated, rule.rejected) for rule in self._rules}
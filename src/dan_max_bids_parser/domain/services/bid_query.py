@@ -0,0 +1,82 @@
+# path: src/dan_max_bids_parser/domain/services/bid_query.py
+"""
+Выборка заявок по критериям (BidQuery): проекции, проверка и курсор.
+
+Списки в интерфейсах читают только нужные колонки: fields — имена полей
+BidEntity, по умолчанию LIST_FIELDS (всё, кроме description). id
+добавляется всегда — по нему строится курсор.
+
+Пагинация — keyset по (published_at, id) или по id, в зависимости от
+BidQuery.order. Курсор — непрозрачная строка; он привязан к порядку
+сортировки, но не к остальным критериям (их передаёт вызывающий код).
+"""
+
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass, fields as dataclass_fields
+from datetime import datetime
+from typing import Optional, Sequence
+
+from dan_max_bids_parser.domain.entities import BidEntity, BidQuery
+
+QUERY_ORDERS = ("published", "id")
+
+MAX_LIMIT = 500
+
+# Поля BidEntity, доступные в проекциях
+QUERY_FIELDS = tuple(f.name for f in dataclass_fields(BidEntity))
+
+# Проекция списков по умолчанию: описание бывает длинным (целые страницы)
+LIST_FIELDS = tuple(name for name in QUERY_FIELDS if name != "description")
+
+
+@dataclass(frozen=True, slots=True)
+class BidQueryCursor:
+    order: str
+    bid_id: int
+    published_at: Optional[datetime] = None
+
+    def encode(self) -> str:
+        published = self.published_at.isoformat() if self.published_at else ""
+        raw = f"{self.order}|{published}|{self.bid_id}".encode("ascii")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str, order: str) -> "BidQueryCursor":
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode("ascii")
+            cursor_order, published, bid_id = raw.split("|")
+            cursor = cls(
+                order=cursor_order,
+                bid_id=int(bid_id),
+                published_at=datetime.fromisoformat(published) if published else None,
+            )
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError(f"Invalid bid query cursor: {value!r}") from None
+        if cursor.order != order or (order == "published") != (cursor.published_at is not None):
+            raise ValueError(f"Cursor does not match order {order!r}")
+        return cursor
+
+
+def projection(fields: Optional[Sequence[str]]) -> tuple[str, ...]:
+    """Поля строки выборки: id первым, без повторов; ValueError на неизвестных."""
+    names = LIST_FIELDS if fields is None else tuple(fields)
+    unknown = sorted(set(names) - set(QUERY_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown bid fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(("id", *names)))
+
+
+def validate(query: BidQuery, limit: int) -> None:
+    if query.order not in QUERY_ORDERS:
+        raise ValueError(f"Unknown bid query order {query.order!r}")
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    for low, high, name in (
+        (query.price_min, query.price_max, "price"),
+        (query.weight_min, query.weight_max, "weight"),
+        (query.published_from, query.published_to, "published"),
+    ):
+        if low is not None and high is not None and low > high:
+            raise ValueError(f"Empty {name} range: {low} > {high}")
@@ -0,0 +1,101 @@
+# path: src/dan_max_bids_parser/domain/services/bid_search.py
+"""
+Полнотекстовый поиск заявок: разбор запроса и курсор пагинации.
+
+Запрос диспетчера («щебень Тверь») разбивается на слова (tokenize);
+все слова обязательны (AND), каждое ищется по префиксу. Дальше запрос
+переводится в синтаксис движка:
+
+- Postgres — to_tsquery('russian', 'щебень:* & тверь:*'): морфологию
+  даёт словарь russian (Snowball);
+- SQLite FTS5 — '"щеб"* AND "тве"*': у unicode61 нет русского стеммера,
+  поэтому ищется общий префикс слова и его основы (stem) без возможной
+  беглой гласной, не короче трёх букв: «щебня» и «щебень» -> «щеб»*,
+  «Тверь» -> «тве»*.
+  Буква «ё» в тексте заявки FTS5 с «е» не сводит.
+
+Порядок выдачи:
+- rank   — по релевантности (ts_rank_cd / bm25), затем по id убыванию;
+- recent — по id убыванию: для широких запросов («щебень»), где
+           ранжировать все совпадения дорого, а нужны свежие заявки.
+
+Пагинация — keyset: курсор хранит (score, id) последней строки страницы
+и кодируется в непрозрачную строку; score передаётся без потерь
+(float.hex), поэтому сравнение на равенство в БД точное.
+"""
+
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass
+
+from dan_max_bids_parser.domain.services.text_matching import stem, tokenize
+
+SEARCH_ORDERS = ("rank", "recent")
+
+MAX_TERMS = 8
+MAX_LIMIT = 200
+_MIN_PREFIX = 3
+_VOWELS = frozenset("аеиоуыэюяaeiouy")
+_FLEETING_BEFORE = frozenset("кнлцр")
+
+
+@dataclass(frozen=True, slots=True)
+class SearchCursor:
+    score: float
+    bid_id: int
+
+    def encode(self) -> str:
+        raw = f"{self.score.hex()}|{self.bid_id}".encode("ascii")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "SearchCursor":
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode("ascii")
+            score, bid_id = raw.split("|")
+            return cls(score=float.fromhex(score), bid_id=int(bid_id))
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError(f"Invalid search cursor: {value!r}") from None
+
+
+def search_terms(text: str) -> list[str]:
+    """Слова запроса без повторов (в порядке появления); ValueError, если слов нет."""
+    terms = list(dict.fromkeys(tokenize(text)))[:MAX_TERMS]
+    if not terms:
+        raise ValueError("Search query has no words")
+    return terms
+
+
+def fts5_prefix(term: str) -> str:
+    """Префикс слова для FTS5: общий с основой, но не короче трёх букв."""
+    root = stem(term)
+    common = 0
+    for a, b in zip(term, root):
+        if a != b:
+            break
+        common += 1
+    # «щебня» -> основа «щебн», но «щебень»: беглая гласная перед последней согласной
+    if (
+        common >= 3
+        and term[common - 1] in _FLEETING_BEFORE
+        and term[common - 2] not in _VOWELS
+    ):
+        common -= 1
+    return term[: max(common, min(_MIN_PREFIX, len(term)))]
+
+
+def fts5_match(terms: list[str]) -> str:
+    # слова — только [а-яa-z0-9], кавычки внутри невозможны
+    return " AND ".join(f'"{fts5_prefix(term)}"*' for term in terms)
+
+
+def pg_tsquery(terms: list[str]) -> str:
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def validate(limit: int, order: str) -> None:
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+    if order not in SEARCH_ORDERS:
+        raise ValueError(f"Unknown search order {order!r}")
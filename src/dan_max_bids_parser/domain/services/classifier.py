@@ -0,0 +1,163 @@
+# path: src/dan_max_bids_parser/domain/services/classifier.py
+"""
+Доменный сервис BidClassifier: определение типа груза и транспорта.
+
+Словари берутся из config_classifier.data:
+
+    {
+        "target": "cargo_type",
+        "categories": {
+            "щебень": {"keywords": ["щебень", "гранитный щебень"], "priority": 10},
+            "песок": ["песок", "пескогрунт"]
+        }
+    }
+
+target — поле BidEntity (cargo_type или transport_type); категорий и
+записей может быть сколько угодно. Все ключевые фразы всех записей
+компилируются в один автомат Ахо–Корасик над основами слов, так что
+текст заявки просматривается один раз при любом размере словаря.
+Автомат пересобирается только при смене версии конфигурации.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Optional, Sequence
+
+from dan_max_bids_parser.domain.entities import BidEntity, ConfigEntryEntity
+from .text_matching import AhoCorasick, keyword_patterns, stem_tokens
+
+logger = logging.getLogger(__name__)
+
+# Поля BidEntity, которые может заполнять классификатор
+CLASSIFIER_TARGETS = ("cargo_type", "transport_type")
+
+# Поля заявки, по тексту которых выполняется классификация
+_TEXT_FIELDS = ("title", "cargo_type", "transport_type", "description")
+
+
+@dataclass(frozen=True, slots=True)
+class _KeywordHit:
+    target: str
+    category: str
+    priority: int
+
+
+def _iter_categories(
+    entry: ConfigEntryEntity,
+) -> Iterable[tuple[str, str, Sequence[str], int]]:
+    """(target, category, keywords, priority) из одной записи config_classifier."""
+    target = entry.data.get("target", "cargo_type")
+    if target not in CLASSIFIER_TARGETS:
+        raise ValueError(f"config_classifier '{entry.code}': unknown target '{target}'")
+
+    categories = entry.data.get("categories")
+    if not isinstance(categories, Mapping):
+        raise ValueError(f"config_classifier '{entry.code}': 'categories' must be an object")
+
+    for category, spec in categories.items():
+        if isinstance(spec, Mapping):
+            keywords = spec.get("keywords", [])
+            priority = int(spec.get("priority", 0))
+        else:
+            keywords, priority = spec, 0
+        yield target, category, [category, *keywords], priority
+
+
+class BidClassifier:
+    """
+    Классификатор заявок по словарям ключевых слов.
+
+    :param max_text_length: сколько символов текста заявки учитывать
+        (сырые HTML-страницы целиком не просматриваем).
+    """
+
+    def __init__(self, max_text_length: int = 20_000) -> None:
+        self._max_text_length = max_text_length
+        self._automaton: Optional[AhoCorasick[_KeywordHit]] = None
+        self._versions: tuple[tuple[str, str], ...] = ()
+        self.keywords_count = 0
+
+    # --- Конфигурация ---
+
+    def refresh(self, entries: Sequence[ConfigEntryEntity]) -> bool:
+        """
+        Пересобирает автомат, если набор записей или их версии изменились.
+
+        :return: True, если автомат был перекомпилирован.
+        """
+        versions = tuple(sorted((e.code, e.version) for e in entries))
+        if self._automaton is not None and versions == self._versions:
+            return False
+
+        automaton: AhoCorasick[_KeywordHit] = AhoCorasick()
+        count = 0
+        for entry in entries:
+            try:
+                categories = list(_iter_categories(entry))
+            except ValueError:
+                logger.exception("Invalid classifier config '%s'", entry.code)
+                continue
+            for target, category, keywords, priority in categories:
+                hit = _KeywordHit(target=target, category=category, priority=priority)
+                for keyword in keywords:
+                    patterns = keyword_patterns(keyword)
+                    for pattern in patterns:
+                        automaton.add(pattern, hit)
+                    count += bool(patterns)
+
+        self._automaton = automaton.build()
+        self._versions = versions
+        self.keywords_count = count
+        logger.info(
+            "Compiled classifier automaton: %d keywords, %d states",
+            count,
+            len(automaton),
+        )
+        return True
+
+    # --- Классификация ---
+
+    def match(self, text: str) -> dict[str, str]:
+        """
+        Категории для текста: {target: category}.
+
+        Побеждает категория с наибольшей суммарной длиной совпавших фраз
+        (многословная фраза специфичнее), при равенстве — с большим
+        priority, затем — встретившаяся раньше.
+        """
+        if self._automaton is None or not text:
+            return {}
+
+        scores: dict[tuple[str, str], list[int]] = {}
+        for start, length, hit in self._automaton.iter_matches(
+            stem_tokens(text[: self._max_text_length])
+        ):
+            key = (hit.target, hit.category)
+            score = scores.get(key)
+            if score is None:
+                # [вес, приоритет, -позиция первого вхождения]
+                scores[key] = [length, hit.priority, -start]
+            else:
+                score[0] += length
+
+        best: dict[str, tuple[list[int], str]] = {}
+        for (target, category), score in scores.items():
+            current = best.get(target)
+            if current is None or score > current[0]:
+                best[target] = (score, category)
+        return {target: category for target, (_, category) in best.items()}
+
+    def classify(self, bid: BidEntity) -> BidEntity:
+        """Заполняет cargo_type/transport_type заявки (in place)."""
+        text = " ".join(
+            value for value in (getattr(bid, name) for name in _TEXT_FIELDS) if value
+        )
+        for target, category in self.match(text).items():
+            setattr(bid, target, category)
+        return bid
+
+    def classify_many(self, bids: Iterable[BidEntity]) -> list[BidEntity]:
+        return [self.classify(bid) for bid in bids]
+
@@ -0,0 +1,138 @@
+# path: src/dan_max_bids_parser/domain/services/daily_stats.py
+"""
+Дневные агрегаты заявок (bid_daily_stats) и отчёт о состоянии сбора.
+
+Ключ агрегата — (сутки UTC по created_at, source_id, тип груза; "" — без
+типа). Агрегат поддерживается двумя путями:
+
+- инкрементально: сбор в той же транзакции, что и вставка заявок,
+  прибавляет приращения from_raw_items() + from_bids();
+- пересчётом (DailyStatsRepositoryPort.rollup): переобработка заменяет
+  заявки, дубли помечаются позже, а ошибки пишутся в errors помимо
+  сбора — такие изменения догоняет периодический rollup за последние дни.
+
+Отчёт (build_health_report) читает только агрегат: O(дни × источники),
+без сканирования bids и raw_items.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from typing import Iterable, Sequence
+
+from dan_max_bids_parser.domain.entities import (
+    BidEntity,
+    DailyHealthReport,
+    DailyStatsEntity,
+    RawItemEntity,
+    SourceEntity,
+    SourceHealth,
+)
+
+StatsKey = tuple[date, int, str]
+
+# Дольше окно пересчёта не нужно: отчёт смотрит последние дни
+MAX_ROLLUP_DAYS = 366
+
+
+def stats_day(moment: datetime) -> date:
+    """Сутки агрегата: UTC; наивное время считается уже UTC (как datetime.utcnow)."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.date()
+
+
+def stats_key(stats: DailyStatsEntity) -> StatsKey:
+    return stats.day, stats.source_id, stats.cargo_type
+
+
+def _row(rows: dict[StatsKey, DailyStatsEntity], key: StatsKey) -> DailyStatsEntity:
+    row = rows.get(key)
+    if row is None:
+        row = rows[key] = DailyStatsEntity(day=key[0], source_id=key[1], cargo_type=key[2])
+    return row
+
+
+def from_bids(bids: Iterable[BidEntity]) -> list[DailyStatsEntity]:
+    """Приращения от новых заявок (дублями они ещё не помечены)."""
+    rows: dict[StatsKey, DailyStatsEntity] = {}
+    for bid in bids:
+        row = _row(rows, (stats_day(bid.created_at), bid.source_id, bid.cargo_type or ""))
+        row.bids += 1
+        if bid.price is not None:
+            row.price_sum += bid.price
+            row.price_count += 1
+    return list(rows.values())
+
+
+def from_raw_items(raw_items: Iterable[RawItemEntity]) -> list[DailyStatsEntity]:
+    """Приращения от нового сырья — в строку источника (cargo_type="")."""
+    rows: dict[StatsKey, DailyStatsEntity] = {}
+    for item in raw_items:
+        _row(rows, (stats_day(item.created_at), item.source_id, "")).raw_items += 1
+    return list(rows.values())
+
+
+def merge(deltas: Iterable[DailyStatsEntity]) -> list[DailyStatsEntity]:
+    """Складывает строки с одинаковым ключом (порядок — первого появления)."""
+    rows: dict[StatsKey, DailyStatsEntity] = {}
+    for delta in deltas:
+        row = _row(rows, stats_key(delta))
+        row.bids += delta.bids
+        row.duplicates += delta.duplicates
+        row.raw_items += delta.raw_items
+        row.errors += delta.errors
+        row.price_sum += delta.price_sum
+        row.price_count += delta.price_count
+    return list(rows.values())
+
+
+def validate_range(day_from: date, day_to: date) -> None:
+    if day_from > day_to:
+        raise ValueError(f"Empty day range: {day_from} > {day_to}")
+    if (day_to - day_from).days >= MAX_ROLLUP_DAYS:
+        raise ValueError(f"Day range must not exceed {MAX_ROLLUP_DAYS} days")
+
+
+def build_health_report(
+    day_from: date,
+    day_to: date,
+    sources: Sequence[SourceEntity],
+    stats: Iterable[DailyStatsEntity],
+) -> DailyHealthReport:
+    """
+    Отчёт за [day_from, day_to] по строкам агрегата.
+
+    В отчёт попадают все переданные источники (активные без единой строки —
+    «молчащие»), а также источники, у которых за период есть данные.
+    """
+    health: dict[int, SourceHealth] = {
+        s.id: SourceHealth(source_id=s.id, source_code=s.code) for s in sources if s.id is not None
+    }
+    price_sum: dict[int, float] = {}
+    price_count: dict[int, int] = {}
+    for row in stats:
+        if not day_from <= row.day <= day_to:
+            continue
+        item = health.get(row.source_id)
+        if item is None:
+            item = health[row.source_id] = SourceHealth(
+                source_id=row.source_id, source_code=str(row.source_id)
+            )
+        item.bids += row.bids
+        item.duplicates += row.duplicates
+        item.raw_items += row.raw_items
+        item.errors += row.errors
+        if row.bids:
+            item.cargo_types[row.cargo_type] = item.cargo_types.get(row.cargo_type, 0) + row.bids
+        price_sum[row.source_id] = price_sum.get(row.source_id, 0.0) + row.price_sum
+        price_count[row.source_id] = price_count.get(row.source_id, 0) + row.price_count
+
+    for source_id, count in price_count.items():
+        if count:
+            health[source_id].avg_price = price_sum[source_id] / count
+    return DailyHealthReport(
+        day_from=day_from,
+        day_to=day_to,
+        sources=sorted(health.values(), key=lambda s: s.source_code),
+    )
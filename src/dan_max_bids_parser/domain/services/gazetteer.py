@@ -0,0 +1,147 @@
+# path: src/dan_max_bids_parser/domain/services/gazetteer.py
+"""
+Доменный сервис Gazetteer: пункт погрузки/выгрузки -> код региона.
+
+Справочник — офлайн-файл configs/gazetteer_ru.tsv (регионы и города РФ,
+коды ISO 3166-2:RU, например RU-TVE). Все названия и их варианты
+компилируются в один автомат Ахо–Корасик над основами слов
+(text_matching), поэтому «Тверь», «г. Твери», «Тверская обл.» находятся
+за один проход по строке при любом размере справочника.
+
+Если в строке найдено несколько названий, побеждает:
+1) явно указанный регион («Химки, Тверская обл.» -> RU-TVE);
+2) более длинное название («Нижний Новгород», а не «Новгород»);
+3) название, встретившееся раньше.
+
+Строки пунктов сильно повторяются, поэтому resolve() кэшируется
+(ограниченный LRU на экземпляр, как в Normalizer).
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from importlib import resources
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+from dan_max_bids_parser.domain.entities import BidEntity
+from .text_matching import AhoCorasick, keyword_patterns, stem_tokens
+
+GAZETTEER_KINDS = ("region", "city")
+
+DEFAULT_GAZETTEER = "gazetteer_ru.tsv"
+
+# Регион важнее города: город может быть упомянут как ориентир
+_PRIORITY = {"region": 2, "city": 1}
+
+# Сокращения последнего слова названия региона
+_ABBREVIATIONS = {"область": ("обл",), "край": ("кр",)}
+
+
+def _variants(name: str) -> list[str]:
+    variants = [name]
+    head, _, last = name.rpartition(" ")
+    for short in _ABBREVIATIONS.get(last.lower(), ()) if head else ():
+        variants.append(f"{head} {short}")
+    return variants
+
+
+def parse_lines(lines: Iterable[str]) -> list[tuple[str, str, list[str]]]:
+    """
+    Строки справочника -> [(код, вид, названия)].
+
+    Формат: «код TAB вид TAB название|вариант|...»; пустые строки
+    и строки с # пропускаются.
+    """
+    entries = []
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split("\t")
+        if len(parts) != 3:
+            raise ValueError(f"gazetteer line {number}: expected 3 tab-separated fields")
+        code, kind, names = parts
+        if kind not in GAZETTEER_KINDS:
+            raise ValueError(f"gazetteer line {number}: unknown kind '{kind}'")
+        entries.append((code, kind, [name for name in names.split("|") if name]))
+    return entries
+
+
+class Gazetteer:
+    """
+    Справочник регионов.
+
+    Использование:
+        gazetteer = Gazetteer.load()
+        gazetteer.resolve("г. Тверь, ул. Складская")  # -> "RU-TVE"
+        gazetteer.fill_regions(bids)
+
+    :param entries: [(код региона, "region" | "city", названия)].
+    :param cache_size: размер LRU-кэша resolve().
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[tuple[str, str, Sequence[str]]],
+        cache_size: int = 8192,
+    ) -> None:
+        self._names: dict[str, str] = {}
+        automaton: AhoCorasick[tuple[str, int]] = AhoCorasick()
+        for code, kind, names in entries:
+            if kind == "region" and names:
+                self._names.setdefault(code, names[0])
+            for name in names:
+                for variant in _variants(name):
+                    for pattern in keyword_patterns(variant):
+                        automaton.add(pattern, (code, _PRIORITY[kind]))
+        self._automaton = automaton.build()
+        self._resolve_cached = lru_cache(maxsize=cache_size)(self._resolve)
+
+    @classmethod
+    def load(cls, path: Optional[str | Path] = None, cache_size: int = 8192) -> "Gazetteer":
+        """Справочник из файла; по умолчанию — встроенный gazetteer_ru.tsv."""
+        if path is None:
+            source = resources.files("dan_max_bids_parser.configs").joinpath(DEFAULT_GAZETTEER)
+            text = source.read_text(encoding="utf-8")
+        else:
+            text = Path(path).read_text(encoding="utf-8")
+        return cls(parse_lines(text.splitlines()), cache_size=cache_size)
+
+    def __len__(self) -> int:
+        """Число регионов справочника."""
+        return len(self._names)
+
+    def region_name(self, code: str) -> Optional[str]:
+        """Каноническое название региона по коду."""
+        return self._names.get(code)
+
+    def resolve(self, text: Optional[str]) -> Optional[str]:
+        """Код региона для строки пункта или None, если ничего не найдено."""
+        if not text:
+            return None
+        return self._resolve_cached(text)
+
+    def fill_regions(self, bids: Iterable[BidEntity]) -> None:
+        """Заполняет load_region / unload_region, если они ещё не заданы."""
+        resolve = self.resolve
+        for bid in bids:
+            if bid.load_region is None:
+                bid.load_region = resolve(bid.load_point)
+            if bid.unload_region is None:
+                bid.unload_region = resolve(bid.unload_point)
+
+    def cache_info(self) -> Any:
+        """Статистика LRU-кэша resolve() (для бенчмарков и отладки)."""
+        return self._resolve_cached.cache_info()
+
+    def _resolve(self, text: str) -> Optional[str]:
+        best: Optional[tuple[int, int, int]] = None
+        code: Optional[str] = None
+        for start, length, (match_code, priority) in self._automaton.iter_matches(
+            stem_tokens(text)
+        ):
+            key = (priority, length, -start)
+            if best is None or key > best:
+                best, code = key, match_code
+        return code
@@ -0,0 +1,443 @@
+# path: src/dan_max_bids_parser/domain/services/normalizer.py
+"""
+Доменный сервис Normalizer: приведение «сырых» строк заявки к типам BidEntity.
+
+Поддерживаемые форматы (примеры):
+- вес: "25 т", "25000 кг", "25,5 тонн", "200 ц";
+- цена: "45 000 руб", "1,5 млн руб", "45 т.р.", "$ 500", "2500 руб/т";
+- дата: "сегодня 14:30", "вчера в 9:05", "3 часа назад", "12.03.2025 10:00",
+  "12 марта 14:30", ISO 8601;
+- телефон: "8 (900) 123-45-67", "+7 900 123 45 67" -> "+79001234567".
+
+Все регулярные выражения компилируются один раз при импорте модуля,
+единицы измерения и валюты — в таблицах ниже. Повторяющиеся строки
+(одни и те же «25 т» встречаются тысячи раз) проходят через
+ограниченный LRU-кэш, поэтому регулярки на них не запускаются повторно.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+# --- Таблицы единиц и валют ---
+
+# Коэффициент перевода в тонны
+WEIGHT_UNITS: dict[str, float] = {
+    "т": 1.0,
+    "тн": 1.0,
+    "тонна": 1.0,
+    "тонны": 1.0,
+    "тонн": 1.0,
+    "t": 1.0,
+    "ц": 0.1,
+    "кг": 0.001,
+    "kg": 0.001,
+}
+
+# Множители сумм ("тыс", "млн" и т.п.)
+MULTIPLIERS: dict[str, float] = {
+    "тыс": 1_000.0,
+    "т": 1_000.0,  # "45 т.р." — тысяч рублей
+    "к": 1_000.0,
+    "k": 1_000.0,
+    "млн": 1_000_000.0,
+    "м": 1_000_000.0,
+}
+
+# Обозначение валюты -> ISO-код
+CURRENCIES: dict[str, str] = {
+    "руб": "RUB",
+    "р": "RUB",
+    "₽": "RUB",
+    "rub": "RUB",
+    "$": "USD",
+    "usd": "USD",
+    "€": "EUR",
+    "eur": "EUR",
+    "тг": "KZT",
+    "kzt": "KZT",
+}
+
+MONTHS: dict[str, int] = {
+    "янв": 1, "фев": 2, "мар": 3, "апр": 4, "май": 5, "мая": 5,
+    "июн": 6, "июл": 7, "авг": 8, "сен": 9, "окт": 10, "ноя": 11, "дек": 12,
+}
+
+RELATIVE_DAYS: dict[str, int] = {"сегодня": 0, "вчера": -1, "позавчера": -2}
+
+RELATIVE_UNITS: dict[str, timedelta] = {
+    "мин": timedelta(minutes=1),
+    "час": timedelta(hours=1),
+    "дн": timedelta(days=1),
+    "ден": timedelta(days=1),
+}
+
+# Значения цены, означающие «цены нет»
+_NO_PRICE_WORDS = ("договор", "запрос", "торг")
+
+# --- Предкомпилированные регулярные выражения ---
+
+_NUM = r"(?P<num>\d{1,3}(?:[ \u00a0\u202f]\d{3})+(?:[.,]\d+)?|\d+(?:[.,]\d+)?)"
+
+_WEIGHT_RE = re.compile(
+    _NUM + r"\s*(?P<unit>тонн[аы]?|тн|т|ц|кг|kg|t)(?![а-яa-z]|\.?\s*р\b)",
+    re.IGNORECASE,
+)
+
+_PRICE_RE = re.compile(
+    r"(?P<pre>[$€₽])?\s*"
+    + _NUM
+    + r"\s*(?P<mult>тыс|млн|т(?=\.?\s*р)|к|k|м(?=\.?\s*р))?\.?\s*"
+    r"(?P<cur>руб[а-я]*|rub|usd|eur|kzt|тг|р(?![а-я])|₽|\$|€)?\.?"
+    r"(?P<per>\s*(?:/|за)\s*(?:т|тонну|тн)(?![а-яa-z]))?",
+    re.IGNORECASE,
+)
+
+_ISO_RE = re.compile(r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2})?)?")
+
+_REL_DAY_RE = re.compile(
+    r"(?P<day>позавчера|вчера|сегодня)(?:,?\s*(?:в\s*)?(?P<h>\d{1,2})[:.](?P<m>\d{2}))?",
+    re.IGNORECASE,
+)
+
+_REL_AGO_RE = re.compile(
+    r"(?P<n>\d+)?\s*(?P<unit>мин|час|дн|ден)[а-я]*\.?\s+назад",
+    re.IGNORECASE,
+)
+
+_NUMERIC_DATE_RE = re.compile(
+    r"(?P<d>\d{1,2})\.(?P<mo>\d{1,2})(?:\.(?P<y>\d{2,4}))?"
+    r"(?:,?\s*(?:в\s*)?(?P<h>\d{1,2}):(?P<m>\d{2}))?"
+)
+
+_TEXT_DATE_RE = re.compile(
+    r"(?P<d>\d{1,2})\s+(?P<mon>[а-я]{3,})\.?(?:\s+(?P<y>\d{4}))?"
+    r"(?:,?\s*(?:в\s*)?(?P<h>\d{1,2}):(?P<m>\d{2}))?",
+    re.IGNORECASE,
+)
+
+_PHONE_RE = re.compile(r"(?:\+?\d[\d\s()\- ]{8,}\d)")
+_NON_DIGITS_RE = re.compile(r"\D+")
+
+# Максимальная длина free-text, в котором ищем вес/цену/телефон.
+# Длинные описания (целые HTML-страницы) не сканируем.
+_MAX_SCAN_LENGTH = 4000
+
+# Длина колонки contact_phone в БД
+_CONTACT_MAX_LENGTH = 64
+
+
+def _to_float(num: str) -> float:
+    cleaned = num.replace(" ", "").replace("\u00a0", "").replace("\u202f", "")
+    return float(cleaned.replace(",", "."))
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedPrice:
+    """Результат разбора цены (до привязки к весу)."""
+
+    amount: float
+    currency: Optional[str]
+    per_ton: bool = False
+
+
+# Спецификация даты, не зависящая от «сейчас» — её и кэшируем.
+# ("iso", datetime) | ("day", offset, h, m) | ("ago", timedelta)
+# | ("dm", day, month, year, h, m)
+_DateSpec = tuple
+
+
+class Normalizer:
+    """
+    Нормализатор полей заявки.
+
+    Вход — словарь полей от парсера (ключи как в BidEntity, значения-строки),
+    выход — словарь, готовый для BidEntity: weight_tons/price — float,
+    currency — ISO-код, published_at — naive UTC datetime, contact — телефон
+    в формате +7XXXXXXXXXX (если найден).
+
+    :param clock: источник текущего времени (naive UTC), для тестов.
+    :param source_utc_offset: смещение времени площадок относительно UTC
+        (по умолчанию МСК, +3 ч) — «сегодня 14:30» трактуется как местное время.
+    :param cache_size: размер LRU-кэша на каждый тип полей.
+    :param default_currency: валюта для «голой» цены без обозначения.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], datetime] = datetime.utcnow,
+        source_utc_offset: timedelta = timedelta(hours=3),
+        cache_size: int = 8192,
+        default_currency: str = "RUB",
+    ) -> None:
+        self._clock = clock
+        self._offset = source_utc_offset
+        self._default_currency = default_currency
+
+        self._weight_cached = lru_cache(maxsize=cache_size)(self._parse_weight)
+        self._price_cached = lru_cache(maxsize=cache_size)(self._parse_price)
+        self._date_spec_cached = lru_cache(maxsize=cache_size)(self._parse_date_spec)
+        self._phone_cached = lru_cache(maxsize=cache_size)(self._parse_phone)
+
+    # --- Публичный API по отдельным полям ---
+
+    def weight_tons(self, text: Optional[str]) -> Optional[float]:
+        if not text:
+            return None
+        return self._weight_cached(text)
+
+    def price(self, text: Optional[str]) -> Optional[ParsedPrice]:
+        if not text:
+            return None
+        return self._price_cached(text)
+
+    def published_at(
+        self,
+        text: Optional[str],
+        now: Optional[datetime] = None,
+    ) -> Optional[datetime]:
+        if not text:
+            return None
+        spec = self._date_spec_cached(text)
+        if spec is None:
+            return None
+        return self._resolve_date(spec, now or self._clock())
+
+    def phone(self, text: Optional[str]) -> Optional[str]:
+        if not text:
+            return None
+        return self._phone_cached(text)
+
+    # --- Пакетный API ---
+
+    def normalize(
+        self,
+        fields: Mapping[str, Any],
+        now: Optional[datetime] = None,
+    ) -> dict[str, Any]:
+        """
+        Нормализует один словарь полей.
+
+        Текстовые поля копируются как есть; weight_tons, price, currency,
+        published_at и contact приводятся к типам BidEntity. Если веса,
+        цены или телефона нет в отдельных полях, они ищутся в description
+        (актуально для текстов Telegram).
+        """
+        result = dict(fields)
+        if now is None:
+            now = self._clock()
+
+        description = fields.get("description")
+        scan_text = (
+            description
+            if isinstance(description, str) and len(description) <= _MAX_SCAN_LENGTH
+            else None
+        )
+
+        weight = self._typed_or_parsed(fields.get("weight_tons"), self.weight_tons)
+        if weight is None and scan_text:
+            weight = self._parse_weight(scan_text)
+        result["weight_tons"] = weight
+
+        raw_price = fields.get("price")
+        price: Optional[float] = None
+        currency = fields.get("currency") if isinstance(fields.get("currency"), str) else None
+        if isinstance(raw_price, (int, float)):
+            price = float(raw_price)
+        else:
+            parsed = self.price(raw_price)
+            if parsed is None and scan_text:
+                parsed = self._parse_price(scan_text, require_currency=True)
+            if parsed is not None:
+                price = parsed.amount
+                if parsed.per_ton:
+                    # Ставка за тонну -> итоговая цена, если вес известен
+                    price = price * weight if weight is not None else None
+                currency = currency or parsed.currency or self._default_currency
+        result["price"] = price
+        result["currency"] = currency if price is not None else None
+
+        raw_date = fields.get("published_at")
+        if isinstance(raw_date, datetime):
+            result["published_at"] = raw_date
+        else:
+            result["published_at"] = self.published_at(raw_date, now)
+
+        contact = fields.get("contact")
+        phone = self.phone(contact) if isinstance(contact, str) else None
+        if phone is None and not contact and scan_text:
+            phone = self._parse_phone(scan_text)
+        if phone is not None:
+            result["contact"] = phone
+        elif isinstance(contact, str):
+            result["contact"] = contact.strip()[:_CONTACT_MAX_LENGTH] or None
+
+        return result
+
+    def normalize_many(
+        self,
+        records: Iterable[Mapping[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """
+        Пакетная нормализация: «сейчас» берётся один раз на весь пакет,
+        чтобы относительные даты внутри пакета были согласованы.
+        """
+        now = self._clock()
+        normalize = self.normalize
+        return [normalize(fields, now) for fields in records]
+
+    def cache_info(self) -> dict[str, Any]:
+        """Статистика LRU-кэшей (для бенчмарков и отладки)."""
+        return {
+            "weight": self._weight_cached.cache_info(),
+            "price": self._price_cached.cache_info(),
+            "date": self._date_spec_cached.cache_info(),
+            "phone": self._phone_cached.cache_info(),
+        }
+
+    # --- Разбор (без кэша) ---
+
+    @staticmethod
+    def _typed_or_parsed(value: Any, parse: Callable[[str], Optional[float]]) -> Optional[float]:
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            return parse(value)
+        return None
+
+    @staticmethod
+    def _parse_weight(text: str) -> Optional[float]:
+        match = _WEIGHT_RE.search(text)
+        if match is None:
+            return None
+        factor = WEIGHT_UNITS[match.group("unit").lower()]
+        return round(_to_float(match.group("num")) * factor, 3)
+
+    @staticmethod
+    def _parse_price(text: str, require_currency: bool = False) -> Optional[ParsedPrice]:
+        lowered = text.lower()
+        if any(word in lowered for word in _NO_PRICE_WORDS):
+            return None
+
+        for match in _PRICE_RE.finditer(lowered):
+            cur_token = match.group("pre") or match.group("cur")
+            if require_currency and cur_token is None:
+                continue
+
+            amount = _to_float(match.group("num"))
+            mult = match.group("mult")
+            if mult:
+                amount *= MULTIPLIERS[mult]
+            if cur_token and cur_token.startswith("руб"):
+                cur_token = "руб"
+            currency = CURRENCIES.get(cur_token) if cur_token else None
+            return ParsedPrice(
+                amount=round(amount, 2),
+                currency=currency,
+                per_ton=match.group("per") is not None,
+            )
+        return None
+
+    @staticmethod
+    def _parse_date_spec(text: str) -> Optional[_DateSpec]:
+        text = text.strip()
+
+        if _ISO_RE.match(text):
+            try:
+                return ("iso", datetime.fromisoformat(text))
+            except ValueError:
+                pass
+
+        match = _REL_DAY_RE.search(text)
+        if match is not None:
+            hour = int(match.group("h")) if match.group("h") else None
+            minute = int(match.group("m")) if match.group("m") else None
+            return ("day", RELATIVE_DAYS[match.group("day").lower()], hour, minute)
+
+        match = _REL_AGO_RE.search(text)
+        if match is not None:
+            count = int(match.group("n") or 1)
+            return ("ago", RELATIVE_UNITS[match.group("unit").lower()] * count)
+
+        match = _NUMERIC_DATE_RE.search(text)
+        if match is not None:
+            year = match.group("y")
+            if year is not None and len(year) == 2:
+                year = "20" + year
+            return (
+                "dm",
+                int(match.group("d")),
+                int(match.group("mo")),
+                int(year) if year else None,
+                int(match.group("h")) if match.group("h") else 0,
+                int(match.group("m")) if match.group("m") else 0,
+            )
+
+        match = _TEXT_DATE_RE.search(text)
+        if match is not None:
+            month = MONTHS.get(match.group("mon").lower()[:3])
+            if month is not None:
+                return (
+                    "dm",
+                    int(match.group("d")),
+                    month,
+                    int(match.group("y")) if match.group("y") else None,
+                    int(match.group("h")) if match.group("h") else 0,
+                    int(match.group("m")) if match.group("m") else 0,
+                )
+
+        return None
+
+    def _resolve_date(self, spec: _DateSpec, now: datetime) -> Optional[datetime]:
+        """Переводит спецификацию даты в naive UTC относительно now (UTC)."""
+        kind = spec[0]
+
+        if kind == "iso":
+            value: datetime = spec[1]
+            if value.tzinfo is not None:
+                return (value - value.utcoffset()).replace(tzinfo=None)
+            return value - self._offset
+
+        if kind == "ago":
+            return now - spec[1]
+
+        local_now = now + self._offset
+
+        if kind == "day":
+            _, offset, hour, minute = spec
+            day = local_now + timedelta(days=offset)
+            if hour is None:
+                local = day.replace(hour=0, minute=0, second=0, microsecond=0)
+            else:
+                try:
+                    local = day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+                except ValueError:
+                    return None
+            return local - self._offset
+
+        # "dm": день/месяц[/год] [часы:минуты]
+        _, day, month, year, hour, minute = spec
+        try:
+            local = datetime(year or local_now.year, month, day, hour, minute)
+        except ValueError:
+            return None
+        if year is None and local > local_now + timedelta(days=1):
+            # "31 декабря" в январе — это прошлый год
+            local = local.replace(year=local.year - 1)
+        return local - self._offset
+
+    @staticmethod
+    def _parse_phone(text: str) -> Optional[str]:
+        for match in _PHONE_RE.finditer(text):
+            digits = _NON_DIGITS_RE.sub("", match.group(0))
+            if len(digits) == 11 and digits[0] in "78":
+                return "+7" + digits[1:]
+            if len(digits) == 10 and digits[0] == "9":
+                return "+7" + digits
+            if 11 <= len(digits) <= 15 and match.group(0).lstrip().startswith("+"):
+                return "+" + digits
+        return None
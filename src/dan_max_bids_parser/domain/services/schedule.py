@@ -0,0 +1,232 @@
+# path: src/dan_max_bids_parser/domain/services/schedule.py
+"""
+Расписания сбора из config_schedule: cron/интервал, джиттер и политика
+пропусков (misfire).
+
+Одна запись config_schedule — одно расписание источника:
+
+    {"source": "ATI", "cron": "*/15 6-22 * * 1-5", "timezone": "Europe/Moscow"}
+    {"source": "TG", "interval_seconds": 600, "jitter_seconds": 30}
+    {"cron": "@hourly", "misfire": "skip", "misfire_grace_seconds": 120,
+     "max_instances": 1}
+
+source — код источника (по умолчанию — code записи). cron — 5 полей
+(минута, час, день месяца, месяц, день недели; *, списки, диапазоны,
+шаг, имена jan..dec / sun..sat) или @hourly / @daily / @weekly / @monthly.
+Если ограничены и день месяца, и день недели, срабатывает любое из них
+(как в Vixie cron).
+
+misfire — что делать с запуском, опоздавшим больше чем на
+misfire_grace_seconds (процесс стоял, пул был занят, источник ещё
+собирался): "run_once" — выполнить один раз и продолжить по расписанию
+от текущего момента (пропущенные слоты схлопываются), "skip" —
+пропустить. max_instances — сколько запусков источника может идти
+одновременно.
+
+Все моменты — наивные datetime в UTC (как datetime.utcnow); cron
+вычисляется в timezone записи (по умолчанию UTC).
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from dan_max_bids_parser.domain.entities import ConfigEntryEntity
+
+MISFIRE_POLICIES = ("run_once", "skip")
+
+_MACROS = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+_MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+_WEEKDAYS = ("sun", "mon", "tue", "wed", "thu", "fri", "sat")
+
+# (минимум, максимум, имена) полей cron по порядку
+_FIELDS = (
+    (0, 59, ()),
+    (0, 23, ()),
+    (1, 31, ()),
+    (1, 12, _MONTHS),
+    (0, 7, _WEEKDAYS),  # 0 и 7 — воскресенье
+)
+
+# Дальше четырёх лет совпадение есть всегда (29 февраля) — или его нет вовсе
+_MAX_SEARCH_DAYS = 366 * 4 + 1
+
+
+def _parse_value(token: str, names: tuple[str, ...], low: int) -> int:
+    lowered = token.lower()
+    if lowered in names:
+        return names.index(lowered) + low
+    return int(token)
+
+
+def _parse_field(text: str, low: int, high: int, names: tuple[str, ...]) -> tuple[frozenset[int], bool]:
+    """Поле cron -> (множество значений, ограничено ли поле)."""
+    values: set[int] = set()
+    for part in text.split(","):
+        base, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if step < 1:
+            raise ValueError(f"cron step must be positive: {part!r}")
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start_text, end_text = base.split("-", 1)
+            start, end = _parse_value(start_text, names, low), _parse_value(end_text, names, low)
+            if names is _WEEKDAYS and end == 0 < start:
+                # sun в конце диапазона — это 7: mon-sun, sat-sun (7 потом сводится к 0)
+                end = 7
+        else:
+            start = _parse_value(base, names, low)
+            end = high if step_text else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"cron value out of range {low}-{high}: {part!r}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values), text != "*"
+
+
+@dataclass(frozen=True, slots=True)
+class CronExpression:
+    """Разобранное cron-выражение; next_after() — ближайшее срабатывание."""
+
+    text: str
+    minutes: tuple[int, ...]
+    hours: tuple[int, ...]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]  # 0 — воскресенье
+    days_restricted: bool
+    weekdays_restricted: bool
+
+    @classmethod
+    def parse(cls, text: str) -> "CronExpression":
+        expression = _MACROS.get(text.strip().lower(), text)
+        parts = expression.split()
+        if len(parts) != len(_FIELDS):
+            raise ValueError(f"cron expression must have 5 fields: {text!r}")
+        try:
+            parsed = [_parse_field(p, *spec) for p, spec in zip(parts, _FIELDS)]
+        except ValueError as exc:
+            raise ValueError(f"Invalid cron expression {text!r}: {exc}") from None
+        (minutes, _), (hours, _), (days, days_restricted), (months, _), (weekdays, wd_restricted) = (
+            parsed
+        )
+        return cls(
+            text=text,
+            minutes=tuple(sorted(minutes)),
+            hours=tuple(sorted(hours)),
+            days=days,
+            months=months,
+            weekdays=frozenset(d % 7 for d in weekdays),
+            days_restricted=days_restricted,
+            weekdays_restricted=wd_restricted,
+        )
+
+    def matches_day(self, day: date) -> bool:
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    def next_after(self, moment: datetime) -> datetime:
+        """Первая минута расписания строго после moment (наивное время)."""
+        start = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.date()
+        for offset in range(_MAX_SEARCH_DAYS):
+            if self.matches_day(day):
+                first_day = offset == 0
+                for hour in self.hours:
+                    if first_day and hour < start.hour:
+                        continue
+                    for minute in self.minutes:
+                        if first_day and hour == start.hour and minute < start.minute:
+                            continue
+                        return datetime.combine(day, time(hour, minute))
+            day += timedelta(days=1)
+        raise ValueError(f"cron expression {self.text!r} never fires")
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleSpec:
+    """Расписание одного источника (запись config_schedule)."""
+
+    code: str
+    source_code: str
+    cron: Optional[CronExpression] = None
+    interval: Optional[timedelta] = None
+    timezone: str = "UTC"
+    jitter_seconds: float = 0.0
+    misfire: str = "run_once"
+    misfire_grace: timedelta = timedelta(minutes=5)
+    max_instances: int = 1
+    version: str = ""
+
+    def next_fire(self, after: datetime) -> datetime:
+        """Номинальное (без джиттера) срабатывание строго после after, UTC."""
+        if self.interval is not None:
+            return after + self.interval
+        assert self.cron is not None
+        if self.timezone == "UTC":
+            return self.cron.next_after(after)
+        zone = ZoneInfo(self.timezone)
+        local = after.replace(tzinfo=timezone.utc).astimezone(zone).replace(tzinfo=None)
+        fire = self.cron.next_after(local).replace(tzinfo=zone)
+        return fire.astimezone(timezone.utc).replace(tzinfo=None)
+
+    def jittered(self, nominal: datetime, rng: random.Random) -> datetime:
+        """Момент запуска: номинал плюс случайная задержка [0, jitter_seconds]."""
+        if not self.jitter_seconds:
+            return nominal
+        return nominal + timedelta(seconds=rng.uniform(0, self.jitter_seconds))
+
+
+def parse_schedule(entry: ConfigEntryEntity) -> ScheduleSpec:
+    """Запись config_schedule -> ScheduleSpec; ValueError на некорректных данных."""
+    data = entry.data
+    has_cron, has_interval = "cron" in data, "interval_seconds" in data
+    if has_cron == has_interval:
+        raise ValueError(f"config_schedule '{entry.code}': exactly one of cron / interval_seconds")
+
+    interval = None
+    if has_interval:
+        seconds = float(data["interval_seconds"])
+        if seconds <= 0:
+            raise ValueError(f"config_schedule '{entry.code}': interval_seconds must be positive")
+        interval = timedelta(seconds=seconds)
+
+    tz_name = str(data.get("timezone", "UTC"))
+    try:
+        ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"config_schedule '{entry.code}': unknown timezone {tz_name!r}") from None
+
+    misfire = str(data.get("misfire", "run_once"))
+    if misfire not in MISFIRE_POLICIES:
+        raise ValueError(f"config_schedule '{entry.code}': unknown misfire policy {misfire!r}")
+    max_instances = int(data.get("max_instances", 1))
+    if max_instances < 1:
+        raise ValueError(f"config_schedule '{entry.code}': max_instances must be positive")
+
+    return ScheduleSpec(
+        code=entry.code,
+        source_code=str(data.get("source", entry.code)),
+        cron=CronExpression.parse(str(data["cron"])) if has_cron else None,
+        interval=interval,
+        timezone=tz_name,
+        jitter_seconds=max(0.0, float(data.get("jitter_seconds", 0))),
+        misfire=misfire,
+        misfire_grace=timedelta(seconds=float(data.get("misfire_grace_seconds", 300))),
+        max_instances=max_instances,
+        version=entry.version,
+    )
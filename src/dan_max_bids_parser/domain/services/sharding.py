@@ -0,0 +1,142 @@
+# path: src/dan_max_bids_parser/domain/services/sharding.py
+"""
+Распределение источников между узлами-воркерами: согласованное
+хеширование с ограниченной нагрузкой (consistent hashing with bounded
+loads) и весами.
+
+- Кольцо: у каждого узла vnodes × capacity виртуальных точек; источник
+  принадлежит первому узлу по часовой стрелке от хеша своего кода.
+  При уходе или появлении одного из N узлов переезжает ~1/N источников.
+- Стоимость: у источника есть вес (средняя длительность запуска), и
+  узел не берёт больше load_factor × (его доля мощности) × (сумма весов).
+  Источник, упёршийся в предел узла, идёт к следующему узлу на кольце —
+  дорогие источники не скапливаются на одном узле.
+
+Результат детерминирован: все узлы, видя один состав и одни веса,
+получают одно и то же распределение без координации. Веса стоит
+огрублять (quantize_costs): тогда небольшое расхождение во входных
+длительностях между узлами не меняет распределения.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import math
+import statistics
+from collections.abc import Iterator, Mapping, Sequence
+
+from dan_max_bids_parser.domain.entities import SourceEntity
+
+DEFAULT_VNODES = 64
+DEFAULT_LOAD_FACTOR = 1.25
+# Ступеней веса на удвоение: 2 — шаг ~41%
+DEFAULT_COST_STEPS = 2
+
+
+def ring_hash(key: str) -> int:
+    """Стабильный между процессами 64-битный хеш (hash() рандомизирован)."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Кольцо узлов; nodes — {node_id: мощность}."""
+
+    def __init__(self, nodes: Mapping[str, float], vnodes: int = DEFAULT_VNODES) -> None:
+        if not nodes:
+            raise ValueError("Hash ring needs at least one node")
+        points = []
+        for node_id, capacity in nodes.items():
+            if capacity <= 0:
+                raise ValueError(f"Node {node_id!r}: capacity must be positive")
+            for replica in range(max(1, round(vnodes * capacity))):
+                points.append((ring_hash(f"{node_id}#{replica}"), node_id))
+        points.sort()
+        self._hashes = [h for h, _ in points]
+        self._nodes = [node for _, node in points]
+        self._count = len(nodes)
+
+    def walk(self, key: str) -> Iterator[str]:
+        """Узлы по часовой стрелке от хеша key, каждый по одному разу."""
+        start = bisect.bisect(self._hashes, ring_hash(key))
+        seen: set[str] = set()
+        size = len(self._nodes)
+        for offset in range(size):
+            node = self._nodes[(start + offset) % size]
+            if node not in seen:
+                seen.add(node)
+                yield node
+                if len(seen) == self._count:
+                    return
+
+    def node_for(self, key: str) -> str:
+        return next(self.walk(key))
+
+
+def assign(
+    costs: Mapping[str, float],
+    nodes: Mapping[str, float],
+    load_factor: float = DEFAULT_LOAD_FACTOR,
+    vnodes: int = DEFAULT_VNODES,
+) -> dict[str, str]:
+    """
+    {код источника: node_id}.
+
+    :param costs: {код источника: вес > 0}.
+    :param nodes: {node_id: мощность > 0}.
+    :param load_factor: допустимый перекос нагрузки узла относительно
+        его справедливой доли (>= 1; чем больше, тем меньше переездов
+        и тем сильнее перекос).
+    """
+    if load_factor < 1:
+        raise ValueError("load_factor must be >= 1")
+    if not costs:
+        return {}
+    ring = HashRing(nodes, vnodes)
+    total_cost = sum(costs.values())
+    total_capacity = sum(nodes.values())
+    heaviest = max(costs.values())
+    # Предел не меньше самого дорогого источника — иначе он не влезет никуда
+    limits = {
+        node_id: max(load_factor * total_cost * capacity / total_capacity, heaviest)
+        for node_id, capacity in nodes.items()
+    }
+    loads = dict.fromkeys(nodes, 0.0)
+
+    result: dict[str, str] = {}
+    # Порядок по коду (а не по весу): изменение весов двигает только то,
+    # что упёрлось в пределы
+    for code in sorted(costs):
+        cost = costs[code]
+        owner = next((n for n in ring.walk(code) if loads[n] + cost <= limits[n]), None)
+        if owner is None:
+            owner = min(nodes, key=lambda n: (loads[n] / nodes[n], n))
+        loads[owner] += cost
+        result[code] = owner
+    return result
+
+
+def source_costs(
+    sources: Sequence[SourceEntity],
+    durations: Mapping[int, float],
+    minimum: float = 0.1,
+) -> dict[str, float]:
+    """
+    Веса источников по средней длительности запуска (сек); у источников
+    без истории — медиана известных (или 1, если истории нет ни у кого).
+    """
+    known = [max(d, minimum) for d in durations.values()]
+    default = statistics.median(known) if known else 1.0
+    return {
+        s.code: max(durations[s.id], minimum) if s.id in durations else default for s in sources
+    }
+
+
+def quantize_costs(costs: Mapping[str, float], steps: int = DEFAULT_COST_STEPS) -> dict[str, float]:
+    """
+    Веса, округлённые до ступеней 2 ** (k / steps): длительности,
+    отличающиеся на проценты, дают один и тот же вес.
+    """
+    if steps < 1:
+        raise ValueError("steps must be positive")
+    return {code: 2 ** (round(math.log2(cost) * steps) / steps) for code, cost in costs.items()}
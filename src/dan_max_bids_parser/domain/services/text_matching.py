@@ -0,0 +1,202 @@
+# path: src/dan_max_bids_parser/domain/services/text_matching.py
+"""
+Общие примитивы поиска ключевых слов в тексте заявок.
+
+- tokenize() — разбиение текста на слова (нижний регистр, ё -> е);
+- stem() — лёгкий стеммер существительных и прилагательных (по мотивам
+  Snowball) с «беглыми» гласными: песок/песка, щебень/щебня сводятся
+  к одной основе;
+- keyword_patterns() — шаблоны ключевой фразы (основы и исходная форма);
+- AhoCorasick — автомат Ахо–Корасик над последовательностью основ слов.
+
+Автомат работает по словам, а не по символам: и ключевые слова,
+и текст приводятся к последовательности основ, после чего весь словарь
+(тысячи фраз) проверяется за один проход по тексту.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Generic, Hashable, Iterable, Iterator, Sequence, TypeVar
+
+T = TypeVar("T")
+
+_TOKEN_RE = re.compile(r"[а-яa-z0-9]+")
+
+_VOWELS = frozenset("аеиоуыэюя")
+
+# --- Окончания (по мотивам Snowball Russian) ---
+#
+# Словари грузов и транспорта состоят из существительных и прилагательных,
+# поэтому глагольные шаги Snowball (деепричастия, возвратные и глагольные
+# окончания) не применяются: на существительных они дают ложные срезы
+# («самосвал» -> «самосва», «смесь» -> «сме»).
+
+_ADJECTIVE = (
+    "ими", "ыми", "его", "ого", "ему", "ому", "ее", "ие", "ые", "ое", "ей", "ий",
+    "ый", "ой", "ем", "им", "ым", "ом", "их", "ых", "ую", "юю", "ая", "яя", "ою", "ею",
+)
+_NOUN = (
+    "иями", "ями", "ами", "ией", "иям", "ием", "иях", "ев", "ов", "ие", "ье", "еи",
+    "ии", "ей", "ой", "ий", "ям", "ем", "ам", "ом", "ах", "ях", "ию", "ью", "ия",
+    "ья", "а", "е", "и", "й", "о", "у", "ы", "ь", "ю", "я",
+)
+# «-ев»/«-ов» срезаем только у длинных слов: «грузов» -> «груз», но «отсев» — основа
+_SHORT_WORD_KEEP = frozenset(("ев", "ов"))
+_SUPERLATIVE = ("ейше", "ейш")
+
+# Согласные, перед которыми гласная бывает «беглой»: песок/песка, камень/камня
+_FLEETING_BEFORE = frozenset("кнлцр")
+
+
+def _strip(word: str, rv_start: int, endings: Sequence[str]) -> str | None:
+    """Удаляет первое подходящее окончание внутри RV или возвращает None."""
+    for ending in endings:
+        if not word.endswith(ending):
+            continue
+        cut = len(word) - len(ending)
+        if cut < rv_start:
+            continue
+        if ending in _SHORT_WORD_KEEP and len(word) < 6:
+            continue
+        return word[:cut]
+    return None
+
+
+def _stem_uncached(word: str) -> str:
+    if len(word) <= 2 or not word.isalpha():
+        return word
+
+    # RV — часть слова после первой гласной
+    rv_start = next((i + 1 for i, ch in enumerate(word) if ch in _VOWELS), len(word))
+
+    word = _strip(word, rv_start, _ADJECTIVE) or _strip(word, rv_start, _NOUN) or word
+
+    if word.endswith("и") and len(word) - 1 >= rv_start:
+        word = word[:-1]
+
+    word = _strip(word, rv_start, _SUPERLATIVE) or word
+    if word.endswith("нн"):
+        word = word[:-1]
+    elif word.endswith("ь") and len(word) - 1 >= rv_start:
+        word = word[:-1]
+
+    # Беглая гласная: «песок» -> «песк», «щебен» -> «щебн»
+    if len(word) >= 4 and word[-2] in "ое" and word[-1] in _FLEETING_BEFORE:
+        word = word[:-2] + word[-1]
+
+    return word
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Основа слова. Кэшируется: словарь заявок невелик и сильно повторяется.
+    """
+    return _stem_uncached(word)
+
+
+def tokenize(text: str) -> list[str]:
+    """Слова текста в нижнем регистре, «ё» заменена на «е»."""
+    return _TOKEN_RE.findall(text.lower().replace("ё", "е"))
+
+
+def stem_tokens(text: str) -> list[str]:
+    """Последовательность основ слов текста."""
+    return [stem(token) for token in tokenize(text)]
+
+
+def keyword_patterns(phrase: str) -> list[list[str]]:
+    """
+    Шаблоны ключевой фразы для AhoCorasick.
+
+    Помимо основ добавляется и исходная форма слов: у существительных
+    мужского рода на согласный именительный падеж совпадает с основой
+    косвенных («металлолом» -> «металлол», но «металлолома» -> «металлолом»).
+    """
+    stems = stem_tokens(phrase)
+    if not stems:
+        return []
+    tokens = tokenize(phrase)
+    return [stems] if tokens == stems else [stems, tokens]
+
+
+class AhoCorasick(Generic[T]):
+    """
+    Автомат Ахо–Корасик над последовательностями хешируемых символов
+    (в нашем случае — основ слов).
+
+    Использование:
+        automaton = AhoCorasick()
+        automaton.add(["гранитн", "щебн"], "щебень")
+        automaton.build()
+        for start, length, value in automaton.iter_matches(stem_tokens(text)): ...
+    """
+
+    __slots__ = ("_goto", "_fail", "_out", "_built")
+
+    def __init__(self) -> None:
+        self._goto: list[dict[Hashable, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[tuple[int, T], ...]] = [()]
+        self._built = False
+
+    def __len__(self) -> int:
+        """Число состояний автомата."""
+        return len(self._goto)
+
+    def add(self, pattern: Sequence[Hashable], value: T) -> None:
+        """Добавляет шаблон (непустую последовательность символов)."""
+        if self._built:
+            raise RuntimeError("AhoCorasick automaton is already built")
+        if not pattern:
+            return
+
+        state = 0
+        for symbol in pattern:
+            nxt = self._goto[state].get(symbol)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][symbol] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = self._out[state] + ((len(pattern), value),)
+
+    def build(self) -> "AhoCorasick[T]":
+        """Строит fail-ссылки (BFS) и объединяет выходы по ним."""
+        queue: list[int] = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for symbol, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and symbol not in self._goto[fail]:
+                    fail = self._fail[fail]
+                candidate = self._goto[fail].get(symbol, 0)
+                self._fail[nxt] = candidate if candidate != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+        return self
+
+    def iter_matches(self, sequence: Iterable[Hashable]) -> Iterator[tuple[int, int, T]]:
+        """
+        Все вхождения шаблонов: (позиция начала, длина шаблона, значение).
+
+        Один проход по sequence независимо от количества шаблонов.
+        """
+        if not self._built:
+            raise RuntimeError("AhoCorasick automaton is not built")
+
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, symbol in enumerate(sequence):
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+            for length, value in out[state]:
+                yield index - length + 1, length, value
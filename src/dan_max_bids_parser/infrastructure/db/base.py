@@ -4,7 +4,9 @@
 
 - определение Base для ORM-моделей;
 - фабрика движка на основе DATABASE_URL;
-- SessionFactory для работы с БД.
+- SessionFactory для работы с БД;
+- учёт SQL-запросов: счётчики в пределах логической операции
+  (query_scope), детектор N+1 и журнал медленных запросов.
 
 Логика:
 1. DATABASE_URL читается из переменной окружения;
@@ -16,10 +18,16 @@ from __future__ import annotations
 
 import logging
 import os
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
@@ -92,8 +100,120 @@ def create_engine_from_env() -> Engine:
     return engine
 
 
+# --- Учёт SQL-запросов ---
+
+
+@dataclass
+class QueryStats:
+    """
+    Статистика запросов одной логической операции.
+
+    rows — строки, затронутые DML (для SELECT драйверы обычно отдают -1,
+    такие запросы в rows не учитываются); пакетный INSERT — по числу
+    строк пакета; executemany — один запрос (страница insertmanyvalues —
+    тоже один).
+    """
+
+    name: str
+    statements: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    by_statement: Counter[str] = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Запросы, выполненные не меньше threshold раз (кандидаты в N+1)."""
+        return [(sql, n) for sql, n in self.by_statement.most_common() if n >= threshold]
+
+
+_active_scopes: ContextVar[tuple[QueryStats, ...]] = ContextVar("_active_scopes", default=())
+
+_slow_query_seconds: float = float(os.getenv("SQL_SLOW_QUERY_MS", "500")) / 1000
+
+# Повторов одного запроса в операции, после которых пишем предупреждение
+N_PLUS_ONE_THRESHOLD = 20
+
+
+def set_slow_query_threshold(milliseconds: Optional[float]) -> None:
+    """Порог журнала медленных запросов; None или 0 — журнал выключен."""
+    global _slow_query_seconds
+    _slow_query_seconds = (milliseconds or 0) / 1000
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["_query_started"].pop()
+    if _slow_query_seconds and elapsed >= _slow_query_seconds:
+        logger.warning(
+            "Slow query (%.1f ms): %s", elapsed * 1000, " ".join(statement.split())[:1000]
+        )
+    scopes = _active_scopes.get()
+    if not scopes:
+        return
+    rows = _affected_rows(cursor, context, executemany)
+    for stats in scopes:
+        stats.statements += 1
+        stats.seconds += elapsed
+        stats.rows += rows
+        stats.by_statement[statement] += 1
+
+
+def _affected_rows(cursor, context, executemany: bool) -> int:
+    """
+    Строки, затронутые запросом.
+
+    Пакетный INSERT (executemany и страницы insertmanyvalues, у которых
+    rowcount до чтения RETURNING равен 0) считается по числу наборов
+    параметров — один раз на выполнение, а не на каждую страницу.
+    """
+    if executemany and context is not None and context.isinsert:
+        if getattr(context, "_query_rows_counted", False):
+            return 0
+        context._query_rows_counted = True
+        return len(context.compiled_parameters)
+    return cursor.rowcount if cursor.rowcount and cursor.rowcount > 0 else 0
+
+
+def instrument_engine(target: Engine) -> Engine:
+    """Подключает учёт запросов к движку (повторный вызов ничего не меняет)."""
+    if not event.contains(target, "after_cursor_execute", _after_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    return target
+
+
+@contextmanager
+def query_scope(
+    name: str,
+    n_plus_one_threshold: Optional[int] = N_PLUS_ONE_THRESHOLD,
+) -> Iterator[QueryStats]:
+    """
+    Считает запросы инструментированных движков внутри блока.
+
+    Области вкладываются: запрос учитывается во всех активных областях.
+    При выходе пишет предупреждение о запросах, повторённых не меньше
+    n_plus_one_threshold раз (None — не проверять).
+    """
+    stats = QueryStats(name=name)
+    token = _active_scopes.set(_active_scopes.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_scopes.reset(token)
+        if n_plus_one_threshold:
+            for sql, count in stats.repeated(n_plus_one_threshold):
+                logger.warning(
+                    "Possible N+1 in %s: statement executed %d times: %s",
+                    name,
+                    count,
+                    " ".join(sql.split())[:300],
+                )
+
+
 # Глобальный engine и фабрика сессий для приложения
-engine: Engine = create_engine_from_env()
+engine: Engine = instrument_engine(create_engine_from_env())
 
 SessionFactory = sessionmaker(
     bind=engine,
@@ -0,0 +1,181 @@
+# path: src/dan_max_bids_parser/infrastructure/db/locks.py
+"""
+Реализации SourceLockPort — блокировки запуска сбора источника.
+
+- PostgresAdvisorySourceLock: сессионный pg_try_advisory_lock на
+  отдельном соединении, которое держится весь запуск. Блокировку
+  снимает сама БД, если процесс умер и соединение закрылось.
+- RowSourceLock: строка в source_locks (SQLite и другие БД без
+  advisory-блокировок). Захват — один INSERT ... ON CONFLICT DO UPDATE
+  WHERE expires_at < now; строку умершего процесса можно забрать по
+  истечении ttl, поэтому ttl должен быть больше самого долгого запуска.
+
+create_source_lock() выбирает реализацию по диалекту движка.
+Ожидание (timeout > 0) — опрос с интервалом poll_interval.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.domain.ports import SourceLockPort
+from .models import SourceLock
+
+logger = logging.getLogger(__name__)
+
+# Первый ключ двухключевого advisory lock: пространство блокировок сбора,
+# чтобы не пересекаться с другими advisory-блокировками в той же БД
+ADVISORY_NAMESPACE = 48_201
+
+
+def _poll(attempt, timeout: float, poll_interval: float) -> bool:
+    """Повторяет attempt() до успеха или истечения timeout секунд."""
+    deadline = time.monotonic() + timeout
+    while True:
+        if attempt():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(poll_interval, remaining))
+
+
+class PostgresAdvisorySourceLock(SourceLockPort):
+    """
+    Ключ — (ADVISORY_NAMESPACE, hashtext(source_code)); коллизия хешей
+    лишь изредка заставит два источника ждать друг друга.
+
+    Каждый захват держит своё соединение пула до release() — пул
+    должен быть больше числа одновременных запусков.
+    """
+
+    def __init__(self, engine: Engine, poll_interval: float = 0.5) -> None:
+        self._engine = engine
+        self._poll_interval = poll_interval
+        self._held: dict[str, Connection] = {}
+        self._guard = threading.Lock()
+
+    def acquire(self, source_code: str, timeout: float = 0.0) -> bool:
+        conn = self._engine.connect()
+
+        def attempt() -> bool:
+            locked = conn.execute(
+                text("SELECT pg_try_advisory_lock(:ns, hashtext(:key))"),
+                {"ns": ADVISORY_NAMESPACE, "key": source_code},
+            ).scalar()
+            # Сессионная блокировка переживает конец транзакции
+            conn.commit()
+            return bool(locked)
+
+        try:
+            acquired = _poll(attempt, timeout, self._poll_interval)
+        except Exception:
+            conn.invalidate()
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        with self._guard:
+            self._held[source_code] = conn
+        return True
+
+    def release(self, source_code: str) -> None:
+        with self._guard:
+            conn = self._held.pop(source_code, None)
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                text("SELECT pg_advisory_unlock(:ns, hashtext(:key))"),
+                {"ns": ADVISORY_NAMESPACE, "key": source_code},
+            )
+            conn.commit()
+        except Exception:
+            # Соединение не вернётся в пул: закрытие сессии снимет блокировку
+            logger.exception("Failed to unlock source %s, dropping connection", source_code)
+            conn.invalidate()
+        finally:
+            conn.close()
+
+
+class RowSourceLock(SourceLockPort):
+    """
+    :param ttl: через сколько чужую незаснятую блокировку можно забрать.
+    :param holder: префикс владельца (по умолчанию узел:pid); к нему
+        добавляется случайный суффикс на каждый захват.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        ttl: timedelta = timedelta(hours=1),
+        poll_interval: float = 0.5,
+        holder: Optional[str] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._ttl = ttl
+        self._poll_interval = poll_interval
+        self._holder = holder or f"{socket.gethostname()}:{os.getpid()}"
+        self._held: dict[str, str] = {}
+        self._guard = threading.Lock()
+
+    def acquire(self, source_code: str, timeout: float = 0.0) -> bool:
+        token = f"{self._holder}:{uuid.uuid4().hex[:8]}"
+        if not _poll(lambda: self._try(source_code, token), timeout, self._poll_interval):
+            return False
+        with self._guard:
+            self._held[source_code] = token
+        return True
+
+    def release(self, source_code: str) -> None:
+        with self._guard:
+            token = self._held.pop(source_code, None)
+        if token is None:
+            return
+        with self._session_factory() as session:
+            session.execute(
+                delete(SourceLock).where(
+                    SourceLock.source_code == source_code, SourceLock.holder == token
+                )
+            )
+            session.commit()
+
+    def _try(self, source_code: str, token: str) -> bool:
+        now = datetime.utcnow()
+        values = {
+            "source_code": source_code,
+            "holder": token,
+            "acquired_at": now,
+            "expires_at": now + self._ttl,
+        }
+        with self._session_factory() as session:
+            dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+            stmt = dialect.insert(SourceLock).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[SourceLock.source_code],
+                set_={k: stmt.excluded[k] for k in ("holder", "acquired_at", "expires_at")},
+                where=SourceLock.expires_at < now,
+            )
+            acquired = session.execute(stmt).rowcount == 1
+            session.commit()
+        return acquired
+
+
+def create_source_lock(engine: Engine, session_factory: sessionmaker) -> SourceLockPort:
+    """Advisory lock на Postgres, строка source_locks — на остальных БД."""
+    if engine.dialect.name == "postgresql":
+        return PostgresAdvisorySourceLock(engine)
+    return RowSourceLock(session_factory)
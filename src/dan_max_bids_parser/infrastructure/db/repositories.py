@@ -1,19 +1,64 @@
 # path: src/dan_max_bids_parser/infrastructure/db/repositories.py
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Iterable, Optional, Sequence
+import hashlib
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Iterable, Iterator, Optional, Sequence
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+import sqlalchemy as sa
+from sqlalchemy import and_, delete, func, literal_column, or_, select, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, undefer
+from sqlalchemy.sql.compiler import InsertmanyvaluesSentinelOpts
 
-from dan_max_bids_parser.domain.entities import BidEntity, RawItemEntity, SourceEntity
+from dan_max_bids_parser.domain.entities import (
+    BidEntity,
+    BidPage,
+    BidQuery,
+    BidSearchHit,
+    BidSearchPage,
+    ConfigEntryEntity,
+    DailyStatsEntity,
+    ExportCursorEntity,
+    JobEntity,
+    RawItemEntity,
+    RawItemHeaderEntity,
+    SourceEntity,
+    WorkerNodeEntity,
+)
 from dan_max_bids_parser.domain.ports import (
     BidRepositoryPort,
+    BidSearchPort,
+    ConfigRepositoryPort,
+    DailyStatsRepositoryPort,
+    ExportCursorRepositoryPort,
+    JobQueuePort,
+    JobRepositoryPort,
     RawItemRepositoryPort,
     SourceRepositoryPort,
+    WorkerNodeRepositoryPort,
+)
+from dan_max_bids_parser.domain.services import bid_query, bid_search, daily_stats
+from dan_max_bids_parser.domain.services.bid_query import BidQueryCursor
+from dan_max_bids_parser.domain.services.bid_search import SearchCursor
+from dan_max_bids_parser.infrastructure.db.base import Base
+from .models import (
+    Bid,
+    BidDailyStats,
+    ConfigAntibot,
+    ConfigClassifier,
+    ConfigDedup,
+    ConfigExport,
+    ConfigFilterRule,
+    ConfigSchedule,
+    ConfigSource,
+    ErrorLog,
+    ExportCursor,
+    Job,
+    RawItem,
+    Source,
+    WorkerNode,
 )
-from .models import Bid, RawItem, Source
 
 
 # --- Вспомогательные функции маппинга ORM <-> Domain ---
@@ -54,10 +99,42 @@ def _raw_item_to_entity(model: RawItem) -> RawItemEntity:
     )
 
 
+# Колонки метаданных raw_items: всё, кроме payload
+_RAW_ITEM_HEADER_COLUMNS = (
+    RawItem.id,
+    RawItem.source_id,
+    RawItem.external_id,
+    RawItem.url,
+    RawItem.status,
+    RawItem.hash,
+    RawItem.created_at,
+    RawItem.fetched_at,
+)
+
+
+def _raw_item_header(row: Any) -> RawItemHeaderEntity:
+    return RawItemHeaderEntity(
+        id=row.id,
+        source_id=row.source_id,
+        external_id=row.external_id,
+        url=row.url,
+        status=row.status,
+        hash=row.hash,
+        created_at=row.created_at,
+        received_at=row.fetched_at,
+    )
+
+
+def payload_hash(payload: str) -> str:
+    """Значение raw_items.hash: sha256 payload (ключ find_headers_by_hash)."""
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def _raw_item_update_model_from_entity(model: RawItem, entity: RawItemEntity) -> None:
     model.source_id = entity.source_id
     model.external_id = entity.external_id
     model.payload = entity.payload
+    model.hash = payload_hash(entity.payload)
     model.url = entity.url
 
     # fetched_at — момент получения данных с источника
@@ -92,6 +169,8 @@ def _bid_to_entity(model: Bid) -> BidEntity:
         transport_type=model.transport_type,
         load_point=model.load_location,
         unload_point=model.unload_location,
+        load_region=model.load_region,
+        unload_region=model.unload_region,
         weight_tons=float(model.weight_value) if model.weight_value is not None else None,
         price=float(model.price_value) if model.price_value is not None else None,
         currency=model.price_currency,
@@ -99,15 +178,69 @@ def _bid_to_entity(model: Bid) -> BidEntity:
         url=model.url,
         published_at=model.published_at,
         created_at=model.created_at,
+        updated_at=model.updated_at,
     )
 
 
+# Поле BidEntity -> колонка Bid (для проекций BidRepository.query)
+_BID_FIELD_COLUMNS = {
+    name: getattr(Bid, column)
+    for name, column in {
+        **{name: name for name in bid_query.QUERY_FIELDS},
+        "load_point": "load_location",
+        "unload_point": "unload_location",
+        "weight_tons": "weight_value",
+        "price": "price_value",
+        "currency": "price_currency",
+        "contact": "contact_phone",
+    }.items()
+}
+
+
+def _bid_row(fields: Sequence[str], values: Sequence[Any]) -> dict[str, Any]:
+    """Строка проекции с теми же приведениями типов, что и _bid_to_entity."""
+    row = dict(zip(fields, values))
+    for name in ("weight_tons", "price"):
+        if row.get(name) is not None:
+            row[name] = float(row[name])
+    if "description" in row:
+        row["description"] = row["description"] or ""
+    return row
+
+
+def _bid_query_conditions(query: BidQuery) -> list[Any]:
+    """Критерии BidQuery -> условия WHERE (все через AND)."""
+    conditions: list[Any] = []
+    if query.source_ids:
+        conditions.append(Bid.source_id.in_(list(query.source_ids)))
+    if query.cargo_types:
+        conditions.append(Bid.cargo_type.in_(list(query.cargo_types)))
+    if query.load_region is not None:
+        conditions.append(Bid.load_region == query.load_region)
+    if query.unload_region is not None:
+        conditions.append(Bid.unload_region == query.unload_region)
+    for column, low, high in (
+        (Bid.price_value, query.price_min, query.price_max),
+        (Bid.weight_value, query.weight_min, query.weight_max),
+        (Bid.published_at, query.published_from, query.published_to),
+    ):
+        if low is not None:
+            conditions.append(column >= low)
+        if high is not None:
+            conditions.append(column <= high)
+    if query.is_duplicate is not None:
+        conditions.append(Bid.is_duplicate.is_(query.is_duplicate))
+    if query.order == "published":
+        conditions.append(Bid.published_at.is_not(None))
+    return conditions
+
+
 def _bid_update_model_from_entity(model: Bid, entity: BidEntity) -> None:
     """
     Доменная BidEntity -> ORM Bid.
 
     Заполняем только те поля, которые реально существуют в модели Bid.
-    Остальные (region, dedup_key и т.п.) оставляем на будущее.
+    Остальные (dedup_key и т.п.) оставляем на будущее.
     """
     model.source_id = entity.source_id
     model.raw_item_id = entity.raw_item_id
@@ -120,6 +253,8 @@ def _bid_update_model_from_entity(model: Bid, entity: BidEntity) -> None:
     # Маршрут
     model.load_location = entity.load_point
     model.unload_location = entity.unload_point
+    model.load_region = entity.load_region
+    model.unload_region = entity.unload_region
 
     # Вес / цена
     model.weight_value = entity.weight_tons
@@ -138,12 +273,80 @@ def _bid_update_model_from_entity(model: Bid, entity: BidEntity) -> None:
     # created_at — из доменной сущности
     model.created_at = entity.created_at
 
-    # updated_at в схеме NOT NULL → по умолчанию считаем = created_at,
-    # пока нет отдельной логики обновления.
-    if getattr(model, "updated_at", None) is None:
+    # updated_at в схеме NOT NULL → по умолчанию считаем = created_at;
+    # явное значение из сущности двигает заявку в инкрементальных выгрузках.
+    if entity.updated_at is not None:
+        model.updated_at = entity.updated_at
+    elif getattr(model, "updated_at", None) is None:
         model.updated_at = entity.created_at
 
 
+def _config_to_entity(model) -> ConfigEntryEntity:
+    return ConfigEntryEntity(
+        id=model.id,
+        code=model.code,
+        name=model.name,
+        is_active=model.is_active,
+        data=dict(model.data or {}),
+        updated_at=model.updated_at,
+    )
+
+
+def _job_to_entity(model: Job) -> JobEntity:
+    return JobEntity(
+        id=model.id,
+        job_type=model.job_type,
+        source_id=model.source_id,
+        status=model.status,
+        started_at=model.started_at,
+        finished_at=model.finished_at,
+        items_total=model.items_total,
+        items_created=model.items_created,
+        items_updated=model.items_updated,
+        error_message=model.error_message,
+        checkpoint=dict(model.checkpoint or {}),
+        stage_durations=dict(model.stage_durations or {}),
+        created_at=model.created_at,
+        attempts=model.attempts or 0,
+        max_attempts=model.max_attempts or 1,
+        run_after=model.run_after,
+        leased_by=model.leased_by,
+        lease_expires_at=model.lease_expires_at,
+        heartbeat_at=model.heartbeat_at,
+    )
+
+
+def _job_update_model_from_entity(model: Job, entity: JobEntity) -> None:
+    model.job_type = entity.job_type
+    model.source_id = entity.source_id
+    model.status = entity.status
+    model.started_at = entity.started_at
+    model.finished_at = entity.finished_at
+    model.items_total = entity.items_total
+    model.items_created = entity.items_created
+    model.items_updated = entity.items_updated
+    model.error_message = entity.error_message
+    # Новый dict, чтобы SQLAlchemy увидел изменение JSON-поля
+    model.checkpoint = dict(entity.checkpoint)
+    model.stage_durations = dict(entity.stage_durations)
+    model.created_at = entity.created_at
+
+
+# Секция конфигурации (имя таблицы без префикса config_) -> ORM-модель
+# Ключ advisory-блокировки bid_daily_stats (Postgres, однокомпонентный
+# bigint — не пересекается с двухкомпонентными ключами блокировок источников)
+_DAILY_STATS_LOCK_KEY = 48_202
+
+_CONFIG_MODELS = {
+    "source": ConfigSource,
+    "filter_rule": ConfigFilterRule,
+    "classifier": ConfigClassifier,
+    "dedup": ConfigDedup,
+    "schedule": ConfigSchedule,
+    "antibot": ConfigAntibot,
+    "export": ConfigExport,
+}
+
 
 # --- Реализации портов ---
 
@@ -199,11 +402,70 @@ class SqlAlchemySourceRepository(SourceRepositoryPort):
         return source
 
 
+# --- Пакетная вставка ---
+
+
+def _insert_values(model: Base) -> dict[str, Any]:
+    """
+    Значения колонок несохранённой ORM-модели для Core INSERT.
+
+    У всех строк пакета одинаковый набор ключей (иначе executemany
+    разбивается на группы), поэтому скалярные default колонок
+    подставляются здесь, а не в INSERT.
+    """
+    values = {}
+    for column in model.__table__.columns:
+        if column.primary_key:
+            continue
+        value = getattr(model, column.key)
+        if value is None and column.default is not None and column.default.is_scalar:
+            value = column.default.arg
+        values[column.key] = value
+    return values
+
+
+def _insert_returning_ids(session: Session, models: Sequence[Base]) -> list[int]:
+    """
+    Вставляет строки пакетом и возвращает их id в порядке models.
+
+    Запросов — по одному на страницу insertmanyvalues (1000 строк):
+    INSERT ... VALUES (...), (...) RETURNING id.
+    - PostgreSQL: порядок RETURNING упорядочивается по параметрам
+      (sort_by_parameter_order, сторож — autoincrement id).
+    - SQLite порядок RETURNING не гарантирует, но rowid внутри одного
+      INSERT выдаются подряд в порядке VALUES (max(rowid) + 1 под
+      блокировкой записи) — id сортируются и проверяются на
+      непрерывность.
+    """
+    if not models:
+        return []
+    table = models[0].__table__
+    rows = [_insert_values(model) for model in models]
+    dialect = session.get_bind().dialect
+    if dialect.insertmanyvalues_implicit_sentinel & InsertmanyvaluesSentinelOpts.ANY_AUTOINCREMENT:
+        stmt = sa.insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        return list(session.execute(stmt, rows).scalars())
+
+    ids = sorted(session.execute(sa.insert(table).returning(table.c.id), rows).scalars())
+    if ids[-1] - ids[0] + 1 != len(ids):
+        # rowid достиг максимума и SQLite выдаёт случайные — порядок не восстановить
+        raise RuntimeError(f"Non-contiguous ids after bulk insert into {table.name}")
+    return ids
+
+
 class SqlAlchemyRawItemRepository(RawItemRepositoryPort):
     """
     Реализация RawItemRepositoryPort через SQLAlchemy Session.
+
+    Колонка payload отложенная (deferred): методы, возвращающие
+    RawItemEntity, подгружают её в том же запросе (undefer), а методы
+    *headers* и выборки по hash её не читают вовсе.
     """
 
+    # Порция id для get_payloads: держит IN (...) в пределах лимита
+    # параметров SQLite и объём одного ответа — в пределах нескольких МБ
+    PAYLOAD_CHUNK = 200
+
     def __init__(self, session: Session) -> None:
         self._session = session
 
@@ -218,13 +480,22 @@ class SqlAlchemyRawItemRepository(RawItemRepositoryPort):
     def add_many(
         self, raw_items: Iterable[RawItemEntity]
     ) -> Sequence[RawItemEntity]:
-        result = []
-        for item in raw_items:
-            result.append(self.add(item))
+        """
+        Пакетная вставка: multi-row INSERT ... RETURNING id страницами по
+        1000 строк на обоих диалектах (см. _insert_returning_ids).
+        """
+        result = list(raw_items)
+        models = []
+        for item in result:
+            model = RawItem()
+            _raw_item_update_model_from_entity(model, item)
+            models.append(model)
+        for item, raw_item_id in zip(result, _insert_returning_ids(self._session, models)):
+            item.id = raw_item_id
         return result
 
     def get_by_id(self, raw_item_id: int) -> Optional[RawItemEntity]:
-        model = self._session.get(RawItem, raw_item_id)
+        model = self._session.get(RawItem, raw_item_id, options=[undefer(RawItem.payload)])
         if model is None:
             return None
         return _raw_item_to_entity(model)
@@ -241,10 +512,105 @@ class SqlAlchemyRawItemRepository(RawItemRepositoryPort):
                 RawItem.created_at >= since,
             )
             .order_by(RawItem.created_at)
+            .options(undefer(RawItem.payload))
         )
         result = self._session.execute(stmt).scalars().all()
         return [_raw_item_to_entity(m) for m in result]
 
+    def list_after_id(
+        self,
+        after_id: int,
+        limit: int,
+        source_id: Optional[int] = None,
+        max_id: Optional[int] = None,
+    ) -> Sequence[RawItemEntity]:
+        stmt = self._after_id(select(RawItem), after_id, limit, source_id, max_id)
+        result = self._session.execute(stmt.options(undefer(RawItem.payload))).scalars().all()
+        return [_raw_item_to_entity(m) for m in result]
+
+    def max_id(self, source_id: Optional[int] = None) -> int:
+        stmt = select(func.max(RawItem.id))
+        if source_id is not None:
+            stmt = stmt.where(RawItem.source_id == source_id)
+        return self._session.execute(stmt).scalar_one() or 0
+
+    def iter_header_batches(
+        self,
+        batch_size: int,
+        source_ids: Optional[Sequence[int]] = None,
+        created_since: Optional[datetime] = None,
+    ) -> Iterator[Sequence[RawItemHeaderEntity]]:
+        # Только колонки метаданных: payload не читается из БД вовсе
+        stmt = select(*_RAW_ITEM_HEADER_COLUMNS)
+        if source_ids is not None:
+            stmt = stmt.where(RawItem.source_id.in_(list(source_ids)))
+        if created_since is not None:
+            stmt = stmt.where(RawItem.created_at >= created_since)
+        # yield_per => stream_results: на Postgres — серверный курсор
+        stmt = stmt.order_by(RawItem.id).execution_options(yield_per=batch_size)
+        for rows in self._session.execute(stmt).partitions():
+            yield [_raw_item_header(row) for row in rows]
+
+    def list_headers_for_source_since(
+        self,
+        source_id: int,
+        since: datetime,
+    ) -> Sequence[RawItemHeaderEntity]:
+        stmt = (
+            select(*_RAW_ITEM_HEADER_COLUMNS)
+            .where(
+                RawItem.source_id == source_id,
+                RawItem.created_at >= since,
+            )
+            .order_by(RawItem.created_at)
+        )
+        return [_raw_item_header(row) for row in self._session.execute(stmt)]
+
+    def list_headers_after_id(
+        self,
+        after_id: int,
+        limit: int,
+        source_id: Optional[int] = None,
+        max_id: Optional[int] = None,
+    ) -> Sequence[RawItemHeaderEntity]:
+        stmt = self._after_id(select(*_RAW_ITEM_HEADER_COLUMNS), after_id, limit, source_id, max_id)
+        return [_raw_item_header(row) for row in self._session.execute(stmt)]
+
+    def find_headers_by_hash(self, hashes: Sequence[str]) -> Sequence[RawItemHeaderEntity]:
+        if not hashes:
+            return []
+        # по индексу ix_raw_items_hash
+        stmt = (
+            select(*_RAW_ITEM_HEADER_COLUMNS)
+            .where(RawItem.hash.in_(list(hashes)))
+            .order_by(RawItem.id)
+        )
+        return [_raw_item_header(row) for row in self._session.execute(stmt)]
+
+    def get_payload(self, raw_item_id: int) -> Optional[str]:
+        stmt = select(RawItem.payload).where(RawItem.id == raw_item_id)
+        return self._session.execute(stmt).scalar_one_or_none()
+
+    def get_payloads(self, raw_item_ids: Sequence[int]) -> dict[int, str]:
+        ids = list(dict.fromkeys(raw_item_ids))
+        payloads: dict[int, str] = {}
+        for start in range(0, len(ids), self.PAYLOAD_CHUNK):
+            stmt = select(RawItem.id, RawItem.payload).where(
+                RawItem.id.in_(ids[start:start + self.PAYLOAD_CHUNK])
+            )
+            for raw_item_id, payload in self._session.execute(stmt):
+                payloads[raw_item_id] = payload
+        return payloads
+
+    @staticmethod
+    def _after_id(stmt, after_id: int, limit: int, source_id: Optional[int], max_id: Optional[int]):
+        stmt = stmt.where(RawItem.id > after_id)
+        if source_id is not None:
+            stmt = stmt.where(RawItem.source_id == source_id)
+        if max_id is not None:
+            stmt = stmt.where(RawItem.id <= max_id)
+        return stmt.order_by(RawItem.id).limit(limit)
+
 
 class SqlAlchemyBidRepository(BidRepositoryPort):
     """
@@ -263,9 +629,15 @@ class SqlAlchemyBidRepository(BidRepositoryPort):
         return bid
 
     def add_many(self, bids: Iterable[BidEntity]) -> Sequence[BidEntity]:
-        result = []
-        for item in bids:
-            result.append(self.add(item))
+        """Пакетная вставка (см. SqlAlchemyRawItemRepository.add_many)."""
+        result = list(bids)
+        models = []
+        for bid in result:
+            model = Bid()
+            _bid_update_model_from_entity(model, bid)
+            models.append(model)
+        for bid, bid_id in zip(result, _insert_returning_ids(self._session, models)):
+            bid.id = bid_id
         return result
 
     def get_by_id(self, bid_id: int) -> Optional[BidEntity]:
@@ -303,3 +675,885 @@ class SqlAlchemyBidRepository(BidRepositoryPort):
         )
         result = self._session.execute(stmt).scalars().all()
         return [_bid_to_entity(m) for m in result]
+
+    def replace_for_raw_items(
+        self,
+        raw_item_ids: Sequence[int],
+        bids: Sequence[BidEntity],
+    ) -> Sequence[BidEntity]:
+        """
+        Не больше четырёх запросов на порцию: SELECT старых id, UPDATE по
+        первичному ключу (executemany), DELETE лишних и пакетная вставка
+        (см. SqlAlchemyRawItemRepository.add_many).
+        """
+        # raw_item_id -> [(id, created_at)] старых заявок по возрастанию id
+        existing: dict[int, list[tuple[int, datetime]]] = {}
+        if raw_item_ids:
+            rows = self._session.execute(
+                select(Bid.raw_item_id, Bid.id, Bid.created_at)
+                .where(Bid.raw_item_id.in_(list(raw_item_ids)))
+                .order_by(Bid.id.desc())
+            ).all()
+            for raw_item_id, bid_id, created_at in rows:
+                existing.setdefault(raw_item_id, []).append((bid_id, created_at))
+
+        now = datetime.utcnow()
+        updates: list[dict[str, Any]] = []
+        inserted: list[BidEntity] = []
+        for bid in bids:
+            free = existing.get(bid.raw_item_id)
+            bid.updated_at = now
+            if not free:
+                bid.id = None
+                inserted.append(bid)
+                continue
+            # Строка остаётся той же заявкой: id и момент появления сохраняются
+            bid.id, bid.created_at = free.pop()
+            model = Bid()
+            _bid_update_model_from_entity(model, bid)
+            updates.append({"id": bid.id, **_insert_values(model)})
+
+        if updates:
+            self._session.execute(
+                sa.update(Bid).execution_options(synchronize_session=False), updates
+            )
+        stale = [bid_id for free in existing.values() for bid_id, _ in free]
+        if stale:
+            self._session.execute(
+                delete(Bid).where(Bid.id.in_(stale)).execution_options(synchronize_session=False)
+            )
+
+        models = []
+        for bid in inserted:
+            model = Bid()
+            _bid_update_model_from_entity(model, bid)
+            models.append(model)
+        for bid, bid_id in zip(inserted, _insert_returning_ids(self._session, models)):
+            bid.id = bid_id
+        return bids
+
+    def list_after_id(
+        self,
+        after_id: int,
+        limit: int,
+        source_ids: Optional[Sequence[int]] = None,
+        created_since: Optional[datetime] = None,
+    ) -> Sequence[BidEntity]:
+        stmt = select(Bid).where(Bid.id > after_id)
+        if source_ids is not None:
+            stmt = stmt.where(Bid.source_id.in_(list(source_ids)))
+        if created_since is not None:
+            stmt = stmt.where(Bid.created_at >= created_since)
+        stmt = stmt.order_by(Bid.id).limit(limit)
+        result = self._session.execute(stmt).scalars().all()
+        return [_bid_to_entity(m) for m in result]
+
+    def iter_batches(
+        self,
+        batch_size: int,
+        source_ids: Optional[Sequence[int]] = None,
+        created_since: Optional[datetime] = None,
+    ) -> Iterator[Sequence[BidEntity]]:
+        stmt = select(Bid)
+        if source_ids is not None:
+            stmt = stmt.where(Bid.source_id.in_(list(source_ids)))
+        if created_since is not None:
+            stmt = stmt.where(Bid.created_at >= created_since)
+        # yield_per => stream_results: на Postgres — серверный курсор
+        stmt = stmt.order_by(Bid.id).execution_options(yield_per=batch_size)
+        for models in self._session.execute(stmt).scalars().partitions():
+            yield [_bid_to_entity(m) for m in models]
+
+    def list_for_route(
+        self,
+        load_region: str,
+        unload_region: Optional[str] = None,
+        published_since: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> Sequence[BidEntity]:
+        # Поиск и сортировка — по индексу ix_bids_route без отдельной сортировки
+        stmt = select(Bid).where(Bid.load_region == load_region)
+        if unload_region is not None:
+            stmt = stmt.where(Bid.unload_region == unload_region)
+        if published_since is not None:
+            stmt = stmt.where(Bid.published_at >= published_since)
+        else:
+            stmt = stmt.where(Bid.published_at.is_not(None))
+        stmt = stmt.order_by(Bid.published_at.desc()).limit(limit)
+        result = self._session.execute(stmt).scalars().all()
+        return [_bid_to_entity(m) for m in result]
+
+    def query(
+        self,
+        query: BidQuery,
+        fields: Optional[Sequence[str]] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> BidPage:
+        bid_query.validate(query, limit)
+        names = bid_query.projection(fields)
+        after = BidQueryCursor.decode(cursor, query.order) if cursor else None
+
+        # Колонка сортировки нужна для курсора, даже если её нет в проекции
+        selected = names if query.order == "id" else tuple(dict.fromkeys((*names, "published_at")))
+        stmt = select(*(_BID_FIELD_COLUMNS[name] for name in selected))
+        stmt = stmt.where(*_bid_query_conditions(query))
+        if query.order == "published":
+            # (published_at, id) DESC — по ix_bids_published_at_id или ix_bids_route
+            if after is not None:
+                stmt = stmt.where(
+                    tuple_(Bid.published_at, Bid.id) < tuple_(after.published_at, after.bid_id)
+                )
+            stmt = stmt.order_by(Bid.published_at.desc(), Bid.id.desc())
+        else:
+            if after is not None:
+                stmt = stmt.where(Bid.id < after.bid_id)
+            stmt = stmt.order_by(Bid.id.desc())
+
+        rows = [_bid_row(selected, values) for values in self._session.execute(stmt.limit(limit + 1))]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = BidQueryCursor(
+                order=query.order,
+                bid_id=last["id"],
+                published_at=last["published_at"] if query.order == "published" else None,
+            ).encode()
+        if len(selected) != len(names):
+            for row in rows:
+                del row["published_at"]
+        return BidPage(rows=rows, next_cursor=next_cursor)
+
+    def count(self, query: BidQuery) -> int:
+        stmt = select(func.count()).select_from(Bid).where(*_bid_query_conditions(query))
+        return int(self._session.execute(stmt).scalar_one())
+
+    def exists(self, query: BidQuery) -> bool:
+        # EXISTS останавливается на первой подходящей строке
+        stmt = select(sa.exists().where(*_bid_query_conditions(query)))
+        return bool(self._session.execute(stmt).scalar())
+
+    def list_changed_after(
+        self,
+        updated_at: Optional[datetime],
+        after_id: int,
+        limit: int,
+        source_ids: Optional[Sequence[int]] = None,
+        until: Optional[datetime] = None,
+    ) -> Sequence[BidEntity]:
+        # Сравнение кортежей (row value) идёт по индексу ix_bids_updated_at_id
+        stmt = select(Bid)
+        if updated_at is not None:
+            stmt = stmt.where(tuple_(Bid.updated_at, Bid.id) > tuple_(updated_at, after_id))
+        if source_ids is not None:
+            stmt = stmt.where(Bid.source_id.in_(list(source_ids)))
+        if until is not None:
+            stmt = stmt.where(Bid.updated_at <= until)
+        stmt = stmt.order_by(Bid.updated_at, Bid.id).limit(limit)
+        result = self._session.execute(stmt).scalars().all()
+        return [_bid_to_entity(m) for m in result]
+
+
+class SqlAlchemyBidSearch(BidSearchPort):
+    """
+    Реализация BidSearchPort: tsvector + GIN на Postgres, FTS5 на SQLite
+    (DDL — infrastructure.db.search_ddl).
+
+    Keyset-условие по (score, id) и LIMIT на SQLite применяются прямо к
+    FTS5-подзапросу, если нет фильтра по источникам: для order="recent"
+    FTS5 тогда читает совпадения по rowid с конца и останавливается на
+    странице, не материализуя все совпадения.
+    """
+
+    # Веса bm25 в порядке search_ddl.FTS_COLUMNS
+    _BM25 = "bm25(bids_fts, 4.0, 4.0, 3.0, 3.0, 1.0)"
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def search(
+        self,
+        text: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        order: str = "rank",
+        source_ids: Optional[Sequence[int]] = None,
+    ) -> BidSearchPage:
+        bid_search.validate(limit, order)
+        terms = bid_search.search_terms(text)
+        after = SearchCursor.decode(cursor) if cursor else None
+
+        if self._session.get_bind().dialect.name == "postgresql":
+            stmt = self._postgres(terms, order, after)
+        else:
+            stmt = self._sqlite(terms, order, after, limit + 1 if source_ids is None else None)
+        score = stmt.selected_columns.score
+        if source_ids is not None:
+            stmt = stmt.where(Bid.source_id.in_(list(source_ids)))
+        stmt = stmt.order_by(score.desc(), Bid.id.desc()).limit(limit + 1)
+
+        rows = self._session.execute(stmt).all()
+        hits = [BidSearchHit(bid=_bid_to_entity(bid), score=float(s)) for bid, s in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = hits[-1]
+            next_cursor = SearchCursor(score=last.score, bid_id=last.bid.id).encode()
+        return BidSearchPage(hits=hits, next_cursor=next_cursor)
+
+    def _postgres(self, terms: list[str], order: str, after: Optional[SearchCursor]):
+        vector = literal_column("bids.search_vector")
+        query = func.to_tsquery(sa.literal("russian", sa.String), bid_search.pg_tsquery(terms))
+        if order == "rank":
+            # ts_rank_cd возвращает real: курсор сравниваем в том же типе
+            score = func.ts_rank_cd(vector, query)
+            after_score = sa.cast(after.score, sa.REAL) if after else None
+        else:
+            score = sa.literal(0.0, sa.Float)
+            after_score = None
+        stmt = select(Bid, score.label("score")).where(vector.op("@@")(query))
+        if after is not None:
+            if order == "recent":
+                stmt = stmt.where(Bid.id < after.bid_id)
+            else:
+                stmt = stmt.where(
+                    or_(score < after_score, and_(score == after_score, Bid.id < after.bid_id))
+                )
+        return stmt
+
+    def _sqlite(
+        self,
+        terms: list[str],
+        order: str,
+        after: Optional[SearchCursor],
+        inner_limit: Optional[int],
+    ):
+        score_sql = f"-{self._BM25}" if order == "rank" else "0.0"
+        sql = f"SELECT rowid AS bid_id, {score_sql} AS score FROM bids_fts WHERE bids_fts MATCH :match"
+        params: dict[str, object] = {"match": bid_search.fts5_match(terms)}
+        if after is not None:
+            if order == "recent":
+                sql += " AND rowid < :after_id"
+            else:
+                sql += (
+                    f" AND ({score_sql} < :after_score"
+                    f" OR ({score_sql} = :after_score AND rowid < :after_id))"
+                )
+                params["after_score"] = after.score
+            params["after_id"] = after.bid_id
+        if inner_limit is not None:
+            sql += f" ORDER BY score DESC, rowid DESC LIMIT {int(inner_limit)}"
+        matches = (
+            text(sql)
+            .bindparams(**params)
+            .columns(bid_id=sa.Integer, score=sa.Float)
+            .subquery("matches")
+        )
+        return select(Bid, matches.c.score).join(matches, matches.c.bid_id == Bid.id)
+
+
+class SqlAlchemyJobRepository(JobRepositoryPort):
+    """
+    Реализация JobRepositoryPort через SQLAlchemy Session.
+    """
+
+    # Статусы, с которых задачу можно продолжить
+    _UNFINISHED_STATUSES = ("running", "failed")
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def add(self, job: JobEntity) -> JobEntity:
+        model = Job()
+        _job_update_model_from_entity(model, job)
+        self._session.add(model)
+        self._session.flush()
+        job.id = model.id
+        return job
+
+    def get_by_id(self, job_id: int) -> Optional[JobEntity]:
+        model = self._session.get(Job, job_id)
+        if model is None:
+            return None
+        return _job_to_entity(model)
+
+    def save(self, job: JobEntity) -> JobEntity:
+        if job.id is None:
+            return self.add(job)
+        model = self._session.get(Job, job.id)
+        if model is None:
+            raise ValueError(f"Job with id={job.id} not found")
+        _job_update_model_from_entity(model, job)
+        self._session.flush()
+        return job
+
+    def find_unfinished(
+        self,
+        job_type: str,
+        source_id: Optional[int] = None,
+    ) -> Optional[JobEntity]:
+        stmt = select(Job).where(
+            Job.job_type == job_type,
+            Job.status.in_(self._UNFINISHED_STATUSES),
+        )
+        if source_id is None:
+            stmt = stmt.where(Job.source_id.is_(None))
+        else:
+            stmt = stmt.where(Job.source_id == source_id)
+        model = self._session.execute(stmt.order_by(Job.id.desc()).limit(1)).scalar_one_or_none()
+        if model is None:
+            return None
+        return _job_to_entity(model)
+
+    def mean_durations(
+        self,
+        job_type: str,
+        since: datetime,
+        until: Optional[datetime] = None,
+    ) -> dict[int, float]:
+        if self._session.get_bind().dialect.name == "postgresql":
+            seconds = func.extract("epoch", Job.finished_at - Job.started_at)
+        else:
+            seconds = (func.julianday(Job.finished_at) - func.julianday(Job.started_at)) * 86400.0
+        conditions = [
+            Job.job_type == job_type,
+            Job.status == "success",
+            Job.source_id.is_not(None),
+            Job.started_at >= since,
+            Job.finished_at.is_not(None),
+        ]
+        if until is not None:
+            conditions.append(Job.finished_at < until)
+        rows = self._session.execute(
+            select(Job.source_id, func.avg(seconds)).where(*conditions).group_by(Job.source_id)
+        ).all()
+        return {source_id: float(avg) for source_id, avg in rows if avg is not None}
+
+    def oldest_running_started_at(
+        self,
+        job_types: Sequence[str],
+        since: datetime,
+    ) -> Optional[datetime]:
+        started_at = self._session.execute(
+            select(func.min(Job.started_at)).where(
+                Job.job_type.in_(list(job_types)),
+                Job.status == "running",
+                Job.started_at >= since,
+            )
+        ).scalar_one_or_none()
+        if started_at is not None and started_at.tzinfo is not None:
+            started_at = started_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return started_at
+
+
+class SqlAlchemyJobQueue(JobQueuePort):
+    """
+    Реализация JobQueuePort поверх таблицы jobs.
+
+    claim() — один UPDATE ... WHERE id IN (SELECT ... LIMIT n
+    FOR UPDATE SKIP LOCKED) RETURNING: на Postgres параллельные воркеры
+    пропускают строки, заблокированные друг другом, и не ждут; SQLite
+    FOR UPDATE не поддерживает (SQLAlchemy его не выводит), но UPDATE
+    выполняется под блокировкой записи всей базы, поэтому выборка и
+    захват атомарны. Все изменения аренды — условные UPDATE по
+    (id, leased_by): воркер, чью аренду забрали, ничего не перезапишет.
+    Транзакцией управляет UnitOfWork: claim и heartbeat стоит сразу
+    фиксировать, не держа блокировки на время выполнения задачи.
+
+    enqueue() не ставит вторую ждущую задачу того же типа и источника:
+    частичный уникальный индекс ux_jobs_pending (job_type, source_id)
+    WHERE status = 'pending' и INSERT ... ON CONFLICT DO NOTHING, так что
+    параллельные постановки с разных узлов не плодят дубли. Выполняемую
+    задачу индекс не видит — её проверяет предварительный SELECT.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def enqueue(
+        self,
+        job_type: str,
+        source_id: Optional[int] = None,
+        run_after: Optional[datetime] = None,
+        max_attempts: int = 3,
+    ) -> Optional[JobEntity]:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be positive")
+        same_source = Job.source_id.is_(None) if source_id is None else Job.source_id == source_id
+        # NULL в уникальном индексе не совпадают — задачи без источника ловит только SELECT
+        queued = select(Job.id).where(
+            Job.job_type == job_type,
+            same_source,
+            or_(
+                Job.status == "pending",
+                and_(Job.status == "running", Job.leased_by.is_not(None)),
+            ),
+        )
+        if self._session.execute(queued.limit(1)).first() is not None:
+            return None
+        is_postgres = self._session.get_bind().dialect.name == "postgresql"
+        stmt = (
+            (postgresql if is_postgres else sqlite).insert(Job)
+            .values(
+                job_type=job_type,
+                source_id=source_id,
+                status="pending",
+                run_after=run_after,
+                attempts=0,
+                max_attempts=max_attempts,
+                checkpoint={},
+                stage_durations={},
+                created_at=datetime.utcnow(),
+            )
+            .on_conflict_do_nothing(
+                index_elements=["job_type", "source_id"],
+                index_where=Job.status == "pending",
+            )
+            .returning(Job.id)
+        )
+        job_id = self._session.execute(stmt).scalar_one_or_none()
+        if job_id is None:
+            # ту же задачу только что поставил другой узел
+            return None
+        return _job_to_entity(self._session.get(Job, job_id))
+
+    def claim(
+        self,
+        worker_id: str,
+        job_types: Sequence[str],
+        limit: int = 1,
+        lease: timedelta = timedelta(minutes=5),
+        now: Optional[datetime] = None,
+    ) -> Sequence[JobEntity]:
+        now = now or datetime.utcnow()
+        ready = (
+            select(Job.id)
+            .where(
+                Job.job_type.in_(list(job_types)),
+                Job.status == "pending",
+                or_(Job.run_after.is_(None), Job.run_after <= now),
+            )
+            .order_by(Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            sa.update(Job)
+            .where(Job.id.in_(ready))
+            .values(
+                status="running",
+                leased_by=worker_id,
+                lease_expires_at=now + lease,
+                heartbeat_at=now,
+                attempts=Job.attempts + 1,
+                started_at=now,
+                finished_at=None,
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        models = self._session.execute(stmt).scalars().all()
+        return sorted((_job_to_entity(m) for m in models), key=lambda job: job.id)
+
+    def heartbeat(
+        self,
+        job_id: int,
+        worker_id: str,
+        lease: timedelta = timedelta(minutes=5),
+        now: Optional[datetime] = None,
+    ) -> bool:
+        now = now or datetime.utcnow()
+        return self._update_leased(
+            job_id,
+            worker_id,
+            Job.status == "running",
+            lease_expires_at=now + lease,
+            heartbeat_at=now,
+        )
+
+    def complete(self, job_id: int, worker_id: str) -> bool:
+        # Статус "success" — если исполнитель не записал свой
+        return self._update_leased(
+            job_id,
+            worker_id,
+            status=sa.case((Job.status == "running", "success"), else_=Job.status),
+            finished_at=func.coalesce(Job.finished_at, datetime.utcnow()),
+            leased_by=None,
+            lease_expires_at=None,
+        )
+
+    def fail(
+        self,
+        job_id: int,
+        worker_id: str,
+        error: str,
+        retry_delay: timedelta = timedelta(minutes=1),
+        now: Optional[datetime] = None,
+    ) -> bool:
+        now = now or datetime.utcnow()
+        return self._update_leased(
+            job_id,
+            worker_id,
+            status=self._retry_status(),
+            run_after=now + retry_delay,
+            finished_at=now,
+            error_message=error,
+            leased_by=None,
+            lease_expires_at=None,
+        )
+
+    def release(self, job_id: int, worker_id: str, run_after: Optional[datetime] = None) -> bool:
+        # claim уже засчитал попытку — возвращаем её
+        return self._update_leased(
+            job_id,
+            worker_id,
+            Job.status == "running",
+            status="pending",
+            run_after=run_after,
+            attempts=Job.attempts - 1,
+            leased_by=None,
+            lease_expires_at=None,
+        )
+
+    def reclaim_expired(self, now: Optional[datetime] = None) -> int:
+        now = now or datetime.utcnow()
+        result = self._session.execute(
+            sa.update(Job)
+            .where(
+                Job.status == "running",
+                Job.leased_by.is_not(None),
+                Job.lease_expires_at < now,
+            )
+            .values(
+                status=self._retry_status(),
+                error_message="lease expired",
+                leased_by=None,
+                lease_expires_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    # --- Вспомогательные методы ---
+
+    @staticmethod
+    def _retry_status():
+        return sa.case((Job.attempts < Job.max_attempts, "pending"), else_="failed")
+
+    def _update_leased(self, job_id: int, worker_id: str, *conditions: Any, **values: Any) -> bool:
+        # Итоговый статус к complete / fail мог уже записать исполнитель
+        # (JobRepository.save), поэтому проверяется только владелец аренды
+        result = self._session.execute(
+            sa.update(Job)
+            .where(Job.id == job_id, Job.leased_by == worker_id, *conditions)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+
+class SqlAlchemyConfigRepository(ConfigRepositoryPort):
+    """
+    Реализация ConfigRepositoryPort через SQLAlchemy Session.
+
+    Только чтение: конфигурация правится вручную/через UI, а не кодом ETL.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    @staticmethod
+    def _model_for(section: str):
+        try:
+            return _CONFIG_MODELS[section]
+        except KeyError:
+            raise ValueError(f"Unknown config section '{section}'") from None
+
+    def list_active(self, section: str) -> Sequence[ConfigEntryEntity]:
+        model_cls = self._model_for(section)
+        stmt = (
+            select(model_cls)
+            .where(model_cls.is_active.is_(True))
+            .order_by(model_cls.id)
+        )
+        result = self._session.execute(stmt).scalars().all()
+        return [_config_to_entity(m) for m in result]
+
+    def get_by_code(self, section: str, code: str) -> Optional[ConfigEntryEntity]:
+        model_cls = self._model_for(section)
+        stmt = select(model_cls).where(model_cls.code == code)
+        model = self._session.execute(stmt).scalar_one_or_none()
+        if model is None:
+            return None
+        return _config_to_entity(model)
+
+
+class SqlAlchemyExportCursorRepository(ExportCursorRepositoryPort):
+    """
+    Реализация ExportCursorRepositoryPort: одна строка export_cursors на выгрузку.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def get(self, export_code: str) -> Optional[ExportCursorEntity]:
+        stmt = select(ExportCursor).where(ExportCursor.export_code == export_code)
+        model = self._session.execute(stmt).scalar_one_or_none()
+        if model is None:
+            return None
+        return ExportCursorEntity(
+            id=model.id,
+            export_code=model.export_code,
+            last_updated_at=model.last_updated_at,
+            last_bid_id=model.last_bid_id,
+            rows_exported=model.rows_exported,
+            exported_at=model.exported_at,
+        )
+
+    def save(self, cursor: ExportCursorEntity) -> ExportCursorEntity:
+        stmt = select(ExportCursor).where(ExportCursor.export_code == cursor.export_code)
+        model = self._session.execute(stmt).scalar_one_or_none()
+        if model is None:
+            model = ExportCursor(export_code=cursor.export_code)
+            self._session.add(model)
+        model.last_updated_at = cursor.last_updated_at
+        model.last_bid_id = cursor.last_bid_id
+        model.rows_exported = cursor.rows_exported
+        model.exported_at = cursor.exported_at
+        self._session.flush()
+        cursor.id = model.id
+        return cursor
+
+
+class SqlAlchemyDailyStatsRepository(DailyStatsRepositoryPort):
+    """
+    Реализация DailyStatsRepositoryPort над bid_daily_stats.
+
+    apply() — один INSERT ... ON CONFLICT (day, source_id, cargo_type)
+    DO UPDATE SET x = x + excluded.x (Postgres и SQLite >= 3.24), без
+    чтения строк агрегата. rollup() — DELETE окна и сгруппированные
+    запросы к bids / raw_items / errors по индексам created_at / occurred_at.
+
+    apply() и rollup() не должны перемежаться: сбор, зафиксировавший
+    новую строку агрегата между DELETE и INSERT пересчёта, уронил бы
+    пересчёт на уникальном ключе, а его заявки уже посчитал бы SELECT.
+    На Postgres обе операции берут транзакционную advisory-блокировку
+    агрегата: apply() — разделяемую (сборы друг друга не ждут), rollup()
+    — исключительную до DELETE. Пересчёт ждёт незафиксированные сборы и
+    видит их заявки, а сбор, начавший apply() во время пересчёта,
+    прибавляет свои приращения уже к его результату. На SQLite запись
+    и так сериализована блокировкой базы.
+    """
+
+    _COUNTERS = (
+        ("bids_count", "bids"),
+        ("duplicates_count", "duplicates"),
+        ("raw_items_count", "raw_items"),
+        ("errors_count", "errors"),
+        ("price_sum", "price_sum"),
+        ("price_count", "price_count"),
+    )
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def apply(self, deltas: Iterable[DailyStatsEntity]) -> None:
+        rows = [self._values(row) for row in daily_stats.merge(deltas)]
+        if not rows:
+            return
+        self._lock_stats(shared=True)
+        dialect = postgresql if self._dialect() == "postgresql" else sqlite
+        stmt = dialect.insert(BidDailyStats).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["day", "source_id", "cargo_type"],
+            set_={
+                **{
+                    column: getattr(BidDailyStats, column) + getattr(stmt.excluded, column)
+                    for column, _ in self._COUNTERS
+                },
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        self._session.execute(stmt)
+
+    def rollup(self, day_from: date, day_to: date) -> int:
+        daily_stats.validate_range(day_from, day_to)
+        start, end = self._bounds(day_from, day_to)
+        self._lock_stats(shared=False)
+        self._session.execute(
+            delete(BidDailyStats)
+            .where(BidDailyStats.day.between(day_from, day_to))
+            .execution_options(synchronize_session=False)
+        )
+
+        rows: list[DailyStatsEntity] = []
+        bid_day = self._day(Bid.created_at)
+        cargo = func.coalesce(Bid.cargo_type, "")
+        stmt = (
+            select(
+                bid_day,
+                Bid.source_id,
+                cargo,
+                func.count(),
+                func.sum(sa.case((Bid.is_duplicate.is_(True), 1), else_=0)),
+                func.sum(Bid.price_value),
+                func.count(Bid.price_value),
+            )
+            .where(Bid.created_at >= start, Bid.created_at < end)
+            .group_by(bid_day, Bid.source_id, cargo)
+        )
+        for day, source_id, cargo_type, count, duplicates, price_sum, price_count in (
+            self._session.execute(stmt)
+        ):
+            rows.append(DailyStatsEntity(
+                day=self._as_date(day),
+                source_id=source_id,
+                cargo_type=cargo_type,
+                bids=count,
+                duplicates=int(duplicates or 0),
+                price_sum=float(price_sum or 0),
+                price_count=price_count,
+            ))
+
+        raw_day = self._day(RawItem.created_at)
+        stmt = (
+            select(raw_day, RawItem.source_id, func.count())
+            .where(RawItem.created_at >= start, RawItem.created_at < end)
+            .group_by(raw_day, RawItem.source_id)
+        )
+        for day, source_id, count in self._session.execute(stmt):
+            rows.append(DailyStatsEntity(day=self._as_date(day), source_id=source_id, raw_items=count))
+
+        error_day = self._day(ErrorLog.occurred_at)
+        stmt = (
+            select(error_day, ErrorLog.source_id, func.count())
+            .where(
+                ErrorLog.source_id.is_not(None),
+                ErrorLog.occurred_at >= start,
+                ErrorLog.occurred_at < end,
+            )
+            .group_by(error_day, ErrorLog.source_id)
+        )
+        for day, source_id, count in self._session.execute(stmt):
+            rows.append(DailyStatsEntity(day=self._as_date(day), source_id=source_id, errors=count))
+
+        merged = [self._values(row) for row in daily_stats.merge(rows)]
+        if merged:
+            self._session.execute(sa.insert(BidDailyStats), merged)
+        return len(merged)
+
+    def list_range(
+        self,
+        day_from: date,
+        day_to: date,
+        source_ids: Optional[Sequence[int]] = None,
+    ) -> Sequence[DailyStatsEntity]:
+        stmt = select(BidDailyStats).where(BidDailyStats.day.between(day_from, day_to))
+        if source_ids is not None:
+            stmt = stmt.where(BidDailyStats.source_id.in_(list(source_ids)))
+        stmt = stmt.order_by(BidDailyStats.day, BidDailyStats.source_id, BidDailyStats.cargo_type)
+        return [
+            DailyStatsEntity(
+                day=m.day,
+                source_id=m.source_id,
+                cargo_type=m.cargo_type,
+                bids=m.bids_count,
+                duplicates=m.duplicates_count,
+                raw_items=m.raw_items_count,
+                errors=m.errors_count,
+                price_sum=float(m.price_sum),
+                price_count=m.price_count,
+            )
+            for m in self._session.execute(stmt).scalars()
+        ]
+
+    # --- Вспомогательные методы ---
+
+    def _dialect(self) -> str:
+        return self._session.get_bind().dialect.name
+
+    def _lock_stats(self, shared: bool) -> None:
+        """Advisory-блокировка агрегата до конца транзакции (только Postgres)."""
+        if self._dialect() != "postgresql":
+            return
+        function = "pg_advisory_xact_lock_shared" if shared else "pg_advisory_xact_lock"
+        self._session.execute(text(f"SELECT {function}(:key)"), {"key": _DAILY_STATS_LOCK_KEY})
+
+    def _values(self, row: DailyStatsEntity) -> dict[str, Any]:
+        values: dict[str, Any] = {
+            "day": row.day,
+            "source_id": row.source_id,
+            "cargo_type": row.cargo_type,
+            "updated_at": datetime.utcnow(),
+        }
+        for column, field_name in self._COUNTERS:
+            values[column] = getattr(row, field_name)
+        values["price_sum"] = round(row.price_sum, 2)
+        return values
+
+    def _day(self, column):
+        # Сутки UTC: на Postgres timestamptz приводится к UTC явно,
+        # а не к часовому поясу сессии
+        if self._dialect() == "postgresql":
+            return sa.cast(func.timezone("UTC", column), sa.Date)
+        return func.date(column)
+
+    def _bounds(self, day_from: date, day_to: date) -> tuple[datetime, datetime]:
+        start = datetime.combine(day_from, time.min)
+        end = datetime.combine(day_to + timedelta(days=1), time.min)
+        if self._dialect() == "postgresql":
+            return start.replace(tzinfo=timezone.utc), end.replace(tzinfo=timezone.utc)
+        return start, end
+
+    @staticmethod
+    def _as_date(value) -> date:
+        # SQLite date() возвращает строку YYYY-MM-DD
+        return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+class SqlAlchemyWorkerNodeRepository(WorkerNodeRepositoryPort):
+    """Реализация WorkerNodeRepositoryPort над worker_nodes."""
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def heartbeat(
+        self,
+        node_id: str,
+        capacity: float = 1.0,
+        now: Optional[datetime] = None,
+    ) -> WorkerNodeEntity:
+        if capacity <= 0:
+            raise ValueError("Worker node capacity must be positive")
+        now = now or datetime.utcnow()
+        model = self._session.get(WorkerNode, node_id)
+        if model is None:
+            model = WorkerNode(node_id=node_id, started_at=now)
+            self._session.add(model)
+        model.capacity = capacity
+        model.heartbeat_at = now
+        self._session.flush()
+        return self._to_entity(model)
+
+    def list_alive(self, ttl: timedelta, now: Optional[datetime] = None) -> list[WorkerNodeEntity]:
+        threshold = (now or datetime.utcnow()) - ttl
+        models = self._session.execute(
+            select(WorkerNode).where(WorkerNode.heartbeat_at >= threshold).order_by(WorkerNode.node_id)
+        ).scalars()
+        return [self._to_entity(model) for model in models]
+
+    def remove(self, node_id: str) -> None:
+        self._session.execute(delete(WorkerNode).where(WorkerNode.node_id == node_id))
+
+    def purge(self, before: datetime) -> int:
+        result = self._session.execute(delete(WorkerNode).where(WorkerNode.heartbeat_at < before))
+        return result.rowcount or 0
+
+    @staticmethod
+    def _to_entity(model: WorkerNode) -> WorkerNodeEntity:
+        return WorkerNodeEntity(
+            node_id=model.node_id,
+            capacity=model.capacity,
+            started_at=model.started_at,
+            heartbeat_at=model.heartbeat_at,
+        )
@@ -0,0 +1,97 @@
+# path: src/dan_max_bids_parser/infrastructure/db/search_ddl.py
+"""
+DDL полнотекстового индекса заявок (SqlAlchemyBidSearch).
+
+- Postgres: генерируемая колонка bids.search_vector (tsvector, словарь
+  russian; заголовок, груз и маршрут — вес A, описание — B) и GIN-индекс.
+  Колонки нет в ORM-модели Bid: её заполняет сама БД, а SQLite-базы
+  без неё должны продолжать работать с той же моделью.
+- SQLite: FTS5-таблица bids_fts с внешним содержимым (content='bids'),
+  синхронизируется триггерами на INSERT/UPDATE/DELETE bids.
+
+install_search_ddl() вешает DDL на create_all/drop_all таблицы bids;
+в существующих базах индекс создаёт миграция f2c8d4a61b97
+(SQL там продублирован: миграции не зависят от кода приложения).
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Table, event
+
+FTS_TABLE = "bids_fts"
+# Порядок колонок FTS5 задаёт порядок весов в bm25()
+FTS_COLUMNS = ("title", "cargo_type", "load_location", "unload_location", "description")
+
+_FTS_LIST = ", ".join(FTS_COLUMNS)
+_NEW = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+_OLD = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+
+SQLITE_CREATE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{_FTS_LIST}, content='bids', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS bids_fts_ai AFTER INSERT ON bids BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_FTS_LIST}) VALUES (new.id, {_NEW}); END",
+    f"CREATE TRIGGER IF NOT EXISTS bids_fts_ad AFTER DELETE ON bids BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_FTS_LIST}) "
+    f"VALUES ('delete', old.id, {_OLD}); END",
+    f"CREATE TRIGGER IF NOT EXISTS bids_fts_au AFTER UPDATE OF {_FTS_LIST} ON bids BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_FTS_LIST}) "
+    f"VALUES ('delete', old.id, {_OLD}); "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_FTS_LIST}) VALUES (new.id, {_NEW}); END",
+)
+# Индексирует строки, которые уже были в bids до создания FTS-таблицы
+SQLITE_REBUILD = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+SQLITE_DROP = (
+    "DROP TRIGGER IF EXISTS bids_fts_au",
+    "DROP TRIGGER IF EXISTS bids_fts_ad",
+    "DROP TRIGGER IF EXISTS bids_fts_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+)
+
+POSTGRES_CREATE = (
+    "ALTER TABLE bids ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('russian', coalesce(title, '') || ' ' || "
+    "coalesce(cargo_type, '') || ' ' || coalesce(load_location, '') || ' ' || "
+    "coalesce(unload_location, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_bids_search_vector ON bids USING gin (search_vector)",
+)
+POSTGRES_DROP = (
+    "DROP INDEX IF EXISTS ix_bids_search_vector",
+    "ALTER TABLE bids DROP COLUMN IF EXISTS search_vector",
+)
+
+
+def create_statements(dialect: str) -> tuple[str, ...]:
+    if dialect == "postgresql":
+        return POSTGRES_CREATE
+    if dialect == "sqlite":
+        return SQLITE_CREATE
+    return ()
+
+
+def drop_statements(dialect: str) -> tuple[str, ...]:
+    if dialect == "postgresql":
+        return POSTGRES_DROP
+    if dialect == "sqlite":
+        return SQLITE_DROP
+    return ()
+
+
+def _after_create(target: Table, connection, **kw) -> None:
+    for statement in create_statements(connection.dialect.name):
+        connection.exec_driver_sql(statement)
+
+
+def _before_drop(target: Table, connection, **kw) -> None:
+    # Триггеры SQLite удаляются вместе с bids, а FTS-таблица — нет
+    for statement in drop_statements(connection.dialect.name):
+        connection.exec_driver_sql(statement)
+
+
+def install_search_ddl(bids: Table) -> None:
+    event.listen(bids, "after_create", _after_create)
+    event.listen(bids, "before_drop", _before_drop)
@@ -11,11 +11,25 @@ from dan_max_bids_parser.domain.ports import (
     SourceRepositoryPort,
     RawItemRepositoryPort,
     BidRepositoryPort,
+    BidSearchPort,
+    ConfigRepositoryPort,
+    DailyStatsRepositoryPort,
+    ExportCursorRepositoryPort,
+    JobQueuePort,
+    JobRepositoryPort,
+    WorkerNodeRepositoryPort,
 )
 from dan_max_bids_parser.infrastructure.db.repositories import (
     SqlAlchemySourceRepository,
     SqlAlchemyRawItemRepository,
     SqlAlchemyBidRepository,
+    SqlAlchemyBidSearch,
+    SqlAlchemyConfigRepository,
+    SqlAlchemyDailyStatsRepository,
+    SqlAlchemyExportCursorRepository,
+    SqlAlchemyJobQueue,
+    SqlAlchemyJobRepository,
+    SqlAlchemyWorkerNodeRepository,
 )
 
 # Тип фабрики сессий: совместим с любым sessionmaker, возвращающим Session
@@ -43,6 +57,13 @@ class SqlAlchemyUnitOfWork(UnitOfWork):
     sources: SourceRepositoryPort
     raw_items: RawItemRepositoryPort
     bids: BidRepositoryPort
+    configs: ConfigRepositoryPort
+    jobs: JobRepositoryPort
+    job_queue: JobQueuePort
+    export_cursors: ExportCursorRepositoryPort
+    bid_search: BidSearchPort
+    daily_stats: DailyStatsRepositoryPort
+    worker_nodes: WorkerNodeRepositoryPort
 
     def __init__(self, session_factory: SessionFactory) -> None:
         """
@@ -77,6 +98,13 @@ class SqlAlchemyUnitOfWork(UnitOfWork):
         self.sources = SqlAlchemySourceRepository(self.session)
         self.raw_items = SqlAlchemyRawItemRepository(self.session)
         self.bids = SqlAlchemyBidRepository(self.session)
+        self.configs = SqlAlchemyConfigRepository(self.session)
+        self.jobs = SqlAlchemyJobRepository(self.session)
+        self.job_queue = SqlAlchemyJobQueue(self.session)
+        self.export_cursors = SqlAlchemyExportCursorRepository(self.session)
+        self.bid_search = SqlAlchemyBidSearch(self.session)
+        self.daily_stats = SqlAlchemyDailyStatsRepository(self.session)
+        self.worker_nodes = SqlAlchemyWorkerNodeRepository(self.session)
 
         return self
 
@@ -0,0 +1,193 @@
+# path: src/dan_max_bids_parser/infrastructure/export/fake_sheets_server.py
+"""
+Локальный фейк Google Sheets API (spreadsheets.values) для тестов и бенчмарков.
+
+Поднимает HTTP-сервер на 127.0.0.1 в фоновом потоке и держит листы в
+памяти. Поддерживает ровно то, что использует HttpSheetsTransport:
+
+    GET  /spreadsheets/{id}/values/{range}
+    POST /spreadsheets/{id}/values:batchUpdate
+    POST /spreadsheets/{id}/values:batchClear
+
+Диапазоны: 'Лист', 'Лист'!A2:M10, 'Лист'!5:10. Ведёт счётчик запросов по
+видам и умеет отвечать ошибками (fail_next) — для проверки повторов.
+
+    with FakeSheetsServer() as server:
+        transport = HttpSheetsTransport("sheet-id", base_url=server.base_url)
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+_CELL_RE = re.compile(r"^([A-Z]*)(\d*)$")
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - ord("A") + 1
+    return index
+
+
+def parse_range(range_a1: str) -> tuple[str, int, int, int, int]:
+    """'Лист'!A2:C5 -> (title, row0, col0, row1, col1), 1-based, концы включительно; 0 — без границы."""
+    title, _, cells = range_a1.partition("!")
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    if not cells:
+        return title, 1, 1, 0, 0
+    start, _, end = cells.partition(":")
+    end = end or start
+    col0, row0 = _CELL_RE.match(start).groups()
+    col1, row1 = _CELL_RE.match(end).groups()
+    return (
+        title,
+        int(row0 or 1),
+        _column_index(col0) if col0 else 1,
+        int(row1 or 0),
+        _column_index(col1) if col1 else 0,
+    )
+
+
+class FakeSheetsServer:
+    def __init__(self) -> None:
+        self.sheets: dict[str, list[list[Any]]] = {}
+        self.requests: Counter[str] = Counter()
+        self._failures: list[tuple[int, Optional[float]]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeSheetsServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeSheetsServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def fail_next(self, status: int, times: int = 1, retry_after: Optional[float] = None) -> None:
+        """Следующие times запросов получат ответ status."""
+        with self._lock:
+            self._failures.extend([(status, retry_after)] * times)
+
+    def rows(self, title: str) -> list[list[Any]]:
+        """Содержимое листа без пустых строк и ячеек в конце (как отдаёт API)."""
+        with self._lock:
+            return _trim(self.sheets.get(title, []))
+
+    # --- операции над листом ---
+
+    def _get(self, range_a1: str) -> list[list[Any]]:
+        title, row0, col0, row1, col1 = parse_range(range_a1)
+        grid = self.sheets.get(title, [])
+        row1 = row1 or len(grid)
+        return _trim([
+            row[col0 - 1: col1 or None] for row in grid[row0 - 1: row1]
+        ])
+
+    def _update(self, range_a1: str, values: list[list[Any]]) -> int:
+        title, row0, col0, _, _ = parse_range(range_a1)
+        grid = self.sheets.setdefault(title, [])
+        cells = 0
+        for offset, row in enumerate(values):
+            row_no = row0 + offset
+            while len(grid) < row_no:
+                grid.append([])
+            target = grid[row_no - 1]
+            need = col0 - 1 + len(row)
+            if len(target) < need:
+                target.extend([""] * (need - len(target)))
+            target[col0 - 1: need] = row
+            cells += len(row)
+        return cells
+
+    def _clear(self, range_a1: str) -> None:
+        title, row0, col0, row1, col1 = parse_range(range_a1)
+        grid = self.sheets.get(title, [])
+        for row in grid[row0 - 1: row1 or len(grid)]:
+            stop = min(col1 or len(row), len(row))
+            row[col0 - 1: stop] = [""] * max(stop - col0 + 1, 0)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:  # тишина в выводе тестов
+                pass
+
+            def _reply(self, status: int, body: dict[str, Any], retry_after=None) -> None:
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                if retry_after is not None:
+                    self.send_header("Retry-After", str(retry_after))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _dispatch(self, method: str) -> None:
+                path = urllib.parse.urlsplit(self.path).path
+                _, _, action = path.partition("/spreadsheets/")
+                _, _, action = action.partition("/")
+                action = urllib.parse.unquote(action)
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                with fake._lock:
+                    kind = "get" if method == "GET" else action.removeprefix("values:")
+                    fake.requests[kind] += 1
+                    if fake._failures:
+                        status, retry_after = fake._failures.pop(0)
+                        self._reply(status, {"error": {"code": status}}, retry_after)
+                        return
+                    if method == "GET" and action.startswith("values/"):
+                        range_a1 = action[len("values/"):]
+                        self._reply(200, {"range": range_a1, "values": fake._get(range_a1)})
+                    elif action == "values:batchUpdate":
+                        cells = sum(fake._update(d["range"], d["values"]) for d in body["data"])
+                        self._reply(200, {"totalUpdatedCells": cells})
+                    elif action == "values:batchClear":
+                        for range_a1 in body["ranges"]:
+                            fake._clear(range_a1)
+                        self._reply(200, {"clearedRanges": body["ranges"]})
+                    else:
+                        self._reply(404, {"error": {"code": 404}})
+
+            def do_GET(self) -> None:
+                self._dispatch("GET")
+
+            def do_POST(self) -> None:
+                self._dispatch("POST")
+
+        return Handler
+
+
+def _trim(grid: list[list[Any]]) -> list[list[Any]]:
+    rows = []
+    for row in grid:
+        row = list(row)
+        while row and row[-1] in ("", None):
+            row.pop()
+        rows.append(row)
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
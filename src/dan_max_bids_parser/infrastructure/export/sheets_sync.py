@@ -0,0 +1,465 @@
+# path: src/dan_max_bids_parser/infrastructure/export/sheets_sync.py
+"""
+Адаптер ExportPort для Google Sheets: синхронизация листа по разнице.
+
+Запись по строке упирается в квоту Sheets API (порядка 60 запросов в
+минуту на пользователя), поэтому адаптер пишет только изменившиеся строки
+и отправляет их несколькими values:batchUpdate:
+
+- индекс «ключ строки (первая колонка) -> (номер строки, хэш значений)»
+  строится одним чтением листа или берётся из локального JSON-файла
+  (index_path), тогда лист вообще не читается;
+- write_rows() только сравнивает хэши и копит изменившиеся строки;
+- finish() склеивает соседние строки в диапазоны A{n}:{col}{m}, режет их
+  на запросы по max_ranges_per_request/max_cells_per_request и отправляет;
+  лишние строки в конце листа очищаются одним values:batchClear;
+- 429 и 5xx повторяются с экспоненциальной задержкой и джиттером
+  (Retry-After сервера имеет приоритет).
+
+Режимы ExportPort.begin:
+- replace — лист повторяет выгрузку построчно (строка i -> строка листа i+2),
+            совпадающие строки не пишутся;
+- append  — строки дописываются в конец;
+- upsert  — строка с известным ключом переписывается на своём месте
+            (только если изменилась), новая — дописывается в конец.
+
+Если индекс из файла разошёлся с листом (лист правили руками), файл
+нужно удалить — следующий запуск перестроит индекс по листу. При сбое
+посреди записи файл индекса удаляется сам.
+
+Транспорт подменяемый (SheetsTransport): HttpSheetsTransport ходит в
+REST API v4 (или в локальный FakeSheetsServer), в тестах можно передать
+любой объект с тем же интерфейсом.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Optional, Protocol, Sequence
+
+from dan_max_bids_parser.domain.ports import ExportPort
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = "https://sheets.googleapis.com/v4"
+
+# Ограничение Google Sheets на длину текста в ячейке
+_MAX_CELL_LENGTH = 50000
+
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class SheetsApiError(Exception):
+    """Ошибка Sheets API; status=None — сетевая ошибка (нет ответа)."""
+
+    def __init__(
+        self,
+        status: Optional[int],
+        message: str,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        super().__init__(f"Sheets API error {status}: {message}")
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status is None or self.status in _RETRYABLE_STATUSES
+
+
+class SheetsTransport(Protocol):
+    """Минимальное подмножество spreadsheets.values, нужное синхронизации."""
+
+    def get_values(self, range_a1: str) -> list[list[Any]]:
+        ...
+
+    def batch_update(self, data: list[dict[str, Any]]) -> None:
+        ...
+
+    def batch_clear(self, ranges: list[str]) -> None:
+        ...
+
+
+class HttpSheetsTransport(SheetsTransport):
+    """
+    REST-транспорт Sheets API v4 на urllib.
+
+    token — OAuth access token (Bearer); получение и обновление токена —
+    забота вызывающего кода. base_url подменяется на адрес FakeSheetsServer.
+    """
+
+    def __init__(
+        self,
+        spreadsheet_id: str,
+        token: str = "",
+        base_url: str = DEFAULT_API_URL,
+        timeout: float = 30.0,
+    ) -> None:
+        self._prefix = (
+            f"{base_url.rstrip('/')}/spreadsheets/{urllib.parse.quote(spreadsheet_id, safe='')}"
+        )
+        self._token = token
+        self._timeout = timeout
+
+    def get_values(self, range_a1: str) -> list[list[Any]]:
+        query = urllib.parse.urlencode(
+            {"valueRenderOption": "UNFORMATTED_VALUE", "majorDimension": "ROWS"}
+        )
+        path = f"/values/{urllib.parse.quote(range_a1, safe='')}?{query}"
+        return self._request("GET", path).get("values", [])
+
+    def batch_update(self, data: list[dict[str, Any]]) -> None:
+        self._request("POST", "/values:batchUpdate", {"valueInputOption": "RAW", "data": data})
+
+    def batch_clear(self, ranges: list[str]) -> None:
+        self._request("POST", "/values:batchClear", {"ranges": ranges})
+
+    def _request(self, method: str, path: str, body: Optional[dict] = None) -> dict[str, Any]:
+        headers = {"Accept": "application/json"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            headers["Content-Type"] = "application/json; charset=utf-8"
+        if self._token:
+            headers["Authorization"] = f"Bearer {self._token}"
+        request = urllib.request.Request(
+            self._prefix + path, data=payload, headers=headers, method=method
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self._timeout) as response:
+                raw = response.read()
+        except urllib.error.HTTPError as exc:
+            retry_after = exc.headers.get("Retry-After") if exc.headers else None
+            raise SheetsApiError(
+                exc.code,
+                exc.read().decode("utf-8", "replace")[:500],
+                float(retry_after) if retry_after else None,
+            ) from None
+        except (urllib.error.URLError, TimeoutError) as exc:
+            raise SheetsApiError(None, str(exc)) from None
+        return json.loads(raw) if raw else {}
+
+
+# --- A1-нотация и нормализация значений ---
+
+
+def column_letter(index: int) -> str:
+    """1 -> A, 27 -> AA."""
+    letters = ""
+    while index > 0:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+def quote_sheet_title(title: str) -> str:
+    return "'" + title.replace("'", "''") + "'"
+
+
+def _cell(value: Any) -> Any:
+    """Значение ячейки в том виде, в каком его вернёт UNFORMATTED_VALUE."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None).strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (Decimal, float)):
+        return int(value) if value == int(value) else float(value)
+    if isinstance(value, str) and len(value) > _MAX_CELL_LENGTH:
+        return value[:_MAX_CELL_LENGTH]
+    return value
+
+
+def _digest(values: Sequence[Any]) -> str:
+    encoded = json.dumps(list(values), ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+def _pad(row: Sequence[Any], width: int) -> list[Any]:
+    # API не возвращает пустые ячейки в конце строки
+    row = [_cell(v) for v in row[:width]]
+    return row + [""] * (width - len(row))
+
+
+@dataclass(frozen=True, slots=True)
+class SheetsSyncSettings:
+    max_ranges_per_request: int = 200
+    max_cells_per_request: int = 100_000
+    max_retries: int = 5
+    backoff_base: float = 1.0
+    backoff_max: float = 32.0
+
+    def __post_init__(self) -> None:
+        if self.max_ranges_per_request < 1 or self.max_cells_per_request < 1:
+            raise ValueError("Request limits must be >= 1")
+        if self.max_retries < 0:
+            raise ValueError("max_retries must be >= 0")
+
+
+@dataclass(slots=True)
+class SheetsSyncStats:
+    api_calls: int = 0
+    retries: int = 0
+    rows_written: int = 0
+    ranges_written: int = 0
+    rows_cleared: int = 0
+
+
+class SheetsSyncWriter(ExportPort):
+    def __init__(
+        self,
+        transport: SheetsTransport,
+        sheet_title: str = "Заявки",
+        index_path: Optional[str | Path] = None,
+        location: str = "",
+        settings: Optional[SheetsSyncSettings] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self._transport = transport
+        self._title = sheet_title
+        self._quoted = quote_sheet_title(sheet_title)
+        self._index_path = Path(index_path) if index_path is not None else None
+        self._location = location or sheet_title
+        self._settings = settings or SheetsSyncSettings()
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self.stats = SheetsSyncStats()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._mode = "replace"
+        self._headers: list[Any] = []
+        self._width = 0
+        # ключ -> (номер строки, хэш); номер строки -> ключ
+        self._index: dict[str, tuple[int, str]] = {}
+        self._row_keys: dict[int, str] = {}
+        self._old_rows: dict[str, tuple[int, str]] = {}
+        self._old_last_row = 1
+        self._last_row = 1
+        self._dirty: dict[int, list[Any]] = {}
+        self._clear_all = False
+        self._started = False
+
+    # --- ExportPort ---
+
+    def begin(self, headers: Sequence[str], mode: str = "replace") -> None:
+        if mode not in ("replace", "append", "upsert"):
+            raise ValueError(f"Unknown export mode: {mode!r}")
+        self._reset()
+        self._mode = mode
+        self._headers = [_cell(h) for h in headers]
+        self._width = len(self._headers)
+
+        old_headers = self._load_index()
+        if old_headers != self._headers:
+            if mode != "replace" and self._old_last_row > 1:
+                raise ValueError(
+                    f"Columns of sheet {self._title!r} differ from the export columns; "
+                    "run a full export"
+                )
+            # Другой набор колонок: лист переписывается целиком
+            self._clear_all = self._old_last_row > 0 and old_headers is not None
+            self._index.clear()
+            self._row_keys.clear()
+            self._dirty[1] = self._headers
+
+        if mode == "replace":
+            # Индекс строится заново по порядку выгрузки
+            self._last_row = 1
+            self._old_rows, self._index = self._index, {}
+        else:
+            self._last_row = max(self._old_last_row, 1)
+        self._started = True
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        width = self._width
+        index = self._index
+        dirty = self._dirty
+        for row in rows:
+            values = _pad(row, width)
+            key = str(values[0])
+            if key == "":
+                raise ValueError("Sheets export requires a non-empty key in the first column")
+            digest = _digest(values)
+            if self._mode == "replace":
+                self._last_row += 1
+                row_no = self._last_row
+                old = self._row_keys.get(row_no)
+                if old != key or self._old_rows.get(key, (0, ""))[1] != digest:
+                    dirty[row_no] = values
+            elif self._mode == "upsert" and key in index:
+                row_no, old_digest = index[key]
+                if old_digest != digest:
+                    dirty[row_no] = values
+            else:
+                self._last_row += 1
+                row_no = self._last_row
+                dirty[row_no] = values
+            index[key] = (row_no, digest)
+
+    def finish(self) -> str:
+        try:
+            self._flush()
+        except Exception:
+            # Состояние листа неизвестно: следующий запуск перестроит индекс по листу
+            self._drop_index_file()
+            raise
+        self._save_index()
+        logger.info(
+            "Sheet %r synced: %d rows in %d ranges, %d rows cleared, %d API calls (%d retries)",
+            self._title,
+            self.stats.rows_written,
+            self.stats.ranges_written,
+            self.stats.rows_cleared,
+            self.stats.api_calls,
+            self.stats.retries,
+        )
+        self._started = False
+        return self._location
+
+    def abort(self) -> None:
+        # До finish() в лист ничего не отправлялось
+        self._reset()
+
+    # --- индекс ---
+
+    def _load_index(self) -> Optional[list[Any]]:
+        """Заполняет индекс из файла или из листа; возвращает заголовки листа."""
+        if self._index_path is not None and self._index_path.exists():
+            try:
+                state = json.loads(self._index_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                logger.warning("Broken sheets index %s, rebuilding from sheet", self._index_path)
+            else:
+                if state.get("sheet") == self._title:
+                    self._index = {k: (int(r), d) for k, (r, d) in state["rows"].items()}
+                    self._row_keys = {r: k for k, (r, _) in self._index.items()}
+                    self._old_last_row = int(state["last_row"])
+                    return list(state["headers"])
+
+        rows = self._call(self._transport.get_values, self._quoted)
+        if not rows:
+            self._old_last_row = 0
+            return None
+        headers = [_cell(v) for v in rows[0]]
+        for row_no, row in enumerate(rows[1:], start=2):
+            if not row or row[0] in ("", None):
+                continue
+            key = str(_cell(row[0]))
+            self._index[key] = (row_no, _digest(_pad(row, self._width)))
+            self._row_keys[row_no] = key
+        self._old_last_row = len(rows)
+        return headers
+
+    def _save_index(self) -> None:
+        if self._index_path is None:
+            return
+        state = {
+            "sheet": self._title,
+            "headers": self._headers,
+            "last_row": self._last_row,
+            "rows": {key: [row_no, digest] for key, (row_no, digest) in self._index.items()},
+        }
+        self._index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._index_path.with_name(f".{self._index_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self._index_path)
+
+    def _drop_index_file(self) -> None:
+        if self._index_path is not None:
+            self._index_path.unlink(missing_ok=True)
+
+    # --- отправка ---
+
+    def _flush(self) -> None:
+        if self._clear_all:
+            self._call(self._transport.batch_clear, [self._quoted])
+        for batch in self._batches(self._ranges()):
+            self._call(self._transport.batch_update, batch)
+        stale_from = self._last_row + 1
+        if not self._clear_all and self._mode == "replace" and self._old_last_row >= stale_from:
+            self._call(
+                self._transport.batch_clear,
+                [f"{self._quoted}!{stale_from}:{self._old_last_row}"],
+            )
+            self.stats.rows_cleared += self._old_last_row - stale_from + 1
+        self._dirty = {}
+
+    def _ranges(self) -> list[tuple[int, list[list[Any]]]]:
+        """Изменённые строки, склеенные в непрерывные диапазоны (первая строка, значения)."""
+        ranges: list[tuple[int, list[list[Any]]]] = []
+        prev = None
+        for row_no in sorted(self._dirty):
+            if prev is not None and row_no == prev + 1:
+                ranges[-1][1].append(self._dirty[row_no])
+            else:
+                ranges.append((row_no, [self._dirty[row_no]]))
+            prev = row_no
+        return ranges
+
+    def _batches(self, ranges: list[tuple[int, list[list[Any]]]]) -> list[list[dict[str, Any]]]:
+        settings = self._settings
+        rows_per_request = max(1, settings.max_cells_per_request // max(self._width, 1))
+        last_col = column_letter(max(self._width, 1))
+        batches: list[list[dict[str, Any]]] = []
+        current: list[dict[str, Any]] = []
+        current_rows = 0
+        for start, values in ranges:
+            offset = 0
+            while offset < len(values):
+                if (
+                    len(current) >= settings.max_ranges_per_request
+                    or current_rows >= rows_per_request
+                ):
+                    batches.append(current)
+                    current, current_rows = [], 0
+                # Длинный диапазон режется по лимиту ячеек запроса
+                part = values[offset: offset + rows_per_request - current_rows]
+                first = start + offset
+                current.append({
+                    "range": f"{self._quoted}!A{first}:{last_col}{first + len(part) - 1}",
+                    "majorDimension": "ROWS",
+                    "values": part,
+                })
+                current_rows += len(part)
+                offset += len(part)
+                self.stats.rows_written += len(part)
+                self.stats.ranges_written += 1
+        if current:
+            batches.append(current)
+        return batches
+
+    def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        settings = self._settings
+        attempt = 0
+        while True:
+            self.stats.api_calls += 1
+            try:
+                return fn(*args)
+            except SheetsApiError as exc:
+                if not exc.retryable or attempt >= settings.max_retries:
+                    raise
+                delay = exc.retry_after
+                if delay is None:
+                    delay = min(settings.backoff_max, settings.backoff_base * 2 ** attempt)
+                    delay *= 0.5 + self._rng.random() / 2
+                logger.warning("Sheets API %s, retry %d in %.1fs", exc.status, attempt + 1, delay)
+                attempt += 1
+                self.stats.retries += 1
+                self._sleep(delay)
@@ -0,0 +1,222 @@
+# path: src/dan_max_bids_parser/infrastructure/export/xlsx_writer.py
+"""
+XLSX-адаптер ExportPort на openpyxl в write-only режиме.
+
+Write-only лист не держит ячейки в памяти: каждая строка сразу
+сериализуется во временный XML внутри openpyxl, поэтому память не
+зависит от числа строк. Файл пишется рядом с целевым под временным
+именем и переименовывается в finish() — незавершённая выгрузка не
+подменяет предыдущий результат.
+
+Режимы append/upsert дописывают к существующему файлу: XLSX нельзя
+дополнить на месте, поэтому старые строки потоково копируются из файла
+(read-only) в новый. В upsert порция копится по ID, старые строки с тем
+же ID заменяются на месте при копировании в finish(), оставшиеся новые
+дописываются в конец. Буфер держит в памяти не больше max_pending_rows
+строк, остальное уходит во временную SQLite-базу на диске (_PendingRows):
+первый upsert после потери курсора — это вся выгрузка, а не дельта.
+Если файла ещё нет, заменять нечего и upsert пишет строки сразу, как replace.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.utils import get_column_letter
+
+from dan_max_bids_parser.domain.ports import ExportPort
+
+# Ограничение Excel на длину текста в ячейке
+_MAX_CELL_LENGTH = 32767
+
+# Строк upsert в памяти до сброса на диск
+_MAX_PENDING_ROWS = 50_000
+
+_DEFAULT_WIDTH = 16
+_WIDTHS = {"ID": 10, "Описание": 60, "Ссылка": 40, "Дата публикации": 18}
+
+
+def _clean(value: Any) -> Any:
+    if isinstance(value, str):
+        value = ILLEGAL_CHARACTERS_RE.sub("", value)
+        if len(value) > _MAX_CELL_LENGTH:
+            value = value[:_MAX_CELL_LENGTH]
+    return value
+
+
+class _PendingRows:
+    """Строки upsert по ID в порядке первого появления; сверх лимита — на диске.
+
+    Повторный ID заменяет строку, не меняя её места (как dict). Сброшенные
+    строки лежат во временной SQLite-базе (connect("") — файл удаляется при
+    закрытии соединения), ID и строки хранятся в pickle.
+    """
+
+    def __init__(self, max_rows: int) -> None:
+        self._max_rows = max_rows
+        self._memory: dict[Any, list[Any]] = {}
+        self._disk: Optional[sqlite3.Connection] = None
+
+    def put(self, key: Any, row: list[Any]) -> None:
+        self._memory[key] = row
+        if len(self._memory) >= self._max_rows:
+            self._spill()
+
+    def _spill(self) -> None:
+        if self._disk is None:
+            self._disk = sqlite3.connect("")
+            self._disk.execute(
+                "CREATE TABLE pending (seq INTEGER PRIMARY KEY, key BLOB UNIQUE, row BLOB)"
+            )
+        self._disk.executemany(
+            "INSERT INTO pending (key, row) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET row = excluded.row",
+            ((pickle.dumps(key), pickle.dumps(row)) for key, row in self._memory.items()),
+        )
+        self._memory.clear()
+
+    def pop(self, key: Any) -> Optional[list[Any]]:
+        """Забрать строку для замены; перед чтением с диска буфер сбрасывается целиком."""
+        if self._disk is None:
+            return self._memory.pop(key, None)
+        if self._memory:
+            self._spill()
+        packed = pickle.dumps(key)
+        found = self._disk.execute("SELECT row FROM pending WHERE key = ?", (packed,)).fetchone()
+        if found is None:
+            return None
+        self._disk.execute("DELETE FROM pending WHERE key = ?", (packed,))
+        return pickle.loads(found[0])
+
+    def remaining(self) -> Iterator[list[Any]]:
+        if self._disk is not None:
+            if self._memory:
+                self._spill()
+            for (row,) in self._disk.execute("SELECT row FROM pending ORDER BY seq"):
+                yield pickle.loads(row)
+        else:
+            yield from self._memory.values()
+
+    def close(self) -> None:
+        self._memory.clear()
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+
+class XlsxExportWriter(ExportPort):
+    def __init__(
+        self,
+        path: str | Path,
+        sheet_title: str = "Заявки",
+        max_pending_rows: int = _MAX_PENDING_ROWS,
+    ) -> None:
+        if max_pending_rows < 1:
+            raise ValueError("max_pending_rows must be positive")
+        self._path = Path(path)
+        self._tmp = self._path.with_name(f".{self._path.name}.{os.getpid()}.tmp")
+        self._sheet_title = sheet_title
+        self._workbook: Optional[Workbook] = None
+        self._sheet: Any = None
+        self._existing: Optional[Workbook] = None
+        self._existing_rows: Any = None
+        self._max_pending_rows = max_pending_rows
+        self._pending: Optional[_PendingRows] = None
+
+    def begin(self, headers: Sequence[str], mode: str = "replace") -> None:
+        if mode not in ("replace", "append", "upsert"):
+            raise ValueError(f"Unknown export mode: {mode!r}")
+        if mode != "replace" and self._path.exists():
+            self._open_existing(headers)
+        self._workbook = Workbook(write_only=True)
+        sheet = self._workbook.create_sheet(self._sheet_title[:31])
+        for idx, header in enumerate(headers, start=1):
+            sheet.column_dimensions[get_column_letter(idx)].width = _WIDTHS.get(
+                header, _DEFAULT_WIDTH
+            )
+        sheet.freeze_panes = "A2"
+        sheet.append(list(headers))
+        self._sheet = sheet
+        if mode == "upsert" and self._existing_rows is not None:
+            self._pending = _PendingRows(self._max_pending_rows)
+        elif self._existing_rows is not None:
+            # append: старые строки идут перед новыми
+            for row in self._existing_rows:
+                sheet.append(list(row))
+            self._close_existing()
+
+    def _open_existing(self, headers: Sequence[str]) -> None:
+        workbook = load_workbook(self._path, read_only=True)
+        title = self._sheet_title[:31]
+        sheet = workbook[title] if title in workbook.sheetnames else workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        existing_headers = list(next(rows, ()))
+        if existing_headers != list(headers):
+            workbook.close()
+            raise ValueError(
+                f"Columns of {self._path} differ from the export columns; run a full export"
+            )
+        self._existing = workbook
+        self._existing_rows = rows
+
+    def _close_existing(self) -> None:
+        if self._existing is not None:
+            self._existing.close()
+        self._existing = None
+        self._existing_rows = None
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        if self._pending is not None:
+            put = self._pending.put
+            for row in rows:
+                put(row[0], [_clean(value) for value in row])
+            return
+        append = self._sheet.append
+        for row in rows:
+            append([_clean(value) for value in row])
+
+    def finish(self) -> str:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if self._pending is not None:
+                self._merge_pending()
+            self._workbook.save(self._tmp)
+            os.replace(self._tmp, self._path)
+        finally:
+            self._close_existing()
+            self._close_pending()
+            self._workbook = None
+            self._sheet = None
+            self._tmp.unlink(missing_ok=True)
+        return str(self._path)
+
+    def _merge_pending(self) -> None:
+        """upsert: старые строки с заменой по ID, затем новые ID."""
+        pending = self._pending
+        append = self._sheet.append
+        for row in self._existing_rows or ():
+            replacement = pending.pop(row[0]) if row else None
+            append(replacement if replacement is not None else list(row))
+        for row in pending.remaining():
+            append(row)
+
+    def _close_pending(self) -> None:
+        if self._pending is not None:
+            self._pending.close()
+        self._pending = None
+
+    def abort(self) -> None:
+        # Закрываем поток строк листа (иначе генератор openpyxl ругается при сборке мусора)
+        if self._sheet is not None:
+            self._sheet.close()
+        self._close_existing()
+        self._close_pending()
+        self._workbook = None
+        self._sheet = None
+        self._tmp.unlink(missing_ok=True)
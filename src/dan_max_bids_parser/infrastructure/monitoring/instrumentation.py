@@ -0,0 +1,286 @@
+# path: src/dan_max_bids_parser/infrastructure/monitoring/instrumentation.py
+"""
+Инструментирующие обёртки над портами: провайдером сырья, UnitOfWork
+(репозитории raw_items/bids и commit), блокировкой источника и use-case
+RunSourceHarvesting.
+
+Обёртки реализуют те же протоколы, что и оборачиваемые объекты, поэтому
+подключаются только в wiring (CLI) и не требуют правок в application-слое.
+Метрики берутся из реестра один раз при создании обёртки; в no-op режиме
+(configure_metrics(enabled=False)) остаётся только вызов пустых методов.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Iterator
+from typing import Any, Iterable, Optional, Sequence
+
+from dan_max_bids_parser.application.stages import StageStats
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.application.use_cases.harvest_source import (
+    RunSourceHarvestingCommand,
+    RunSourceHarvestingUseCase,
+)
+from dan_max_bids_parser.domain.entities import BidEntity, RawItemEntity, SourceEntity
+from dan_max_bids_parser.domain.ports import RawItemProviderPort, SourceLockPort
+from dan_max_bids_parser.infrastructure.db.base import query_scope
+from .metrics import MetricsRegistry, get_registry
+
+logger = logging.getLogger(__name__)
+
+# Маркер конца итератора провайдера
+_END = object()
+
+# Бакеты для операций с БД: от 0.1 мс
+DB_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+
+class HarvestMetrics:
+    """Набор метрик ETL-потока в одном реестре."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None) -> None:
+        registry = registry or get_registry()
+        self.fetch_seconds = registry.histogram(
+            "dan_max_fetch_seconds", "Latency of RawItemProvider.fetch_raw_items", ["source"]
+        )
+        self.raw_items_fetched = registry.counter(
+            "dan_max_raw_items_fetched_total", "Raw items returned by providers", ["source"]
+        )
+        self.db_flush_seconds = registry.histogram(
+            "dan_max_db_flush_seconds", "Time of repository bulk writes", ["table"], DB_BUCKETS
+        )
+        self.rows_inserted = registry.counter(
+            "dan_max_rows_inserted_total", "Rows inserted by repositories", ["table"]
+        )
+        self.db_commit_seconds = registry.histogram(
+            "dan_max_db_commit_seconds", "Time of UnitOfWork.commit", [], DB_BUCKETS
+        )
+        self.harvest_seconds = registry.histogram(
+            "dan_max_harvest_seconds", "Duration of RunSourceHarvesting.execute", ["source"]
+        )
+        self.harvest_runs = registry.counter(
+            "dan_max_harvest_runs_total", "Harvest runs by result", ["source", "status"]
+        )
+        self.items_per_second = registry.gauge(
+            "dan_max_harvest_items_per_second",
+            "Raw items per second in the last harvest run",
+            ["source"],
+        )
+        self.db_statements = registry.counter(
+            "dan_max_db_statements_total", "SQL statements issued by an operation", ["operation"]
+        )
+        self.db_statement_seconds = registry.counter(
+            "dan_max_db_statement_seconds_total",
+            "Time spent in SQL statements by an operation",
+            ["operation"],
+        )
+        self.source_lock_wait_seconds = registry.histogram(
+            "dan_max_source_lock_wait_seconds",
+            "Time spent acquiring the per-source harvest lock",
+            ["source"],
+        )
+        self.source_lock_busy = registry.counter(
+            "dan_max_source_lock_busy_total",
+            "Harvest runs that found their source locked by another run",
+            ["source"],
+        )
+        self.queue_depth = registry.gauge(
+            "dan_max_queue_depth", "Number of batches waiting in a processing queue", ["queue"]
+        )
+        self.stage_utilization = registry.gauge(
+            "dan_max_stage_utilization",
+            "Share of the last run a pipeline stage's workers were busy",
+            ["stage"],
+        )
+        self.stage_blocked_seconds = registry.counter(
+            "dan_max_stage_blocked_seconds_total",
+            "Time a pipeline stage waited for room in the next stage's queue",
+            ["stage"],
+        )
+
+    def set_stage_queue_depth(self, stage: str, depth: int) -> None:
+        """Глубина входной очереди этапа сбора (StagedHarvestService.on_queue_depth)."""
+        self.queue_depth.labels(f"harvest_{stage}").set(depth)
+
+    def record_stages(self, stages: Sequence[StageStats]) -> None:
+        """Итоги этапов запуска (StagedHarvestService.on_stage_stats)."""
+        for stats in stages:
+            self.stage_utilization.labels(stats.name).set(stats.utilization)
+            self.stage_blocked_seconds.labels(stats.name).inc(stats.blocked_seconds)
+
+
+# --- Провайдер ---
+
+
+class InstrumentedRawItemProvider(RawItemProviderPort):
+    def __init__(self, inner: RawItemProviderPort, metrics: HarvestMetrics) -> None:
+        self._inner = inner
+        self._metrics = metrics
+
+    def fetch_raw_items(self, source: SourceEntity) -> Iterator[RawItemEntity]:
+        """
+        Лениво, как и сам провайдер: fetch_seconds — время внутри провайдера
+        (без обработки у потребителя), наблюдается по окончании чтения.
+        """
+        fetched = self._metrics.raw_items_fetched.labels(source.code)
+        items = iter(self._inner.fetch_raw_items(source))
+        seconds = 0.0
+        try:
+            while True:
+                started = time.perf_counter()
+                item = next(items, _END)
+                seconds += time.perf_counter() - started
+                if item is _END:
+                    return
+                fetched.inc()
+                yield item
+        finally:
+            self._metrics.fetch_seconds.labels(source.code).observe(seconds)
+
+
+# --- Репозитории и UnitOfWork ---
+
+
+class _InstrumentedRepository:
+    """Делегирует всё, кроме явно переопределённых методов."""
+
+    def __init__(self, inner: Any, table: str, metrics: HarvestMetrics) -> None:
+        self._inner = inner
+        self._metrics = metrics
+        self._flush_seconds = metrics.db_flush_seconds.labels(table)
+        self._rows_inserted = metrics.rows_inserted.labels(table)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+    def _timed_write(self, method: Callable[..., Sequence[Any]], *args: Any) -> Sequence[Any]:
+        started = time.perf_counter()
+        result = method(*args)
+        self._flush_seconds.observe(time.perf_counter() - started)
+        self._rows_inserted.inc(len(result))
+        return result
+
+    def add_many(self, items: Iterable[Any]) -> Sequence[Any]:
+        return self._timed_write(self._inner.add_many, items)
+
+
+class _InstrumentedBidRepository(_InstrumentedRepository):
+    def replace_for_raw_items(
+        self,
+        raw_item_ids: Sequence[int],
+        bids: Sequence[BidEntity],
+    ) -> Sequence[BidEntity]:
+        return self._timed_write(self._inner.replace_for_raw_items, raw_item_ids, bids)
+
+
+class InstrumentedUnitOfWork(UnitOfWork):
+    """UnitOfWork-обёртка: замер записи raw_items/bids и commit."""
+
+    def __init__(self, inner: UnitOfWork, metrics: HarvestMetrics) -> None:
+        self._inner = inner
+        self._metrics = metrics
+
+    def __enter__(self) -> "InstrumentedUnitOfWork":
+        inner = self._inner.__enter__()
+        self.sources = inner.sources
+        self.configs = inner.configs
+        self.jobs = inner.jobs
+        self.job_queue = inner.job_queue
+        self.export_cursors = inner.export_cursors
+        self.bid_search = inner.bid_search
+        self.daily_stats = inner.daily_stats
+        self.worker_nodes = inner.worker_nodes
+        self.raw_items = _InstrumentedRepository(inner.raw_items, "raw_items", self._metrics)
+        self.bids = _InstrumentedBidRepository(inner.bids, "bids", self._metrics)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._inner.__exit__(exc_type, exc_val, exc_tb)
+
+    def commit(self) -> None:
+        started = time.perf_counter()
+        self._inner.commit()
+        self._metrics.db_commit_seconds.observe(time.perf_counter() - started)
+
+    def rollback(self) -> None:
+        self._inner.rollback()
+
+
+def instrument_uow_factory(
+    factory: Callable[[], UnitOfWork],
+    metrics: HarvestMetrics,
+) -> Callable[[], UnitOfWork]:
+    def instrumented() -> UnitOfWork:
+        return InstrumentedUnitOfWork(factory(), metrics)
+
+    return instrumented
+
+
+# --- Блокировка источника ---
+
+
+class InstrumentedSourceLock(SourceLockPort):
+    """Время захвата блокировки (в том числе ожидания) и число занятых источников."""
+
+    def __init__(self, inner: SourceLockPort, metrics: HarvestMetrics) -> None:
+        self._inner = inner
+        self._metrics = metrics
+
+    def acquire(self, source_code: str, timeout: float = 0.0) -> bool:
+        started = time.perf_counter()
+        acquired = self._inner.acquire(source_code, timeout)
+        self._metrics.source_lock_wait_seconds.labels(source_code).observe(
+            time.perf_counter() - started
+        )
+        if not acquired:
+            self._metrics.source_lock_busy.labels(source_code).inc()
+        return acquired
+
+    def release(self, source_code: str) -> None:
+        self._inner.release(source_code)
+
+
+# --- Use-case ---
+
+
+class InstrumentedHarvestService(RunSourceHarvestingUseCase):
+    """
+    Обёртка use-case: длительность и результат запуска, скорость
+    (raw_items в секунду — по счётчику InstrumentedRawItemProvider),
+    число и время SQL-запросов запуска (query_scope, с проверкой на N+1).
+    """
+
+    def __init__(self, inner: RunSourceHarvestingUseCase, metrics: HarvestMetrics) -> None:
+        self._inner = inner
+        self._metrics = metrics
+
+    def execute(self, command: RunSourceHarvestingCommand) -> None:
+        code = command.source_code
+        fetched = self._metrics.raw_items_fetched.labels(code)
+        fetched_before = fetched.value
+        started = time.perf_counter()
+        status = "failed"
+        # Область открыта до try: finally всегда видит queries
+        with query_scope(f"harvest:{code}") as queries:
+            try:
+                self._inner.execute(command)
+                status = "success"
+            finally:
+                elapsed = time.perf_counter() - started
+                self._metrics.db_statements.labels("harvest").inc(queries.statements)
+                self._metrics.db_statement_seconds.labels("harvest").inc(queries.seconds)
+                logger.info(
+                    "Harvest %s: %d SQL statements, %.1f ms in DB, %d rows written",
+                    code,
+                    queries.statements,
+                    queries.seconds * 1000,
+                    queries.rows,
+                )
+                self._metrics.harvest_seconds.labels(code).observe(elapsed)
+                self._metrics.harvest_runs.labels(code, status).inc()
+                if elapsed > 0:
+                    self._metrics.items_per_second.labels(code).set(
+                        (fetched.value - fetched_before) / elapsed
+                    )
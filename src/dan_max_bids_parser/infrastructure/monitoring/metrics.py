@@ -0,0 +1,483 @@
+# path: src/dan_max_bids_parser/infrastructure/monitoring/metrics.py
+"""
+Реестр метрик (counter / gauge / histogram) с выдачей в текстовом
+формате Prometheus: по HTTP (/metrics) или в файл (textfile collector).
+
+Горячий путь без блокировок: у каждого потока свой «шард» значений,
+инкремент — это изменение элемента списка этого потока (атомарно под GIL
+относительно других потоков, т.к. шард никто больше не пишет).
+Блокировка берётся только при создании шарда/дочерней метрики и при сборе.
+Шард завершившегося потока сворачивается в общую базу: потоки этапов и
+пулов создаются на каждый запуск, и число шардов не растёт со временем.
+
+Глобальный no-op режим: configure_metrics(enabled=False) до сборки
+сервисов — get_registry() вернёт реестр, все метрики которого ничего
+не делают (для замера накладных расходов и отключения в проде).
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import os
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+# Бакеты по умолчанию (секунды): от 1 мс до 1 минуты
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _ShardOwner:
+    """Живёт в threading.local потока: удаляется вместе с потоком."""
+
+    __slots__ = ("__weakref__",)
+
+
+class _Shards:
+    """
+    Набор потоковых списков значений фиксированной длины.
+
+    Когда поток завершается, его держатель (_ShardOwner) удаляется, и
+    ключ шарда попадает в _retired; при следующем создании шарда или
+    сборе значения шарда прибавляются к _base, а сам шард забывается.
+    Финализатор только кладёт ключ в deque (без блокировки): он может
+    сработать в любом потоке, в том числе внутри totals().
+    """
+
+    __slots__ = ("_size", "_local", "_live", "_base", "_retired", "_keys", "_lock")
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._local = threading.local()
+        self._live: dict[int, list[float]] = {}
+        self._base = [0.0] * size
+        self._retired: deque[int] = deque()
+        self._keys = itertools.count()
+        self._lock = threading.Lock()
+
+    def get(self) -> list[float]:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = [0.0] * self._size
+            owner = _ShardOwner()
+            key = next(self._keys)
+            with self._lock:
+                self._fold_retired()
+                self._live[key] = values
+            weakref.finalize(owner, self._retired.append, key)
+            self._local.owner = owner
+            self._local.values = values
+            return values
+
+    def totals(self) -> list[float]:
+        with self._lock:
+            self._fold_retired()
+            result = list(self._base)
+            shards = list(self._live.values())
+        for shard in shards:
+            for idx, value in enumerate(shard):
+                result[idx] += value
+        return result
+
+    def __len__(self) -> int:
+        """Число живых шардов (для тестов и отладки)."""
+        with self._lock:
+            self._fold_retired()
+            return len(self._live)
+
+    def _fold_retired(self) -> None:
+        # Вызывается под self._lock
+        while self._retired:
+            values = self._live.pop(self._retired.popleft())
+            for idx, value in enumerate(values):
+                self._base[idx] += value
+
+
+# --- Дочерние метрики (конкретный набор значений меток) ---
+
+
+class _CounterChild:
+    __slots__ = ("_shards",)
+
+    def __init__(self) -> None:
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shards.get()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._shards.totals()[0]
+
+
+class _GaugeChild:
+    """Gauge не на горячем пути (глубина очереди, скорость) — обычная блокировка."""
+
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class _HistogramChild:
+    # Шард: [count по бакетам..., count в +Inf, sum]
+    __slots__ = ("_bounds", "_shards")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        self._shards = _Shards(len(bounds) + 2)
+
+    def observe(self, value: float) -> None:
+        shard = self._shards.get()
+        shard[bisect_left(self._bounds, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self) -> tuple[list[float], float, float]:
+        """(накопительные счётчики по бакетам, включая +Inf; count; sum)."""
+        totals = self._shards.totals()
+        cumulative: list[float] = []
+        running = 0.0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, running, totals[-1]
+
+
+# --- Метрики с метками ---
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_child(self):
+        """Новая дочерняя метрика для очередного набора значений меток."""
+
+    def labels(self, *values: object, **kwargs: object):
+        """Дочерняя метрика для значений меток (кэшируется)."""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"Metric '{self.name}' expects labels {self.labelnames}, got {key}"
+                )
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _default(self):
+        return self.labels()
+
+    def children(self) -> list[tuple[tuple[str, ...], object]]:
+        with self._lock:
+            return list(self._children.items())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+
+# --- No-op метрики ---
+
+
+class _NoopChild:
+    __slots__ = ()
+    value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        pass
+
+    def dec(self, amount: float = 1.0) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def observe(self, value: float) -> None:
+        pass
+
+    def labels(self, *values: object, **kwargs: object) -> "_NoopChild":
+        return self
+
+
+_NOOP = _NoopChild()
+
+
+# --- Реестр ---
+
+
+AnyMetric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """Реестр метрик. Повторная регистрация с тем же именем возвращает ту же метрику."""
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, AnyMetric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, documentation: str, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric '{name}' is already registered with another type/labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def collect(self) -> list[AnyMetric]:
+        with self._lock:
+            return sorted(self._metrics.values(), key=lambda m: m.name)
+
+    def render(self) -> str:
+        return render_text(self)
+
+
+class NoopRegistry(MetricsRegistry):
+    """Реестр, все метрики которого ничего не делают и ничего не выдают."""
+
+    enabled = False
+
+    def counter(self, name, documentation, labelnames=()):  # type: ignore[override]
+        return _NOOP
+
+    def gauge(self, name, documentation, labelnames=()):  # type: ignore[override]
+        return _NOOP
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):  # type: ignore[override]
+        return _NOOP
+
+
+_registry: MetricsRegistry = MetricsRegistry()
+
+
+def configure_metrics(enabled: bool = True) -> MetricsRegistry:
+    """
+    Переключает глобальный реестр. Вызывать до сборки сервисов:
+    метрики захватываются инструментированными обёртками при создании.
+    """
+    global _registry
+    if enabled and not _registry.enabled:
+        _registry = MetricsRegistry()
+    elif not enabled and _registry.enabled:
+        _registry = NoopRegistry()
+    return _registry
+
+
+def get_registry() -> MetricsRegistry:
+    return _registry
+
+
+# --- Текстовый формат Prometheus ---
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if math.isinf(bound) else repr(float(bound))
+
+
+def render_text(registry: MetricsRegistry) -> str:
+    """Экспозиция всех метрик реестра (text format 0.0.4)."""
+    lines: list[str] = []
+    for metric in registry.collect():
+        lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for label_values, child in sorted(metric.children()):
+            if isinstance(metric, Histogram):
+                cumulative, count, total = child.snapshot()
+                for bound, value in zip((*metric.buckets, math.inf), cumulative):
+                    labels = _format_labels(
+                        metric.labelnames, label_values, f'le="{_format_bound(bound)}"'
+                    )
+                    lines.append(f"{metric.name}_bucket{labels} {_format_value(value)}")
+                labels = _format_labels(metric.labelnames, label_values)
+                lines.append(f"{metric.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{metric.name}_count{labels} {_format_value(count)}")
+            else:
+                labels = _format_labels(metric.labelnames, label_values)
+                lines.append(f"{metric.name}{labels} {_format_value(child.value)}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+# --- Выдача ---
+
+
+def write_textfile(path: Union[str, Path], registry: Optional[MetricsRegistry] = None) -> None:
+    """
+    Атомарно записывает метрики в файл (для node_exporter textfile collector):
+    пишем во временный файл рядом и переименовываем.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(render_text(registry or get_registry()), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class MetricsHTTPServer:
+    """HTTP-сервер с /metrics в фоновом daemon-потоке."""
+
+    def __init__(
+        self,
+        port: int,
+        addr: str = "127.0.0.1",
+        registry: Optional[MetricsRegistry] = None,
+    ) -> None:
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = render_text(registry_ref or get_registry()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((addr, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="metrics-http",
+            daemon=True,
+        )
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "MetricsHTTPServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def start_http_server(
+    port: int,
+    addr: str = "127.0.0.1",
+    registry: Optional[MetricsRegistry] = None,
+) -> MetricsHTTPServer:
+    """Запускает выдачу /metrics на локальном порту (0 — любой свободный)."""
+    return MetricsHTTPServer(port, addr, registry).start()
+
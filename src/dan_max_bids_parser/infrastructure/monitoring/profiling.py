@@ -0,0 +1,325 @@
+# path: src/dan_max_bids_parser/infrastructure/monitoring/profiling.py
+"""
+Профилирование запуска CLI одним флагом (--profile cpu|memory|sql).
+
+Результаты пишутся в отдельный каталог <base>/<label>_<YYYYmmdd-HHMMSS>/:
+
+- cpu:    cpu.pstats (cProfile; смотреть snakeviz/pstats) и cpu_top.txt —
+          топ функций по cumulative и по собственному времени;
+- memory: memory.txt — по этапам StageTimer прирост и пик tracemalloc,
+          текущий и пиковый RSS; топ мест аллокаций за весь запуск;
+- sql:    sql.log — каждый запрос с длительностью, числом строк, этапом и
+          методом репозитория; sql_summary.txt — агрегаты по методам и этапам.
+
+Профили memory/sql привязываются к этапам через слушатель StageTimer.
+cpu и memory рассчитаны на работу в одном потоке: cProfile (Python 3.11)
+видит только поток, где вызван start(), а строки memory берутся из
+stage()-блоков StageTimer. Конвейер с потоками-воркерами (StagedHarvestService
+пишет этапы через timer.add) профилируется только в режиме sql.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional, TextIO
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from dan_max_bids_parser.application.stage_timer import (
+    add_stage_listener,
+    remove_stage_listener,
+)
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cpu", "memory", "sql")
+# Режимы, не видящие работу потоков-воркеров
+MAIN_THREAD_PROFILE_MODES = ("cpu", "memory")
+
+# Модули, чьи методы считаются «логическими операциями» для SQL-профиля
+_SQL_CALLER_MODULES = (
+    "dan_max_bids_parser.infrastructure.db.repositories",
+    "dan_max_bids_parser.infrastructure.db.unit_of_work",
+)
+
+
+def make_profile_dir(base: str | Path, label: str) -> Path:
+    """Создаёт каталог <base>/<label>_<timestamp> (с суффиксом при совпадении)."""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = Path(base) / f"{label}_{stamp}"
+    suffix = 1
+    while path.exists():
+        suffix += 1
+        path = Path(base) / f"{label}_{stamp}_{suffix}"
+    path.mkdir(parents=True)
+    return path
+
+
+class _Profiler(ABC):
+    def __init__(self, output_dir: Path) -> None:
+        self.output_dir = output_dir
+
+    @abstractmethod
+    def start(self) -> None:
+        """Начинает сбор профиля."""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Останавливает сбор и пишет отчёты в output_dir."""
+
+
+# --- CPU ---
+
+
+class CpuProfiler(_Profiler):
+    def __init__(self, output_dir: Path, top: int = 60) -> None:
+        super().__init__(output_dir)
+        self._profile = cProfile.Profile()
+        self._top = top
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> None:
+        self._profile.disable()
+        self._profile.dump_stats(str(self.output_dir / "cpu.pstats"))
+        buffer = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=buffer).strip_dirs()
+        buffer.write("=== by cumulative time ===\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self._top)
+        buffer.write("\n=== by own time ===\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self._top)
+        (self.output_dir / "cpu_top.txt").write_text(buffer.getvalue(), encoding="utf-8")
+
+
+# --- Память ---
+
+
+def _current_rss() -> Optional[int]:
+    """Текущий RSS в байтах (Linux: /proc/self/statm), иначе None."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _peak_rss() -> Optional[int]:
+    """Пиковый RSS процесса в байтах (resource есть не на всех платформах)."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдаёт КБ, macOS — байты
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class _StageMemory:
+    name: str
+    allocated: int = 0
+    traced_peak: int = 0
+    rss: Optional[int] = None
+    rss_peak: Optional[int] = None
+
+
+def _mb(value: Optional[int]) -> str:
+    return "—" if value is None else f"{value / 2**20:.1f}"
+
+
+class MemoryProfiler(_Profiler):
+    def __init__(self, output_dir: Path, frames: int = 10, top: int = 30) -> None:
+        super().__init__(output_dir)
+        self._frames = frames
+        self._top = top
+        self._stages: list[_StageMemory] = []
+        self._stage_started: dict[str, int] = {}
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+
+    def start(self) -> None:
+        tracemalloc.start(self._frames)
+        self._baseline = tracemalloc.take_snapshot()
+        add_stage_listener(self)
+
+    def on_stage_start(self, name: str) -> None:
+        tracemalloc.reset_peak()
+        self._stage_started[name] = tracemalloc.get_traced_memory()[0]
+
+    def on_stage_end(self, name: str, elapsed: float) -> None:
+        current, peak = tracemalloc.get_traced_memory()
+        started = self._stage_started.pop(name, current)
+        self._stages.append(
+            _StageMemory(
+                name=name,
+                allocated=current - started,
+                traced_peak=peak - started,
+                rss=_current_rss(),
+                rss_peak=_peak_rss(),
+            )
+        )
+
+    def stop(self) -> None:
+        remove_stage_listener(self)
+        snapshot = tracemalloc.take_snapshot()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        lines = [
+            f"{'stage':<24} {'retained MB':>12} {'peak MB':>10} {'RSS MB':>10} {'peak RSS MB':>12}"
+        ]
+        for stage in self._stages:
+            lines.append(
+                f"{stage.name:<24} {_mb(stage.allocated):>12} {_mb(stage.traced_peak):>10} "
+                f"{_mb(stage.rss):>10} {_mb(stage.rss_peak):>12}"
+            )
+        lines.append("")
+        lines.append(f"traced peak: {_mb(traced_peak)} MB, peak RSS: {_mb(_peak_rss())} MB")
+        lines.append("")
+        lines.append(f"=== top {self._top} allocation sites (retained since start) ===")
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        diff = snapshot.filter_traces(filters).compare_to(
+            self._baseline.filter_traces(filters), "lineno"
+        )
+        lines.extend(str(stat) for stat in diff[: self._top])
+        (self.output_dir / "memory.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+# --- SQL ---
+
+
+@dataclass
+class _SqlTotals:
+    statements: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+
+    def add(self, seconds: float, rows: int) -> None:
+        self.statements += 1
+        self.seconds += seconds
+        self.rows += max(rows, 0)
+
+
+def _sql_caller() -> str:
+    """Первый метод репозитория/UoW в стеке вызова: 'SqlAlchemyBidRepository.add_many'."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_globals.get("__name__", "").startswith(_SQL_CALLER_MODULES):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            return f"{type(owner).__name__}.{name}" if owner is not None else name
+        frame = frame.f_back
+    return "<other>"
+
+
+class SqlProfiler(_Profiler):
+    def __init__(self, output_dir: Path, engine: Engine) -> None:
+        super().__init__(output_dir)
+        self._engine = engine
+        self._log: Optional[TextIO] = None
+        self._stages: list[str] = []
+        self._by_caller: dict[str, _SqlTotals] = defaultdict(_SqlTotals)
+        self._by_stage: dict[str, _SqlTotals] = defaultdict(_SqlTotals)
+        self._total = _SqlTotals()
+
+    def start(self) -> None:
+        self._log = open(self.output_dir / "sql.log", "w", encoding="utf-8")
+        event.listen(self._engine, "before_cursor_execute", self._before)
+        event.listen(self._engine, "after_cursor_execute", self._after)
+        add_stage_listener(self)
+
+    def on_stage_start(self, name: str) -> None:
+        self._stages.append(name)
+
+    def on_stage_end(self, name: str, elapsed: float) -> None:
+        if self._stages:
+            self._stages.pop()
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("_profile_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["_profile_started"].pop()
+        rows = cursor.rowcount if cursor.rowcount is not None else -1
+        caller = _sql_caller()
+        stage = self._stages[-1] if self._stages else "<none>"
+        self._total.add(elapsed, rows)
+        self._by_caller[caller].add(elapsed, rows)
+        self._by_stage[stage].add(elapsed, rows)
+        one_line = " ".join(statement.split())
+        batch = " executemany" if executemany else ""
+        self._log.write(
+            f"{elapsed * 1000:9.3f} ms rows={rows:<6} [{stage}] {caller}{batch}: {one_line}\n"
+        )
+
+    def stop(self) -> None:
+        remove_stage_listener(self)
+        event.remove(self._engine, "before_cursor_execute", self._before)
+        event.remove(self._engine, "after_cursor_execute", self._after)
+        self._log.close()
+
+        def table(title: str, rows: dict[str, _SqlTotals]) -> list[str]:
+            out = [f"=== {title} ===", f"{'':<48} {'stmts':>7} {'ms':>10} {'rows':>8}"]
+            for key, totals in sorted(rows.items(), key=lambda kv: -kv[1].seconds):
+                out.append(
+                    f"{key:<48} {totals.statements:>7} {totals.seconds * 1000:>10.1f} "
+                    f"{totals.rows:>8}"
+                )
+            return out + [""]
+
+        lines = [
+            f"total: {self._total.statements} statements, "
+            f"{self._total.seconds * 1000:.1f} ms, {self._total.rows} rows",
+            "",
+        ]
+        lines += table("by repository method", self._by_caller)
+        lines += table("by stage", self._by_stage)
+        (self.output_dir / "sql_summary.txt").write_text("\n".join(lines), encoding="utf-8")
+
+
+@contextmanager
+def profile_session(
+    mode: str,
+    base_dir: str | Path,
+    label: str,
+    engine: Optional[Engine] = None,
+) -> Iterator[Path]:
+    """
+    Профилирует тело блока в режиме mode; возвращает каталог с результатами.
+    Результаты пишутся и при исключении внутри блока.
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {mode!r}")
+    output_dir = make_profile_dir(base_dir, f"{label}_{mode}")
+    profiler: Any
+    if mode == "cpu":
+        profiler = CpuProfiler(output_dir)
+    elif mode == "memory":
+        profiler = MemoryProfiler(output_dir)
+    else:
+        if engine is None:
+            raise ValueError("SQL profiling requires an engine")
+        profiler = SqlProfiler(output_dir, engine)
+
+    profiler.start()
+    try:
+        yield output_dir
+    finally:
+        profiler.stop()
+        logger.info("Profile (%s) written to %s", mode, output_dir)
@@ -0,0 +1,297 @@
+# path: src/dan_max_bids_parser/infrastructure/parsing/html_extractor.py
+"""
+Конфигурируемый извлекатель полей заявок из HTML на базе lxml.
+
+Правила разбора берутся из config_source.data["parser"]:
+
+    {
+        "parser": {
+            "type": "html",
+            "items": {"css": "table.bids tr.bid"},
+            "fields": {
+                "external_id": {"xpath": "./@data-id"},
+                "title": {"css": "td.cargo a"},
+                "url": {"css": "td.cargo a", "attr": "href", "absolute": true},
+                "weight_tons": {"css": "td.weight"},
+                "contact": {"css": "td.contact span", "multiple": true, "join": ", "}
+            }
+        }
+    }
+
+XPath поля может возвращать и скаляр ("normalize-space(./td[1])",
+"count(./td)"): строка берётся как есть, число и логическое значение —
+в текстовом виде.
+
+CSS-селекторы один раз транслируются в XPath (cssselect), после чего все
+выражения компилируются в etree.XPath. Компиляция выполняется только при
+смене версии конфигурации; разбор страницы идёт напрямую по дереву
+lxml.html, без BeautifulSoup.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Sequence
+from urllib.parse import urljoin
+
+import lxml.html
+from cssselect import GenericTranslator, SelectorError
+from lxml import etree
+
+from dan_max_bids_parser.domain.entities import (
+    ConfigEntryEntity,
+    RawItemEntity,
+    SourceEntity,
+)
+from dan_max_bids_parser.domain.ports import ParserPort
+
+logger = logging.getLogger(__name__)
+
+_CSS_TRANSLATOR = GenericTranslator()
+
+# HTMLParser в lxml не рассчитан на одновременное использование из
+# нескольких потоков — держим по экземпляру на поток.
+_parsers = threading.local()
+
+
+def _html_parser() -> lxml.html.HTMLParser:
+    parser = getattr(_parsers, "parser", None)
+    if parser is None:
+        parser = lxml.html.HTMLParser(encoding="utf-8", remove_comments=True)
+        _parsers.parser = parser
+    return parser
+
+
+def _compile_selector(spec: Any, where: str) -> etree.XPath:
+    """
+    Компилирует селектор вида {"css": ...} / {"xpath": ...} в etree.XPath.
+
+    Допускается и сокращённая строковая форма: "css:..." или "xpath:...".
+
+    :raises ValueError: если селектор некорректен.
+    """
+    if isinstance(spec, str):
+        kind, _, expr = spec.partition(":")
+        spec = {kind: expr}
+
+    if not isinstance(spec, Mapping):
+        raise ValueError(f"{where}: selector must be an object, got {spec!r}")
+
+    try:
+        if "xpath" in spec:
+            return etree.XPath(spec["xpath"], smart_strings=False)
+        if "css" in spec:
+            xpath = _CSS_TRANSLATOR.css_to_xpath(spec["css"])
+            return etree.XPath(xpath, smart_strings=False)
+    except (etree.XPathSyntaxError, SelectorError) as exc:
+        raise ValueError(f"{where}: invalid selector {dict(spec)!r}: {exc}") from exc
+
+    raise ValueError(f"{where}: selector must define 'css' or 'xpath'")
+
+
+def _node_text(node: Any, attr: Optional[str]) -> Optional[str]:
+    """Текст узла (или значение атрибута) с нормализацией пробелов."""
+    if isinstance(node, str):
+        value = node
+    elif attr is not None:
+        value = node.get(attr)
+        if value is None:
+            return None
+    else:
+        value = node.text_content()
+    value = " ".join(value.split())
+    return value or None
+
+
+def _scalar_text(value: Any) -> Optional[str]:
+    """
+    Результат XPath-функции вместо набора узлов: строка (normalize-space(),
+    string()), число (count(), sum()) или логическое значение (boolean()).
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        return str(int(value)) if value.is_integer() else str(value)
+    return _node_text(value, None)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledField:
+    """Скомпилированное правило извлечения одного поля."""
+
+    name: str
+    xpath: etree.XPath
+    attr: Optional[str] = None
+    multiple: bool = False
+    separator: str = " "
+    absolute: bool = False
+
+    def extract(self, node: Any, base_url: Optional[str]) -> Optional[str]:
+        matches = self.xpath(node)
+        if not isinstance(matches, list):
+            value = _scalar_text(matches)
+        elif not matches:
+            return None
+        elif self.multiple:
+            parts = [_node_text(m, self.attr) for m in matches]
+            value = self.separator.join(p for p in parts if p) or None
+        else:
+            value = _node_text(matches[0], self.attr)
+
+        if value is not None and self.absolute and base_url:
+            value = urljoin(base_url, value)
+        return value
+
+
+class CompiledExtractor:
+    """
+    Готовый к работе набор правил для одного источника.
+
+    Создаётся через compile_extractor() и переиспользуется, пока версия
+    конфигурации не изменится.
+    """
+
+    __slots__ = ("version", "_items", "_fields")
+
+    def __init__(
+        self,
+        version: str,
+        items: etree.XPath,
+        fields: Sequence[CompiledField],
+    ) -> None:
+        self.version = version
+        self._items = items
+        self._fields = tuple(fields)
+
+    @property
+    def field_names(self) -> tuple[str, ...]:
+        return tuple(f.name for f in self._fields)
+
+    def extract(
+        self,
+        payload: str | bytes,
+        base_url: Optional[str] = None,
+    ) -> list[dict[str, str]]:
+        """
+        Разбирает HTML-страницу и возвращает список словарей полей.
+
+        Пустые поля в словарь не попадают; строки без единого поля
+        пропускаются.
+        """
+        if not payload:
+            return []
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+
+        try:
+            root = lxml.html.document_fromstring(payload, parser=_html_parser())
+        except (etree.ParserError, ValueError):
+            logger.warning("Failed to parse HTML payload (url=%s)", base_url)
+            return []
+
+        result: list[dict[str, str]] = []
+        for node in self._items(root):
+            record: dict[str, str] = {}
+            for field in self._fields:
+                value = field.extract(node, base_url)
+                if value is not None:
+                    record[field.name] = value
+            if record:
+                result.append(record)
+        return result
+
+
+def compile_extractor(data: Mapping[str, Any], version: str = "") -> CompiledExtractor:
+    """
+    Компилирует правила из config_source.data["parser"].
+
+    :raises ValueError: если конфигурация некорректна.
+    """
+    parser_cfg = data.get("parser")
+    if not isinstance(parser_cfg, Mapping):
+        raise ValueError("config_source.data must contain 'parser' object")
+
+    items = _compile_selector(parser_cfg.get("items"), "parser.items")
+
+    fields_cfg = parser_cfg.get("fields")
+    if not isinstance(fields_cfg, Mapping) or not fields_cfg:
+        raise ValueError("parser.fields must be a non-empty object")
+
+    fields: list[CompiledField] = []
+    for name, spec in fields_cfg.items():
+        where = f"parser.fields.{name}"
+        options = spec if isinstance(spec, Mapping) else {}
+        fields.append(
+            CompiledField(
+                name=name,
+                xpath=_compile_selector(spec, where),
+                attr=options.get("attr"),
+                multiple=bool(options.get("multiple", False)),
+                separator=options.get("join", " "),
+                absolute=bool(options.get("absolute", False)),
+            )
+        )
+
+    return CompiledExtractor(version=version, items=items, fields=fields)
+
+
+def _is_html_parser_config(entry: ConfigEntryEntity) -> bool:
+    parser_cfg = entry.data.get("parser")
+    return isinstance(parser_cfg, Mapping) and parser_cfg.get("type", "html") == "html"
+
+
+class LxmlHtmlParser(ParserPort):
+    """
+    Реализация ParserPort для HTML-источников.
+
+    Связь с источником — по коду: config_source.code == Source.code.
+    Скомпилированные правила кэшируются по коду и пересобираются
+    только при смене ConfigEntryEntity.version.
+    """
+
+    def __init__(self) -> None:
+        self._extractors: dict[str, CompiledExtractor] = {}
+
+    def refresh(self, entries: Sequence[ConfigEntryEntity]) -> None:
+        actual: dict[str, CompiledExtractor] = {}
+        for entry in entries:
+            if not _is_html_parser_config(entry):
+                continue
+
+            version = entry.version
+            current = self._extractors.get(entry.code)
+            if current is not None and current.version == version:
+                actual[entry.code] = current
+                continue
+
+            try:
+                actual[entry.code] = compile_extractor(entry.data, version=version)
+            except ValueError:
+                # Битый конфиг одного источника не должен ломать остальные.
+                logger.exception("Invalid parser config for source '%s'", entry.code)
+                continue
+            logger.info(
+                "Compiled HTML extractor for source '%s' (version %s)",
+                entry.code,
+                version[:8],
+            )
+
+        self._extractors = actual
+
+    def supports(self, source: SourceEntity) -> bool:
+        return source.code in self._extractors
+
+    def parse(
+        self,
+        source: SourceEntity,
+        raw_item: RawItemEntity,
+    ) -> Sequence[Mapping[str, Any]]:
+        extractor = self._extractors.get(source.code)
+        if extractor is None:
+            return []
+        return extractor.extract(raw_item.payload, base_url=raw_item.url)
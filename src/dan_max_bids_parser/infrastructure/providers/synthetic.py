@@ -0,0 +1,236 @@
+# path: src/dan_max_bids_parser/infrastructure/providers/synthetic.py
+"""
+Синтетический RawItemProvider для нагрузочного и soak-тестирования.
+
+Генерирует N сырых объектов на каждый вызов fetch_raw_items:
+- HTML: страница-листинг в разметке ATI (разбирается тем же конфигом
+  парсера, что и реальный ATI), 1–N заявок на страницу;
+- JSON: ответ API со списком заявок;
+- Telegram: текст сообщения о перевозке.
+
+Содержимое детерминировано: зависит только от seed, кода источника и
+номера вызова для этого источника — повторный запуск с тем же seed даёт
+тот же поток. Размер payload задаётся средним числом заявок на страницу
+и лог-нормальным разбросом (size_sigma). Доля duplicate_ratio объектов —
+повторы ранее выданных (тот же external_id и payload), чтобы нагружать
+дедупликацию. latency_ms / latency_jitter_ms имитируют задержку сети.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable
+
+from dan_max_bids_parser.domain.entities import RawItemEntity, SourceEntity
+from dan_max_bids_parser.domain.ports import RawItemProviderPort
+
+PAYLOAD_KINDS = ("html", "json", "telegram")
+
+# Вид payload по Source.kind; для неизвестных — смесь из settings.kinds
+_KIND_BY_SOURCE_KIND = {"html": "html", "api": "json", "telegram": "telegram"}
+
+# Сколько выданных объектов на источник помнить для повторов
+_DUPLICATE_HISTORY = 10_000
+
+_CARGOS = ["Щебень гранитный", "Песок мытый", "ПГС", "Гравий", "Отсев", "Керамзит", "Грунт"]
+_CITIES = ["Москва", "Тверь", "Клин", "Химки", "Калуга", "Тула", "Рязань", "Ярославль", "Подольск"]
+_TRANSPORT = ["самосвал 20 т", "самосвал 30 т", "тонар", "полуприцеп", "шаланда"]
+_NOTES = [
+    "",
+    "Загрузка утром, оплата на карту без НДС.",
+    "Работаем постоянно, нужны машины на неделю, возможна предоплата 50%.",
+    "Документы: ТТН, путевой лист. Простой оплачивается. Возможен догруз попутно.",
+]
+_TELEGRAM_TEMPLATES = [
+    "{cargo} {weight} т, {src} - {dst}, {price} руб, тел {phone}. {note}",
+    "Нужен {transport}! {cargo} {weight} тонн из {src} в {dst}. Оплата {price} руб. "
+    "Звонить {phone}. {note}",
+    "Срочно {cargo}, {weight} т. Загрузка {src}, выгрузка {dst}. Ставка {price} руб. {note}",
+]
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticProviderSettings:
+    """Параметры генерации (все значения — на один вызов fetch_raw_items)."""
+
+    items_per_fetch: int = 100
+    seed: int = 0
+    kinds: Mapping[str, float] = field(
+        default_factory=lambda: {"html": 0.5, "json": 0.2, "telegram": 0.3}
+    )
+    duplicate_ratio: float = 0.0
+    mean_rows: int = 25
+    size_sigma: float = 0.5
+    max_rows: int = 500
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.items_per_fetch < 0:
+            raise ValueError("items_per_fetch must be >= 0")
+        if not 0.0 <= self.duplicate_ratio <= 1.0:
+            raise ValueError("duplicate_ratio must be within [0, 1]")
+        unknown = set(self.kinds) - set(PAYLOAD_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown payload kinds: {sorted(unknown)}")
+        if not any(weight > 0 for weight in self.kinds.values()):
+            raise ValueError("At least one payload kind must have a positive weight")
+        if self.mean_rows < 1 or self.max_rows < 1:
+            raise ValueError("mean_rows and max_rows must be >= 1")
+        if self.latency_ms < 0 or self.latency_jitter_ms < 0:
+            raise ValueError("latency must be >= 0")
+
+
+class SyntheticRawItemProvider(RawItemProviderPort):
+    """
+    Реализация RawItemProviderPort, генерирующая поток сырых объектов.
+
+    Потокобезопасность не гарантируется: один экземпляр — один харвестер.
+    """
+
+    def __init__(
+        self,
+        settings: SyntheticProviderSettings | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._settings = settings or SyntheticProviderSettings()
+        self._sleep = sleep
+        self._calls: dict[str, int] = {}
+        self._history: dict[str, deque[tuple[str, str, str]]] = {}
+
+    def fetch_raw_items(self, source: SourceEntity) -> Iterable[RawItemEntity]:
+        settings = self._settings
+        call_no = self._calls.get(source.code, 0)
+        self._calls[source.code] = call_no + 1
+        # Строковый seed: random хеширует его детерминированно (sha512)
+        rng = random.Random(f"{settings.seed}:{source.code}:{call_no}")
+
+        self._simulate_latency(rng)
+
+        kinds, weights = self._kinds_for(source)
+        history = self._history.setdefault(source.code, deque(maxlen=_DUPLICATE_HISTORY))
+        now = datetime.utcnow()
+        items: list[RawItemEntity] = []
+        for idx in range(settings.items_per_fetch):
+            if history and rng.random() < settings.duplicate_ratio:
+                external_id, payload, url = history[rng.randrange(len(history))]
+            else:
+                kind = rng.choices(kinds, weights)[0]
+                external_id = f"syn-{source.code}-{settings.seed}-{call_no}-{idx}"
+                payload = self._payload(kind, rng)
+                url = f"https://synthetic.test/{source.code.lower()}/{kind}/{call_no}/{idx}"
+                history.append((external_id, payload, url))
+            items.append(
+                RawItemEntity(
+                    source_id=source.id or 0,
+                    external_id=external_id,
+                    payload=payload,
+                    url=url,
+                    created_at=now,
+                    received_at=now,
+                )
+            )
+        return items
+
+    # --- Генерация ---
+
+    def _kinds_for(self, source: SourceEntity) -> tuple[list[str], list[float]]:
+        kind = _KIND_BY_SOURCE_KIND.get(source.kind)
+        if kind is not None:
+            return [kind], [1.0]
+        kinds = [k for k, w in self._settings.kinds.items() if w > 0]
+        return kinds, [self._settings.kinds[k] for k in kinds]
+
+    def _simulate_latency(self, rng: random.Random) -> None:
+        settings = self._settings
+        delay_ms = settings.latency_ms
+        if settings.latency_jitter_ms:
+            delay_ms += rng.uniform(0, settings.latency_jitter_ms)
+        if delay_ms > 0:
+            self._sleep(delay_ms / 1000)
+
+    def _rows(self, rng: random.Random) -> int:
+        settings = self._settings
+        rows = settings.mean_rows * rng.lognormvariate(0.0, settings.size_sigma)
+        return max(1, min(settings.max_rows, round(rows)))
+
+    def _payload(self, kind: str, rng: random.Random) -> str:
+        if kind == "html":
+            return html_listing(rng, self._rows(rng))
+        if kind == "json":
+            return api_json(rng, self._rows(rng))
+        return telegram_text(rng)
+
+
+def _phone(rng: random.Random) -> str:
+    return f"+7 9{rng.randint(10, 99)} {rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(10, 99)}"
+
+
+def html_listing(rng: random.Random, rows: int) -> str:
+    """Страница-листинг в разметке ATI: «обвязка» сайта + таблица заявок."""
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Грузы</title>",
+        "<script>window.__STATE__ = {};</script>",
+        "<link rel='stylesheet' href='/static/app.css'></head><body>",
+        "<header><nav>",
+        "".join(f"<a href='/section/{i}'>Раздел {i}</a>" for i in range(30)),
+        "</nav></header><main>",
+        "<table class='bids-list'><thead><tr><th>Груз</th><th>Маршрут</th></tr></thead><tbody>",
+    ]
+    for _ in range(rows):
+        bid_id = rng.randint(10_000_000, 99_999_999)
+        parts.append(
+            f"<tr class='bid-row' data-bid-id='{bid_id}'>"
+            f"<td class='bid-cargo'><a class='bid-link' href='/loads/{bid_id}'>{rng.choice(_CARGOS)}</a>"
+            f"<div class='bid-note'>{rng.choice(_NOTES)}</div></td>"
+            f"<td class='bid-route'><span class='route-from'>{rng.choice(_CITIES)}</span>"
+            f" — <span class='route-to'>{rng.choice(_CITIES)}</span>"
+            f"<small>{rng.randint(20, 900)} км</small></td>"
+            f"<td class='bid-weight'>{rng.randint(5, 40)} т</td>"
+            f"<td class='bid-price'>{rng.randint(8, 90) * 1000} руб</td>"
+            f"<td class='bid-transport'>{rng.choice(_TRANSPORT)}</td>"
+            f"<td class='bid-date'>сегодня {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}</td>"
+            f"<td class='bid-contact'><span>{_phone(rng)}</span><span>ООО Карьер</span></td>"
+            "</tr>"
+        )
+    parts.append("</tbody></table></main><footer>© synthetic</footer></body></html>")
+    return "".join(parts)
+
+
+def api_json(rng: random.Random, rows: int) -> str:
+    """Ответ API: {"items": [...], "total": rows}."""
+    items = [
+        {
+            "id": rng.randint(10**6, 10**7),
+            "cargo": rng.choice(_CARGOS),
+            "weight": f"{rng.randint(5, 40)} т",
+            "from": rng.choice(_CITIES),
+            "to": rng.choice(_CITIES),
+            "price": f"{rng.randint(8, 90) * 1000} руб",
+            "transport": rng.choice(_TRANSPORT),
+            "contact": _phone(rng),
+            "comment": rng.choice(_NOTES),
+        }
+        for _ in range(rows)
+    ]
+    return json.dumps({"items": items, "total": rows}, ensure_ascii=False)
+
+
+def telegram_text(rng: random.Random) -> str:
+    """Сообщение из Telegram-чата перевозчиков (150–400 байт)."""
+    return rng.choice(_TELEGRAM_TEMPLATES).format(
+        cargo=rng.choice(_CARGOS),
+        weight=rng.randint(5, 40),
+        src=rng.choice(_CITIES),
+        dst=rng.choice(_CITIES),
+        price=rng.randint(8, 90) * 1000,
+        transport=rng.choice(_TRANSPORT),
+        phone=_phone(rng),
+        note=rng.choice(_NOTES),
+    ).strip()
@@ -0,0 +1,131 @@
+# path: src/dan_max_bids_parser/interfaces/export_analytics_cli.py
+"""
+CLI-интерфейс для use-case ExportAnalytics: партиционированный Parquet
+с заявками (и метаданными raw_items) для аналитиков.
+
+Нужен pyarrow (extra "parquet"): pip install 'dan-max-bids-parser[parquet]'.
+
+Пример использования (из корня проекта):
+
+    poetry run python -m dan_max_bids_parser.interfaces.export_analytics_cli \\
+        --output-dir exports/analytics --since-days 90 --raw-items
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from typing import Optional, Sequence
+
+from dan_max_bids_parser.config import get_settings
+from dan_max_bids_parser.application.use_cases.export_analytics import ExportAnalyticsCommand
+from dan_max_bids_parser.application.use_cases.export_analytics_service import (
+    ExportAnalyticsService,
+)
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.domain.ports import ColumnarExportPort
+
+# ВАЖНО: настройки и DATABASE_URL — до импорта infrastructure.db.base
+_settings = get_settings()
+os.environ.setdefault("DATABASE_URL", _settings.DATABASE_URL)
+
+from dan_max_bids_parser.infrastructure.db.base import SessionFactory  # noqa: E402
+from dan_max_bids_parser.infrastructure.db.unit_of_work import (  # noqa: E402
+    SqlAlchemyUnitOfWork,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _uow_factory() -> UnitOfWork:
+    return SqlAlchemyUnitOfWork(SessionFactory)
+
+
+def _parquet_exporter(output_dir: str, compression: str) -> ColumnarExportPort:
+    try:
+        from dan_max_bids_parser.infrastructure.export.parquet_writer import (
+            ParquetDatasetWriter,
+        )
+    except ImportError:
+        raise ValueError(
+            "pyarrow is not installed: pip install 'dan-max-bids-parser[parquet]'"
+        ) from None
+    return ParquetDatasetWriter(output_dir, compression=compression)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="dan_max_bids_export_analytics",
+        description="Выгрузка заявок в партиционированный Parquet (ExportAnalyticsUseCase).",
+    )
+    parser.add_argument("--output-dir", required=True, help="Каталог набора данных.")
+    parser.add_argument(
+        "--since-days",
+        type=int,
+        default=None,
+        help="Только записи за последние N дней (с начала дня); по умолчанию — вся история.",
+    )
+    parser.add_argument(
+        "--source-code",
+        action="append",
+        default=[],
+        help="Код источника (можно несколько раз); по умолчанию — все.",
+    )
+    parser.add_argument(
+        "--raw-items",
+        action="store_true",
+        help="Выгрузить также метаданные raw_items (без payload).",
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument(
+        "--compression",
+        default="zstd",
+        choices=("zstd", "snappy", "gzip", "none"),
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+
+    args = parse_args(argv)
+    command = ExportAnalyticsCommand(
+        since_days=args.since_days,
+        source_codes=tuple(args.source_code),
+        include_raw_items=args.raw_items,
+        batch_size=args.batch_size,
+    )
+
+    try:
+        service = ExportAnalyticsService(
+            uow_factory=_uow_factory,
+            exporter=_parquet_exporter(args.output_dir, args.compression),
+        )
+        result = service.execute(command)
+    except ValueError as exc:
+        logger.error("Business error during analytics export: %s", exc)
+        print(f"ERROR: {exc}")
+        return 1
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Unexpected error during analytics export")
+        print(f"UNEXPECTED ERROR: {exc}")
+        return 1
+
+    for dataset in result.datasets:
+        print(
+            f"{dataset.name}: rows={dataset.rows}, files={dataset.files}, "
+            f"size={dataset.bytes / 2**20:.1f}MB, location={dataset.location}"
+        )
+    print(f"Analytics export finished: job_id={result.job_id}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    import sys
+
+    raise SystemExit(main(sys.argv[1:]))
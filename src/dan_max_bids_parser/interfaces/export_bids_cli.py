@@ -0,0 +1,125 @@
+# path: src/dan_max_bids_parser/interfaces/export_bids_cli.py
+"""
+CLI-интерфейс для use-case ExportBidsToXlsx.
+
+Выгрузка описывается записью config_export (отбор, колонки, путь файла).
+Адаптер выбирается по target: xlsx — файл, sheets — синхронизация листа
+Google Sheets (GOOGLE_SHEETS_TOKEN, GOOGLE_SHEETS_API_URL в окружении).
+
+Пример использования (из корня проекта):
+
+    poetry run python -m dan_max_bids_parser.interfaces.export_bids_cli --export-code monthly
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from typing import Optional, Sequence
+
+from dan_max_bids_parser.config import get_settings
+from dan_max_bids_parser.application.use_cases.export_bids_to_xlsx import (
+    ExportBidsToXlsxCommand,
+)
+from dan_max_bids_parser.application.use_cases.export_bids_to_xlsx_service import (
+    ExportBidsToXlsxService,
+)
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.domain.ports import ExportPort
+from dan_max_bids_parser.domain.services.bid_export import ExportSpec
+
+# ВАЖНО: настройки и DATABASE_URL — до импорта infrastructure.db.base
+_settings = get_settings()
+os.environ.setdefault("DATABASE_URL", _settings.DATABASE_URL)
+
+from dan_max_bids_parser.infrastructure.db.base import SessionFactory  # noqa: E402
+from dan_max_bids_parser.infrastructure.db.unit_of_work import (  # noqa: E402
+    SqlAlchemyUnitOfWork,
+)
+from dan_max_bids_parser.infrastructure.export.sheets_sync import (  # noqa: E402
+    HttpSheetsTransport,
+    SheetsSyncWriter,
+)
+from dan_max_bids_parser.infrastructure.export.xlsx_writer import (  # noqa: E402
+    XlsxExportWriter,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _uow_factory() -> UnitOfWork:
+    return SqlAlchemyUnitOfWork(SessionFactory)
+
+
+def _writer(spec: ExportSpec, path: str) -> ExportPort:
+    if spec.target == "sheets":
+        transport = HttpSheetsTransport(
+            spec.spreadsheet_id,
+            token=_settings.GOOGLE_SHEETS_TOKEN,
+            base_url=_settings.GOOGLE_SHEETS_API_URL,
+        )
+        return SheetsSyncWriter(
+            transport,
+            sheet_title=spec.sheet,
+            index_path=path,
+            location=f"https://docs.google.com/spreadsheets/d/{spec.spreadsheet_id}",
+        )
+    return XlsxExportWriter(path, sheet_title=spec.sheet)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="dan_max_bids_export",
+        description="Выгрузка заявок в XLSX по записи config_export (ExportBidsToXlsxUseCase).",
+    )
+    parser.add_argument(
+        "--export-code",
+        required=True,
+        help="Код записи config_export.",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Путь к файлу (для sheets — к индексу листа); по умолчанию — path из config_export.",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Для режимов append/upsert: перевыгрузить всё, игнорируя курсор.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+
+    args = parse_args(argv)
+    service = ExportBidsToXlsxService(uow_factory=_uow_factory, writer_factory=_writer)
+    command = ExportBidsToXlsxCommand(
+        export_code=args.export_code, output_path=args.output, full=args.full
+    )
+
+    try:
+        result = service.execute(command)
+    except ValueError as exc:
+        logger.error("Business error during export: %s", exc)
+        print(f"ERROR: {exc}")
+        return 1
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Unexpected error during export")
+        print(f"UNEXPECTED ERROR: {exc}")
+        return 1
+
+    print(f"Export finished: job_id={result.job_id}, rows={result.rows}, location={result.location}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    import sys
+
+    raise SystemExit(main(sys.argv[1:]))
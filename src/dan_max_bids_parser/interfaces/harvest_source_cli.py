@@ -9,6 +9,34 @@ CLI-интерфейс для ручного запуска use-case RunSourceHa
 На данном этапе CLI использует простого StubRawItemProvider, который
 генерирует тестовые RawItemEntity, чтобы продемонстрировать end-to-end поток:
 Source -> RawItem -> Bid через SqlAlchemyUnitOfWork.
+
+Для нагрузочного/soak-тестирования есть синтетический провайдер:
+
+    poetry run python -m dan_max_bids_parser.interfaces.harvest_source_cli \
+        --source-code ATI --provider synthetic --items 5000 --runs 20 \
+        --duplicate-ratio 0.1 --latency-ms 200
+
+Конвейер этапов fetch -> parse_normalize -> classify_filter -> store
+с ограниченными очередями (StagedHarvestService):
+
+    poetry run python -m dan_max_bids_parser.interfaces.harvest_source_cli \
+        --source-code ATI --provider synthetic --items 5000 \
+        --staged --batch-size 200 --parse-workers 2 --queue-size 4
+
+Запуски одного источника из cron, планировщика и воркеров очереди
+исключают друг друга (блокировка источника, --on-busy; по умолчанию
+занятый источник пропускается):
+
+    poetry run python -m dan_max_bids_parser.interfaces.harvest_source_cli \
+        --source-code ATI --on-busy wait --lock-wait-seconds 300
+
+Профилирование медленного запуска (результат — в profiles/<метка>_<время>/):
+
+    poetry run python -m dan_max_bids_parser.interfaces.harvest_source_cli \
+        --source-code ATI --profile sql
+
+С --staged доступен только --profile sql: cpu видит лишь главный поток,
+а memory — этапы StageTimer, которых у конвейера нет (см. profiling).
 """
 
 from __future__ import annotations
@@ -16,19 +44,26 @@ from __future__ import annotations
 import argparse
 import logging
 import os
-from datetime import datetime
-from typing import Iterable, Optional, Sequence
+from typing import Optional, Sequence
 
 from dan_max_bids_parser.config import get_settings
+from dan_max_bids_parser.application.source_lock import ExclusiveHarvestService
 from dan_max_bids_parser.application.use_cases.harvest_source import (
     RunSourceHarvestingCommand,
+    RunSourceHarvestingUseCase,
 )
 from dan_max_bids_parser.application.use_cases.harvest_source_service import (
     RunSourceHarvestingService,
 )
+from dan_max_bids_parser.application.use_cases.staged_harvest_service import (
+    StageSettings,
+    StagedHarvestService,
+)
 from dan_max_bids_parser.application.unit_of_work import UnitOfWork
-from dan_max_bids_parser.domain.entities import RawItemEntity, SourceEntity
 from dan_max_bids_parser.domain.ports import RawItemProviderPort
+from dan_max_bids_parser.domain.services.bid_filter import BidFilter
+from dan_max_bids_parser.domain.services.classifier import BidClassifier
+from dan_max_bids_parser.domain.services.gazetteer import Gazetteer
 
 # ВАЖНО:
 # Сначала инициализируем настройки и окружение (DATABASE_URL),
@@ -36,51 +71,45 @@ from dan_max_bids_parser.domain.ports import RawItemProviderPort
 _settings = get_settings()
 os.environ.setdefault("DATABASE_URL", _settings.DATABASE_URL)
 
-from dan_max_bids_parser.infrastructure.db.base import SessionFactory  # noqa: E402
+from dan_max_bids_parser.infrastructure.db.base import SessionFactory, engine  # noqa: E402
 from dan_max_bids_parser.infrastructure.db.unit_of_work import (  # noqa: E402
     SqlAlchemyUnitOfWork,
 )
+from dan_max_bids_parser.infrastructure.monitoring.instrumentation import (  # noqa: E402
+    HarvestMetrics,
+    InstrumentedHarvestService,
+    InstrumentedRawItemProvider,
+    instrument_uow_factory,
+)
+from dan_max_bids_parser.infrastructure.parsing.html_extractor import (  # noqa: E402
+    LxmlHtmlParser,
+)
+from dan_max_bids_parser.infrastructure.monitoring.profiling import (  # noqa: E402
+    MAIN_THREAD_PROFILE_MODES,
+    PROFILE_MODES,
+    profile_session,
+)
+from dan_max_bids_parser.interfaces.lock_options import (  # noqa: E402
+    add_lock_arguments,
+    build_source_lock,
+    exclusive,
+)
+from dan_max_bids_parser.interfaces.pipeline_factory import build_pipeline  # noqa: E402
+from dan_max_bids_parser.interfaces.provider_options import (  # noqa: E402
+    StubRawItemProvider,
+    add_provider_arguments,
+    build_provider,
+)
+from dan_max_bids_parser.interfaces.metrics_options import (  # noqa: E402
+    add_metrics_arguments,
+    flush_metrics,
+    setup_metrics,
+)
 
 
 logger = logging.getLogger(__name__)
 
 
-class StubRawItemProvider(RawItemProviderPort):
-    """
-    Простейший провайдер сырых объектов.
-
-    Генерирует 1–2 тестовых RawItemEntity, чтобы можно было:
-    - проверить wiring UoW + use-case;
-    - увидеть, что данные проходят через весь ETL-поток и попадают в БД.
-
-    В будущем этот провайдер будет заменён на реальные HTML/Telegram/API-адаптеры.
-    """
-
-    def fetch_raw_items(self, source: SourceEntity) -> Iterable[RawItemEntity]:
-        now = datetime.utcnow()
-
-        # В реальной реализации здесь будет парсинг HTML/JSON/сообщений.
-        payload_text = (
-            f"Stub payload for source {source.code} "
-            f"at {now.isoformat(timespec='seconds')}"
-        )
-
-        # source.id может быть None, если источник только что создан и не сохранён,
-        # но в нашем CLI предполагаем, что источники уже заведены в БД.
-        source_id = source.id or 0
-
-        return [
-            RawItemEntity(
-                source_id=source_id,
-                external_id=f"stub-{source.code}-{now:%Y%m%d%H%M%S}",
-                payload=payload_text,
-                url=None,
-                created_at=now,
-                received_at=now,
-            )
-        ]
-
-
 def _create_uow_factory() -> callable:
     """
     Фабрика UnitOfWork для CLI.
@@ -93,16 +122,48 @@ def _create_uow_factory() -> callable:
     return factory
 
 
-def _build_service() -> RunSourceHarvestingService:
+def _build_service(
+    raw_item_provider: Optional[RawItemProviderPort] = None,
+    options: Optional[argparse.Namespace] = None,
+) -> RunSourceHarvestingUseCase:
     """
-    Собирает RunSourceHarvestingService для использования в CLI.
+    Собирает RunSourceHarvestingService для использования в CLI
+    (обёрнутый метриками; в no-op режиме обёртки почти бесплатны) под
+    блокировкой источника. options — аргументы CLI: --staged (конвейер
+    этапов StagedHarvestService) и --on-busy; без них — политика skip.
     """
-    uow_factory = _create_uow_factory()
-    raw_item_provider = StubRawItemProvider()
-    return RunSourceHarvestingService(
-        uow_factory=uow_factory,
-        raw_item_provider=raw_item_provider,
+    metrics = HarvestMetrics()
+    uow_factory = instrument_uow_factory(_create_uow_factory(), metrics)
+    raw_item_provider = InstrumentedRawItemProvider(
+        raw_item_provider or StubRawItemProvider(), metrics
     )
+    if options is not None and options.staged:
+        service: RunSourceHarvestingUseCase = StagedHarvestService(
+            uow_factory=uow_factory,
+            raw_item_provider=raw_item_provider,
+            pipeline_factory=build_pipeline,
+            batch_size=options.batch_size,
+            parse_stage=StageSettings(options.parse_workers, options.queue_size),
+            filter_stage=StageSettings(1, options.queue_size),
+            store_stage=StageSettings(options.store_workers, options.queue_size),
+            on_stage_stats=metrics.record_stages,
+            on_queue_depth=metrics.set_stage_queue_depth,
+        )
+    else:
+        service = RunSourceHarvestingService(
+            uow_factory=uow_factory,
+            raw_item_provider=raw_item_provider,
+            parser=LxmlHtmlParser(),
+            classifier=BidClassifier(),
+            bid_filter=BidFilter(),
+            gazetteer=Gazetteer.load(),
+        )
+    # Блокировка — снаружи: пропущенный запуск не считается в метриках сбора
+    service = InstrumentedHarvestService(service, metrics)
+    locks = build_source_lock(metrics)
+    if options is None:
+        return ExclusiveHarvestService(service, locks, _create_uow_factory())
+    return exclusive(service, options, locks, _create_uow_factory())
 
 
 def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
@@ -123,20 +184,69 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         required=True,
         help="Код источника (Source.code), для которого нужно запустить harvesting.",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=1,
+        help="Сколько раз подряд запустить harvesting (soak-тест).",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        default=None,
+        help="Профилировать запуск: cpu (cProfile), memory (tracemalloc/RSS по этапам), "
+        "sql (все запросы с временем и агрегатами по методам репозиториев); "
+        "с --staged — только sql.",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default="profiles",
+        help="Каталог для результатов профилирования (внутри создаётся подкаталог с меткой времени).",
+    )
+    staged = parser.add_argument_group("staged pipeline")
+    staged.add_argument(
+        "--staged",
+        action="store_true",
+        help="Конвейер fetch -> parse -> filter -> store с ограниченными очередями.",
+    )
+    staged.add_argument("--batch-size", type=int, default=200, help="raw_items в порции.")
+    staged.add_argument("--parse-workers", type=int, default=2)
+    staged.add_argument(
+        "--store-workers", type=int, default=1, help="Больше 1 — только для Postgres."
+    )
+    staged.add_argument("--queue-size", type=int, default=4, help="Порций в очереди этапа.")
+    add_provider_arguments(parser)
+    add_lock_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.staged and args.profile in MAIN_THREAD_PROFILE_MODES:
+        parser.error(
+            f"--profile {args.profile} does not see the --staged worker threads; "
+            "use --profile sql or profile without --staged"
+        )
+    return args
 
 
-def run_harvest(source_code: str) -> None:
+def run_harvest(
+    source_code: str,
+    raw_item_provider: Optional[RawItemProviderPort] = None,
+    runs: int = 1,
+    options: Optional[argparse.Namespace] = None,
+) -> None:
     """
     Высокоуровневая функция запуска harvesting для одного источника.
 
     Вынесена отдельно, чтобы её можно было вызывать из тестов без CLI-обвязки.
+    runs > 1 — повторные запуски одним сервисом (синтетический провайдер
+    выдаёт на каждый запуск новую порцию). options — разобранные
+    аргументы CLI (конвейер этапов, политика занятого источника).
     """
-    service = _build_service()
+    service = _build_service(raw_item_provider, options)
     command = RunSourceHarvestingCommand(source_code=source_code)
 
-    logger.info("Starting harvesting for source_code=%s", source_code)
-    service.execute(command)
+    for run_no in range(1, runs + 1):
+        logger.info("Starting harvesting for source_code=%s (run %d/%d)", source_code, run_no, runs)
+        service.execute(command)
     logger.info("Harvesting completed successfully for source_code=%s", source_code)
 
 
@@ -153,9 +263,17 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     )
 
+    args = parse_args(argv)
+    setup_metrics(args, enabled=_settings.METRICS_ENABLED)
     try:
-        args = parse_args(argv)
-        run_harvest(args.source_code)
+        if args.profile:
+            with profile_session(
+                args.profile, args.profile_dir, f"harvest_{args.source_code}", engine
+            ) as profile_dir:
+                print(f"Profiling ({args.profile}) into {profile_dir}")
+                run_harvest(args.source_code, build_provider(args), args.runs, args)
+        else:
+            run_harvest(args.source_code, build_provider(args), args.runs, args)
         print(f"Harvesting finished for source_code='{args.source_code}'")
         return 0
     except ValueError as exc:
@@ -168,6 +286,8 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         logger.exception("Unexpected error during harvesting")
         print(f"UNEXPECTED ERROR: {exc}")
         return 1
+    finally:
+        flush_metrics(args)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,114 @@
+# path: src/dan_max_bids_parser/interfaces/health_report_cli.py
+"""
+CLI-интерфейс для use-case GenerateDailyHealthReport (состояние сбора
+по источникам за последние дни, из дневных агрегатов).
+
+Пример использования (из корня проекта):
+
+    poetry run python -m dan_max_bids_parser.interfaces.health_report_cli --days 7
+    # пересчитать агрегаты окна (периодическая задача, например раз в час)
+    poetry run python -m dan_max_bids_parser.interfaces.health_report_cli --days 3 --rollup
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from datetime import date
+from typing import Optional, Sequence
+
+from dan_max_bids_parser.config import get_settings
+from dan_max_bids_parser.application.use_cases.generate_daily_health_report import (
+    GenerateDailyHealthReportCommand,
+)
+from dan_max_bids_parser.application.use_cases.generate_daily_health_report_service import (
+    GenerateDailyHealthReportService,
+)
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+
+# ВАЖНО: настройки и DATABASE_URL — до импорта infrastructure.db.base
+_settings = get_settings()
+os.environ.setdefault("DATABASE_URL", _settings.DATABASE_URL)
+
+from dan_max_bids_parser.infrastructure.db.base import SessionFactory  # noqa: E402
+from dan_max_bids_parser.infrastructure.db.unit_of_work import (  # noqa: E402
+    SqlAlchemyUnitOfWork,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _uow_factory() -> UnitOfWork:
+    return SqlAlchemyUnitOfWork(SessionFactory)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="dan_max_bids_health_report",
+        description="Отчёт о состоянии сбора по источникам (GenerateDailyHealthReportUseCase).",
+    )
+    parser.add_argument(
+        "--date",
+        type=date.fromisoformat,
+        default=None,
+        help="Последний день отчёта YYYY-MM-DD (UTC); по умолчанию — сегодня.",
+    )
+    parser.add_argument("--days", type=int, default=1, help="Число дней в отчёте.")
+    parser.add_argument(
+        "--rollup",
+        action="store_true",
+        help="Перед отчётом пересчитать агрегаты окна из bids / raw_items / errors.",
+    )
+    parser.add_argument(
+        "--source-code",
+        action="append",
+        default=[],
+        help="Код источника (можно несколько раз); по умолчанию — все активные.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+
+    args = parse_args(argv)
+    command = GenerateDailyHealthReportCommand(
+        day_to=args.date,
+        days=args.days,
+        rollup=args.rollup,
+        source_codes=tuple(args.source_code),
+    )
+
+    try:
+        report = GenerateDailyHealthReportService(uow_factory=_uow_factory).execute(command)
+    except ValueError as exc:
+        logger.error("Business error during health report: %s", exc)
+        print(f"ERROR: {exc}")
+        return 1
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Unexpected error during health report")
+        print(f"UNEXPECTED ERROR: {exc}")
+        return 1
+
+    print(f"{report.day_from} .. {report.day_to}")
+    print(f"{'source':<16} {'raw':>8} {'bids':>8} {'dups':>6} {'errors':>6} {'avg price':>12}")
+    for item in report.sources:
+        avg = f"{item.avg_price:.0f}" if item.avg_price is not None else "-"
+        print(
+            f"{item.source_code:<16} {item.raw_items:>8} {item.bids:>8} "
+            f"{item.duplicates:>6} {item.errors:>6} {avg:>12}"
+        )
+    silent = ", ".join(s.source_code for s in report.silent_sources)
+    print(f"silent sources: {silent or '-'}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    import sys
+
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,198 @@
+# path: src/dan_max_bids_parser/interfaces/job_queue_cli.py
+"""
+CLI очереди задач сбора (таблица jobs): постановка и воркер.
+
+Пример использования (из корня проекта):
+
+    # поставить в очередь сбор источников
+    poetry run python -m dan_max_bids_parser.interfaces.job_queue_cli enqueue --source-code ATI
+    poetry run python -m dan_max_bids_parser.interfaces.job_queue_cli enqueue --all-active
+
+    # воркер; можно запускать на нескольких узлах одновременно
+    poetry run python -m dan_max_bids_parser.interfaces.job_queue_cli work --lease-seconds 300
+    poetry run python -m dan_max_bids_parser.interfaces.job_queue_cli work --until-idle
+
+Воркер останавливается по SIGINT / SIGTERM, доделав текущую задачу;
+задача умершего воркера вернётся в очередь по истечении аренды.
+Ставить задачи по расписанию умеет планировщик: scheduler_cli --enqueue.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+from datetime import timedelta
+from typing import Optional, Sequence
+
+from dan_max_bids_parser.config import get_settings
+from dan_max_bids_parser.application.job_queue import EnqueueHarvestService, HarvestQueueWorker
+from dan_max_bids_parser.application.use_cases.harvest_source import RunSourceHarvestingCommand
+from dan_max_bids_parser.application.use_cases.harvest_source_service import (
+    RunSourceHarvestingService,
+)
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.domain.services.bid_filter import BidFilter
+from dan_max_bids_parser.domain.services.classifier import BidClassifier
+from dan_max_bids_parser.domain.services.gazetteer import Gazetteer
+
+# ВАЖНО: настройки и DATABASE_URL — до импорта infrastructure.db.base
+_settings = get_settings()
+os.environ.setdefault("DATABASE_URL", _settings.DATABASE_URL)
+
+from dan_max_bids_parser.infrastructure.db.base import SessionFactory  # noqa: E402
+from dan_max_bids_parser.infrastructure.db.unit_of_work import (  # noqa: E402
+    SqlAlchemyUnitOfWork,
+)
+from dan_max_bids_parser.infrastructure.monitoring.instrumentation import (  # noqa: E402
+    HarvestMetrics,
+    InstrumentedHarvestService,
+    InstrumentedRawItemProvider,
+    instrument_uow_factory,
+)
+from dan_max_bids_parser.infrastructure.parsing.html_extractor import (  # noqa: E402
+    LxmlHtmlParser,
+)
+from dan_max_bids_parser.interfaces.lock_options import (  # noqa: E402
+    add_lock_arguments,
+    build_source_lock,
+    exclusive,
+)
+from dan_max_bids_parser.interfaces.metrics_options import (  # noqa: E402
+    add_metrics_arguments,
+    flush_metrics,
+    setup_metrics,
+)
+from dan_max_bids_parser.interfaces.provider_options import (  # noqa: E402
+    add_provider_arguments,
+    build_provider,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _uow_factory() -> UnitOfWork:
+    return SqlAlchemyUnitOfWork(SessionFactory)
+
+
+def _enqueue(args: argparse.Namespace) -> int:
+    if args.all_active:
+        with _uow_factory() as uow:
+            codes = [source.code for source in uow.sources.list_active()]
+    else:
+        codes = args.source_code or []
+    if not codes:
+        raise ValueError("Nothing to enqueue: pass --source-code or --all-active")
+
+    producer = EnqueueHarvestService(_uow_factory, max_attempts=args.max_attempts)
+    queued = 0
+    for code in codes:
+        job = producer.execute(RunSourceHarvestingCommand(source_code=code))
+        if job is not None:
+            queued += 1
+            print(f"{code}: job {job.id}")
+        else:
+            print(f"{code}: already queued")
+    print(f"queued: {queued}; skipped: {len(codes) - queued}")
+    return 0
+
+
+def build_worker(args: argparse.Namespace) -> HarvestQueueWorker:
+    metrics = HarvestMetrics()
+    uow_factory = instrument_uow_factory(_uow_factory, metrics)
+    service = RunSourceHarvestingService(
+        uow_factory=uow_factory,
+        raw_item_provider=InstrumentedRawItemProvider(build_provider(args), metrics),
+        parser=LxmlHtmlParser(),
+        classifier=BidClassifier(),
+        bid_filter=BidFilter(),
+        gazetteer=Gazetteer.load(),
+    )
+    service = exclusive(
+        InstrumentedHarvestService(service, metrics), args, build_source_lock(metrics), _uow_factory
+    )
+    return HarvestQueueWorker(
+        uow_factory=_uow_factory,
+        service=service,
+        worker_id=args.worker_id,
+        lease=timedelta(seconds=args.lease_seconds),
+        poll_interval=args.poll_seconds,
+        retry_delay=timedelta(seconds=args.retry_seconds),
+    )
+
+
+def _work(args: argparse.Namespace) -> int:
+    worker = build_worker(args)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: worker.stop())
+    logger.info("Worker %s started", worker.worker_id)
+    worker.run(until_idle=args.until_idle, max_jobs=args.max_jobs)
+    print(
+        f"worker: {worker.worker_id}; processed: {worker.processed}; failed: {worker.failed}; "
+        f"requeued (source busy): {worker.requeued}"
+    )
+    return 0
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="dan_max_bids_jobs",
+        description="Очередь задач сбора: постановка (enqueue) и воркер (work).",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Поставить сбор источников в очередь.")
+    enqueue.add_argument("--source-code", action="append", help="Код источника (можно повторять).")
+    enqueue.add_argument("--all-active", action="store_true", help="Все активные источники.")
+    enqueue.add_argument("--max-attempts", type=int, default=3)
+
+    work = commands.add_parser("work", help="Разбирать очередь.")
+    work.add_argument("--worker-id", default=None, help="По умолчанию — узел:pid:суффикс.")
+    work.add_argument("--lease-seconds", type=float, default=300.0)
+    work.add_argument("--poll-seconds", type=float, default=1.0)
+    work.add_argument("--retry-seconds", type=float, default=60.0)
+    work.add_argument("--until-idle", action="store_true", help="Выйти, когда очередь опустеет.")
+    work.add_argument("--max-jobs", type=int, default=None)
+    add_provider_arguments(work)
+    # Занятый источник — вернуть задачу в очередь, а не «выполнить» пустой
+    add_lock_arguments(work, on_busy="queue")
+    add_metrics_arguments(work)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+
+    args = parse_args(argv)
+    if args.command == "enqueue":
+        try:
+            return _enqueue(args)
+        except ValueError as exc:
+            logger.error("Business error during enqueue: %s", exc)
+            print(f"ERROR: {exc}")
+            return 1
+
+    setup_metrics(args, enabled=_settings.METRICS_ENABLED)
+    try:
+        return _work(args)
+    except ValueError as exc:
+        logger.error("Business error in queue worker: %s", exc)
+        print(f"ERROR: {exc}")
+        return 1
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Unexpected error in queue worker")
+        print(f"UNEXPECTED ERROR: {exc}")
+        return 1
+    finally:
+        flush_metrics(args)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    import sys
+
+    raise SystemExit(main(sys.argv[1:]))
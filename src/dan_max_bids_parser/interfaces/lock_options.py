@@ -0,0 +1,58 @@
+# path: src/dan_max_bids_parser/interfaces/lock_options.py
+"""
+Общие для CLI флаги блокировки источника: --on-busy, --lock-wait-seconds.
+
+Импортировать после установки DATABASE_URL (модуль тянет
+infrastructure.db.base).
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from datetime import timedelta
+
+from dan_max_bids_parser.application.source_lock import ON_BUSY_POLICIES, ExclusiveHarvestService
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.application.use_cases.harvest_source import RunSourceHarvestingUseCase
+from dan_max_bids_parser.domain.ports import SourceLockPort
+from dan_max_bids_parser.infrastructure.db.base import SessionFactory, engine
+from dan_max_bids_parser.infrastructure.db.locks import create_source_lock
+from dan_max_bids_parser.infrastructure.monitoring.instrumentation import (
+    HarvestMetrics,
+    InstrumentedSourceLock,
+)
+
+
+def add_lock_arguments(parser: argparse.ArgumentParser, on_busy: str = "skip") -> None:
+    group = parser.add_argument_group("source lock")
+    group.add_argument(
+        "--on-busy",
+        choices=ON_BUSY_POLICIES,
+        default=on_busy,
+        help="Источник уже собирается: skip — пропустить, wait — ждать, "
+        "queue — поставить в очередь jobs.",
+    )
+    group.add_argument(
+        "--lock-wait-seconds",
+        type=float,
+        default=60.0,
+        help="wait: сколько ждать блокировку; queue: через сколько повторить.",
+    )
+
+
+def build_source_lock(metrics: HarvestMetrics) -> SourceLockPort:
+    """Одна блокировка на процесс: её можно делить между потоками."""
+    return InstrumentedSourceLock(create_source_lock(engine, SessionFactory), metrics)
+
+
+def exclusive(
+    service: RunSourceHarvestingUseCase,
+    args: argparse.Namespace,
+    locks: SourceLockPort,
+    uow_factory: Callable[[], UnitOfWork],
+) -> RunSourceHarvestingUseCase:
+    delay = timedelta(seconds=args.lock_wait_seconds)
+    return ExclusiveHarvestService(
+        service, locks, uow_factory, on_busy=args.on_busy, wait=delay, requeue_delay=delay
+    )
@@ -0,0 +1,55 @@
+# path: src/dan_max_bids_parser/interfaces/metrics_options.py
+"""
+Общие для CLI флаги метрик: --metrics-port, --metrics-file, --no-metrics.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+
+from dan_max_bids_parser.infrastructure.monitoring.metrics import (
+    configure_metrics,
+    start_http_server,
+    write_textfile,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def add_metrics_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("metrics")
+    group.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Отдавать метрики Prometheus на 127.0.0.1:<port>/metrics во время работы.",
+    )
+    group.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Записать метрики в файл (textfile collector) по завершении.",
+    )
+    group.add_argument(
+        "--no-metrics",
+        action="store_true",
+        help="Отключить метрики (no-op режим).",
+    )
+
+
+def setup_metrics(args: argparse.Namespace, enabled: bool = True) -> None:
+    """
+    Включает/выключает глобальный реестр и запускает HTTP-выдачу.
+    Вызывать до сборки сервисов.
+    """
+    enabled = enabled and not args.no_metrics
+    configure_metrics(enabled=enabled)
+    if enabled and args.metrics_port is not None:
+        server = start_http_server(args.metrics_port)
+        logger.info("Metrics are served on http://127.0.0.1:%d/metrics", server.port)
+
+
+def flush_metrics(args: argparse.Namespace) -> None:
+    """Записывает метрики в файл, если он задан."""
+    if args.metrics_file and not args.no_metrics:
+        write_textfile(args.metrics_file)
@@ -0,0 +1,27 @@
+# path: src/dan_max_bids_parser/interfaces/pipeline_factory.py
+"""
+Сборка BidPipeline с боевыми адаптерами (lxml-парсер, классификатор, фильтр,
+справочник регионов).
+
+Функция уровня модуля и без обращения к БД: её передают в пул процессов
+ReprocessRawItems, и каждый воркер собирает свой экземпляр пайплайна.
+"""
+
+from __future__ import annotations
+
+from dan_max_bids_parser.application.pipeline import BidPipeline
+from dan_max_bids_parser.domain.services.bid_filter import BidFilter
+from dan_max_bids_parser.domain.services.classifier import BidClassifier
+from dan_max_bids_parser.domain.services.gazetteer import Gazetteer
+from dan_max_bids_parser.domain.services.normalizer import Normalizer
+from dan_max_bids_parser.infrastructure.parsing.html_extractor import LxmlHtmlParser
+
+
+def build_pipeline() -> BidPipeline:
+    return BidPipeline(
+        parser=LxmlHtmlParser(),
+        normalizer=Normalizer(),
+        classifier=BidClassifier(),
+        bid_filter=BidFilter(),
+        gazetteer=Gazetteer.load(),
+    )
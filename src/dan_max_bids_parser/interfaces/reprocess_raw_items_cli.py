@@ -0,0 +1,127 @@
+# path: src/dan_max_bids_parser/interfaces/reprocess_raw_items_cli.py
+"""
+CLI-интерфейс для use-case ReprocessRawItems.
+
+Пересобирает заявки из сохранённых raw_items текущей конфигурацией
+(после правки config_source / config_classifier / config_filter_rule).
+Прерванный запуск по умолчанию продолжается с checkpoint в таблице jobs.
+
+Пример использования (из корня проекта):
+
+    poetry run python -m dan_max_bids_parser.interfaces.reprocess_raw_items_cli --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from typing import Optional, Sequence
+
+from dan_max_bids_parser.config import get_settings
+from dan_max_bids_parser.application.use_cases.reprocess_raw_items import (
+    ReprocessRawItemsCommand,
+)
+from dan_max_bids_parser.application.use_cases.reprocess_raw_items_service import (
+    ReprocessRawItemsService,
+)
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+
+# ВАЖНО: настройки и DATABASE_URL — до импорта infrastructure.db.base
+_settings = get_settings()
+os.environ.setdefault("DATABASE_URL", _settings.DATABASE_URL)
+
+from dan_max_bids_parser.infrastructure.db.base import SessionFactory  # noqa: E402
+from dan_max_bids_parser.infrastructure.db.unit_of_work import (  # noqa: E402
+    SqlAlchemyUnitOfWork,
+)
+from dan_max_bids_parser.infrastructure.monitoring.instrumentation import (  # noqa: E402
+    HarvestMetrics,
+    instrument_uow_factory,
+)
+from dan_max_bids_parser.interfaces.metrics_options import (  # noqa: E402
+    add_metrics_arguments,
+    flush_metrics,
+    setup_metrics,
+)
+from dan_max_bids_parser.interfaces.pipeline_factory import build_pipeline  # noqa: E402
+
+
+logger = logging.getLogger(__name__)
+
+
+def _uow_factory() -> UnitOfWork:
+    return SqlAlchemyUnitOfWork(SessionFactory)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="dan_max_bids_reprocess",
+        description="Переобработка raw_items текущей конфигурацией (ReprocessRawItemsUseCase).",
+    )
+    parser.add_argument(
+        "--source-code",
+        default=None,
+        help="Код источника; по умолчанию — все источники.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Число процессов (по умолчанию — по числу ядер; 1 — без пула).",
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Не продолжать незавершённую задачу, начать заново.",
+    )
+    add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+
+    args = parse_args(argv)
+    setup_metrics(args, enabled=_settings.METRICS_ENABLED)
+    metrics = HarvestMetrics()
+    service = ReprocessRawItemsService(
+        uow_factory=instrument_uow_factory(_uow_factory, metrics),
+        pipeline_factory=build_pipeline,
+        max_workers=args.workers,
+        on_queue_depth=metrics.queue_depth.labels("reprocess").set,
+    )
+    command = ReprocessRawItemsCommand(
+        source_code=args.source_code,
+        batch_size=args.batch_size,
+        resume=not args.no_resume,
+    )
+
+    try:
+        job = service.execute(command)
+    except ValueError as exc:
+        logger.error("Business error during reprocessing: %s", exc)
+        print(f"ERROR: {exc}")
+        return 1
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Unexpected error during reprocessing")
+        print(f"UNEXPECTED ERROR: {exc}")
+        return 1
+    finally:
+        flush_metrics(args)
+
+    print(
+        f"Reprocessing finished: job_id={job.id}, raw_items={job.items_total}, "
+        f"bids={job.items_created}"
+    )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    import sys
+
+    raise SystemExit(main(sys.argv[1:]))
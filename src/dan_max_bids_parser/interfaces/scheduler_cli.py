@@ -0,0 +1,204 @@
+# path: src/dan_max_bids_parser/interfaces/scheduler_cli.py
+"""
+CLI долгоживущего планировщика сбора (HarvestScheduler) по config_schedule.
+
+Пример использования (из корня проекта):
+
+    poetry run python -m dan_max_bids_parser.interfaces.scheduler_cli --workers 4
+    poetry run python -m dan_max_bids_parser.interfaces.scheduler_cli \\
+        --workers 2 --provider synthetic --items 200 --metrics-port 9108
+    # несколько узлов делят источники между собой (worker_nodes)
+    poetry run python -m dan_max_bids_parser.interfaces.scheduler_cli --shard --node-capacity 2
+    # только ставить задачи в очередь jobs — выполняют воркеры job_queue_cli
+    poetry run python -m dan_max_bids_parser.interfaces.scheduler_cli --enqueue
+
+Останавливается по SIGINT / SIGTERM, дождавшись идущих запусков.
+Каждый поток пула держит свой RunSourceHarvestingService; engine,
+справочник регионов и провайдер сырья общие на процесс. Запуски одного
+источника на разных узлах исключают друг друга (--on-busy, см.
+application.source_lock).
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+from datetime import timedelta
+from typing import Callable, Optional, Sequence
+
+from dan_max_bids_parser.config import get_settings
+from dan_max_bids_parser.application.job_queue import EnqueueHarvestService
+from dan_max_bids_parser.application.scheduler import HarvestScheduler
+from dan_max_bids_parser.application.sharding import SourceSharding
+from dan_max_bids_parser.application.use_cases.harvest_source import RunSourceHarvestingUseCase
+from dan_max_bids_parser.application.use_cases.harvest_source_service import (
+    RunSourceHarvestingService,
+)
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.domain.services.bid_filter import BidFilter
+from dan_max_bids_parser.domain.services.classifier import BidClassifier
+from dan_max_bids_parser.domain.services.gazetteer import Gazetteer
+
+# ВАЖНО: настройки и DATABASE_URL — до импорта infrastructure.db.base
+_settings = get_settings()
+os.environ.setdefault("DATABASE_URL", _settings.DATABASE_URL)
+
+from dan_max_bids_parser.infrastructure.db.base import SessionFactory  # noqa: E402
+from dan_max_bids_parser.infrastructure.db.unit_of_work import (  # noqa: E402
+    SqlAlchemyUnitOfWork,
+)
+from dan_max_bids_parser.infrastructure.monitoring.instrumentation import (  # noqa: E402
+    HarvestMetrics,
+    InstrumentedHarvestService,
+    InstrumentedRawItemProvider,
+    instrument_uow_factory,
+)
+from dan_max_bids_parser.infrastructure.parsing.html_extractor import (  # noqa: E402
+    LxmlHtmlParser,
+)
+from dan_max_bids_parser.interfaces.lock_options import (  # noqa: E402
+    add_lock_arguments,
+    build_source_lock,
+    exclusive,
+)
+from dan_max_bids_parser.interfaces.metrics_options import (  # noqa: E402
+    add_metrics_arguments,
+    flush_metrics,
+    setup_metrics,
+)
+from dan_max_bids_parser.interfaces.provider_options import (  # noqa: E402
+    add_provider_arguments,
+    build_provider,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _uow_factory() -> UnitOfWork:
+    return SqlAlchemyUnitOfWork(SessionFactory)
+
+
+def build_scheduler(
+    args: argparse.Namespace,
+    owns: Optional[Callable[[str], bool]] = None,
+) -> HarvestScheduler:
+    if args.enqueue:
+        return HarvestScheduler(
+            uow_factory=_uow_factory,
+            service_factory=lambda: EnqueueHarvestService(_uow_factory, args.max_attempts),
+            max_workers=args.workers,
+            refresh_interval=timedelta(seconds=args.refresh_seconds),
+            owns=owns,
+        )
+
+    metrics = HarvestMetrics()
+    uow_factory = instrument_uow_factory(_uow_factory, metrics)
+    provider = InstrumentedRawItemProvider(build_provider(args), metrics)
+    gazetteer = Gazetteer.load()
+    locks = build_source_lock(metrics)
+
+    def service_factory() -> RunSourceHarvestingUseCase:
+        # Парсер, классификатор и фильтр держат скомпилированные правила —
+        # у каждого потока свои; справочник и провайдер — общие
+        service = RunSourceHarvestingService(
+            uow_factory=uow_factory,
+            raw_item_provider=provider,
+            parser=LxmlHtmlParser(),
+            classifier=BidClassifier(),
+            bid_filter=BidFilter(),
+            gazetteer=gazetteer,
+        )
+        # Блокировка — снаружи: пропущенный запуск не считается в метриках сбора
+        return exclusive(InstrumentedHarvestService(service, metrics), args, locks, _uow_factory)
+
+    return HarvestScheduler(
+        uow_factory=_uow_factory,
+        service_factory=service_factory,
+        max_workers=args.workers,
+        refresh_interval=timedelta(seconds=args.refresh_seconds),
+        owns=owns,
+    )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="dan_max_bids_scheduler",
+        description="Планировщик сбора по расписаниям config_schedule (HarvestScheduler).",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Одновременных запусков всего.")
+    parser.add_argument(
+        "--refresh-seconds",
+        type=float,
+        default=60.0,
+        help="Как часто перечитывать config_schedule.",
+    )
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Не собирать самим, а ставить задачи в очередь jobs (см. job_queue_cli work).",
+    )
+    parser.add_argument("--max-attempts", type=int, default=3, help="--enqueue: попыток на задачу.")
+    parser.add_argument(
+        "--shard",
+        action="store_true",
+        help="Собирать только источники, закреплённые за этим узлом (worker_nodes).",
+    )
+    parser.add_argument("--node-id", default=None, help="--shard: id узла (по умолчанию узел:pid).")
+    parser.add_argument(
+        "--node-capacity", type=float, default=1.0, help="--shard: относительная мощность узла."
+    )
+    add_provider_arguments(parser)
+    add_lock_arguments(parser)
+    add_metrics_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+
+    args = parse_args(argv)
+    setup_metrics(args, enabled=_settings.METRICS_ENABLED)
+    sharding: Optional[SourceSharding] = None
+    try:
+        if args.shard:
+            sharding = SourceSharding(_uow_factory, node_id=args.node_id, capacity=args.node_capacity)
+            sharding.start()
+            logger.info("Node %s owns sources: %s", sharding.node_id, ", ".join(sharding.owned()))
+        scheduler = build_scheduler(args, owns=sharding.owns if sharding else None)
+    except ValueError as exc:
+        logger.error("Business error during scheduler start: %s", exc)
+        print(f"ERROR: {exc}")
+        if sharding is not None:
+            sharding.stop()
+        return 1
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: scheduler.stop())
+    try:
+        scheduler.run()
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Unexpected error in scheduler")
+        print(f"UNEXPECTED ERROR: {exc}")
+        return 1
+    finally:
+        if sharding is not None:
+            sharding.stop()
+        flush_metrics(args)
+    stats = scheduler.stats
+    print(
+        f"dispatched: {stats.dispatched}; succeeded: {stats.succeeded}; failed: {stats.failed}; "
+        f"misfired: {stats.misfired}; coalesced: {stats.coalesced}; not owned: {stats.not_owned}"
+    )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    import sys
+
+    raise SystemExit(main(sys.argv[1:]))
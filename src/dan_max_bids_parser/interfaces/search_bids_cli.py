@@ -0,0 +1,97 @@
+# path: src/dan_max_bids_parser/interfaces/search_bids_cli.py
+"""
+CLI-интерфейс для use-case SearchBids (полнотекстовый поиск заявок).
+
+Пример использования (из корня проекта):
+
+    poetry run python -m dan_max_bids_parser.interfaces.search_bids_cli --query "щебень Тверь"
+    poetry run python -m dan_max_bids_parser.interfaces.search_bids_cli \\
+        --query "щебень" --order recent --cursor <next_cursor>
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from typing import Optional, Sequence
+
+from dan_max_bids_parser.config import get_settings
+from dan_max_bids_parser.application.use_cases.search_bids import SearchBidsCommand
+from dan_max_bids_parser.application.use_cases.search_bids_service import SearchBidsService
+from dan_max_bids_parser.application.unit_of_work import UnitOfWork
+from dan_max_bids_parser.domain.services.bid_search import MAX_LIMIT, SEARCH_ORDERS
+
+# ВАЖНО: настройки и DATABASE_URL — до импорта infrastructure.db.base
+_settings = get_settings()
+os.environ.setdefault("DATABASE_URL", _settings.DATABASE_URL)
+
+from dan_max_bids_parser.infrastructure.db.base import SessionFactory  # noqa: E402
+from dan_max_bids_parser.infrastructure.db.unit_of_work import (  # noqa: E402
+    SqlAlchemyUnitOfWork,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _uow_factory() -> UnitOfWork:
+    return SqlAlchemyUnitOfWork(SessionFactory)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="dan_max_bids_search",
+        description="Полнотекстовый поиск заявок (SearchBidsUseCase).",
+    )
+    parser.add_argument("--query", required=True, help="Слова запроса, например 'щебень Тверь'.")
+    parser.add_argument("--limit", type=int, default=20, help=f"Строк на странице (до {MAX_LIMIT}).")
+    parser.add_argument("--order", choices=SEARCH_ORDERS, default="rank")
+    parser.add_argument("--cursor", default=None, help="next_cursor предыдущей страницы.")
+    parser.add_argument(
+        "--source-code",
+        action="append",
+        default=[],
+        help="Код источника (можно несколько раз); по умолчанию — все.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+
+    args = parse_args(argv)
+    command = SearchBidsCommand(
+        text=args.query,
+        limit=args.limit,
+        cursor=args.cursor,
+        order=args.order,
+        source_codes=tuple(args.source_code),
+    )
+
+    try:
+        page = SearchBidsService(uow_factory=_uow_factory).execute(command)
+    except ValueError as exc:
+        logger.error("Business error during search: %s", exc)
+        print(f"ERROR: {exc}")
+        return 1
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Unexpected error during search")
+        print(f"UNEXPECTED ERROR: {exc}")
+        return 1
+
+    for hit in page.hits:
+        bid = hit.bid
+        route = f"{bid.load_point or '?'} -> {bid.unload_point or '?'}"
+        print(f"{bid.id:>8} {hit.score:>8.3f}  {bid.title[:40]:<40} {route:<40} {bid.price or ''}")
+    print(f"found: {len(page.hits)}; next_cursor: {page.next_cursor or '-'}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    import sys
+
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,144 @@
+# path: tests/application/test_export_bids_to_xlsx_service.py
+"""
+ExportBidsToXlsxService + XlsxExportWriter на SQLite-файле:
+- все заявки выгружаются порциями в 13 колонок клиентского формата;
+- отбор по источникам и давности из config_export;
+- сбой записи не оставляет файла, задача помечается failed.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.application.use_cases.export_bids_to_xlsx import (
+    ExportBidsToXlsxCommand,
+)
+from dan_max_bids_parser.application.use_cases.export_bids_to_xlsx_service import (
+    ExportBidsToXlsxService,
+)
+from dan_max_bids_parser.domain.services.bid_export import DEFAULT_COLUMNS
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import Bid, ConfigExport, Job, Source
+from dan_max_bids_parser.infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+from dan_max_bids_parser.infrastructure.export.xlsx_writer import XlsxExportWriter
+
+NOW = datetime.utcnow()
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.sqlite'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    with factory() as session:
+        ati = Source(code="ATI", name="ATI.SU", kind="html", is_active=True)
+        tg = Source(code="TG", name="Telegram", kind="telegram", is_active=True)
+        session.add_all([ati, tg])
+        session.flush()
+        for idx in range(25):
+            created = NOW - timedelta(days=idx)
+            session.add(
+                Bid(
+                    source_id=ati.id if idx % 5 else tg.id,
+                    external_id=f"b-{idx}",
+                    title=f"Щебень {idx}",
+                    description="Загрузка утром\x07",  # управляющий символ недопустим в XLSX
+                    cargo_type="щебень",
+                    load_location="Тверь",
+                    unload_location="Москва",
+                    weight_value=20 + idx,
+                    price_value=1000 * idx,
+                    price_currency="RUB",
+                    published_at=created,
+                    created_at=created,
+                    updated_at=created,
+                )
+            )
+        for code, data in {
+            "all": {"chunk_size": 7},
+            "ati_week": {"source_codes": ["ATI"], "since_days": 7, "columns": ["id", "source"]},
+            "broken": {"source_codes": ["NOPE"]},
+        }.items():
+            session.add(
+                ConfigExport(code=code, name=code, is_active=True, data=data,
+                             created_at=NOW, updated_at=NOW)
+            )
+        session.commit()
+    return factory
+
+
+def _service(session_factory, writer_factory=None) -> ExportBidsToXlsxService:
+    return ExportBidsToXlsxService(
+        uow_factory=lambda: SqlAlchemyUnitOfWork(session_factory),
+        writer_factory=writer_factory or (lambda spec, path: XlsxExportWriter(path, spec.sheet)),
+    )
+
+
+def _read_rows(path) -> list[tuple]:
+    workbook = load_workbook(path, read_only=True)
+    rows = list(workbook["Заявки"].iter_rows(values_only=True))
+    workbook.close()
+    return rows
+
+
+def test_exports_all_bids_in_chunks(session_factory, tmp_path):
+    target = tmp_path / "out" / "all.xlsx"
+    result = _service(session_factory).execute(
+        ExportBidsToXlsxCommand(export_code="all", output_path=str(target))
+    )
+
+    assert result.rows == 25 and result.location == str(target)
+    rows = _read_rows(target)
+    assert len(rows[0]) == len(DEFAULT_COLUMNS) == 13
+    assert rows[0][:3] == ("ID", "Дата публикации", "Источник")
+    assert [r[0] for r in rows[1:]] == list(range(1, 26))
+    assert rows[1][2] == "Telegram" and rows[2][2] == "ATI.SU"
+    assert rows[1][12] == "Загрузка утром"
+    assert list(target.parent.iterdir()) == [target]  # временный файл убран
+
+    with session_factory() as session:
+        job = session.execute(select(Job)).scalar_one()
+    assert (job.job_type, job.status, job.items_total) == ("export_bids", "success", 25)
+    assert set(job.stage_durations) == {"read", "write", "finish"}
+
+
+def test_export_filters_by_source_and_age(session_factory, tmp_path):
+    target = tmp_path / "week.xlsx"
+    result = _service(session_factory).execute(
+        ExportBidsToXlsxCommand(export_code="ati_week", output_path=str(target))
+    )
+
+    rows = _read_rows(target)
+    assert rows[0] == ("ID", "Источник")
+    # idx 1..6 (idx 0 и 5 — Telegram, idx >= 7 — старше недели)
+    assert [r[0] for r in rows[1:]] == [2, 3, 4, 5, 7]
+    assert result.rows == 5
+
+
+def test_failed_write_leaves_no_file_and_marks_job(session_factory, tmp_path):
+    class FailingWriter(XlsxExportWriter):
+        def write_rows(self, rows):
+            raise RuntimeError("disk full")
+
+    target = tmp_path / "fail.xlsx"
+    with pytest.raises(RuntimeError):
+        _service(session_factory, lambda spec, path: FailingWriter(path)).execute(
+            ExportBidsToXlsxCommand(export_code="all", output_path=str(target))
+        )
+
+    assert list(tmp_path.glob("*.xlsx*")) == []
+    with session_factory() as session:
+        job = session.execute(select(Job)).scalar_one()
+    assert job.status == "failed" and "disk full" in job.error_message
+
+
+@pytest.mark.parametrize("code", ["missing", "broken"])
+def test_unknown_export_or_source_raises_value_error(session_factory, code):
+    with pytest.raises(ValueError):
+        _service(session_factory).execute(ExportBidsToXlsxCommand(export_code=code))
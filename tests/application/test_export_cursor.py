@@ -0,0 +1,244 @@
+# path: tests/application/test_export_cursor.py
+"""
+Инкрементальные выгрузки (append/upsert) по курсору export_cursors:
+- второй запуск выгружает только новые/изменённые заявки;
+- без изменений файл не переписывается;
+- upsert заменяет строку с тем же ID на месте и идемпотентен при повторе;
+- буфер upsert сверх лимита уходит на диск, порядок и замены сохраняются;
+- заявки моложе cursor_lag_seconds ждут следующего запуска;
+- идущий сбор держит границу курсора до своего начала (брошенные задачи
+  старше cursor_job_timeout_seconds — нет);
+- переобработка сохраняет id заявок, и upsert заменяет строки на месте.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import create_engine, delete, select, update
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.application.use_cases.export_bids_to_xlsx import (
+    ExportBidsToXlsxCommand,
+)
+from dan_max_bids_parser.application.use_cases.export_bids_to_xlsx_service import (
+    ExportBidsToXlsxService,
+)
+from dan_max_bids_parser.domain.entities import BidEntity, ConfigEntryEntity
+from dan_max_bids_parser.domain.services.bid_export import parse_export_config
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import (
+    Bid,
+    ConfigExport,
+    ExportCursor,
+    Job,
+    RawItem,
+    Source,
+)
+from dan_max_bids_parser.infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+from dan_max_bids_parser.infrastructure.export.xlsx_writer import XlsxExportWriter
+
+NOW = datetime.utcnow()
+COLUMNS = ["id", "title"]
+
+
+def _bid(idx: int, updated_at: datetime) -> Bid:
+    return Bid(
+        source_id=1,
+        external_id=f"b-{idx}",
+        title=f"Щебень {idx}",
+        created_at=updated_at,
+        updated_at=updated_at,
+    )
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'delta.sqlite'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    with factory() as session:
+        session.add(Source(id=1, code="ATI", name="ATI.SU", kind="html", is_active=True))
+        session.add_all(_bid(idx, NOW - timedelta(hours=10 - idx)) for idx in range(5))
+        for code, mode in (("delta_append", "append"), ("delta_upsert", "upsert")):
+            session.add(
+                ConfigExport(code=code, name=code, is_active=True,
+                             data={"mode": mode, "columns": COLUMNS, "chunk_size": 2},
+                             created_at=NOW, updated_at=NOW)
+            )
+        session.commit()
+    return factory
+
+
+def _run(session_factory, code: str, target, full: bool = False):
+    service = ExportBidsToXlsxService(
+        uow_factory=lambda: SqlAlchemyUnitOfWork(session_factory),
+        writer_factory=lambda spec, path: XlsxExportWriter(path, spec.sheet),
+    )
+    return service.execute(
+        ExportBidsToXlsxCommand(export_code=code, output_path=str(target), full=full)
+    )
+
+
+def _read_rows(path) -> list[tuple]:
+    workbook = load_workbook(path, read_only=True)
+    rows = list(workbook["Заявки"].iter_rows(values_only=True))
+    workbook.close()
+    return rows
+
+
+def test_append_exports_only_new_bids(session_factory, tmp_path):
+    target = tmp_path / "append.xlsx"
+    assert _run(session_factory, "delta_append", target).rows == 5
+
+    mtime = target.stat().st_mtime_ns
+    unchanged = _run(session_factory, "delta_append", target)
+    assert unchanged.rows == 0 and unchanged.location == str(target)
+    assert target.stat().st_mtime_ns == mtime
+
+    with session_factory() as session:
+        session.add_all([_bid(5, NOW - timedelta(minutes=5)), _bid(6, NOW - timedelta(minutes=4))])
+        session.commit()
+    assert _run(session_factory, "delta_append", target).rows == 2
+
+    rows = _read_rows(target)
+    assert rows[0] == ("ID", "Заголовок")
+    assert [r[0] for r in rows[1:]] == list(range(1, 8))
+    with session_factory() as session:
+        cursor = session.execute(select(ExportCursor)).scalar_one()
+    assert (cursor.export_code, cursor.last_bid_id, cursor.rows_exported) == ("delta_append", 7, 7)
+
+
+def test_upsert_replaces_changed_rows_and_is_idempotent(session_factory, tmp_path):
+    target = tmp_path / "upsert.xlsx"
+    _run(session_factory, "delta_upsert", target)
+
+    with session_factory() as session:
+        session.execute(
+            update(Bid)
+            .where(Bid.id == 2)
+            .values(title="Песок", updated_at=NOW - timedelta(minutes=3))
+        )
+        session.add(_bid(5, NOW - timedelta(minutes=2)))
+        session.commit()
+    assert _run(session_factory, "delta_upsert", target).rows == 2
+
+    expected = [(1, "Щебень 0"), (2, "Песок"), (3, "Щебень 2"), (4, "Щебень 3"),
+                (5, "Щебень 4"), (6, "Щебень 5")]
+    assert _read_rows(target)[1:] == expected
+
+    # курсор потерян (сбой после записи файла) — повтор порции ничего не дублирует
+    with session_factory() as session:
+        session.execute(delete(ExportCursor))
+        session.commit()
+    assert _run(session_factory, "delta_upsert", target).rows == 6
+    assert _read_rows(target)[1:] == expected
+
+
+def test_upsert_buffer_spills_to_disk_past_the_limit(tmp_path):
+    target = tmp_path / "spill.xlsx"
+    headers = ["ID", "Заголовок"]
+    first = XlsxExportWriter(target, max_pending_rows=2)
+    first.begin(headers, "upsert")  # файла нет — строки пишутся сразу
+    assert first._pending is None
+    first.write_rows([(i, f"Щебень {i}") for i in range(1, 6)])
+    first.finish()
+
+    writer = XlsxExportWriter(target, max_pending_rows=2)
+    writer.begin(headers, "upsert")
+    writer.write_rows([(3, "Песок"), (7, "Гравий"), (1, "Глина")])
+    writer.write_rows([(8, "Торф"), (7, "Гравий 2"), (3, "Песок 2")])
+    writer.finish()
+
+    assert _read_rows(target)[1:] == [
+        (1, "Глина"), (2, "Щебень 2"), (3, "Песок 2"), (4, "Щебень 4"), (5, "Щебень 5"),
+        (7, "Гравий 2"), (8, "Торф"),
+    ]
+
+
+def test_recent_bids_wait_for_cursor_lag_and_full_rebuilds(session_factory, tmp_path):
+    target = tmp_path / "lag.xlsx"
+    with session_factory() as session:
+        session.add(_bid(5, NOW))  # моложе cursor_lag_seconds (60 с по умолчанию)
+        session.commit()
+
+    assert _run(session_factory, "delta_append", target).rows == 5
+    assert [r[0] for r in _read_rows(target)[1:]] == [1, 2, 3, 4, 5]
+
+    rebuilt = _run(session_factory, "delta_append", target, full=True)
+    assert rebuilt.rows == 5
+    assert [r[0] for r in _read_rows(target)[1:]] == [1, 2, 3, 4, 5]
+
+
+def test_running_harvest_holds_cursor_until_it_finishes(session_factory, tmp_path):
+    target = tmp_path / "held.xlsx"
+    with session_factory() as session:
+        running = Job(job_type="harvest_source", status="running",
+                      started_at=NOW - timedelta(hours=7, minutes=30), created_at=NOW)
+        # упавший процесс оставил running сутки назад — границу не держит
+        abandoned = Job(job_type="reprocess_raw_items", status="running",
+                        started_at=NOW - timedelta(days=1), created_at=NOW)
+        session.add_all([running, abandoned])
+        session.execute(
+            update(ConfigExport)
+            .where(ConfigExport.code == "delta_append")
+            .values(data={"mode": "append", "columns": COLUMNS,
+                          "cursor_job_timeout_seconds": 12 * 3600})
+        )
+        session.commit()
+
+    # заявки в -10 ч .. -6 ч: до начала идущего сбора только первые три
+    assert _run(session_factory, "delta_append", target).rows == 3
+
+    with session_factory() as session:
+        session.execute(update(Job).where(Job.id == running.id).values(status="success"))
+        session.commit()
+    assert _run(session_factory, "delta_append", target).rows == 2
+    assert [r[0] for r in _read_rows(target)[1:]] == [1, 2, 3, 4, 5]
+
+
+def test_reprocessing_keeps_bid_ids_for_upsert(session_factory, tmp_path):
+    target = tmp_path / "reprocessed.xlsx"
+    with session_factory() as session:
+        raw = RawItem(source_id=1, external_id="r-1", payload={}, fetched_at=NOW, created_at=NOW)
+        session.add(raw)
+        session.flush()
+        session.execute(update(Bid).where(Bid.id.in_([1, 2])).values(raw_item_id=raw.id))
+        session.commit()
+    _run(session_factory, "delta_upsert", target)
+
+    with SqlAlchemyUnitOfWork(session_factory) as uow:
+        # парсер теперь выдаёт одну заявку вместо двух
+        [bid] = uow.bids.replace_for_raw_items(
+            [raw.id], [BidEntity(source_id=1, raw_item_id=raw.id, title="Песок")]
+        )
+        uow.commit()
+    assert bid.id == 1 and bid.updated_at > NOW
+
+    with session_factory() as session:
+        rows = session.execute(select(Bid.id, Bid.title).order_by(Bid.id)).all()
+    assert [tuple(r) for r in rows] == [(1, "Песок"), (3, "Щебень 2"), (4, "Щебень 3"),
+                                        (5, "Щебень 4")]
+
+    # заявка изменена только что — без запаса cursor_lag_seconds
+    with session_factory() as session:
+        session.execute(
+            update(ConfigExport)
+            .where(ConfigExport.code == "delta_upsert")
+            .values(data={"mode": "upsert", "columns": COLUMNS, "cursor_lag_seconds": 0})
+        )
+        session.commit()
+    assert _run(session_factory, "delta_upsert", target).rows == 1
+    # строка заменена на месте; удалённая переобработкой заявка 2 остаётся в файле
+    assert _read_rows(target)[1:3] == [(1, "Песок"), (2, "Щебень 1")]
+
+
+def test_upsert_requires_id_as_first_column():
+    entry = ConfigEntryEntity(code="bad", data={"mode": "upsert", "columns": ["title", "id"]})
+    with pytest.raises(ValueError, match="upsert"):
+        parse_export_config(entry)
+    with pytest.raises(ValueError, match="mode"):
+        parse_export_config(ConfigEntryEntity(code="bad", data={"mode": "merge"}))
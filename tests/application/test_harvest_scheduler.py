@@ -0,0 +1,215 @@
+# path: tests/application/test_harvest_scheduler.py
+"""
+HarvestScheduler на фиктивных сервисах и явных моментах времени:
+- срабатывания из кучи запускаются в пуле, сервисы переиспользуются;
+- лимиты: глобальный и на источник, лишние срабатывания схлопываются;
+- misfire: "skip" пропускает опоздавший запуск, "run_once" — выполняет
+  один раз и планирует дальше от текущего момента;
+- смена config_schedule перепланирует расписание;
+- с owns запускаются только источники своего узла.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from dan_max_bids_parser.application.scheduler import HarvestScheduler
+from dan_max_bids_parser.domain.entities import ConfigEntryEntity
+
+T0 = datetime(2025, 3, 12, 10, 0)
+
+
+class _Configs:
+    def __init__(self, entries: list[ConfigEntryEntity]) -> None:
+        self.entries = entries
+
+    def list_active(self, section: str):
+        assert section == "schedule"
+        return [e for e in self.entries if e.is_active]
+
+
+class _UnitOfWork:
+    def __init__(self, configs: _Configs) -> None:
+        self.configs = configs
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+class _Service:
+    """Записывает запуски; gate — запуск ждёт, пока его не отпустят."""
+
+    def __init__(self, calls: list[str], gate: threading.Event) -> None:
+        self._calls = calls
+        self._gate = gate
+
+    def execute(self, command) -> None:
+        self._calls.append(command.source_code)
+        assert self._gate.wait(5)
+        if command.source_code == "BROKEN":
+            raise ConnectionError("site is down")
+
+
+class _Harness:
+    def __init__(self, entries: list[ConfigEntryEntity], max_workers: int = 4, owns=None) -> None:
+        self.configs = _Configs(entries)
+        self.calls: list[str] = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.services_built = 0
+
+        def service_factory():
+            self.services_built += 1
+            return _Service(self.calls, self.gate)
+
+        self.scheduler = HarvestScheduler(
+            uow_factory=lambda: _UnitOfWork(self.configs),
+            service_factory=service_factory,
+            max_workers=max_workers,
+            owns=owns,
+        )
+        self.scheduler.reload(T0)
+
+    def tick(self, minutes: float) -> int:
+        return self.scheduler.tick(T0 + timedelta(minutes=minutes))
+
+
+def _entry(code: str, **data) -> ConfigEntryEntity:
+    return ConfigEntryEntity(code=code, data=data)
+
+
+@pytest.fixture
+def harness_factory():
+    created: list[_Harness] = []
+
+    def make(*entries: ConfigEntryEntity, max_workers: int = 4, owns=None) -> _Harness:
+        harness = _Harness(list(entries), max_workers, owns)
+        created.append(harness)
+        return harness
+
+    yield make
+    for harness in created:
+        harness.gate.set()
+        harness.scheduler.close()
+
+
+def test_dispatches_due_schedules_and_reuses_services(harness_factory):
+    h = harness_factory(
+        _entry("ATI", interval_seconds=300),
+        _entry("tg-cron", source="TG", cron="*/10 * * * *"),
+        max_workers=1,
+    )
+    assert h.scheduler.next_fire_at() == T0 + timedelta(minutes=5)
+    assert h.tick(4) == 0
+
+    for minute in (5, 10, 15, 20):
+        h.tick(minute)
+        assert h.scheduler.wait_idle(5)
+        h.tick(minute)  # запуск, ждавший свободного воркера
+        assert h.scheduler.wait_idle(5)
+
+    assert h.calls.count("ATI") == 4 and h.calls.count("TG") == 2
+    # Один поток пула — один «тёплый» сервис на все запуски
+    assert h.services_built == 1
+    assert h.scheduler.stats.succeeded == 6
+
+
+def test_per_source_limit_coalesces_and_global_limit_queues(harness_factory):
+    h = harness_factory(
+        _entry("ATI", interval_seconds=60),
+        _entry("TG", interval_seconds=60),
+        _entry("AVITO", interval_seconds=60),
+        max_workers=2,
+    )
+    h.gate.clear()
+    assert h.tick(1) == 2  # глобальный лимит: третий источник ждёт
+    # ATI и TG ещё идут: новые срабатывания не запускаются и схлопываются
+    assert h.tick(2) == 0
+    assert h.tick(3) == 0
+    assert sorted(h.calls) == ["ATI", "TG"]
+    assert h.scheduler.stats.coalesced >= 2
+
+    h.gate.set()
+    assert h.scheduler.wait_idle(5)
+    h.tick(3)
+    assert h.scheduler.wait_idle(5)
+    h.tick(3)
+    assert h.scheduler.wait_idle(5)
+    # каждый источник — не больше одного ожидающего запуска
+    assert sorted(h.calls) == ["ATI", "ATI", "AVITO", "TG", "TG"]
+
+
+def test_misfire_policies(harness_factory):
+    h = harness_factory(
+        _entry("ATI", interval_seconds=60, misfire="skip", misfire_grace_seconds=30),
+        _entry("TG", interval_seconds=60, misfire="run_once", misfire_grace_seconds=30),
+    )
+    # Процесс «проспал» десять минут
+    h.tick(11)
+    assert h.scheduler.wait_idle(5)
+    assert h.calls == ["TG"]
+    assert h.scheduler.stats.misfired == 1
+    # Пропущенные слоты схлопнуты: следующее срабатывание — через интервал от now
+    assert h.scheduler.next_fire_at() == T0 + timedelta(minutes=12)
+
+
+def test_reload_reschedules_changed_and_removed_entries(harness_factory):
+    h = harness_factory(_entry("ATI", interval_seconds=600), _entry("TG", interval_seconds=60))
+    h.configs.entries = [_entry("ATI", interval_seconds=120)]
+    h.scheduler.reload(T0)
+
+    assert h.scheduler.next_fire_at() == T0 + timedelta(minutes=2)
+    h.tick(10)
+    assert h.scheduler.wait_idle(5)
+    assert h.calls == ["ATI"]
+
+
+def test_failed_run_is_counted_and_scheduler_keeps_going(harness_factory):
+    h = harness_factory(_entry("BROKEN", interval_seconds=60), _entry("ATI", interval_seconds=60))
+    h.tick(1)
+    assert h.scheduler.wait_idle(5)
+    h.tick(2)
+    assert h.scheduler.wait_idle(5)
+    assert (h.scheduler.stats.failed, h.scheduler.stats.succeeded) == (2, 2)
+
+
+def test_sources_of_other_nodes_are_not_run(harness_factory):
+    owned = {"ATI"}
+    h = harness_factory(
+        _entry("ATI", interval_seconds=60),
+        _entry("TG", interval_seconds=60),
+        owns=lambda code: code in owned,
+    )
+    h.tick(1)
+    assert h.scheduler.wait_idle(5)
+    # Перераспределение: TG перешёл к этому узлу
+    owned.add("TG")
+    h.tick(2)
+    assert h.scheduler.wait_idle(5)
+
+    assert sorted(h.calls) == ["ATI", "ATI", "TG"]
+    assert h.scheduler.stats.not_owned == 1
+
+
+def test_run_loop_stops_on_request(harness_factory):
+    h = harness_factory(_entry("ATI", interval_seconds=0.05))
+    scheduler = HarvestScheduler(
+        uow_factory=lambda: _UnitOfWork(h.configs),
+        service_factory=lambda: _Service(h.calls, h.gate),
+        max_workers=1,
+    )
+    thread = threading.Thread(target=scheduler.run)
+    thread.start()
+    deadline = datetime.utcnow() + timedelta(seconds=5)
+    while scheduler.stats.succeeded < 2 and datetime.utcnow() < deadline:
+        threading.Event().wait(0.01)
+    scheduler.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert scheduler.stats.succeeded >= 2
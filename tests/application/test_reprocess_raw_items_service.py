@@ -0,0 +1,178 @@
+# path: tests/application/test_reprocess_raw_items_service.py
+"""
+ReprocessRawItemsService на SQLite-файле:
+- заявки пересобираются порциями и заменяют старые;
+- прерванная задача продолжается с checkpoint;
+- обработка в пуле процессов даёт тот же результат.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.application.pipeline import BidPipeline
+from dan_max_bids_parser.application.use_cases.reprocess_raw_items import (
+    ReprocessRawItemsCommand,
+)
+from dan_max_bids_parser.application.use_cases.reprocess_raw_items_service import (
+    ReprocessRawItemsService,
+)
+from dan_max_bids_parser.domain.services.classifier import BidClassifier
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import Bid, ConfigClassifier, RawItem, Source
+from dan_max_bids_parser.infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+
+
+# --- Фабрики пайплайна (уровня модуля — передаются в пул процессов) ---
+
+
+def classifying_pipeline() -> BidPipeline:
+    return BidPipeline(classifier=BidClassifier())
+
+
+class _ExplodingParser:
+    """Парсер, падающий на raw_item с payload «boom»."""
+
+    def refresh(self, entries) -> None:
+        pass
+
+    def supports(self, source) -> bool:
+        return True
+
+    def parse(self, source, raw_item):
+        if raw_item.payload == "boom":
+            raise RuntimeError("parser failure")
+        return [{"external_id": raw_item.external_id, "description": raw_item.payload}]
+
+
+def exploding_pipeline() -> BidPipeline:
+    return BidPipeline(parser=_ExplodingParser())
+
+
+# --- Фикстуры ---
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reprocess.sqlite'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    now = datetime.utcnow()
+    with factory() as session:
+        source = Source(code="TG", name="Telegram", kind="telegram", is_active=True)
+        session.add(source)
+        session.flush()
+        payloads = ["Щебень 30 т", "Песок 20 т", "boom", "Щебня 10 т", "Песка 5 т"]
+        for idx, payload in enumerate(payloads, start=1):
+            session.add(
+                RawItem(
+                    source_id=source.id,
+                    external_id=f"m-{idx}",
+                    payload=payload,
+                    fetched_at=now,
+                    created_at=now,
+                )
+            )
+        session.flush()
+        # Старая заявка, которая должна быть заменена
+        session.add(
+            Bid(
+                source_id=source.id,
+                raw_item_id=1,
+                title="old",
+                created_at=now,
+                updated_at=now,
+            )
+        )
+        session.add(
+            ConfigClassifier(
+                code="cargo",
+                name="cargo",
+                is_active=True,
+                data={"target": "cargo_type", "categories": {"щебень": [], "песок": []}},
+                created_at=now,
+                updated_at=now,
+            )
+        )
+        session.commit()
+    return factory
+
+
+def _service(session_factory, pipeline_factory, workers: int = 1) -> ReprocessRawItemsService:
+    return ReprocessRawItemsService(
+        uow_factory=lambda: SqlAlchemyUnitOfWork(session_factory),
+        pipeline_factory=pipeline_factory,
+        max_workers=workers,
+    )
+
+
+def _bids(session_factory) -> list[tuple[int, str]]:
+    with session_factory() as session:
+        rows = session.execute(select(Bid.raw_item_id, Bid.cargo_type).order_by(Bid.raw_item_id))
+        return [tuple(row) for row in rows]
+
+
+# --- Тесты ---
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reprocess_replaces_bids_in_batches(session_factory, workers):
+    job = _service(session_factory, classifying_pipeline, workers).execute(
+        ReprocessRawItemsCommand(batch_size=2)
+    )
+
+    assert job.status == "success"
+    assert job.items_total == 5
+    assert job.checkpoint == {"last_raw_item_id": 5, "max_raw_item_id": 5}
+    assert _bids(session_factory) == [
+        (1, "щебень"),
+        (2, "песок"),
+        (3, None),
+        (4, "щебень"),
+        (5, "песок"),
+    ]
+
+
+def test_interrupted_job_resumes_from_checkpoint(session_factory):
+    with pytest.raises(RuntimeError):
+        _service(session_factory, exploding_pipeline).execute(
+            ReprocessRawItemsCommand(batch_size=2)
+        )
+
+    with session_factory() as session:
+        # Первая порция (raw 1-2) записана, вторая (с «boom») — нет
+        assert session.execute(select(func.count(Bid.id))).scalar_one() == 2
+
+    job = _service(session_factory, classifying_pipeline).execute(
+        ReprocessRawItemsCommand(batch_size=2)
+    )
+
+    assert job.status == "success"
+    assert job.error_message is None
+    # Продолжили ту же задачу: обработаны все 5 raw_items, без повторов
+    assert job.items_total == 5
+    assert [raw_id for raw_id, _ in _bids(session_factory)] == [1, 2, 3, 4, 5]
+
+
+def test_resume_disabled_starts_new_job(session_factory):
+    with pytest.raises(RuntimeError):
+        _service(session_factory, exploding_pipeline).execute(ReprocessRawItemsCommand())
+
+    job = _service(session_factory, classifying_pipeline).execute(
+        ReprocessRawItemsCommand(resume=False)
+    )
+
+    assert job.id == 2
+    assert job.items_total == 5
+
+
+def test_unknown_source_raises_value_error(session_factory):
+    with pytest.raises(ValueError, match="Source with code='NOPE' not found"):
+        _service(session_factory, classifying_pipeline).execute(
+            ReprocessRawItemsCommand(source_code="NOPE")
+        )
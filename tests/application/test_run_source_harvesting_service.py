@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Optional, Sequence
 
 from dan_max_bids_parser.application.use_cases.harvest_source import (
@@ -13,9 +13,22 @@ from dan_max_bids_parser.application.use_cases.harvest_source_service import (
     UnitOfWorkFactory,
 )
 from dan_max_bids_parser.application.unit_of_work import UnitOfWork
-from dan_max_bids_parser.domain.entities import BidEntity, RawItemEntity, SourceEntity
+from dan_max_bids_parser.domain.entities import (
+    BidEntity,
+    ConfigEntryEntity,
+    DailyStatsEntity,
+    JobEntity,
+    RawItemEntity,
+    SourceEntity,
+)
+from dan_max_bids_parser.domain.services import daily_stats
+from dan_max_bids_parser.domain.services.bid_filter import BidFilter
+from dan_max_bids_parser.domain.services.classifier import BidClassifier
 from dan_max_bids_parser.domain.ports import (
     BidRepositoryPort,
+    ConfigRepositoryPort,
+    DailyStatsRepositoryPort,
+    JobRepositoryPort,
     RawItemRepositoryPort,
     SourceRepositoryPort,
 )
@@ -125,6 +138,62 @@ class InMemoryBidRepository(BidRepositoryPort):
         ]
 
 
+class InMemoryConfigRepository(ConfigRepositoryPort):
+    def __init__(self, entries: Optional[dict[str, list[ConfigEntryEntity]]] = None) -> None:
+        self.entries: dict[str, list[ConfigEntryEntity]] = entries or {}
+
+    def list_active(self, section: str) -> Sequence[ConfigEntryEntity]:
+        return [e for e in self.entries.get(section, []) if e.is_active]
+
+    def get_by_code(self, section: str, code: str) -> Optional[ConfigEntryEntity]:
+        return next((e for e in self.entries.get(section, []) if e.code == code), None)
+
+
+class InMemoryJobRepository(JobRepositoryPort):
+    def __init__(self) -> None:
+        self.items: dict[int, JobEntity] = {}
+        self._next_id: int = 1
+
+    def add(self, job: JobEntity) -> JobEntity:
+        job.id = self._next_id
+        self._next_id += 1
+        self.items[job.id] = replace(job)
+        return job
+
+    def get_by_id(self, job_id: int) -> Optional[JobEntity]:
+        return self.items.get(job_id)
+
+    def save(self, job: JobEntity) -> JobEntity:
+        # Копия: как и в БД, дальнейшие изменения объекта без save() не видны
+        self.items[job.id] = replace(job)
+        return job
+
+    def find_unfinished(self, job_type: str, source_id: Optional[int] = None) -> Optional[JobEntity]:
+        candidates = [
+            j
+            for j in self.items.values()
+            if j.job_type == job_type and j.source_id == source_id and j.status in ("running", "failed")
+        ]
+        return candidates[-1] if candidates else None
+
+
+class InMemoryDailyStatsRepository(DailyStatsRepositoryPort):
+    def __init__(self) -> None:
+        self.rows: dict[tuple, DailyStatsEntity] = {}
+
+    def apply(self, deltas: Iterable[DailyStatsEntity]) -> None:
+        self.rows = {
+            daily_stats.stats_key(row): row
+            for row in daily_stats.merge([*self.rows.values(), *deltas])
+        }
+
+    def rollup(self, day_from, day_to) -> int:
+        raise NotImplementedError
+
+    def list_range(self, day_from, day_to, source_ids=None) -> Sequence[DailyStatsEntity]:
+        return [r for r in self.rows.values() if day_from <= r.day <= day_to]
+
+
 class InMemoryUnitOfWork(UnitOfWork):
     """
     Простая in-memory реализация UnitOfWork для теста use-case.
@@ -140,10 +209,16 @@ class InMemoryUnitOfWork(UnitOfWork):
         sources: InMemorySourceRepository,
         raw_items: InMemoryRawItemRepository,
         bids: InMemoryBidRepository,
+        configs: Optional[InMemoryConfigRepository] = None,
+        jobs: Optional[InMemoryJobRepository] = None,
+        daily_stats: Optional[InMemoryDailyStatsRepository] = None,
     ) -> None:
         self.sources = sources
         self.raw_items = raw_items
         self.bids = bids
+        self.configs = configs or InMemoryConfigRepository()
+        self.jobs = jobs or InMemoryJobRepository()
+        self.daily_stats = daily_stats or InMemoryDailyStatsRepository()
         self.committed: bool = False
         self.rolled_back: bool = False
 
@@ -175,6 +250,27 @@ class StubRawItemProvider:
         return list(self.items)
 
 
+@dataclass
+class StubParser:
+    """
+    Заглушечный парсер: каждую строку payload превращает в отдельную заявку.
+    """
+    supported_codes: set[str]
+    refreshed_with: list[list[ConfigEntryEntity]] = field(default_factory=list)
+
+    def refresh(self, entries) -> None:
+        self.refreshed_with.append(list(entries))
+
+    def supports(self, source: SourceEntity) -> bool:
+        return source.code in self.supported_codes
+
+    def parse(self, source: SourceEntity, raw_item: RawItemEntity):
+        return [
+            {"external_id": line, "title": f"Заявка {line}", "weight_tons": "25 т"}
+            for line in raw_item.payload.splitlines()
+        ]
+
+
 # --- Тесты ---
 
 
@@ -250,3 +346,255 @@ def test_run_source_harvesting_raises_if_source_not_found():
         assert "Source with code='UNKNOWN' not found" in str(exc)
     else:
         assert False, "Ожидалось ValueError при отсутствии источника"
+
+
+def test_run_source_harvesting_uses_parser_for_configured_source():
+    source = SourceEntity(id=1, code="ATI", name="ATI", kind="html")
+    source_repo = InMemorySourceRepository([source])
+    raw_repo = InMemoryRawItemRepository()
+    bid_repo = InMemoryBidRepository()
+    config_entry = ConfigEntryEntity(id=1, code="ATI", name="ATI", data={"parser": {}})
+    config_repo = InMemoryConfigRepository({"source": [config_entry]})
+
+    raw_provider = StubRawItemProvider(
+        items=[RawItemEntity(source_id=1, payload="a-1\na-2", url="https://ati/list")]
+    )
+    parser = StubParser(supported_codes={"ATI"})
+
+    def uow_factory() -> UnitOfWork:
+        return InMemoryUnitOfWork(source_repo, raw_repo, bid_repo, config_repo)
+
+    service = RunSourceHarvestingService(
+        uow_factory=uow_factory,
+        raw_item_provider=raw_provider,
+        parser=parser,
+    )
+
+    service.execute(RunSourceHarvestingCommand(source_code="ATI"))
+
+    # Конфиг запрошен один раз на запуск
+    assert parser.refreshed_with == [[config_entry]]
+
+    # Одна страница -> две заявки, обе ссылаются на один raw_item
+    assert len(raw_repo.items) == 1
+    assert [b.external_id for b in bid_repo.items] == ["a-1", "a-2"]
+    assert [b.title for b in bid_repo.items] == ["Заявка a-1", "Заявка a-2"]
+    assert {b.raw_item_id for b in bid_repo.items} == {raw_repo.items[0].id}
+    assert all(b.url == "https://ati/list" for b in bid_repo.items)
+    # Строки парсера прошли через Normalizer
+    assert all(b.weight_tons == 25.0 for b in bid_repo.items)
+
+
+def test_run_source_harvesting_normalizes_free_text_payload():
+    source = SourceEntity(id=1, code="TG", name="Telegram", kind="telegram")
+    source_repo = InMemorySourceRepository([source])
+    raw_repo = InMemoryRawItemRepository()
+    bid_repo = InMemoryBidRepository()
+    raw_provider = StubRawItemProvider(
+        items=[
+            RawItemEntity(
+                source_id=1,
+                external_id="msg-1",
+                payload="Щебень 30 т Тверь - Москва, 45 000 руб, тел. 8 (900) 123-45-67",
+            )
+        ]
+    )
+
+    def uow_factory() -> UnitOfWork:
+        return InMemoryUnitOfWork(source_repo, raw_repo, bid_repo)
+
+    service = RunSourceHarvestingService(
+        uow_factory=uow_factory,
+        raw_item_provider=raw_provider,
+    )
+
+    service.execute(RunSourceHarvestingCommand(source_code="TG"))
+
+    [bid] = bid_repo.items
+    assert bid.weight_tons == 30.0
+    assert bid.price == 45000.0
+    assert bid.currency == "RUB"
+    assert bid.contact == "+79001234567"
+    assert bid.title == "Telegram: заявка msg-1"
+
+
+def test_run_source_harvesting_classifies_bids_by_config_dictionaries():
+    source = SourceEntity(id=1, code="TG", name="Telegram", kind="telegram")
+    source_repo = InMemorySourceRepository([source])
+    raw_repo = InMemoryRawItemRepository()
+    bid_repo = InMemoryBidRepository()
+    config_repo = InMemoryConfigRepository(
+        {
+            "classifier": [
+                ConfigEntryEntity(
+                    id=1,
+                    code="cargo",
+                    name="Грузы",
+                    data={"target": "cargo_type", "categories": {"щебень": ["щебень"]}},
+                ),
+                ConfigEntryEntity(
+                    id=2,
+                    code="transport",
+                    name="Транспорт",
+                    data={"target": "transport_type", "categories": {"самосвал": ["самосвал"]}},
+                ),
+            ]
+        }
+    )
+    raw_provider = StubRawItemProvider(
+        items=[RawItemEntity(source_id=1, external_id="m-1", payload="Нужны самосвалы, щебня 30 т")]
+    )
+
+    def uow_factory() -> UnitOfWork:
+        return InMemoryUnitOfWork(source_repo, raw_repo, bid_repo, config_repo)
+
+    service = RunSourceHarvestingService(
+        uow_factory=uow_factory,
+        raw_item_provider=raw_provider,
+        classifier=BidClassifier(),
+    )
+
+    service.execute(RunSourceHarvestingCommand(source_code="TG"))
+
+    [bid] = bid_repo.items
+    assert bid.cargo_type == "щебень"
+    assert bid.transport_type == "самосвал"
+
+
+def test_run_source_harvesting_does_not_persist_filtered_out_bids():
+    source = SourceEntity(id=1, code="TG", name="Telegram", kind="telegram")
+    source_repo = InMemorySourceRepository([source])
+    raw_repo = InMemoryRawItemRepository()
+    bid_repo = InMemoryBidRepository()
+    config_repo = InMemoryConfigRepository(
+        {
+            "filter_rule": [
+                ConfigEntryEntity(
+                    id=1,
+                    code="min-weight",
+                    name="Минимальный вес",
+                    data={"kind": "weight", "min": 10},
+                )
+            ]
+        }
+    )
+    raw_provider = StubRawItemProvider(
+        items=[
+            RawItemEntity(source_id=1, external_id="m-1", payload="Песок 30 т"),
+            RawItemEntity(source_id=1, external_id="m-2", payload="Песок 2 т"),
+        ]
+    )
+
+    def uow_factory() -> UnitOfWork:
+        return InMemoryUnitOfWork(source_repo, raw_repo, bid_repo, config_repo)
+
+    service = RunSourceHarvestingService(
+        uow_factory=uow_factory,
+        raw_item_provider=raw_provider,
+        bid_filter=BidFilter(),
+    )
+
+    service.execute(RunSourceHarvestingCommand(source_code="TG"))
+
+    # Сырьё сохраняется полностью, заявки — только прошедшие фильтр
+    assert len(raw_repo.items) == 2
+    assert [b.external_id for b in bid_repo.items] == ["m-1"]
+
+
+def test_run_source_harvesting_records_job_with_stage_durations():
+    source = SourceEntity(id=1, code="ATI", name="ATI", kind="html")
+    source_repo = InMemorySourceRepository([source])
+    raw_repo = InMemoryRawItemRepository()
+    bid_repo = InMemoryBidRepository()
+    job_repo = InMemoryJobRepository()
+    raw_provider = StubRawItemProvider(
+        items=[
+            RawItemEntity(source_id=1, external_id="ext-1", payload="raw 1"),
+            RawItemEntity(source_id=1, external_id="ext-2", payload="raw 2"),
+        ]
+    )
+
+    def uow_factory() -> UnitOfWork:
+        return InMemoryUnitOfWork(source_repo, raw_repo, bid_repo, jobs=job_repo)
+
+    service = RunSourceHarvestingService(uow_factory=uow_factory, raw_item_provider=raw_provider)
+    service.execute(RunSourceHarvestingCommand(source_code="ATI"))
+
+    [job] = job_repo.items.values()
+    assert job.job_type == "harvest_source"
+    assert job.source_id == 1
+    assert job.status == "success"
+    assert job.started_at is not None and job.finished_at >= job.started_at
+    assert (job.items_total, job.items_created, job.items_updated) == (2, 2, 0)
+    assert list(job.stage_durations) == [
+        "fetch",
+        "persist_raw_items",
+        "load_config",
+        "parse_normalize",
+        "classify_filter",
+        "persist_bids",
+        "commit",
+    ]
+    assert all(value >= 0 for value in job.stage_durations.values())
+
+
+def test_run_source_harvesting_records_failed_job():
+    class FailingProvider:
+        def fetch_raw_items(self, source):
+            raise ConnectionError("site is down")
+
+    source = SourceEntity(id=1, code="ATI", name="ATI", kind="html")
+    source_repo = InMemorySourceRepository([source])
+    job_repo = InMemoryJobRepository()
+
+    def uow_factory() -> UnitOfWork:
+        return InMemoryUnitOfWork(
+            source_repo, InMemoryRawItemRepository(), InMemoryBidRepository(), jobs=job_repo
+        )
+
+    service = RunSourceHarvestingService(uow_factory=uow_factory, raw_item_provider=FailingProvider())
+
+    try:
+        service.execute(RunSourceHarvestingCommand(source_code="ATI"))
+    except ConnectionError:
+        pass
+    else:
+        assert False, "Ожидалась ошибка провайдера"
+
+    [job] = job_repo.items.values()
+    assert job.status == "failed"
+    assert "site is down" in job.error_message
+    assert list(job.stage_durations) == ["fetch"]
+
+
+def test_run_source_harvesting_updates_daily_stats():
+    source = SourceEntity(id=1, code="ATI", name="ATI", kind="html")
+    source_repo = InMemorySourceRepository([source])
+    stats_repo = InMemoryDailyStatsRepository()
+    raw_provider = StubRawItemProvider(
+        items=[
+            RawItemEntity(source_id=1, external_id="ext-1", payload="a\nb"),
+            RawItemEntity(source_id=1, external_id="ext-2", payload="c"),
+        ]
+    )
+
+    def uow_factory() -> UnitOfWork:
+        return InMemoryUnitOfWork(
+            source_repo,
+            InMemoryRawItemRepository(),
+            InMemoryBidRepository(),
+            daily_stats=stats_repo,
+        )
+
+    service = RunSourceHarvestingService(
+        uow_factory=uow_factory,
+        raw_item_provider=raw_provider,
+        parser=StubParser(supported_codes={"ATI"}),
+    )
+    service.execute(RunSourceHarvestingCommand(source_code="ATI"))
+    service.execute(RunSourceHarvestingCommand(source_code="ATI"))
+
+    # Один ключ (сегодня, ATI, без типа груза): повторный запуск прибавляет
+    [row] = stats_repo.rows.values()
+    assert (row.source_id, row.cargo_type) == (1, "")
+    assert (row.raw_items, row.bids, row.price_count) == (4, 6, 0)
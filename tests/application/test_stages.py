@@ -0,0 +1,110 @@
+# path: tests/application/test_stages.py
+"""
+run_stages (конвейер этапов с ограниченными очередями):
+- все порции проходят через этапы, None отбрасывает порцию;
+- медленный этап не даёт очередям расти больше queue_size, а этапы
+  до него копят blocked_seconds;
+- несколько потоков этапа работают одновременно;
+- ошибка этапа останавливает конвейер и пробрасывается наружу;
+- с on_output результаты последнего этапа не копятся в outputs.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from dan_max_bids_parser.application.stages import Stage, run_stages
+
+
+def test_items_pass_through_all_stages():
+    result = run_stages(
+        range(10),
+        [
+            Stage("double", lambda x: x * 2, workers=3),
+            Stage("odd_out", lambda x: None if x % 4 else x),
+        ],
+        source_name="fetch",
+    )
+
+    assert sorted(result.outputs) == [0, 4, 8, 12, 16]
+    assert [s.name for s in result.stages] == ["fetch", "double", "odd_out"]
+    assert [s.items for s in result.stages] == [10, 10, 10]
+
+
+def test_slow_stage_applies_backpressure():
+    produced = []
+    depths: dict[str, int] = {}
+
+    def source():
+        for n in range(30):
+            produced.append(n)
+            yield n
+
+    def slow(item):
+        time.sleep(0.01)
+        return item
+
+    result = run_stages(
+        source(),
+        [Stage("fast", lambda x: x, queue_size=2), Stage("slow", slow, queue_size=2)],
+        on_depth=lambda name, depth: depths.__setitem__(name, max(depth, depths.get(name, 0))),
+    )
+
+    assert len(result.outputs) == 30
+    assert all(result.stage(name).max_depth <= 2 for name in ("fast", "slow"))
+    assert depths["slow"] == 2
+    # источник и быстрый этап ждали места в очередях, медленный — занят
+    assert result.stage("fast").blocked_seconds > 0
+    assert result.stage("slow").utilization > result.stage("fast").utilization
+
+
+def test_stage_workers_run_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def wait_for_all(item):
+        barrier.wait()
+        return item
+
+    result = run_stages(range(3), [Stage("io", wait_for_all, workers=3)])
+
+    assert sorted(result.outputs) == [0, 1, 2]
+
+
+def test_stage_error_stops_pipeline():
+    seen = []
+
+    def store(item):
+        if item == 3:
+            raise RuntimeError("disk full")
+        seen.append(item)
+        return item
+
+    with pytest.raises(RuntimeError, match="disk full"):
+        run_stages(iter(range(10_000)), [Stage("parse", lambda x: x), Stage("store", store)])
+
+    # конвейер остановился, источник не дочитан
+    assert len(seen) < 100
+
+
+def test_on_output_receives_results_instead_of_outputs():
+    received = []
+
+    result = run_stages(
+        range(10),
+        [Stage("double", lambda x: x * 2, workers=2), Stage("store", lambda x: x + 1)],
+        on_output=received.append,
+    )
+
+    assert result.outputs == []
+    assert sorted(received) == [1, 3, 5, 7, 9, 11, 13, 15, 17, 19]
+    assert result.stage("store").items == 10
+
+
+def test_invalid_stage_settings_are_rejected():
+    with pytest.raises(ValueError):
+        run_stages([1], [])
+    with pytest.raises(ValueError):
+        run_stages([1], [Stage("parse", lambda x: x, workers=0)])
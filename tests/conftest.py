@@ -0,0 +1,43 @@
+# path: tests/conftest.py
+"""
+Общие фикстуры тестов.
+
+assert_max_queries — фиксирует число SQL-запросов блока:
+
+    def test_bulk_insert(assert_max_queries, engine):
+        with assert_max_queries(engine, 3):
+            repo.add_many(items)   # O(1) запросов независимо от len(items)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+
+import pytest
+from sqlalchemy.engine import Engine
+
+from dan_max_bids_parser.infrastructure.db.base import (
+    QueryStats,
+    instrument_engine,
+    query_scope,
+)
+
+
+@pytest.fixture
+def assert_max_queries() -> Callable[[Engine, int], AbstractContextManager[QueryStats]]:
+    @contextmanager
+    def checker(engine: Engine, limit: int) -> Iterator[QueryStats]:
+        instrument_engine(engine)
+        with query_scope("test", n_plus_one_threshold=None) as stats:
+            yield stats
+        if stats.statements > limit:
+            details = "\n".join(
+                f"  {count} x {' '.join(sql.split())[:200]}"
+                for sql, count in stats.by_statement.most_common()
+            )
+            pytest.fail(
+                f"Expected at most {limit} SQL statements, got {stats.statements}:\n{details}"
+            )
+
+    return checker
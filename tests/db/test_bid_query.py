@@ -0,0 +1,134 @@
+# path: tests/db/test_bid_query.py
+"""
+BidRepository.query / count / exists на SQLite:
+- критерии, проекция без description и один SQL-запрос на страницу;
+- keyset-страницы без дублей и пропусков в обоих порядках;
+- запрос идёт по индексу, без сортировки во временном B-дереве.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.domain.entities import BidEntity, BidQuery
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import Source
+from dan_max_bids_parser.infrastructure.db.repositories import SqlAlchemyBidRepository
+
+NOW = datetime(2025, 3, 12, 10, 0)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'query.sqlite'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def repo(engine):
+    with sessionmaker(bind=engine)() as session:
+        session.add_all([
+            Source(id=1, code="ATI", name="ATI.SU", kind="html"),
+            Source(id=2, code="TG", name="Telegram", kind="telegram"),
+        ])
+        session.flush()
+        repo = SqlAlchemyBidRepository(session)
+        repo.add_many(
+            BidEntity(
+                source_id=1 + idx % 2,
+                title=f"Заявка {idx}",
+                description="<html>" * 50,
+                cargo_type="щебень" if idx % 3 else "песок",
+                load_region="RU-TVE",
+                unload_region="RU-MOS" if idx % 4 else "RU-MOW",
+                weight_tons=10 + idx,
+                price=1000 * idx,
+                # у каждой пятой заявки даты публикации нет
+                published_at=None if idx % 5 == 4 else NOW - timedelta(hours=idx // 2),
+                created_at=NOW,
+            )
+            for idx in range(40)
+        )
+        yield repo
+
+
+def _statements(engine) -> list[str]:
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *args: statements.append(stmt))
+    return statements
+
+
+def test_filters_and_projection(repo, engine):
+    query = BidQuery(cargo_types=("щебень",), unload_region="RU-MOS", price_min=5000,
+                     weight_max=40, source_ids=(1,))
+    statements = _statements(engine)
+
+    page = repo.query(query, fields=["title", "price"])
+
+    assert len(statements) == 1 and "description" not in statements[0]
+    assert page.rows and all(set(row) == {"id", "title", "price"} for row in page.rows)
+    expected = [idx for idx in range(40) if idx % 3 and idx % 4 and idx % 5 != 4
+                and idx % 2 == 0 and idx >= 5 and idx <= 30]
+    assert sorted(int(row["title"].split()[1]) for row in page.rows) == expected
+    assert all(isinstance(row["price"], float) for row in page.rows)
+    assert repo.count(query) == len(expected)
+    assert repo.exists(query)
+    assert not repo.exists(BidQuery(load_region="RU-KDA"))
+
+
+def test_default_projection_skips_description(repo):
+    row = repo.query(BidQuery(), limit=1).rows[0]
+    assert "description" not in row and "load_region" in row
+
+
+@pytest.mark.parametrize(("order", "total"), [("published", 32), ("id", 40)])
+def test_keyset_pages_have_no_duplicates_or_gaps(repo, order, total):
+    query = BidQuery(order=order)
+    seen, cursor = [], None
+    while True:
+        page = repo.query(query, fields=["published_at"], limit=7, cursor=cursor)
+        seen.extend(page.rows)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    ids = [row["id"] for row in seen]
+    assert len(ids) == len(set(ids)) == total == repo.count(query)
+    if order == "published":
+        keys = [(row["published_at"], row["id"]) for row in seen]
+        assert keys == sorted(keys, reverse=True)
+    else:
+        assert ids == sorted(ids, reverse=True)
+
+
+def test_listing_uses_index_without_sort(repo, engine):
+    statements = _statements(engine)
+    repo.query(BidQuery(), fields=["title"])
+    repo.query(BidQuery(load_region="RU-TVE", unload_region="RU-MOS"), fields=["title"])
+    repo.query(BidQuery(cargo_types=("песок",)), fields=["title"])
+
+    queries = list(statements)
+    with engine.connect() as conn:
+        for sql in queries:
+            params = ("x",) * sql.count("?")
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+            details = " ".join(row[-1] for row in plan)
+            assert "USING INDEX" in details and "TEMP B-TREE" not in details, details
+
+
+def test_invalid_arguments_raise_value_error(repo):
+    with pytest.raises(ValueError):
+        repo.query(BidQuery(), fields=["payload"])
+    with pytest.raises(ValueError):
+        repo.query(BidQuery(order="price"))
+    with pytest.raises(ValueError):
+        repo.query(BidQuery(price_min=10, price_max=1))
+    cursor = repo.query(BidQuery(order="id"), limit=1).next_cursor
+    with pytest.raises(ValueError):
+        repo.query(BidQuery(order="published"), cursor=cursor)
@@ -0,0 +1,58 @@
+# path: tests/db/test_bid_routes.py
+"""
+Маршрутные запросы по регионам (BidRepository.list_for_route):
+регионы сохраняются и читаются, выборка идёт по индексу ix_bids_route.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.domain.entities import BidEntity
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import Source
+from dan_max_bids_parser.infrastructure.db.repositories import SqlAlchemyBidRepository
+
+NOW = datetime(2025, 3, 12, 10, 0)
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'routes.sqlite'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add(Source(id=1, code="ATI", name="ATI.SU", kind="html"))
+        session.flush()
+        yield session
+
+
+def test_list_for_route_returns_fresh_bids_of_route(session):
+    repo = SqlAlchemyBidRepository(session)
+    routes = [("RU-TVE", "RU-MOS"), ("RU-TVE", "RU-MOW"), ("RU-MOS", "RU-TVE")]
+    repo.add_many(
+        BidEntity(source_id=1, title=f"Щебень {idx}", load_region=load, unload_region=unload,
+                  published_at=NOW - timedelta(hours=idx), created_at=NOW)
+        for idx, (load, unload) in enumerate(routes * 4)
+    )
+    repo.add(BidEntity(source_id=1, title="Без даты", load_region="RU-TVE",
+                       unload_region="RU-MOS", created_at=NOW))
+
+    bids = repo.list_for_route("RU-TVE", "RU-MOS", limit=3)
+    assert [b.published_at for b in bids] == [NOW - timedelta(hours=h) for h in (0, 3, 6)]
+    assert {(b.load_region, b.unload_region) for b in bids} == {("RU-TVE", "RU-MOS")}
+
+    since = repo.list_for_route("RU-TVE", published_since=NOW - timedelta(hours=4))
+    # idx 0, 1, 3, 4 (Тверь -> Подмосковье и -> Москва)
+    assert len(since) == 4
+
+    plan = session.execute(
+        text("EXPLAIN QUERY PLAN SELECT id FROM bids WHERE load_region = 'RU-TVE' "
+             "AND unload_region = 'RU-MOS' AND published_at IS NOT NULL "
+             "ORDER BY published_at DESC LIMIT 20")
+    ).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_bids_route" in details and "TEMP B-TREE" not in details
@@ -0,0 +1,112 @@
+# path: tests/db/test_bid_search.py
+"""
+SqlAlchemyBidSearch на SQLite (FTS5):
+- ранжирование и поиск по форме слова («щебня» -> «щебень»);
+- keyset-пагинация без дублей и пропусков, порядок "recent";
+- триггеры держат bids_fts в актуальном состоянии;
+- ошибки запроса/курсора — ValueError.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, delete, update
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.domain.services.bid_search import SearchCursor, fts5_prefix
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import Bid, Source
+from dan_max_bids_parser.infrastructure.db.repositories import SqlAlchemyBidSearch
+
+NOW = datetime(2025, 3, 12, 10, 0)
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.sqlite'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add_all([
+            Source(id=1, code="ATI", name="ATI.SU", kind="html"),
+            Source(id=2, code="TG", name="Telegram", kind="telegram"),
+        ])
+        session.flush()
+        yield session
+
+
+def _bid(session, title, load="Москва", unload="Тверь", description="", source_id=1) -> Bid:
+    bid = Bid(source_id=source_id, title=title, load_location=load, unload_location=unload,
+              description=description, created_at=NOW, updated_at=NOW)
+    session.add(bid)
+    session.flush()
+    return bid
+
+
+def test_fts5_prefix_covers_word_forms():
+    assert fts5_prefix("щебня") == fts5_prefix("щебень") == "щеб"
+    assert fts5_prefix("тверь") == "тве"
+    assert fts5_prefix("ка") == "ка"
+
+
+def test_ranks_title_matches_first_and_matches_word_forms(session):
+    in_description = _bid(session, "Песок", description="можно и щебень")
+    in_title = _bid(session, "Щебень 20 т")
+    _bid(session, "Песок 10 т")
+
+    page = SqlAlchemyBidSearch(session).search("щебня тверь")
+
+    assert [hit.bid.id for hit in page.hits] == [in_title.id, in_description.id]
+    assert page.hits[0].score > page.hits[1].score
+    assert page.next_cursor is None
+
+
+def test_keyset_pages_have_no_duplicates_or_gaps(session):
+    ids = {_bid(session, f"Щебень {idx}", description="щебень " * (idx % 4)).id for idx in range(23)}
+    search = SqlAlchemyBidSearch(session)
+
+    for order in ("rank", "recent"):
+        seen: list[int] = []
+        cursor = None
+        while True:
+            page = search.search("щебень", limit=5, cursor=cursor, order=order)
+            seen.extend(hit.bid.id for hit in page.hits)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert len(seen) == len(set(seen)) and set(seen) == ids
+        if order == "recent":
+            assert seen == sorted(ids, reverse=True)
+
+
+def test_source_filter(session):
+    _bid(session, "Щебень", source_id=1)
+    tg = _bid(session, "Щебень", source_id=2)
+
+    page = SqlAlchemyBidSearch(session).search("щебень", source_ids=[2])
+
+    assert [hit.bid.id for hit in page.hits] == [tg.id]
+
+
+def test_triggers_keep_index_in_sync(session):
+    bid = _bid(session, "Щебень")
+    search = SqlAlchemyBidSearch(session)
+
+    session.execute(update(Bid).where(Bid.id == bid.id).values(title="Песок"))
+    assert search.search("щебень").hits == []
+    assert [hit.bid.id for hit in search.search("песок").hits] == [bid.id]
+
+    session.execute(delete(Bid).where(Bid.id == bid.id))
+    assert search.search("песок").hits == []
+
+
+def test_invalid_query_and_cursor_raise_value_error(session):
+    search = SqlAlchemyBidSearch(session)
+    with pytest.raises(ValueError):
+        search.search("  -- !")
+    with pytest.raises(ValueError):
+        search.search("щебень", cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        search.search("щебень", order="price")
+    assert SearchCursor.decode(SearchCursor(-1.25, 7).encode()) == SearchCursor(-1.25, 7)
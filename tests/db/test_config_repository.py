@@ -0,0 +1,83 @@
+# path: tests/db/test_config_repository.py
+"""
+Проверка SqlAlchemyConfigRepository на SQLite in-memory:
+- выбираются только активные записи нужной секции;
+- версия конфигурации зависит от содержимого data.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import ConfigClassifier, ConfigSource
+from dan_max_bids_parser.infrastructure.db.repositories import (
+    SqlAlchemyConfigRepository,
+)
+
+
+def _make_session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, expire_on_commit=False)()
+
+
+def _config_row(model_cls, code: str, data: dict, is_active: bool = True):
+    now = datetime.utcnow()
+    return model_cls(
+        code=code,
+        name=code,
+        is_active=is_active,
+        data=data,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_list_active_returns_only_active_entries_of_section() -> None:
+    session = _make_session()
+    session.add_all(
+        [
+            _config_row(ConfigSource, "ATI", {"parser": {"items": "css:tr"}}),
+            _config_row(ConfigSource, "OFF", {}, is_active=False),
+            _config_row(ConfigClassifier, "cargo", {"categories": {}}),
+        ]
+    )
+    session.flush()
+
+    repo = SqlAlchemyConfigRepository(session)
+
+    entries = repo.list_active("source")
+    assert [e.code for e in entries] == ["ATI"]
+    assert entries[0].data == {"parser": {"items": "css:tr"}}
+
+    assert repo.get_by_code("classifier", "cargo") is not None
+    assert repo.get_by_code("source", "missing") is None
+
+    with pytest.raises(ValueError, match="Unknown config section"):
+        repo.list_active("unknown")
+
+    session.close()
+
+
+def test_config_version_changes_with_data() -> None:
+    session = _make_session()
+    row = _config_row(ConfigSource, "ATI", {"a": 1})
+    session.add(row)
+    session.flush()
+
+    repo = SqlAlchemyConfigRepository(session)
+    before = repo.get_by_code("source", "ATI")
+
+    row.data = {"a": 2}
+    session.flush()
+    after = repo.get_by_code("source", "ATI")
+
+    assert before is not None and after is not None
+    assert before.version != after.version
+
+    session.close()
@@ -0,0 +1,198 @@
+# path: tests/db/test_daily_stats.py
+"""
+Дневные агрегаты bid_daily_stats на SQLite:
+- apply() накапливает приращения upsert'ом;
+- инкрементальные приращения совпадают с пересчётом rollup();
+- rollup() догоняет дубли и ошибки, записанные помимо сбора;
+- сбор во время rollup() не теряется и не считается дважды; на Postgres
+  обе операции берут advisory-блокировку агрегата;
+- отчёт читает только агрегат, не bids и не raw_items.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.application.use_cases.generate_daily_health_report import (
+    GenerateDailyHealthReportCommand,
+)
+from dan_max_bids_parser.application.use_cases.generate_daily_health_report_service import (
+    GenerateDailyHealthReportService,
+)
+from dan_max_bids_parser.domain.entities import BidEntity, RawItemEntity
+from dan_max_bids_parser.domain.services import daily_stats
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import Bid, ErrorLog, Source
+from dan_max_bids_parser.infrastructure.db.repositories import SqlAlchemyDailyStatsRepository
+from dan_max_bids_parser.infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+
+DAY = date(2025, 3, 12)
+NOW = datetime(2025, 3, 12, 10, 0)
+
+
+@pytest.fixture
+def factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.sqlite'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with factory() as session:
+        session.add_all([
+            Source(id=1, code="ATI", name="ATI.SU", kind="html"),
+            Source(id=2, code="TG", name="Telegram", kind="telegram"),
+            Source(id=3, code="OLD", name="Silent", kind="html"),
+        ])
+        session.commit()
+    return factory
+
+
+def _harvest(factory, source_id: int, created_at: datetime, count: int) -> None:
+    """Как RunSourceHarvestingService: вставка и приращения в одной транзакции."""
+    with SqlAlchemyUnitOfWork(factory) as uow:
+        raw_items = list(uow.raw_items.add_many(
+            RawItemEntity(source_id=source_id, payload=f"raw {i}", created_at=created_at)
+            for i in range(count)
+        ))
+        bids = list(uow.bids.add_many(
+            BidEntity(
+                source_id=source_id,
+                raw_item_id=raw.id,
+                title=f"Заявка {i}",
+                cargo_type="щебень" if i % 2 else None,
+                price=1000.0 * (i + 1) if i % 3 else None,
+                created_at=created_at,
+            )
+            for i, raw in enumerate(raw_items)
+        ))
+        uow.daily_stats.apply(daily_stats.from_raw_items(raw_items) + daily_stats.from_bids(bids))
+        uow.commit()
+
+
+def _rows(factory, day_from=DAY - timedelta(days=1), day_to=DAY):
+    with SqlAlchemyUnitOfWork(factory) as uow:
+        return {
+            daily_stats.stats_key(row): row
+            for row in uow.daily_stats.list_range(day_from, day_to)
+        }
+
+
+def test_apply_accumulates_and_matches_rollup(factory):
+    _harvest(factory, 1, NOW, 6)
+    _harvest(factory, 1, NOW + timedelta(hours=1), 4)
+    _harvest(factory, 2, NOW - timedelta(days=1), 3)
+
+    incremental = _rows(factory)
+    ati = incremental[(DAY, 1, "щебень")]
+    # щебень — нечётные i (3 + 2 заявки), цена — у i, не кратных 3 (i=1,5 и i=1)
+    assert (ati.bids, ati.price_count, ati.price_sum) == (5, 3, 2000.0 + 6000 + 2000)
+    assert incremental[(DAY, 1, "")].raw_items == 10
+    assert incremental[(DAY - timedelta(days=1), 2, "")].raw_items == 3
+
+    with SqlAlchemyUnitOfWork(factory) as uow:
+        assert uow.daily_stats.rollup(DAY - timedelta(days=1), DAY) == len(incremental)
+        uow.commit()
+    assert _rows(factory) == incremental
+
+
+def test_rollup_picks_up_duplicates_and_errors(factory):
+    _harvest(factory, 1, NOW, 4)
+    with factory() as session:
+        session.execute(update(Bid).where(Bid.id <= 2).values(is_duplicate=True))
+        session.add(ErrorLog(source_id=1, occurred_at=NOW, message="timeout", created_at=NOW))
+        session.add(ErrorLog(source_id=None, occurred_at=NOW, message="global", created_at=NOW))
+        session.commit()
+
+    with SqlAlchemyUnitOfWork(factory) as uow:
+        uow.daily_stats.rollup(DAY, DAY)
+        uow.commit()
+
+    rows = _rows(factory, DAY, DAY)
+    assert rows[(DAY, 1, "")].duplicates == 1
+    assert rows[(DAY, 1, "щебень")].duplicates == 1
+    assert rows[(DAY, 1, "")].errors == 1
+
+
+def test_harvest_during_rollup_is_counted_once(factory):
+    _harvest(factory, 1, NOW, 4)
+    engine = factory.kw["bind"]
+    # Сбор источника без строк агрегата — новый ключ, как в гонке с INSERT пересчёта
+    harvest = threading.Thread(target=_harvest, args=(factory, 2, NOW, 3))
+
+    def start_harvest_after_delete(conn, cursor, statement, *args) -> None:
+        if statement.startswith("DELETE FROM bid_daily_stats") and not harvest.is_alive():
+            harvest.start()
+            time.sleep(0.2)  # сбор успевает упереться в блокировку пересчёта
+
+    event.listen(engine, "after_cursor_execute", start_harvest_after_delete)
+    try:
+        with SqlAlchemyUnitOfWork(factory) as uow:
+            uow.daily_stats.rollup(DAY, DAY)
+            uow.commit()
+    finally:
+        event.remove(engine, "after_cursor_execute", start_harvest_after_delete)
+    harvest.join()
+
+    interleaved = _rows(factory, DAY, DAY)
+    assert interleaved[(DAY, 2, "")].raw_items == 3
+    with SqlAlchemyUnitOfWork(factory) as uow:
+        uow.daily_stats.rollup(DAY, DAY)
+        uow.commit()
+    assert _rows(factory, DAY, DAY) == interleaved
+
+
+class _PostgresRecordingSession:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    def execute(self, statement, *args):
+        self.statements.append(str(statement))
+        return []
+
+
+def test_postgres_apply_and_rollup_take_stats_lock_first():
+    session = _PostgresRecordingSession()
+    repo = SqlAlchemyDailyStatsRepository(session)
+
+    repo.apply([daily_stats.DailyStatsEntity(day=DAY, source_id=1, raw_items=1)])
+    repo.rollup(DAY, DAY)
+
+    apply_lock, upsert, rollup_lock, delete = session.statements[:4]
+    assert "pg_advisory_xact_lock_shared" in apply_lock and upsert.startswith("INSERT")
+    assert "pg_advisory_xact_lock(" in rollup_lock and delete.startswith("DELETE")
+
+
+def test_report_reads_only_aggregates(factory):
+    _harvest(factory, 1, NOW, 6)
+    _harvest(factory, 2, NOW - timedelta(days=3), 2)
+
+    statements: list[str] = []
+    engine = factory.kw["bind"]
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *args: statements.append(stmt))
+    report = GenerateDailyHealthReportService(lambda: SqlAlchemyUnitOfWork(factory)).execute(
+        GenerateDailyHealthReportCommand(day_to=DAY, days=2)
+    )
+
+    assert not [s for s in statements if "FROM bids" in s or "FROM raw_items" in s]
+    by_code = {item.source_code: item for item in report.sources}
+    assert (by_code["ATI"].raw_items, by_code["ATI"].bids) == (6, 6)
+    assert by_code["ATI"].cargo_types == {"": 3, "щебень": 3}
+    assert by_code["ATI"].avg_price == pytest.approx((2000 + 3000 + 5000 + 6000) / 4)
+    assert [s.source_code for s in report.silent_sources] == ["OLD", "TG"]
+
+
+def test_report_rejects_bad_window(factory):
+    service = GenerateDailyHealthReportService(lambda: SqlAlchemyUnitOfWork(factory))
+    with pytest.raises(ValueError):
+        service.execute(GenerateDailyHealthReportCommand(day_to=DAY, days=0))
+    with pytest.raises(ValueError):
+        service.execute(GenerateDailyHealthReportCommand(day_to=DAY, source_codes=("NOPE",)))
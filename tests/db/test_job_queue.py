@@ -0,0 +1,231 @@
+# path: tests/db/test_job_queue.py
+"""
+Таблица jobs как очередь (SqlAlchemyJobQueue) на SQLite-файле:
+- claim выдаёт готовые задачи по порядку, с арендой и счётчиком попыток;
+- параллельная постановка того же источника не создаёт вторую ждущую
+  задачу (частичный уникальный индекс + ON CONFLICT DO NOTHING);
+- heartbeat / complete / fail работают только для владельца аренды;
+- упавшая задача повторяется до max_attempts, просроченная аренда
+  возвращается в очередь; release возвращает задачу, не тратя попытку;
+- несколько процессов разбирают очередь без повторной выдачи задач;
+- HarvestQueueWorker выполняет сбор и пишет итоги в задачу очереди.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.application.job_queue import EnqueueHarvestService, HarvestQueueWorker
+from dan_max_bids_parser.application.use_cases.harvest_source import RunSourceHarvestingCommand
+from dan_max_bids_parser.application.use_cases.harvest_source_service import (
+    JOB_TYPE,
+    RunSourceHarvestingService,
+)
+from dan_max_bids_parser.domain.entities import RawItemEntity
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import Bid, Job, Source
+from dan_max_bids_parser.infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+
+NOW = datetime(2025, 3, 12, 10, 0)
+LEASE = timedelta(minutes=5)
+
+
+def _factory(url: str):
+    engine = create_engine(url, future=True, connect_args={"timeout": 30})
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'queue.sqlite'}"
+    engine = create_engine(url, future=True)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add_all([
+            Source(id=1, code="ATI", name="ATI.SU", kind="html"),
+            Source(id=2, code="TG", name="Telegram", kind="telegram"),
+        ])
+        session.commit()
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def uow_factory(db_url):
+    factory = _factory(db_url)
+    return lambda: SqlAlchemyUnitOfWork(factory)
+
+
+def _queue(uow_factory, method: str, *args, **kwargs):
+    with uow_factory() as uow:
+        result = getattr(uow.job_queue, method)(*args, **kwargs)
+        uow.commit()
+    return result
+
+
+def test_claim_leases_ready_jobs_in_order(uow_factory):
+    first = _queue(uow_factory, "enqueue", JOB_TYPE, 1)
+    later = _queue(uow_factory, "enqueue", JOB_TYPE, 2, run_after=NOW + timedelta(hours=1))
+    # тот же источник уже в очереди
+    assert _queue(uow_factory, "enqueue", JOB_TYPE, 1) is None
+
+    [job] = _queue(uow_factory, "claim", "w1", [JOB_TYPE], limit=5, lease=LEASE, now=NOW)
+    assert (job.id, job.status, job.leased_by, job.attempts) == (first.id, "running", "w1", 1)
+    assert job.lease_expires_at == NOW + LEASE
+    assert _queue(uow_factory, "claim", "w2", [JOB_TYPE], now=NOW) == []
+
+    [job] = _queue(uow_factory, "claim", "w2", [JOB_TYPE], now=NOW + timedelta(hours=2))
+    assert job.id == later.id
+
+
+def test_concurrent_enqueue_keeps_one_pending_job(db_url, uow_factory):
+    factory = _factory(db_url)
+    raced: list = []
+
+    def enqueue_elsewhere(conn, cursor, statement, *args) -> None:
+        # Другой узел ставит тот же источник между проверкой и INSERT
+        if statement.lstrip().startswith("SELECT") and not raced:
+            raced.append(_queue(uow_factory, "enqueue", JOB_TYPE, 1))
+
+    event.listen(factory.kw["bind"], "after_cursor_execute", enqueue_elsewhere)
+    with SqlAlchemyUnitOfWork(factory) as uow:
+        assert uow.job_queue.enqueue(JOB_TYPE, 1) is None
+        uow.commit()
+
+    with factory() as session:
+        pending = session.execute(select(Job.id).where(Job.status == "pending")).scalars().all()
+    assert pending == [raced[0].id]
+
+
+def test_lease_operations_are_fenced_by_owner(uow_factory):
+    job = _queue(uow_factory, "enqueue", JOB_TYPE, 1)
+    _queue(uow_factory, "claim", "w1", [JOB_TYPE], now=NOW)
+
+    assert _queue(uow_factory, "heartbeat", job.id, "w2", LEASE, now=NOW) is False
+    assert _queue(uow_factory, "heartbeat", job.id, "w1", LEASE, now=NOW + timedelta(minutes=4))
+    assert _queue(uow_factory, "complete", job.id, "w2") is False
+    assert _queue(uow_factory, "complete", job.id, "w1") is True
+
+    with uow_factory() as uow:
+        done = uow.jobs.get_by_id(job.id)
+    assert (done.status, done.leased_by, done.heartbeat_at) == (
+        "success", None, NOW + timedelta(minutes=4)
+    )
+
+
+def test_failed_and_expired_jobs_are_retried_until_max_attempts(uow_factory):
+    job = _queue(uow_factory, "enqueue", JOB_TYPE, 1, max_attempts=2)
+
+    _queue(uow_factory, "claim", "w1", [JOB_TYPE], lease=LEASE, now=NOW)
+    assert _queue(uow_factory, "fail", job.id, "w1", "boom", timedelta(minutes=1), now=NOW)
+    with uow_factory() as uow:
+        retry = uow.jobs.get_by_id(job.id)
+    assert (retry.status, retry.run_after, retry.error_message) == (
+        "pending", NOW + timedelta(minutes=1), "boom"
+    )
+
+    # Воркер взял задачу и умер: аренда истекает, попытки кончились
+    later = NOW + timedelta(minutes=2)
+    _queue(uow_factory, "claim", "w2", [JOB_TYPE], lease=LEASE, now=later)
+    assert _queue(uow_factory, "reclaim_expired", now=later + LEASE / 2) == 0
+    assert _queue(uow_factory, "reclaim_expired", now=later + LEASE * 2) == 1
+    with uow_factory() as uow:
+        dead = uow.jobs.get_by_id(job.id)
+    assert (dead.status, dead.attempts, dead.leased_by) == ("failed", 2, None)
+    # Поздний heartbeat умершего воркера аренду не возвращает
+    assert _queue(uow_factory, "heartbeat", job.id, "w2", LEASE) is False
+
+
+def test_released_job_keeps_its_attempts(uow_factory):
+    job = _queue(uow_factory, "enqueue", JOB_TYPE, 1, max_attempts=1)
+
+    for n in range(3):
+        now = NOW + timedelta(minutes=n)
+        [claimed] = _queue(uow_factory, "claim", "w1", [JOB_TYPE], lease=LEASE, now=now)
+        assert claimed.attempts == 1
+        assert _queue(uow_factory, "release", job.id, "w2", now) is False
+        assert _queue(uow_factory, "release", job.id, "w1", now + timedelta(seconds=30))
+
+    with uow_factory() as uow:
+        released = uow.jobs.get_by_id(job.id)
+    assert (released.status, released.attempts, released.leased_by, released.run_after) == (
+        "pending", 0, None, NOW + timedelta(minutes=2, seconds=30)
+    )
+
+
+def _drain(db_url: str, worker_id: str) -> list[int]:
+    """Процесс-воркер: забирает задачи, пока очередь не опустеет."""
+    factory = _factory(db_url)
+    taken: list[int] = []
+    while True:
+        with SqlAlchemyUnitOfWork(factory) as uow:
+            jobs = uow.job_queue.claim(worker_id, [JOB_TYPE], limit=2)
+            uow.commit()
+        if not jobs:
+            return taken
+        for job in jobs:
+            taken.append(job.id)
+            with SqlAlchemyUnitOfWork(factory) as uow:
+                assert uow.job_queue.complete(job.id, worker_id)
+                uow.commit()
+
+
+def test_several_processes_take_each_job_once(db_url, uow_factory):
+    with _factory(db_url)() as session:
+        session.add_all(
+            Source(id=n, code=f"S{n}", name=f"Источник {n}", kind="html") for n in range(3, 61)
+        )
+        session.commit()
+    for source_id in range(1, 61):
+        _queue(uow_factory, "enqueue", JOB_TYPE, source_id)
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(4) as pool:
+        results = pool.starmap(_drain, [(db_url, f"worker-{n}") for n in range(4)])
+
+    taken = [job_id for result in results for job_id in result]
+    assert len(taken) == len(set(taken)) == 60
+    with _factory(db_url)() as session:
+        rows = session.execute(select(Job.status, Job.attempts)).all()
+    assert set(rows) == {("success", 1)}
+
+
+class _Provider:
+    def __init__(self, fail_codes: set[str]) -> None:
+        self._fail_codes = fail_codes
+
+    def fetch_raw_items(self, source):
+        if source.code in self._fail_codes:
+            raise ConnectionError("site is down")
+        return [RawItemEntity(source_id=source.id, external_id=f"{source.code}-1", payload="x")]
+
+
+def test_worker_runs_queued_harvests(uow_factory):
+    producer = EnqueueHarvestService(uow_factory, max_attempts=2)
+    producer.execute(RunSourceHarvestingCommand(source_code="ATI"))
+    producer.execute(RunSourceHarvestingCommand(source_code="TG"))
+    with pytest.raises(ValueError):
+        producer.execute(RunSourceHarvestingCommand(source_code="NOPE"))
+
+    service = RunSourceHarvestingService(uow_factory, raw_item_provider=_Provider({"TG"}))
+    worker = HarvestQueueWorker(uow_factory, service, worker_id="w1", retry_delay=timedelta(0))
+    worker.run(until_idle=True)
+
+    assert (worker.processed, worker.failed) == (1, 2)
+    with uow_factory() as uow:
+        ati, tg = uow.jobs.get_by_id(1), uow.jobs.get_by_id(2)
+        bids = uow.session.execute(select(Bid.source_id)).scalars().all()
+        jobs_count = len(uow.session.execute(select(Job.id)).all())
+    # итоги сбора записаны в задачу очереди, новых строк jobs нет
+    assert jobs_count == 2
+    assert (ati.status, ati.items_total, ati.leased_by, "fetch" in ati.stage_durations) == (
+        "success", 1, None, True
+    )
+    assert (tg.status, tg.attempts) == ("failed", 2)
+    assert "site is down" in tg.error_message
+    assert bids == [1]
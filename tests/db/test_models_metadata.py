@@ -31,6 +31,10 @@ def test_metadata_contains_expected_tables() -> None:
         "config_schedule",
         "config_antibot",
         "config_export",
+        "export_cursors",
+        "bid_daily_stats",
+        "source_locks",
+        "worker_nodes",
     }
 
     missing = expected - tables
@@ -0,0 +1,104 @@
+# path: tests/db/test_query_counter.py
+from __future__ import annotations
+
+"""
+Учёт SQL-запросов (infrastructure.db.base): пакетная вставка за O(1)
+запросов (страница insertmanyvalues — один запрос) с верным числом
+строк, вложенные области, детектор N+1 и журнал медленных запросов.
+"""
+
+import logging
+import math
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.domain.entities import BidEntity, RawItemEntity
+from dan_max_bids_parser.infrastructure.db import base
+from dan_max_bids_parser.infrastructure.db.base import Base, instrument_engine, query_scope
+from dan_max_bids_parser.infrastructure.db.models import Bid, RawItem, Source
+from dan_max_bids_parser.infrastructure.db.repositories import (
+    SqlAlchemyBidRepository,
+    SqlAlchemyRawItemRepository,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    return instrument_engine(engine)
+
+
+@pytest.fixture
+def session(engine):
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    session.add(Source(id=1, code="ATI", name="ATI", kind="html", is_active=True))
+    session.flush()
+    yield session
+    session.close()
+
+
+def _insert_bound(engine, count: int) -> int:
+    """
+    Сколько INSERT допустимо на пакет из count строк: multi-row
+    INSERT ... RETURNING страницами insertmanyvalues на обоих диалектах.
+    """
+    return math.ceil(count / engine.dialect.insertmanyvalues_page_size)
+
+
+@pytest.mark.parametrize("count", [10, 300, 2500])
+def test_add_many_issues_constant_number_of_inserts(assert_max_queries, engine, session, count):
+    raw_items = [RawItemEntity(source_id=1, external_id=f"r{i}", payload="x") for i in range(count)]
+    with assert_max_queries(engine, _insert_bound(engine, count)) as stats:
+        saved = SqlAlchemyRawItemRepository(session).add_many(raw_items)
+    assert stats.rows == count
+    ids = [item.id for item in saved]
+    assert len(set(ids)) == count and all(ids)
+
+    bids = [
+        BidEntity(source_id=1, raw_item_id=saved[i].id, external_id=f"b{i}", title="t")
+        for i in range(count)
+    ]
+    with assert_max_queries(engine, _insert_bound(engine, count)) as stats:
+        SqlAlchemyBidRepository(session).add_many(bids)
+    assert stats.rows == count
+    assert all(sql.startswith("INSERT INTO bids ") for sql in stats.by_statement)
+
+    # id вернулись в порядке пакета: заявка связана со своим raw_item
+    rows = session.execute(select(Bid.external_id, RawItem.external_id).join(RawItem)).all()
+    assert all(bid_ext[1:] == raw_ext[1:] for bid_ext, raw_ext in rows)
+    assert session.get(Bid, bids[-1].id).external_id == f"b{count - 1}"
+
+
+def test_scopes_nest_and_count_rows(engine):
+    with engine.begin() as conn:
+        with query_scope("outer") as outer:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            with query_scope("inner") as inner:
+                conn.execute(text("INSERT INTO t VALUES (1), (2), (3)"))
+    assert (outer.statements, inner.statements) == (2, 1)
+    assert inner.rows == 3
+    assert outer.seconds >= inner.seconds > 0
+
+
+def test_repeated_statement_is_reported_as_n_plus_one(engine, caplog):
+    with caplog.at_level(logging.WARNING, logger=base.__name__):
+        with engine.connect() as conn, query_scope("lookup", n_plus_one_threshold=5) as stats:
+            for i in range(6):
+                conn.execute(text("SELECT :i"), {"i": i})
+    assert stats.repeated(5) == [("SELECT ?", 6)]
+    assert "Possible N+1 in lookup: statement executed 6 times" in caplog.text
+
+
+def test_slow_query_log(engine, caplog, monkeypatch):
+    monkeypatch.setattr(base, "_slow_query_seconds", 0)
+    with engine.connect() as conn:
+        base.set_slow_query_threshold(0.000001)
+        with caplog.at_level(logging.WARNING, logger=base.__name__):
+            conn.execute(text("SELECT 1"))
+        base.set_slow_query_threshold(None)
+        conn.execute(text("SELECT 2"))
+    assert "Slow query" in caplog.text and "SELECT 1" in caplog.text
+    assert "SELECT 2" not in caplog.text
@@ -0,0 +1,99 @@
+# path: tests/db/test_raw_item_payload.py
+"""
+Отложенная загрузка RawItem.payload:
+- методы заголовков и выборка по hash не читают payload;
+- hash заполняется при записи (sha256 payload);
+- методы RawItemEntity подгружают payload тем же запросом (без N+1);
+- payload по одному и пачкой по id.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.domain.entities import RawItemEntity
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import RawItem, Source
+from dan_max_bids_parser.infrastructure.db.repositories import (
+    SqlAlchemyRawItemRepository,
+    payload_hash,
+)
+
+NOW = datetime(2025, 3, 12, 10, 0)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'raw.sqlite'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@pytest.fixture
+def session(engine):
+    with sessionmaker(bind=engine)() as session:
+        session.add(Source(id=1, code="ATI", name="ATI.SU", kind="html"))
+        session.flush()
+        SqlAlchemyRawItemRepository(session).add_many(
+            RawItemEntity(source_id=1, external_id=f"e{idx}", payload=f"<p>{idx}</p>" * 1000,
+                          url=f"https://example.test/{idx}", created_at=NOW + timedelta(minutes=idx))
+            for idx in range(12)
+        )
+        session.commit()
+        session.expunge_all()
+        yield session
+
+
+@pytest.fixture
+def statements(engine) -> list[str]:
+    result: list[str] = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *args: result.append(stmt))
+    return result
+
+
+def test_payload_is_deferred_on_plain_orm_queries(session, statements):
+    models = session.execute(select(RawItem)).scalars().all()
+    assert len(models) == 12 and "payload" not in statements[0]
+
+
+def test_header_methods_do_not_read_payload(session, statements):
+    repo = SqlAlchemyRawItemRepository(session)
+    duplicate = payload_hash("<p>3</p>" * 1000)
+
+    headers = repo.list_headers_for_source_since(1, NOW + timedelta(minutes=5))
+    page = repo.list_headers_after_id(3, limit=4, source_id=1)
+    by_hash = repo.find_headers_by_hash([duplicate, "nope"])
+
+    assert [h.external_id for h in headers] == [f"e{idx}" for idx in range(5, 12)]
+    assert [h.id for h in page] == [4, 5, 6, 7]
+    assert [(h.external_id, h.hash) for h in by_hash] == [("e3", duplicate)]
+    selects = [s for s in statements if s.lstrip().startswith("SELECT")]
+    assert len(selects) == 3 and all("payload" not in s for s in selects)
+
+
+def test_entity_methods_load_payload_in_one_query(session, statements):
+    repo = SqlAlchemyRawItemRepository(session)
+
+    items = repo.list_after_id(0, limit=12)
+    assert len(statements) == 1 and "payload" in statements[0]
+    assert items[3].payload == "<p>3</p>" * 1000
+    assert repo.get_by_id(5).payload == "<p>4</p>" * 1000
+    assert len(statements) == 2
+
+
+def test_get_payloads_in_bulk(session, statements, monkeypatch):
+    repo = SqlAlchemyRawItemRepository(session)
+    monkeypatch.setattr(SqlAlchemyRawItemRepository, "PAYLOAD_CHUNK", 5)
+
+    payloads = repo.get_payloads([1, 2, 2, 7, 8, 9, 10, 11, 12, 999])
+
+    assert sorted(payloads) == [1, 2, 7, 8, 9, 10, 11, 12]
+    assert payloads[7] == "<p>6</p>" * 1000
+    assert len(statements) == 2
+    assert repo.get_payload(3) == "<p>2</p>" * 1000
+    assert repo.get_payload(999) is None
@@ -0,0 +1,182 @@
+# path: tests/db/test_source_lock.py
+"""
+Блокировка запуска сбора источника:
+- RowSourceLock на SQLite-файле: один владелец, снятие, ожидание,
+  захват строки с истёкшим ttl;
+- ExclusiveHarvestService: одновременные запуски одного источника не
+  пересекаются, политики skip / wait / queue; задача очереди при занятом
+  источнике возвращается в очередь (без траты попытки), а не закрывается.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.application.job_queue import HarvestQueueWorker
+from dan_max_bids_parser.application.source_lock import ExclusiveHarvestService, SourceBusyError
+from dan_max_bids_parser.application.use_cases.harvest_source import RunSourceHarvestingCommand
+from dan_max_bids_parser.application.use_cases.harvest_source_service import JOB_TYPE
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.locks import RowSourceLock, create_source_lock
+from dan_max_bids_parser.infrastructure.db.models import Job, Source
+from dan_max_bids_parser.infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'locks.sqlite'}", future=True, connect_args={"timeout": 30}
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with factory() as session:
+        session.add(Source(id=1, code="ATI", name="ATI.SU", kind="html"))
+        session.commit()
+    return factory
+
+
+def _locks(session_factory, **kwargs) -> RowSourceLock:
+    return RowSourceLock(session_factory, poll_interval=0.01, **kwargs)
+
+
+def test_row_lock_has_single_holder(session_factory):
+    first, second = _locks(session_factory), _locks(session_factory)
+    assert isinstance(create_source_lock(session_factory.kw["bind"], session_factory), RowSourceLock)
+
+    assert first.acquire("ATI")
+    assert not second.acquire("ATI")
+    assert second.acquire("TG")
+    # Чужую блокировку release не снимает
+    second.release("ATI")
+    assert not second.acquire("ATI", timeout=0.05)
+
+    first.release("ATI")
+    assert second.acquire("ATI")
+
+
+def test_row_lock_waits_for_release(session_factory):
+    first, second = _locks(session_factory), _locks(session_factory)
+    assert first.acquire("ATI")
+    threading.Timer(0.1, first.release, ["ATI"]).start()
+
+    started = time.monotonic()
+    assert second.acquire("ATI", timeout=5)
+    assert time.monotonic() - started < 5
+
+
+def test_expired_row_lock_is_taken_over(session_factory):
+    dead = _locks(session_factory, ttl=timedelta(milliseconds=50))
+    assert dead.acquire("ATI")
+    alive = _locks(session_factory)
+    assert alive.acquire("ATI", timeout=2)
+    # «Умерший» владелец не снимает новую блокировку
+    dead.release("ATI")
+    assert not _locks(session_factory).acquire("ATI")
+
+
+class _SlowHarvest:
+    def __init__(self) -> None:
+        self.running = 0
+        self.peak = 0
+        self.runs = 0
+        self._guard = threading.Lock()
+
+    def execute(self, command) -> None:
+        with self._guard:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.05)
+        with self._guard:
+            self.running -= 1
+            self.runs += 1
+
+
+def _service(session_factory, inner, on_busy: str, **kwargs) -> ExclusiveHarvestService:
+    return ExclusiveHarvestService(
+        inner,
+        _locks(session_factory),
+        lambda: SqlAlchemyUnitOfWork(session_factory),
+        on_busy=on_busy,
+        **kwargs,
+    )
+
+
+def test_concurrent_runs_of_a_source_never_overlap(session_factory):
+    inner = _SlowHarvest()
+    # У каждого «узла» своя блокировка, как у отдельных процессов
+    services = [_service(session_factory, inner, "wait", wait=timedelta(seconds=10)) for _ in range(4)]
+    command = RunSourceHarvestingCommand(source_code="ATI")
+
+    threads = [threading.Thread(target=s.execute, args=(command,)) for s in services]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert (inner.runs, inner.peak) == (4, 1)
+
+
+def test_busy_policies(session_factory):
+    holder = _locks(session_factory)
+    assert holder.acquire("ATI")
+    inner = _SlowHarvest()
+    command = RunSourceHarvestingCommand(source_code="ATI")
+
+    skipping = _service(session_factory, inner, "skip")
+    skipping.execute(command)
+    assert (skipping.skipped, inner.runs) == (1, 0)
+
+    waiting = _service(session_factory, inner, "wait", wait=timedelta(milliseconds=50))
+    with pytest.raises(SourceBusyError):
+        waiting.execute(command)
+
+    queueing = _service(session_factory, inner, "queue", requeue_delay=timedelta(minutes=5))
+    queueing.execute(command)
+    queueing.execute(command)
+    # Запуск из очереди не плодит задач, а возвращает свою
+    with pytest.raises(SourceBusyError):
+        queueing.execute(RunSourceHarvestingCommand(source_code="ATI", job_id=1))
+    with session_factory() as session:
+        jobs = session.execute(select(Job.source_id, Job.status)).all()
+    assert queueing.queued == 2
+    assert jobs == [(1, "pending")]
+
+    holder.release("ATI")
+    skipping.execute(command)
+    assert inner.runs == 1
+
+    with pytest.raises(ValueError):
+        _service(session_factory, inner, "ignore")
+
+
+def test_queued_run_of_busy_source_is_requeued_with_default_policy(session_factory):
+    uow_factory = lambda: SqlAlchemyUnitOfWork(session_factory)  # noqa: E731
+    with uow_factory() as uow:
+        job = uow.job_queue.enqueue(JOB_TYPE, 1)
+        uow.commit()
+    holder = _locks(session_factory)
+    assert holder.acquire("ATI")
+    inner = _SlowHarvest()
+    service = ExclusiveHarvestService(inner, _locks(session_factory), uow_factory)
+    worker = HarvestQueueWorker(uow_factory, service, worker_id="w1", retry_delay=timedelta(0))
+
+    # Конкуренция за источник дольше max_attempts не «роняет» задачу
+    for _ in range(job.max_attempts + 1):
+        assert worker.run_once().id == job.id
+    with session_factory() as session:
+        row = session.get(Job, job.id)
+    assert (worker.processed, worker.failed, worker.requeued) == (0, 0, job.max_attempts + 1)
+    assert (service.skipped, inner.runs) == (0, 0)
+    assert (row.status, row.attempts, row.error_message) == ("pending", 0, None)
+
+    holder.release("ATI")
+    assert worker.run_once().id == job.id
+    with session_factory() as session:
+        assert session.get(Job, job.id).status == "success"
+    assert (worker.processed, inner.runs) == (1, 1)
@@ -0,0 +1,166 @@
+# path: tests/db/test_source_sharding.py
+"""
+Распределение источников между узлами на SQLite-файле:
+- worker_nodes: отметки, живые узлы, уход и чистка;
+- стоимость источников — средняя длительность успешных запусков в окне,
+  выровненном по эпохе: узлы, пересчитавшие в разные моменты, получают
+  одно распределение;
+- SourceSharding: узлы без координации получают непересекающиеся
+  подмножества, уход узла передаёт его источники остальным.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.application.sharding import SourceSharding
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import Job, Source
+from dan_max_bids_parser.infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+
+NOW = datetime(2025, 3, 12, 10, 0)
+TTL = timedelta(seconds=90)
+
+
+@pytest.fixture
+def uow_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'nodes.sqlite'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with factory() as session:
+        session.add_all(
+            Source(id=i, code=f"SRC{i:02}", name=f"Source {i}", kind="html", is_active=i != 13)
+            for i in range(1, 25)
+        )
+        session.commit()
+    return lambda: SqlAlchemyUnitOfWork(factory)
+
+
+def test_worker_nodes_membership(uow_factory):
+    with uow_factory() as uow:
+        uow.worker_nodes.heartbeat("a", now=NOW - timedelta(minutes=10))
+        uow.worker_nodes.heartbeat("b", capacity=2.0, now=NOW - timedelta(minutes=10))
+        uow.worker_nodes.heartbeat("a", now=NOW)
+        uow.worker_nodes.heartbeat("c", now=NOW - timedelta(seconds=30))
+        uow.commit()
+
+    with uow_factory() as uow:
+        alive = uow.worker_nodes.list_alive(TTL, now=NOW)
+        assert [(n.node_id, n.started_at) for n in alive] == [
+            ("a", NOW - timedelta(minutes=10)),
+            ("c", NOW - timedelta(seconds=30)),
+        ]
+        assert uow.worker_nodes.purge(NOW - timedelta(minutes=5)) == 1
+        uow.worker_nodes.remove("c")
+        uow.commit()
+        assert [n.node_id for n in uow.worker_nodes.list_alive(timedelta(days=1), now=NOW)] == ["a"]
+        with pytest.raises(ValueError):
+            uow.worker_nodes.heartbeat("a", capacity=0)
+
+
+def test_mean_durations_of_successful_runs(uow_factory):
+    with uow_factory() as uow:
+        for source_id, status, seconds, age in (
+            (1, "success", 10, 1),
+            (1, "success", 30, 2),
+            (1, "failed", 500, 1),
+            (2, "success", 4, 1),
+            (2, "success", 400, 30),  # за пределами окна
+        ):
+            started = NOW - timedelta(days=age)
+            uow.session.add(
+                Job(
+                    job_type="harvest_source",
+                    source_id=source_id,
+                    status=status,
+                    started_at=started,
+                    finished_at=started + timedelta(seconds=seconds),
+                    checkpoint={},
+                    stage_durations={},
+                    created_at=started,
+                )
+            )
+        uow.commit()
+        durations = uow.jobs.mean_durations("harvest_source", NOW - timedelta(days=7))
+
+    assert durations.keys() == {1, 2}
+    assert durations[1] == pytest.approx(20, abs=0.01)
+    assert durations[2] == pytest.approx(4, abs=0.01)
+
+
+def test_nodes_split_sources_and_take_over_on_leave(uow_factory):
+    nodes = [
+        SourceSharding(uow_factory, node_id=f"node-{i}", clock=lambda: NOW) for i in range(3)
+    ]
+    for node in nodes:
+        node.refresh()
+    # Первые узлы видели неполный состав — пересчёт после отметки всех
+    assignments = [node.refresh() for node in nodes]
+
+    assert assignments[0] == assignments[1] == assignments[2]
+    owned = [set(node.owned()) for node in nodes]
+    assert all(owned)
+    assert set.union(*owned) == {f"SRC{i:02}" for i in range(1, 25) if i != 13}
+    assert sum(len(o) for o in owned) == 23
+    assert nodes[0].owns(next(iter(owned[0]))) and not nodes[1].owns(next(iter(owned[0])))
+
+    nodes[2].stop()
+    for node in nodes[:2]:
+        node.refresh()
+    assert set(nodes[0].owned()) | set(nodes[1].owned()) == set.union(*owned)
+    # Источники оставшихся узлов не переезжают
+    assert owned[0] <= set(nodes[0].owned()) and owned[1] <= set(nodes[1].owned())
+
+
+def _add_run(uow, source_id: int, started: datetime, seconds: float) -> None:
+    uow.session.add(
+        Job(
+            job_type="harvest_source",
+            source_id=source_id,
+            status="success",
+            started_at=started,
+            finished_at=started + timedelta(seconds=seconds),
+            checkpoint={},
+            stage_durations={},
+            created_at=started,
+        )
+    )
+
+
+def test_nodes_refreshing_at_different_moments_agree(uow_factory):
+    with uow_factory() as uow:
+        for source_id in range(1, 25):
+            _add_run(uow, source_id, NOW - timedelta(days=1), 5 * source_id)
+        uow.commit()
+        # До начала часа — в окне; завершённый после — нет
+        assert uow.jobs.mean_durations("harvest_source", NOW - timedelta(days=7), NOW)[3] == (
+            pytest.approx(15, abs=0.01)
+        )
+
+    moment = {"a": NOW + timedelta(minutes=5), "b": NOW + timedelta(minutes=5)}
+    nodes = {
+        name: SourceSharding(
+            uow_factory, node_id=name, load_factor=1.0, clock=lambda name=name: moment[name]
+        )
+        for name in ("a", "b")
+    }
+    for node in nodes.values():
+        node.refresh()
+    first = nodes["a"].refresh()
+
+    # Между пересчётами узлов завершились новые запуски с другой длительностью
+    with uow_factory() as uow:
+        for source_id in range(1, 25, 2):
+            _add_run(uow, source_id, NOW + timedelta(minutes=5, seconds=10), 60)
+        uow.commit()
+    moment["b"] = NOW + timedelta(minutes=6, seconds=20)
+    second = nodes["b"].refresh()
+
+    assert first == second
+    owned_a, owned_b = set(nodes["a"].owned()), set(nodes["b"].owned())
+    assert not owned_a & owned_b
+    assert owned_a | owned_b == set(first)
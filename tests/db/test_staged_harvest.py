@@ -0,0 +1,145 @@
+# path: tests/db/test_staged_harvest.py
+"""
+StagedHarvestService на SQLite-файле:
+- сырьё и заявки сохраняются порциями, заявки связаны со своим raw_item;
+- повтор заявки внутри запуска (тот же external_id) не сохраняется;
+- задача jobs получает счётчики и время этапов (имена — как у
+  последовательного сбора: load_config, fetch, parse_normalize, ...);
+- ошибка этапа помечает задачу failed, записанные порции остаются;
+- записанные порции освобождаются сразу, а не копятся до конца запуска.
+"""
+
+from __future__ import annotations
+
+import gc
+import weakref
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from dan_max_bids_parser.application.pipeline import BidPipeline
+from dan_max_bids_parser.application.use_cases.harvest_source import RunSourceHarvestingCommand
+from dan_max_bids_parser.application.use_cases.staged_harvest_service import (
+    StageSettings,
+    StagedHarvestService,
+)
+from dan_max_bids_parser.domain.entities import RawItemEntity
+from dan_max_bids_parser.infrastructure.db.base import Base
+from dan_max_bids_parser.infrastructure.db.models import Bid, BidDailyStats, RawItem, Source
+from dan_max_bids_parser.infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork
+
+
+class _Provider:
+    def __init__(self, external_ids: list[str], fail_after: int | None = None) -> None:
+        self._external_ids = external_ids
+        self._fail_after = fail_after
+
+    def fetch_raw_items(self, source):
+        for n, external_id in enumerate(self._external_ids):
+            if n == self._fail_after:
+                raise ConnectionError("site is down")
+            yield RawItemEntity(source_id=source.id, external_id=external_id, payload=f"bid {n}")
+
+
+class _TrackedRawItem(RawItemEntity):
+    """Подкласс без __slots__: на него можно взять weakref."""
+
+
+@pytest.fixture
+def uow_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'staged.sqlite'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with factory() as session:
+        session.add(Source(id=1, code="ATI", name="ATI.SU", kind="html"))
+        session.commit()
+    return lambda: SqlAlchemyUnitOfWork(factory)
+
+
+def _service(uow_factory, provider, **kwargs) -> StagedHarvestService:
+    return StagedHarvestService(
+        uow_factory,
+        provider,
+        pipeline_factory=BidPipeline,
+        batch_size=4,
+        parse_stage=StageSettings(workers=2, queue_size=2),
+        store_stage=StageSettings(queue_size=1),
+        **kwargs,
+    )
+
+
+def test_staged_harvest_stores_batches_with_linked_bids(uow_factory):
+    external_ids = [f"ATI-{n}" for n in range(18)] + ["ATI-3", "ATI-7"]
+    reported = []
+    service = _service(uow_factory, _Provider(external_ids), on_stage_stats=reported.append)
+
+    service.execute(RunSourceHarvestingCommand(source_code="ATI"))
+
+    with uow_factory() as uow:
+        session = uow.session
+        raw_count = session.scalar(select(func.count(RawItem.id)))
+        links = session.execute(
+            select(Bid.external_id, RawItem.external_id).join(RawItem, Bid.raw_item_id == RawItem.id)
+        ).all()
+        job = uow.jobs.get_by_id(1)
+        stats = session.execute(
+            select(BidDailyStats.raw_items_count, BidDailyStats.bids_count)
+        ).one()
+
+    assert raw_count == 20
+    assert len(links) == 18
+    assert all(bid_id == raw_id for bid_id, raw_id in links)
+    assert len({bid_id for bid_id, _ in links}) == 18
+    assert (job.status, job.items_total, job.items_created) == ("success", 20, 18)
+    assert list(job.stage_durations) == [
+        "load_config", "fetch", "parse_normalize", "classify_filter", "store"
+    ]
+    assert tuple(stats) == (20, 18)
+    [stages] = reported
+    assert [s.name for s in stages] == ["fetch", "parse_normalize", "classify_filter", "store"]
+    assert stages[0].items == 5
+
+
+def test_staged_harvest_failure_keeps_stored_batches(uow_factory):
+    service = _service(uow_factory, _Provider([f"ATI-{n}" for n in range(20)], fail_after=10))
+
+    with pytest.raises(ConnectionError):
+        service.execute(RunSourceHarvestingCommand(source_code="ATI"))
+
+    with uow_factory() as uow:
+        job = uow.jobs.get_by_id(1)
+        bids = uow.session.scalar(select(func.count(Bid.id)))
+    assert job.status == "failed"
+    assert "site is down" in job.error_message
+    # до ошибки могли дойти до store только полные порции (не больше двух)
+    assert bids in (0, 4, 8)
+
+
+def test_staged_harvest_releases_stored_batches(uow_factory):
+    refs: list[weakref.ref] = []
+    peak = 0
+
+    class Provider:
+        def fetch_raw_items(self, source):
+            nonlocal peak
+            for n in range(200):
+                if n % 4 == 0:
+                    gc.collect()
+                    peak = max(peak, sum(ref() is not None for ref in refs))
+                item = _TrackedRawItem(source_id=source.id, external_id=f"ATI-{n}", payload=f"bid {n}")
+                refs.append(weakref.ref(item))
+                yield item
+
+    _service(uow_factory, Provider()).execute(RunSourceHarvestingCommand(source_code="ATI"))
+
+    with uow_factory() as uow:
+        job = uow.jobs.get_by_id(1)
+    assert (job.items_total, job.items_created) == (200, 200)
+    # живы только порции в очередях и потоках (12 порций по 4), а не весь запуск
+    assert peak <= 52
+
+
+def test_staged_harvest_rejects_invalid_batch_size(uow_factory):
+    with pytest.raises(ValueError):
+        StagedHarvestService(uow_factory, _Provider([]), pipeline_factory=BidPipeline, batch_size=0)
@@ -0,0 +1,109 @@
+# path: tests/domain/test_bid_filter.py
+from dan_max_bids_parser.domain.entities import BidEntity, ConfigEntryEntity
+from dan_max_bids_parser.domain.services.bid_filter import BidFilter
+
+
+def rule(code: str, **data) -> ConfigEntryEntity:
+    return ConfigEntryEntity(id=None, code=code, name=code, data=data)
+
+
+def make_bid(**fields) -> BidEntity:
+    return BidEntity(source_id=1, **fields)
+
+
+def test_include_and_exclude_rules_report_rejecting_rule():
+    bid_filter = BidFilter()
+    bid_filter.refresh(
+        [
+            rule("only-stone", kind="cargo", values=["Щебень", "песок"]),
+            rule("price-range", kind="price", min=10_000, max=100_000),
+            rule("no-scrap", kind="keywords", mode="exclude", values=["металлолом"]),
+        ]
+    )
+    ok = make_bid(cargo_type="щебень", price=50_000, title="Щебень 20 т")
+    wrong_cargo = make_bid(cargo_type="торф", price=50_000)
+    too_cheap = make_bid(cargo_type="песок", price=500)
+    scrap = make_bid(cargo_type="песок", price=20_000, description="Вывоз металлолома")
+
+    result = bid_filter.filter_many([ok, wrong_cargo, too_cheap, scrap])
+
+    assert result.accepted == [ok]
+    assert result.rejected == [
+        (wrong_cargo, "only-stone"),
+        (too_cheap, "price-range"),
+        (scrap, "no-scrap"),
+    ]
+
+
+def test_missing_numeric_value_respects_allow_missing():
+    strict, lenient = BidFilter(), BidFilter()
+    strict.refresh([rule("w", kind="weight", min=5)])
+    lenient.refresh([rule("w", kind="weight", min=5, allow_missing=True)])
+    bid = make_bid(weight_tons=None)
+
+    assert strict.filter_many([bid]).rejected == [(bid, "w")]
+    assert lenient.filter_many([bid]).accepted == [bid]
+
+
+def test_route_and_region_match_points_by_substring():
+    bid_filter = BidFilter()
+    bid_filter.refresh(
+        [
+            rule("route", kind="route", **{"from": ["тверь"], "to": ["москва"]}),
+            rule("no-spb", kind="region", mode="exclude", values=["санкт-петербург"]),
+        ]
+    )
+    good = make_bid(load_point="г. Тверь", unload_point="Москва, МКАД")
+    reverse = make_bid(load_point="Москва", unload_point="Тверь")
+
+    result = bid_filter.filter_many([good, reverse])
+
+    assert result.accepted == [good]
+    assert result.rejected == [(reverse, "route")]
+
+
+def test_keyword_rules_share_one_automaton_and_use_stems():
+    bid_filter = BidFilter()
+    bid_filter.refresh(
+        [
+            rule("need-dump-truck", kind="keywords", values=["самосвал"]),
+            rule("no-oversize", kind="keywords", mode="exclude", values=["негабаритный груз"]),
+        ]
+    )
+    ok = make_bid(description="Нужны самосвалы на неделю")
+    oversize = make_bid(description="Самосвалом, негабаритного груза нет... негабаритный груз")
+    other = make_bid(description="Нужен тягач")
+
+    result = bid_filter.filter_many([ok, oversize, other])
+
+    assert result.accepted == [ok]
+    assert {code for _, code in result.rejected} == {"no-oversize", "need-dump-truck"}
+
+
+def test_plan_puts_cheap_rules_first_and_adapts_to_selectivity():
+    bid_filter = BidFilter()
+    bid_filter.refresh(
+        [
+            rule("kw", kind="keywords", values=["щебень"]),
+            rule("region", kind="region", values=["москва"]),
+            rule("weight", kind="weight", min=1),
+            rule("cargo", kind="cargo", values=["щебень"]),
+        ]
+    )
+    assert bid_filter.plan[-2:] == ["region", "kw"]
+
+    # cargo отсекает всё, weight — ничего: после пакета cargo идёт первым
+    bids = [make_bid(cargo_type="песок", weight_tons=10.0) for _ in range(10)]
+    bid_filter.filter_many(bids)
+    assert bid_filter.plan[:2] == ["cargo", "weight"]
+
+
+def test_refresh_skips_invalid_rules_and_recompiles_on_change():
+    bid_filter = BidFilter()
+    assert bid_filter.refresh([rule("bad", kind="unknown"), rule("w", kind="weight", max=30)])
+    assert bid_filter.plan == ["w"]
+    assert bid_filter.refresh([rule("bad", kind="unknown"), rule("w", kind="weight", max=30)]) is False
+    assert bid_filter.refresh([]) is True
+
+    bid = make_bid()
+    assert bid_filter.filter_many([bid]).accepted == [bid]
@@ -0,0 +1,113 @@
+# path: tests/domain/test_classifier.py
+import pytest
+
+from dan_max_bids_parser.domain.entities import BidEntity, ConfigEntryEntity
+from dan_max_bids_parser.domain.services.classifier import BidClassifier
+from dan_max_bids_parser.domain.services.text_matching import AhoCorasick, stem, stem_tokens
+
+CARGO = ConfigEntryEntity(
+    id=1,
+    code="cargo",
+    name="Грузы",
+    data={
+        "target": "cargo_type",
+        "categories": {
+            "щебень": {"keywords": ["щебень", "гранитный щебень", "щебёнка"], "priority": 10},
+            "песок": ["песок", "пескогрунт"],
+            "ПГС": {"keywords": ["песчано-гравийная смесь", "пгс"], "priority": 5},
+        },
+    },
+)
+TRANSPORT = ConfigEntryEntity(
+    id=2,
+    code="transport",
+    name="Транспорт",
+    data={"target": "transport_type", "categories": {"самосвал": ["самосвал", "шаланда"]}},
+)
+
+
+@pytest.fixture
+def classifier() -> BidClassifier:
+    result = BidClassifier()
+    result.refresh([CARGO, TRANSPORT])
+    return result
+
+
+@pytest.mark.parametrize(
+    ("forms", "expected"),
+    [
+        (["песок", "песка", "песком"], "песк"),
+        (["щебень", "щебня", "щебнем"], "щебн"),
+        (["самосвал", "самосвалы", "самосвалов"], "самосвал"),
+        (["гранитный", "гранитного", "гранитная"], "гранитн"),
+    ],
+)
+def test_stem_merges_word_forms(forms, expected):
+    assert {stem(form) for form in forms} == {expected}
+
+
+def test_aho_corasick_finds_overlapping_phrases():
+    automaton: AhoCorasick[str] = AhoCorasick()
+    automaton.add(["a", "b"], "ab")
+    automaton.add(["b", "c"], "bc")
+    automaton.add(["b"], "b")
+    automaton.build()
+
+    matches = list(automaton.iter_matches(["x", "a", "b", "c"]))
+
+    assert sorted(matches) == [(1, 2, "ab"), (2, 1, "b"), (2, 2, "bc")]
+
+
+def test_word_forms_are_classified(classifier):
+    assert classifier.match("Нужно 3 шаланды, перевезти щебня 30 т") == {
+        "cargo_type": "щебень",
+        "transport_type": "самосвал",
+    }
+    assert classifier.match("Пескогрунт, 200 т") == {"cargo_type": "песок"}
+    assert classifier.match("Куплю металлолом") == {}
+
+
+def test_multiword_phrase_outweighs_single_word(classifier):
+    # «песчано-гравийная смесь» (3 основы) важнее одиночного «песок»
+    result = classifier.match("Песок или песчано-гравийная смесь, самовывоз")
+    assert result["cargo_type"] == "ПГС"
+    assert stem_tokens("песчано-гравийная")[0] == "песчан"
+
+
+def test_priority_breaks_ties(classifier):
+    assert classifier.match("песок и щебень") == {"cargo_type": "щебень"}
+
+
+def test_classify_many_fills_bid_fields(classifier):
+    bids = [
+        BidEntity(source_id=1, title="Щебёнка 20-40", description="самосвалы 25 т"),
+        BidEntity(source_id=1, title="Заявка", description=None, cargo_type="прочее"),
+    ]
+
+    first, second = classifier.classify_many(bids)
+
+    assert (first.cargo_type, first.transport_type) == ("щебень", "самосвал")
+    # Без совпадений поля не затираются
+    assert second.cargo_type == "прочее"
+
+
+def test_refresh_recompiles_only_on_version_change(classifier):
+    assert classifier.refresh([CARGO, TRANSPORT]) is False
+
+    changed = ConfigEntryEntity(
+        id=2,
+        code="transport",
+        name="Транспорт",
+        data={"target": "transport_type", "categories": {"тонар": ["тонар"]}},
+    )
+    assert classifier.refresh([CARGO, changed]) is True
+    assert classifier.match("Нужен тонар") == {"transport_type": "тонар"}
+
+
+def test_invalid_config_entry_is_skipped():
+    broken = ConfigEntryEntity(id=3, code="broken", name="", data={"target": "unknown"})
+    classifier = BidClassifier()
+
+    classifier.refresh([broken, CARGO])
+
+    assert classifier.match("песок") == {"cargo_type": "песок"}
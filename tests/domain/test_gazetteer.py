@@ -0,0 +1,67 @@
+# path: tests/domain/test_gazetteer.py
+import pytest
+
+from dan_max_bids_parser.application.pipeline import BidPipeline
+from dan_max_bids_parser.domain.entities import BidEntity
+from dan_max_bids_parser.domain.services.gazetteer import Gazetteer, parse_lines
+
+
+@pytest.fixture(scope="module")
+def gazetteer() -> Gazetteer:
+    return Gazetteer.load()
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Тверь", "RU-TVE"),
+        ("г. Твери, ул. Складская, 5", "RU-TVE"),
+        ("карьер, Тверская обл.", "RU-TVE"),
+        ("Московской области", "RU-MOS"),
+        ("Химки", "RU-MOS"),
+        ("Москва, Ленинградский пр-т", "RU-MOW"),
+        ("Нижний Новгород", "RU-NIZ"),
+        ("Ростов-на-Дону", "RU-ROS"),
+        ("СПб", "RU-SPE"),
+        ("Краснодарский кр.", "RU-KDA"),
+        ("Щёлково", "RU-MOS"),
+        ("на базу", None),
+        ("", None),
+    ],
+)
+def test_resolves_place_strings_to_region_codes(gazetteer, text, expected):
+    assert gazetteer.resolve(text) == expected
+
+
+def test_explicit_region_wins_over_city(gazetteer):
+    # Химки — Подмосковье, но в строке явно указан регион
+    assert gazetteer.resolve("Химки, Тверская обл.") == "RU-TVE"
+    assert gazetteer.region_name("RU-TVE") == "Тверская область"
+    assert len(gazetteer) >= 80
+
+
+def test_resolve_is_memoized():
+    gazetteer = Gazetteer(parse_lines(["RU-TVE\tcity\tТверь"]))
+    for _ in range(3):
+        assert gazetteer.resolve("Тверь") == "RU-TVE"
+    info = gazetteer.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+def test_parse_lines_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        parse_lines(["RU-TVE\tvillage\tТверь"])
+
+
+def test_pipeline_fills_regions_without_overwriting(gazetteer):
+    bids = [
+        BidEntity(title="Щебень", load_point="Тверь", unload_point="Клин"),
+        BidEntity(title="Песок", load_point="Тверь", load_region="RU-MOS", unload_point="где-то"),
+    ]
+
+    BidPipeline(gazetteer=gazetteer).classify_and_filter(bids)
+
+    assert [(b.load_region, b.unload_region) for b in bids] == [
+        ("RU-TVE", "RU-MOS"),
+        ("RU-MOS", None),
+    ]
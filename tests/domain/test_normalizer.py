@@ -0,0 +1,131 @@
+# path: tests/domain/test_normalizer.py
+from datetime import datetime
+
+import pytest
+
+from dan_max_bids_parser.domain.services.normalizer import Normalizer
+
+# «Сейчас» для тестов: 12.03.2025 08:00 UTC = 11:00 МСК
+NOW = datetime(2025, 3, 12, 8, 0)
+
+
+@pytest.fixture
+def normalizer() -> Normalizer:
+    return Normalizer(clock=lambda: NOW)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("25 т", 25.0),
+        ("25000 кг", 25.0),
+        ("25,5 тонн", 25.5),
+        ("200 ц", 20.0),
+        ("30т", 30.0),
+        ("1 500 кг", 1.5),
+        ("без веса", None),
+    ],
+)
+def test_weight_units_are_converted_to_tons(normalizer, text, expected):
+    assert normalizer.weight_tons(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("text", "amount", "currency"),
+    [
+        ("45 000 руб", 45000.0, "RUB"),
+        ("1,5 млн руб", 1_500_000.0, "RUB"),
+        ("45 т.р.", 45000.0, "RUB"),
+        ("25 тыс. руб.", 25000.0, "RUB"),
+        ("$ 500", 500.0, "USD"),
+        ("50000", 50000.0, None),
+    ],
+)
+def test_price_multipliers_and_currencies(normalizer, text, amount, currency):
+    parsed = normalizer.price(text)
+    assert parsed is not None
+    assert parsed.amount == amount
+    assert parsed.currency == currency
+
+
+def test_negotiable_price_is_empty(normalizer):
+    assert normalizer.price("договорная") is None
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("сегодня 14:30", datetime(2025, 3, 12, 11, 30)),
+        ("вчера в 9:05", datetime(2025, 3, 11, 6, 5)),
+        ("3 часа назад", datetime(2025, 3, 12, 5, 0)),
+        ("12.03.2025 10:00", datetime(2025, 3, 12, 7, 0)),
+        ("12 марта 14:30", datetime(2025, 3, 12, 11, 30)),
+        ("31 декабря", datetime(2024, 12, 30, 21, 0)),
+        ("2025-03-01T10:00:00+00:00", datetime(2025, 3, 1, 10, 0)),
+        ("когда-то", None),
+    ],
+)
+def test_dates_are_converted_to_naive_utc(normalizer, text, expected):
+    assert normalizer.published_at(text) == expected
+
+
+def test_relative_dates_are_cached_independently_of_now(normalizer):
+    first = normalizer.published_at("сегодня 14:30", now=NOW)
+    next_day = normalizer.published_at("сегодня 14:30", now=datetime(2025, 3, 13, 8, 0))
+
+    assert first == datetime(2025, 3, 12, 11, 30)
+    assert next_day == datetime(2025, 3, 13, 11, 30)
+    assert normalizer.cache_info()["date"].hits == 1
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("8 (900) 123-45-67", "+79001234567"),
+        ("+7 900 123 45 67, Иван", "+79001234567"),
+        ("9001234567", "+79001234567"),
+        ("Иван", None),
+    ],
+)
+def test_phone_normalization(normalizer, text, expected):
+    assert normalizer.phone(text) == expected
+
+
+def test_normalize_many_builds_bid_ready_fields(normalizer):
+    records = [
+        {
+            "title": "Щебень",
+            "weight_tons": "20 т",
+            "price": "2 500 руб/т",
+            "published_at": "сегодня 10:00",
+            "contact": "Пётр",
+        },
+        {"description": "Песок 25 т, 45 000 руб, тел 8-900-123-45-67"},
+    ]
+
+    first, second = normalizer.normalize_many(records)
+
+    assert first["title"] == "Щебень"
+    assert first["weight_tons"] == 20.0
+    # Ставка за тонну пересчитывается в итоговую цену
+    assert first["price"] == 50000.0
+    assert first["currency"] == "RUB"
+    assert first["published_at"] == datetime(2025, 3, 12, 7, 0)
+    assert first["contact"] == "Пётр"
+
+    assert second["weight_tons"] == 25.0
+    assert second["price"] == 45000.0
+    assert second["contact"] == "+79001234567"
+
+
+def test_repeated_strings_hit_lru_cache():
+    normalizer = Normalizer(clock=lambda: NOW, cache_size=2)
+
+    for _ in range(3):
+        normalizer.weight_tons("25 т")
+    normalizer.weight_tons("30 т")
+    normalizer.weight_tons("40 т")
+
+    info = normalizer.cache_info()["weight"]
+    assert info.hits == 2
+    assert info.currsize == 2
@@ -0,0 +1,81 @@
+# path: tests/domain/test_schedule.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from dan_max_bids_parser.domain.entities import ConfigEntryEntity
+from dan_max_bids_parser.domain.services.schedule import CronExpression, parse_schedule
+
+
+@pytest.mark.parametrize(
+    ("expression", "after", "expected"),
+    [
+        ("*/15 * * * *", datetime(2025, 3, 12, 10, 7, 30), datetime(2025, 3, 12, 10, 15)),
+        ("*/15 * * * *", datetime(2025, 3, 12, 10, 45), datetime(2025, 3, 12, 11, 0)),
+        ("0 6-22/4 * * *", datetime(2025, 3, 12, 22, 30), datetime(2025, 3, 13, 6, 0)),
+        # 2025-03-15 — суббота: следующий будний день — понедельник
+        ("30 9 * * mon-fri", datetime(2025, 3, 14, 10, 0), datetime(2025, 3, 17, 9, 30)),
+        ("@monthly", datetime(2025, 12, 31, 23, 59), datetime(2026, 1, 1, 0, 0)),
+        ("0 0 29 feb *", datetime(2025, 3, 1), datetime(2028, 2, 29, 0, 0)),
+        # день месяца ИЛИ день недели (1-е число или воскресенье)
+        ("0 12 1 * 0", datetime(2025, 3, 12), datetime(2025, 3, 16, 12, 0)),
+    ],
+)
+def test_cron_next_after(expression, after, expected):
+    assert CronExpression.parse(expression).next_after(after) == expected
+
+
+@pytest.mark.parametrize(
+    ("field", "weekdays"),
+    [
+        ("mon-sun", {0, 1, 2, 3, 4, 5, 6}),
+        ("1-7", {0, 1, 2, 3, 4, 5, 6}),
+        ("sat-sun", {6, 0}),
+        ("fri-sun/2", {5, 0}),
+        ("7", {0}),
+        ("sun", {0}),
+    ],
+)
+def test_cron_weekday_ranges_ending_on_sunday(field, weekdays):
+    cron = CronExpression.parse(f"0 10 * * {field}")
+    assert cron.weekdays == frozenset(weekdays)
+    # 2025-03-15 — суббота, следующий день — воскресенье
+    if 0 in weekdays:
+        assert cron.next_after(datetime(2025, 3, 15, 12, 0)) == datetime(2025, 3, 16, 10, 0)
+
+
+@pytest.mark.parametrize(
+    "expression", ["* * * *", "61 * * * *", "*/0 * * * *", "0 0 31 2 *", "0 0 * * fri-mon"]
+)
+def test_invalid_cron_raises_value_error(expression):
+    with pytest.raises(ValueError):
+        CronExpression.parse(expression).next_after(datetime(2025, 1, 1))
+
+
+def test_parse_schedule_with_timezone_and_defaults():
+    spec = parse_schedule(
+        ConfigEntryEntity(code="ati-day", data={"source": "ATI", "cron": "0 9 * * *",
+                                                "timezone": "Europe/Moscow"})
+    )
+    assert (spec.source_code, spec.misfire, spec.max_instances) == ("ATI", "run_once", 1)
+    # 09:00 по Москве — 06:00 UTC
+    assert spec.next_fire(datetime(2025, 3, 12, 7, 0)) == datetime(2025, 3, 13, 6, 0)
+
+    interval = parse_schedule(ConfigEntryEntity(code="TG", data={"interval_seconds": 600}))
+    assert interval.source_code == "TG"
+    assert interval.next_fire(datetime(2025, 3, 12)) == datetime(2025, 3, 12) + timedelta(minutes=10)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"cron": "@hourly", "interval_seconds": 60},
+        {"interval_seconds": 0},
+        {"cron": "@hourly", "misfire": "later"},
+        {"cron": "@hourly", "timezone": "Mars/Olympus"},
+    ],
+)
+def test_parse_schedule_rejects_bad_data(data):
+    with pytest.raises(ValueError):
+        parse_schedule(ConfigEntryEntity(code="bad", data=data))
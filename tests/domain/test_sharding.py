@@ -0,0 +1,107 @@
+# path: tests/domain/test_sharding.py
+from __future__ import annotations
+
+import random
+from collections import Counter
+
+import pytest
+
+from dan_max_bids_parser.domain.entities import SourceEntity
+from dan_max_bids_parser.domain.services.sharding import (
+    HashRing,
+    assign,
+    quantize_costs,
+    source_costs,
+)
+
+
+def _costs(n: int = 45, seed: int = 1) -> dict[str, float]:
+    rng = random.Random(seed)
+    return {f"SRC{i:02}": float(rng.choice([1, 2, 5, 30, 120])) for i in range(n)}
+
+
+def _nodes(n: int) -> dict[str, float]:
+    return {f"node-{i}": 1.0 for i in range(n)}
+
+
+def _loads(assignment: dict[str, str], costs: dict[str, float]) -> Counter:
+    loads: Counter = Counter()
+    for code, node in assignment.items():
+        loads[node] += costs[code]
+    return loads
+
+
+def test_ring_walk_visits_each_node_once_and_is_stable():
+    ring = HashRing(_nodes(4))
+    walk = list(ring.walk("ATI"))
+    assert sorted(walk) == sorted(_nodes(4))
+    assert HashRing(dict(reversed(list(_nodes(4).items())))).node_for("ATI") == walk[0]
+
+    with pytest.raises(ValueError):
+        HashRing({})
+    with pytest.raises(ValueError):
+        HashRing({"node-0": 0})
+
+
+def test_node_join_or_leave_moves_about_one_nth_of_sources():
+    costs = _costs()
+    before = assign(costs, _nodes(4))
+
+    joined = assign(costs, _nodes(5))
+    moved = [code for code in costs if before[code] != joined[code]]
+    assert len(moved) <= len(costs) * 0.3
+    # Переезжают в основном на новый узел
+    assert sum(joined[code] == "node-4" for code in moved) >= len(moved) * 0.6
+
+    left = assign(costs, {n: c for n, c in _nodes(4).items() if n != "node-3"})
+    moved = [code for code in costs if before[code] != left[code]]
+    assert len(moved) <= len(costs) * 0.35
+    assert all(before[code] == "node-3" or left[code] != "node-3" for code in moved)
+
+
+def test_loads_are_bounded_by_cost_and_capacity():
+    costs = _costs()
+    total = sum(costs.values())
+
+    loads = _loads(assign(costs, _nodes(4), load_factor=1.25), costs)
+    assert max(loads.values()) <= max(1.25 * total / 4, max(costs.values()))
+
+    # Узел вдвое мощнее получает примерно вдвое больше работы
+    weighted = _loads(assign(costs, {"big": 2.0, "small-1": 1.0, "small-2": 1.0}), costs)
+    assert weighted["big"] > max(weighted["small-1"], weighted["small-2"])
+    assert weighted["big"] <= 1.25 * total / 2
+
+
+def test_assignment_is_deterministic_and_validated():
+    costs = _costs(10)
+    assert assign(costs, _nodes(3)) == assign(dict(sorted(costs.items(), reverse=True)), _nodes(3))
+    assert assign({}, _nodes(3)) == {}
+    with pytest.raises(ValueError):
+        assign(costs, _nodes(3), load_factor=0.9)
+
+
+def test_source_costs_default_to_median_of_known():
+    sources = [SourceEntity(id=i, code=f"S{i}", name=f"S{i}", kind="html") for i in (1, 2, 3, 4)]
+    assert source_costs(sources, {1: 10.0, 2: 30.0, 3: 0.0}) == {
+        "S1": 10.0,
+        "S2": 30.0,
+        "S3": 0.1,
+        "S4": 10.0,
+    }
+    assert source_costs(sources[:1], {}) == {"S1": 1.0}
+
+
+def test_quantized_costs_absorb_small_differences_between_nodes():
+    costs = _costs()
+    # Другой узел видит чуть другие средние: завершился ещё один запуск
+    drifted = {code: cost * (1.03 if n % 3 else 0.98) for n, (code, cost) in enumerate(costs.items())}
+    nodes = _nodes(4)
+
+    assert assign(quantize_costs(costs), nodes) == assign(quantize_costs(drifted), nodes)
+    assert quantize_costs({"A": 10.0, "B": 10.4, "C": 1.0}) == {
+        "A": pytest.approx(2 ** 3.5),
+        "B": pytest.approx(2 ** 3.5),
+        "C": 1.0,
+    }
+    with pytest.raises(ValueError):
+        quantize_costs(costs, steps=0)
@@ -0,0 +1,112 @@
+# path: tests/export/test_parquet_export.py
+"""
+ExportAnalyticsService + ParquetDatasetWriter на SQLite-файле:
+- заявки и метаданные raw_items раскладываются по date=/source=;
+- payload raw_items не читается и не выгружается;
+- повторная выгрузка заменяет партиции, а не дописывает их.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.dataset as ds  # noqa: E402
+from sqlalchemy import create_engine, event, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from dan_max_bids_parser.application.use_cases.export_analytics import (  # noqa: E402
+    ExportAnalyticsCommand,
+)
+from dan_max_bids_parser.application.use_cases.export_analytics_service import (  # noqa: E402
+    ExportAnalyticsService,
+)
+from dan_max_bids_parser.infrastructure.db.base import Base  # noqa: E402
+from dan_max_bids_parser.infrastructure.db.models import Bid, Job, RawItem, Source  # noqa: E402
+from dan_max_bids_parser.infrastructure.db.unit_of_work import SqlAlchemyUnitOfWork  # noqa: E402
+from dan_max_bids_parser.infrastructure.export.parquet_writer import (  # noqa: E402
+    ParquetDatasetWriter,
+)
+
+DAY = datetime(2025, 3, 12, 10, 0)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'analytics.sqlite'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as session:
+        session.add_all([
+            Source(id=1, code="ATI", name="ATI.SU", kind="html"),
+            Source(id=2, code="TG", name="Telegram", kind="telegram"),
+        ])
+        session.flush()
+        for idx in range(30):
+            created = DAY - timedelta(days=idx % 3, minutes=idx)
+            raw = RawItem(source_id=1 + idx % 2, fetched_at=created, created_at=created,
+                          payload={"html": "<p>" * 100}, status="parsed", hash=f"h{idx}")
+            session.add(raw)
+            session.flush()
+            session.add(Bid(source_id=raw.source_id, raw_item_id=raw.id, title=f"Щебень {idx}",
+                            weight_value=20 + idx, price_value=1000 * idx, price_currency="RUB",
+                            created_at=created, updated_at=created))
+        session.commit()
+    return engine
+
+
+def _service(engine, out_dir) -> ExportAnalyticsService:
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    return ExportAnalyticsService(
+        uow_factory=lambda: SqlAlchemyUnitOfWork(factory),
+        exporter=ParquetDatasetWriter(out_dir, row_group_size=4, max_rows_per_file=8),
+    )
+
+
+def test_exports_partitioned_bids_and_raw_item_metadata(engine, tmp_path):
+    out = tmp_path / "analytics"
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, stmt, *args: statements.append(stmt))
+
+    result = _service(engine, out).execute(
+        ExportAnalyticsCommand(include_raw_items=True, batch_size=7)
+    )
+
+    assert [(d.name, d.rows) for d in result.datasets] == [("bids", 30), ("raw_items", 30)]
+    assert (out / "bids" / "date=2025-03-12" / "source=ATI").is_dir()
+    assert result.datasets[0].files >= 6 and result.datasets[0].bytes > 0
+
+    bids = ds.dataset(out / "bids", format="parquet", partitioning="hive").to_table()
+    assert bids.num_rows == 30
+    assert bids.schema.field("created_at").type == pa.timestamp("us")
+    assert sorted(bids.column("id").to_pylist()) == list(range(1, 31))
+    row = bids.filter(ds.field("id") == 2).to_pylist()[0]
+    assert (row["source"], row["weight_tons"], row["title"]) == ("TG", 21.0, "Щебень 1")
+
+    raw = ds.dataset(out / "raw_items", format="parquet", partitioning="hive").to_table()
+    assert "payload" not in raw.column_names and raw.num_rows == 30
+    # payload не читался из БД
+    raw_selects = [s for s in statements if "FROM raw_items" in s]
+    assert raw_selects and all("payload" not in s for s in raw_selects)
+
+    with sessionmaker(bind=engine)() as session:
+        job = session.execute(select(Job)).scalar_one()
+    assert (job.job_type, job.status, job.items_total) == ("export_analytics", "success", 60)
+
+
+def test_reexport_replaces_partitions(engine, tmp_path):
+    out = tmp_path / "analytics"
+    _service(engine, out).execute(ExportAnalyticsCommand(source_codes=("ATI",)))
+    _service(engine, out).execute(ExportAnalyticsCommand(source_codes=("ATI",)))
+
+    table = ds.dataset(out / "bids", format="parquet", partitioning="hive").to_table()
+    assert table.num_rows == 15
+    assert set(table.column("source").to_pylist()) == {"ATI"}
+
+
+def test_unknown_source_raises_value_error(engine, tmp_path):
+    with pytest.raises(ValueError):
+        _service(engine, tmp_path).execute(ExportAnalyticsCommand(source_codes=("NOPE",)))
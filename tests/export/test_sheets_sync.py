@@ -0,0 +1,144 @@
+# path: tests/export/test_sheets_sync.py
+"""
+SheetsSyncWriter против локального FakeSheetsServer (HttpSheetsTransport):
+- 10k строк уходят парой batchUpdate, повтор без изменений — без записи;
+- upsert переписывает только изменённые строки, новые — в конец;
+- индекс из файла избавляет от чтения листа;
+- 429/503 повторяются с задержкой, при невосстановимой ошибке индекс сбрасывается.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from dan_max_bids_parser.infrastructure.export.fake_sheets_server import FakeSheetsServer
+from dan_max_bids_parser.infrastructure.export.sheets_sync import (
+    HttpSheetsTransport,
+    SheetsApiError,
+    SheetsSyncSettings,
+    SheetsSyncWriter,
+)
+
+HEADERS = ["ID", "Груз", "Вес, т", "Дата публикации"]
+
+
+def _rows(count: int, start: int = 1) -> list[list]:
+    return [
+        [idx, f"Щебень {idx}", 20.0 + idx % 5, datetime(2025, 3, 1, 8, idx % 60)]
+        for idx in range(start, start + count)
+    ]
+
+
+@pytest.fixture
+def server():
+    with FakeSheetsServer() as fake:
+        yield fake
+
+
+def _writer(server, sleeps=None, **kwargs) -> SheetsSyncWriter:
+    transport = HttpSheetsTransport("sheet-1", base_url=server.base_url)
+    return SheetsSyncWriter(
+        transport,
+        sheet_title="Заявки",
+        sleep=(sleeps.append if sleeps is not None else lambda _: None),
+        **kwargs,
+    )
+
+
+def _sync(writer: SheetsSyncWriter, rows, mode: str = "replace", chunk: int = 1000) -> None:
+    writer.begin(HEADERS, mode)
+    for offset in range(0, len(rows), chunk):
+        writer.write_rows(rows[offset: offset + chunk])
+    writer.finish()
+
+
+def test_sync_10k_rows_in_a_handful_of_calls(server):
+    writer = _writer(server)
+    _sync(writer, _rows(10_000))
+
+    sheet = server.rows("Заявки")
+    assert sheet[0] == HEADERS and len(sheet) == 10_001
+    assert sheet[1] == [1, "Щебень 1", 21, "2025-03-01 08:01:00"]
+    # 1 чтение листа + 40k ячеек одним batchUpdate
+    assert dict(server.requests) == {"get": 1, "batchUpdate": 1}
+
+    again = _writer(server)
+    _sync(again, _rows(10_000))
+    assert server.requests["batchUpdate"] == 1  # ничего не изменилось — ничего не пишем
+    assert again.stats.rows_written == 0
+
+
+def test_request_limits_split_batches(server):
+    writer = _writer(server, settings=SheetsSyncSettings(max_cells_per_request=4_000))
+    _sync(writer, _rows(2_000))
+
+    assert server.requests["batchUpdate"] == 3  # 2001 строка по 1000 строк на запрос
+    assert len(server.rows("Заявки")) == 2_001
+
+
+def test_upsert_rewrites_changed_rows_only(server):
+    _sync(_writer(server), _rows(100))
+
+    changed = _rows(100)
+    changed[9][1] = "Песок"
+    changed[10][1] = "Гравий"
+    changed[49][2] = 40
+    writer = _writer(server)
+    _sync(writer, changed[9:11] + [changed[49]] + _rows(3, start=101), mode="upsert")
+
+    sheet = server.rows("Заявки")
+    assert len(sheet) == 104
+    assert sheet[10][1] == "Песок" and sheet[11][1] == "Гравий" and sheet[50][2] == 40
+    assert [r[0] for r in sheet[101:]] == [101, 102, 103]
+    # строки 11-12, 51 и 102-104 — три диапазона в одном запросе
+    assert writer.stats.ranges_written == 3 and writer.stats.rows_written == 6
+    assert server.requests["batchUpdate"] == 2
+
+
+def test_replace_clears_tail_and_index_file_skips_reads(server, tmp_path):
+    index = tmp_path / "sheets" / "index.json"
+    _sync(_writer(server, index_path=index), _rows(50))
+    assert index.exists() and server.requests["get"] == 1
+
+    writer = _writer(server, index_path=index)
+    _sync(writer, _rows(30))
+
+    assert server.requests["get"] == 1  # индекс взят из файла
+    assert writer.stats.rows_cleared == 20 and writer.stats.rows_written == 0
+    assert len(server.rows("Заявки")) == 31
+
+
+def test_retries_throttling_with_backoff(server):
+    sleeps: list[float] = []
+    writer = _writer(server, sleeps=sleeps)
+    writer.begin(HEADERS)
+    writer.write_rows(_rows(10))
+    server.fail_next(429, retry_after=2)
+    server.fail_next(503)
+    writer.finish()
+
+    assert sleeps[0] == 2 and 0.5 <= sleeps[1] <= 2.0
+    assert writer.stats.retries == 2
+    assert len(server.rows("Заявки")) == 11
+
+
+def test_fatal_error_drops_index_file(server, tmp_path):
+    index = tmp_path / "index.json"
+    _sync(_writer(server, index_path=index), _rows(5))
+
+    writer = _writer(server, index_path=index)
+    writer.begin(HEADERS, "upsert")
+    writer.write_rows(_rows(2, start=6))
+    server.fail_next(400)
+    with pytest.raises(SheetsApiError):
+        writer.finish()
+    assert not index.exists()
+
+
+def test_append_with_other_columns_is_rejected(server):
+    _sync(_writer(server), _rows(3))
+    writer = _writer(server)
+    with pytest.raises(ValueError):
+        writer.begin(["ID", "Груз"], "append")
@@ -14,6 +14,7 @@ from typing import Any
 
 import pytest
 
+from dan_max_bids_parser.domain.entities import SourceEntity
 from dan_max_bids_parser.interfaces import harvest_source_cli
 
 
@@ -27,7 +28,7 @@ def test_main_success_calls_run_harvest_and_returns_zero(monkeypatch, capsys):
 
     called: dict[str, Any] = {}
 
-    def fake_run_harvest(source_code: str) -> None:
+    def fake_run_harvest(source_code: str, *args: Any) -> None:
         called["source_code"] = source_code
 
     monkeypatch.setattr(
@@ -51,7 +52,7 @@ def test_main_returns_one_on_value_error(monkeypatch, capsys):
     - напечатать сообщение с префиксом 'ERROR:'.
     """
 
-    def fake_run_harvest(source_code: str) -> None:  # noqa: ARG001
+    def fake_run_harvest(source_code: str, *args: Any) -> None:  # noqa: ARG001
         raise ValueError("Source with code='UNKNOWN' not found")
 
     monkeypatch.setattr(
@@ -74,7 +75,7 @@ def test_main_returns_one_on_unexpected_exception(monkeypatch, capsys):
     - напечатать сообщение с префиксом 'UNEXPECTED ERROR:'.
     """
 
-    def fake_run_harvest(source_code: str) -> None:  # noqa: ARG001
+    def fake_run_harvest(source_code: str, *args: Any) -> None:  # noqa: ARG001
         raise RuntimeError("boom")
 
     monkeypatch.setattr(
@@ -88,3 +89,83 @@ def test_main_returns_one_on_unexpected_exception(monkeypatch, capsys):
 
     assert exit_code == 1
     assert "UNEXPECTED ERROR: boom" in captured.out
+
+
+def test_main_passes_synthetic_provider_and_runs(monkeypatch):
+    """--provider synthetic собирает SyntheticRawItemProvider с параметрами из CLI."""
+    from dan_max_bids_parser.infrastructure.providers.synthetic import SyntheticRawItemProvider
+
+    called: dict[str, Any] = {}
+
+    def fake_run_harvest(source_code: str, raw_item_provider: Any, runs: int, options: Any) -> None:
+        called.update(provider=raw_item_provider, runs=runs)
+
+    monkeypatch.setattr(harvest_source_cli, "run_harvest", fake_run_harvest)
+
+    exit_code = harvest_source_cli.main(
+        ["--source-code", "ATI", "--provider", "synthetic", "--items", "7", "--runs", "3"]
+    )
+
+    assert exit_code == 0
+    assert isinstance(called["provider"], SyntheticRawItemProvider)
+    assert called["runs"] == 3
+    items = called["provider"].fetch_raw_items(SourceEntity(id=1, code="ATI"))
+    assert len(items) == 7
+
+
+def test_main_passes_staged_pipeline_options(monkeypatch):
+    """--staged передаёт настройки этапов в run_harvest."""
+    called: dict[str, Any] = {}
+
+    def fake_run_harvest(source_code: str, raw_item_provider: Any, runs: int, options: Any) -> None:
+        called.update(options=options)
+
+    monkeypatch.setattr(harvest_source_cli, "run_harvest", fake_run_harvest)
+
+    exit_code = harvest_source_cli.main(
+        ["--source-code", "ATI", "--staged", "--batch-size", "50", "--parse-workers", "3"]
+    )
+
+    assert exit_code == 0
+    options = called["options"]
+    assert (options.staged, options.batch_size, options.parse_workers, options.queue_size) == (
+        True, 50, 3, 4
+    )
+
+
+@pytest.mark.parametrize("mode", ["cpu", "memory"])
+def test_staged_rejects_main_thread_profiles(mode, capsys):
+    """cpu/memory не видят воркеров конвейера — сочетание с --staged запрещено."""
+    with pytest.raises(SystemExit) as exc_info:
+        harvest_source_cli.parse_args(["--source-code", "ATI", "--staged", "--profile", mode])
+
+    assert exc_info.value.code == 2
+    assert f"--profile {mode} does not see the --staged worker threads" in capsys.readouterr().err
+    options = harvest_source_cli.parse_args(["--source-code", "ATI", "--staged", "--profile", "sql"])
+    assert options.profile == "sql"
+
+
+def test_main_passes_source_lock_options(monkeypatch):
+    """Ручной/cron-запуск берёт блокировку источника; --on-busy по умолчанию — skip."""
+    called: dict[str, Any] = {}
+
+    def fake_run_harvest(source_code: str, raw_item_provider: Any, runs: int, options: Any) -> None:
+        called.update(options=options)
+
+    monkeypatch.setattr(harvest_source_cli, "run_harvest", fake_run_harvest)
+
+    assert harvest_source_cli.main(["--source-code", "ATI"]) == 0
+    assert (called["options"].on_busy, called["options"].lock_wait_seconds) == ("skip", 60.0)
+
+    harvest_source_cli.main(["--source-code", "ATI", "--on-busy", "wait"])
+    assert called["options"].on_busy == "wait"
+
+
+def test_build_service_wraps_harvest_in_source_lock():
+    from dan_max_bids_parser.application.source_lock import ExclusiveHarvestService
+
+    options = harvest_source_cli.parse_args(["--source-code", "ATI", "--on-busy", "queue"])
+    service = harvest_source_cli._build_service(options=options)
+
+    assert isinstance(service, ExclusiveHarvestService)
+    assert isinstance(harvest_source_cli._build_service(), ExclusiveHarvestService)
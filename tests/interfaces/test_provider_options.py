@@ -0,0 +1,38 @@
+# path: tests/interfaces/test_provider_options.py
+"""
+Общие флаги провайдера (provider_options): ручной запуск, планировщик и
+воркер очереди разбирают одни и те же --provider/--items/... и строят
+провайдер одной функцией build_provider.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from dan_max_bids_parser.domain.entities import SourceEntity
+from dan_max_bids_parser.infrastructure.providers.synthetic import SyntheticRawItemProvider
+from dan_max_bids_parser.interfaces import harvest_source_cli, job_queue_cli, scheduler_cli
+from dan_max_bids_parser.interfaces.provider_options import StubRawItemProvider, build_provider
+
+SYNTHETIC = ["--provider", "synthetic", "--items", "4", "--seed", "7", "--mean-rows", "3"]
+
+
+@pytest.mark.parametrize(
+    "parse_args, argv",
+    [
+        (harvest_source_cli.parse_args, ["--source-code", "ATI", *SYNTHETIC]),
+        (scheduler_cli.parse_args, SYNTHETIC),
+        (job_queue_cli.parse_args, ["work", *SYNTHETIC]),
+    ],
+    ids=["harvest", "scheduler", "worker"],
+)
+def test_all_clis_build_the_same_synthetic_provider(parse_args, argv):
+    provider = build_provider(parse_args(argv))
+
+    assert isinstance(provider, SyntheticRawItemProvider)
+    items = provider.fetch_raw_items(SourceEntity(id=1, code="ATI"))
+    assert len(items) == 4
+
+
+def test_stub_provider_is_the_default():
+    assert isinstance(build_provider(scheduler_cli.parse_args([])), StubRawItemProvider)
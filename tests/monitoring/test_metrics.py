@@ -0,0 +1,286 @@
+# path: tests/monitoring/test_metrics.py
+from __future__ import annotations
+
+import threading
+import urllib.request
+
+import pytest
+
+from dan_max_bids_parser.application.stages import StageStats
+from dan_max_bids_parser.application.use_cases.harvest_source import (
+    RunSourceHarvestingCommand,
+)
+from dan_max_bids_parser.domain.entities import RawItemEntity, SourceEntity
+from dan_max_bids_parser.infrastructure.monitoring.instrumentation import (
+    HarvestMetrics,
+    InstrumentedHarvestService,
+    InstrumentedRawItemProvider,
+    InstrumentedSourceLock,
+    InstrumentedUnitOfWork,
+)
+from dan_max_bids_parser.infrastructure.monitoring.metrics import (
+    MetricsRegistry,
+    NoopRegistry,
+    configure_metrics,
+    get_registry,
+    render_text,
+    start_http_server,
+    write_textfile,
+)
+
+
+def test_counter_shards_are_summed_across_threads():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs", ["source"]).labels("ATI")
+
+    def work() -> None:
+        for _ in range(10_000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value == 40_000
+
+
+def test_shards_of_finished_threads_are_folded():
+    registry = MetricsRegistry()
+    counter = registry.counter("runs_total", "Runs").labels()
+    histogram = registry.histogram("run_seconds", "Run", buckets=[1.0]).labels()
+
+    def work() -> None:
+        counter.inc()
+        histogram.observe(0.5)
+
+    for _ in range(20):
+        threads = [threading.Thread(target=work) for _ in range(100)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert counter.value == 2000
+    assert histogram.snapshot() == ([2000, 2000], 2000, 1000.0)
+    # Живы шарды только работающих потоков, а не всех 2000 когда-либо писавших
+    assert len(counter._shards) <= 1
+    assert len(histogram._shards) <= 1
+
+
+def test_render_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.counter("rows_total", "Rows inserted", ["table"]).labels(table="bids").inc(3)
+    registry.gauge("queue_depth", "Depth").set(2)
+    histogram = registry.histogram("fetch_seconds", "Fetch", ["source"], buckets=[0.1, 1.0])
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.labels('A"TI').observe(value)
+
+    text = render_text(registry)
+
+    assert text.splitlines() == [
+        "# HELP fetch_seconds Fetch",
+        "# TYPE fetch_seconds histogram",
+        'fetch_seconds_bucket{source="A\\"TI",le="0.1"} 2',
+        'fetch_seconds_bucket{source="A\\"TI",le="1.0"} 3',
+        'fetch_seconds_bucket{source="A\\"TI",le="+Inf"} 4',
+        'fetch_seconds_sum{source="A\\"TI"} 3.65',
+        'fetch_seconds_count{source="A\\"TI"} 4',
+        "# HELP queue_depth Depth",
+        "# TYPE queue_depth gauge",
+        "queue_depth 2",
+        "# HELP rows_total Rows inserted",
+        "# TYPE rows_total counter",
+        'rows_total{table="bids"} 3',
+    ]
+
+
+def test_registry_rejects_conflicting_registration():
+    registry = MetricsRegistry()
+    assert registry.counter("x", "X") is registry.counter("x", "X")
+    with pytest.raises(ValueError):
+        registry.gauge("x", "X")
+    with pytest.raises(ValueError):
+        registry.counter("y", "Y", ["a"]).labels("1", "2")
+
+
+def test_noop_mode_switches_global_registry():
+    try:
+        registry = configure_metrics(enabled=False)
+        assert isinstance(registry, NoopRegistry)
+        counter = get_registry().counter("x", "X", ["a"])
+        counter.labels("1").inc()
+        assert render_text(get_registry()) == ""
+    finally:
+        configure_metrics(enabled=True)
+    assert get_registry().enabled
+
+
+def test_http_server_and_textfile_expose_metrics(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("hits_total", "Hits").inc()
+
+    server = start_http_server(0, registry=registry)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.stop()
+    assert "hits_total 1" in body
+    assert content_type.startswith("text/plain; version=0.0.4")
+
+    path = tmp_path / "metrics" / "harvest.prom"
+    write_textfile(path, registry)
+    assert path.read_text(encoding="utf-8") == render_text(registry)
+
+
+# --- Инструментирование ---
+
+
+class _Provider:
+    def fetch_raw_items(self, source):
+        return [RawItemEntity(source_id=1, payload="a"), RawItemEntity(source_id=1, payload="b")]
+
+
+class _Repo:
+    def add_many(self, items):
+        return list(items)
+
+    def get_by_id(self, item_id):
+        return item_id
+
+
+class _UnitOfWork:
+    def __init__(self) -> None:
+        self.sources = self.configs = self.jobs = self.job_queue = self.export_cursors = None
+        self.bid_search = self.daily_stats = self.worker_nodes = None
+        self.raw_items = _Repo()
+        self.bids = _Repo()
+        self.committed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def commit(self) -> None:
+        self.committed = True
+
+    def rollback(self) -> None:
+        pass
+
+
+def test_instrumented_uow_and_provider_record_metrics():
+    registry = MetricsRegistry()
+    metrics = HarvestMetrics(registry)
+    inner = _UnitOfWork()
+
+    with InstrumentedUnitOfWork(inner, metrics) as uow:
+        uow.raw_items.add_many([1, 2, 3])
+        # Остальные методы делегируются без изменений
+        assert uow.bids.get_by_id(7) == 7
+        uow.commit()
+
+    items = InstrumentedRawItemProvider(_Provider(), metrics).fetch_raw_items(
+        SourceEntity(id=1, code="ATI")
+    )
+    # Обёртка ленива, как провайдер: счёт идёт по мере чтения
+    assert metrics.raw_items_fetched.labels("ATI").value == 0
+    assert len(list(items)) == 2
+
+    assert inner.committed
+    assert metrics.rows_inserted.labels("raw_items").value == 3
+    assert metrics.raw_items_fetched.labels("ATI").value == 2
+    _, fetches, _ = metrics.fetch_seconds.labels("ATI").snapshot()
+    assert fetches == 1
+    assert "dan_max_db_commit_seconds_count 1" in render_text(registry)
+
+
+def test_instrumented_harvest_service_counts_runs_by_status():
+    registry = MetricsRegistry()
+    metrics = HarvestMetrics(registry)
+
+    class Service:
+        def __init__(self) -> None:
+            self.fail = False
+
+        def execute(self, command) -> None:
+            if self.fail:
+                raise ValueError("boom")
+
+    inner = Service()
+    service = InstrumentedHarvestService(inner, metrics)
+    service.execute(RunSourceHarvestingCommand(source_code="ATI"))
+    inner.fail = True
+    with pytest.raises(ValueError):
+        service.execute(RunSourceHarvestingCommand(source_code="ATI"))
+
+    assert metrics.harvest_runs.labels("ATI", "success").value == 1
+    assert metrics.harvest_runs.labels("ATI", "failed").value == 1
+
+
+def test_instrumented_harvest_service_keeps_query_scope_error(monkeypatch):
+    from dan_max_bids_parser.infrastructure.monitoring import instrumentation
+
+    def broken_scope(name):
+        raise RuntimeError("scope is broken")
+
+    monkeypatch.setattr(instrumentation, "query_scope", broken_scope)
+    service = InstrumentedHarvestService(lambda: None, HarvestMetrics(MetricsRegistry()))
+
+    with pytest.raises(RuntimeError, match="scope is broken"):
+        service.execute(RunSourceHarvestingCommand(source_code="ATI"))
+
+
+def test_metric_base_class_is_abstract():
+    from dan_max_bids_parser.infrastructure.monitoring.metrics import _Metric
+
+    with pytest.raises(TypeError):
+        _Metric("x", "X", [])
+
+
+def test_instrumented_source_lock_records_wait_and_busy():
+    registry = MetricsRegistry()
+    metrics = HarvestMetrics(registry)
+
+    class Locks:
+        def __init__(self) -> None:
+            self.held: set[str] = set()
+
+        def acquire(self, source_code: str, timeout: float = 0.0) -> bool:
+            if source_code in self.held:
+                return False
+            self.held.add(source_code)
+            return True
+
+        def release(self, source_code: str) -> None:
+            self.held.discard(source_code)
+
+    locks = InstrumentedSourceLock(Locks(), metrics)
+    assert locks.acquire("ATI")
+    assert not locks.acquire("ATI")
+    locks.release("ATI")
+
+    _, count, _ = metrics.source_lock_wait_seconds.labels("ATI").snapshot()
+    assert count == 2
+    assert metrics.source_lock_busy.labels("ATI").value == 1
+
+
+def test_stage_stats_are_exported():
+    registry = MetricsRegistry()
+    metrics = HarvestMetrics(registry)
+
+    metrics.set_stage_queue_depth("store", 3)
+    metrics.record_stages([
+        StageStats("parse", workers=2, busy_seconds=3.0, blocked_seconds=0.5, wall_seconds=2.0),
+        StageStats("store", busy_seconds=1.0, wall_seconds=2.0),
+    ])
+    metrics.record_stages([StageStats("parse", workers=2, blocked_seconds=0.25, wall_seconds=1.0)])
+
+    assert metrics.queue_depth.labels("harvest_store").value == 3
+    assert metrics.stage_utilization.labels("store").value == 0.5
+    assert metrics.stage_utilization.labels("parse").value == 0.0
+    assert metrics.stage_blocked_seconds.labels("parse").value == 0.75
@@ -0,0 +1,66 @@
+# path: tests/monitoring/test_profiling.py
+from __future__ import annotations
+
+"""
+Тесты профилировщиков CLI: каталоги с результатами, привязка SQL и
+памяти к этапам StageTimer.
+"""
+
+import pstats
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from dan_max_bids_parser.application.stage_timer import StageTimer
+from dan_max_bids_parser.infrastructure.monitoring.profiling import profile_session
+
+
+def test_cpu_profile_writes_pstats_and_report(tmp_path):
+    with profile_session("cpu", tmp_path, "harvest_ATI") as out:
+        sum(i * i for i in range(10_000))
+
+    assert out.parent == tmp_path and out.name.startswith("harvest_ATI_cpu_")
+    assert pstats.Stats(str(out / "cpu.pstats")).total_calls > 0
+    assert "by cumulative time" in (out / "cpu_top.txt").read_text(encoding="utf-8")
+
+
+def test_memory_profile_reports_stages(tmp_path):
+    timer = StageTimer()
+    with profile_session("memory", tmp_path, "run") as out:
+        with timer.stage("parse"):
+            blob = [bytearray(1024) for _ in range(2000)]
+        del blob
+
+    report = (out / "memory.txt").read_text(encoding="utf-8")
+    parse_line = next(line for line in report.splitlines() if line.startswith("parse"))
+    assert float(parse_line.split()[2]) >= 1.5  # peak MB этапа
+    assert "allocation sites" in report
+
+
+def test_sql_profile_logs_statements_by_stage(tmp_path):
+    engine = create_engine("sqlite://", future=True)
+    timer = StageTimer()
+    with profile_session("sql", tmp_path, "run", engine) as out:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (x INTEGER)"))
+            with timer.stage("persist_bids"):
+                conn.execute(text("INSERT INTO t VALUES (1), (2), (3)"))
+                conn.execute(text("SELECT * FROM t"))
+
+    log_lines = (out / "sql.log").read_text(encoding="utf-8").splitlines()
+    assert len(log_lines) == 3
+    assert sum("[persist_bids]" in line for line in log_lines) == 2
+    summary = (out / "sql_summary.txt").read_text(encoding="utf-8")
+    assert summary.startswith("total: 3 statements")
+    assert "persist_bids" in summary
+
+    # слушатели сняты — новые запросы не пишутся
+    with engine.begin() as conn:
+        conn.execute(text("SELECT 1"))
+    assert len((out / "sql.log").read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_unknown_mode_raises(tmp_path):
+    with pytest.raises(ValueError):
+        with profile_session("gpu", tmp_path, "run"):
+            pass
@@ -0,0 +1,163 @@
+# path: tests/parsing/test_html_extractor.py
+"""
+Тесты для конфигурируемого HTML-извлекателя на lxml.
+
+Проверяем:
+- извлечение полей по CSS и XPath, атрибуты, абсолютные ссылки;
+- XPath-функции со скалярным результатом (строка, число, логическое);
+- компиляцию правил только при смене версии конфигурации;
+- понятную ошибку на некорректном конфиге.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from dan_max_bids_parser.domain.entities import (
+    ConfigEntryEntity,
+    RawItemEntity,
+    SourceEntity,
+)
+from dan_max_bids_parser.infrastructure.parsing.html_extractor import (
+    LxmlHtmlParser,
+    compile_extractor,
+)
+
+
+LISTING_HTML = """
+<html><body>
+<table class="bids">
+  <tr class="bid" data-id="101">
+    <td class="cargo"><a href="/bid/101">Щебень гранитный</a></td>
+    <td class="route"><span class="from">Тверь</span> — <span class="to">Москва</span></td>
+    <td class="weight">25 т</td>
+    <td class="contact"><span>+7 900 000-00-01</span><span>Иван</span></td>
+  </tr>
+  <tr class="bid" data-id="102">
+    <td class="cargo"><a href="/bid/102">  Песок   мытый </a></td>
+    <td class="route"><span class="from">Клин</span> — <span class="to">Химки</span></td>
+  </tr>
+</table>
+</body></html>
+"""
+
+PARSER_CONFIG = {
+    "parser": {
+        "type": "html",
+        "items": {"css": "table.bids tr.bid"},
+        "fields": {
+            "external_id": {"xpath": "./@data-id"},
+            "title": {"css": "td.cargo a"},
+            "url": {"css": "td.cargo a", "attr": "href", "absolute": True},
+            "load_point": {"css": "span.from"},
+            "unload_point": "xpath:.//span[@class='to']",
+            "weight_tons": {"css": "td.weight"},
+            "contact": {"css": "td.contact span", "multiple": True, "join": ", "},
+        },
+    }
+}
+
+
+def test_compiled_extractor_returns_field_dicts() -> None:
+    extractor = compile_extractor(PARSER_CONFIG)
+
+    rows = extractor.extract(LISTING_HTML, base_url="https://ati.example/list?page=1")
+
+    assert rows == [
+        {
+            "external_id": "101",
+            "title": "Щебень гранитный",
+            "url": "https://ati.example/bid/101",
+            "load_point": "Тверь",
+            "unload_point": "Москва",
+            "weight_tons": "25 т",
+            "contact": "+7 900 000-00-01, Иван",
+        },
+        {
+            "external_id": "102",
+            "title": "Песок мытый",
+            "url": "https://ati.example/bid/102",
+            "load_point": "Клин",
+            "unload_point": "Химки",
+        },
+    ]
+
+
+def test_scalar_xpath_results_are_used_as_values() -> None:
+    extractor = compile_extractor(
+        {
+            "parser": {
+                "items": {"css": "table.bids tr.bid"},
+                "fields": {
+                    "title": {"xpath": "normalize-space(./td[1])"},
+                    "cells": {"xpath": "count(./td)"},
+                    "has_weight": {"xpath": "boolean(./td[@class='weight'])"},
+                    "ratio": {"xpath": "count(./td) div 8"},
+                    "missing": {"xpath": "string(./td[@class='price'])"},
+                },
+            }
+        }
+    )
+
+    rows = extractor.extract(LISTING_HTML)
+
+    assert rows == [
+        {"title": "Щебень гранитный", "cells": "4", "has_weight": "true", "ratio": "0.5"},
+        {"title": "Песок мытый", "cells": "2", "has_weight": "false", "ratio": "0.25"},
+    ]
+
+
+def test_extractor_handles_empty_and_broken_payload() -> None:
+    extractor = compile_extractor(PARSER_CONFIG)
+
+    assert extractor.extract("") == []
+    assert extractor.extract("<html><body><p>нет заявок</p></body></html>") == []
+
+
+def test_parser_recompiles_only_on_version_change() -> None:
+    parser = LxmlHtmlParser()
+    source = SourceEntity(id=1, code="ATI", name="ATI", kind="html")
+    entry = ConfigEntryEntity(id=1, code="ATI", name="ATI", data=PARSER_CONFIG)
+
+    assert parser.supports(source) is False
+
+    parser.refresh([entry])
+    first = parser._extractors["ATI"]
+
+    # Та же версия — объект не пересобирается.
+    parser.refresh([ConfigEntryEntity(id=1, code="ATI", name="ATI", data=PARSER_CONFIG)])
+    assert parser._extractors["ATI"] is first
+
+    # Изменился конфиг — новая версия, новые скомпилированные правила.
+    changed = {
+        "parser": {
+            "items": {"css": "tr.bid"},
+            "fields": {"title": {"css": "td.cargo a"}},
+        }
+    }
+    parser.refresh([ConfigEntryEntity(id=1, code="ATI", name="ATI", data=changed)])
+    assert parser._extractors["ATI"] is not first
+
+    rows = parser.parse(source, RawItemEntity(source_id=1, payload=LISTING_HTML))
+    assert rows == [{"title": "Щебень гранитный"}, {"title": "Песок мытый"}]
+
+    # Запись исчезла из активных — источник больше не поддерживается.
+    parser.refresh([])
+    assert parser.supports(source) is False
+
+
+def test_parser_skips_invalid_config() -> None:
+    parser = LxmlHtmlParser()
+    broken = ConfigEntryEntity(
+        code="BROKEN",
+        data={"parser": {"items": {"css": "tr[["}, "fields": {"title": {"css": "a"}}}},
+    )
+
+    parser.refresh([broken])
+
+    assert parser.supports(SourceEntity(code="BROKEN")) is False
+
+
+def test_compile_extractor_rejects_missing_fields() -> None:
+    with pytest.raises(ValueError, match="parser.fields"):
+        compile_extractor({"parser": {"items": {"css": "tr"}}})
@@ -0,0 +1,117 @@
+# path: tests/providers/test_synthetic_provider.py
+from __future__ import annotations
+
+"""
+Тесты SyntheticRawItemProvider: детерминированность, доля дублей,
+размеры payload, задержка и разбор HTML штатным парсером.
+"""
+
+import json
+
+import pytest
+
+from dan_max_bids_parser.domain.entities import ConfigEntryEntity, SourceEntity
+from dan_max_bids_parser.infrastructure.parsing.html_extractor import LxmlHtmlParser
+from dan_max_bids_parser.infrastructure.providers.synthetic import (
+    SyntheticProviderSettings,
+    SyntheticRawItemProvider,
+)
+
+ATI_PARSER_CONFIG = {
+    "parser": {
+        "type": "html",
+        "items": {"css": "table.bids-list tr.bid-row"},
+        "fields": {
+            "external_id": {"xpath": "./@data-bid-id"},
+            "title": {"css": "td.bid-cargo a.bid-link"},
+            "load_point": {"css": "td.bid-route span.route-from"},
+            "unload_point": {"css": "td.bid-route span.route-to"},
+            "price": {"css": "td.bid-price"},
+        },
+    }
+}
+
+ATI = SourceEntity(id=7, code="ATI", kind="html")
+MIXED = SourceEntity(id=8, code="MIX", kind="")
+
+
+def _fetch(settings: SyntheticProviderSettings, source: SourceEntity = MIXED, calls: int = 1):
+    provider = SyntheticRawItemProvider(settings, sleep=lambda _: None)
+    return [list(provider.fetch_raw_items(source)) for _ in range(calls)]
+
+
+def test_same_seed_gives_same_stream_and_new_batch_per_call():
+    settings = SyntheticProviderSettings(items_per_fetch=30, seed=3)
+    first = _fetch(settings, calls=2)
+    second = _fetch(settings, calls=2)
+
+    def key(batches):
+        return [[(i.external_id, i.payload) for i in batch] for batch in batches]
+
+    assert key(first) == key(second)
+    assert {i.external_id for i in first[0]}.isdisjoint(i.external_id for i in first[1])
+    assert all(i.source_id == MIXED.id for i in first[0])
+
+    other_seed = _fetch(SyntheticProviderSettings(items_per_fetch=30, seed=4))
+    assert key(other_seed) != key(first[:1])
+
+
+def test_mixed_kinds_are_valid_payloads():
+    (items,) = _fetch(SyntheticProviderSettings(items_per_fetch=60, seed=1))
+    kinds = {i.url.split("/")[4] for i in items}
+    assert kinds == {"html", "json", "telegram"}
+    for item in items:
+        if "/json/" in item.url:
+            data = json.loads(item.payload)
+            assert data["total"] == len(data["items"]) >= 1
+        elif "/html/" in item.url:
+            assert "bid-row" in item.payload
+
+
+def test_duplicate_ratio_replays_earlier_items():
+    settings = SyntheticProviderSettings(items_per_fetch=500, seed=2, duplicate_ratio=0.3)
+    (items,) = _fetch(settings)
+    duplicates = len(items) - len({i.external_id for i in items})
+    assert 100 <= duplicates <= 200
+
+    by_id = {}
+    for item in items:
+        assert by_id.setdefault(item.external_id, item.payload) == item.payload
+
+
+def test_size_distribution_follows_mean_rows():
+    small = _fetch(SyntheticProviderSettings(items_per_fetch=40, mean_rows=5), source=ATI)[0]
+    large = _fetch(SyntheticProviderSettings(items_per_fetch=40, mean_rows=100), source=ATI)[0]
+    avg = lambda items: sum(len(i.payload) for i in items) / len(items)  # noqa: E731
+    assert avg(large) > 5 * avg(small)
+
+
+def test_latency_is_simulated_once_per_fetch():
+    delays: list[float] = []
+    provider = SyntheticRawItemProvider(
+        SyntheticProviderSettings(items_per_fetch=5, latency_ms=200, latency_jitter_ms=50),
+        sleep=delays.append,
+    )
+    provider.fetch_raw_items(ATI)
+    provider.fetch_raw_items(ATI)
+    assert len(delays) == 2
+    assert all(0.2 <= d <= 0.25 for d in delays)
+
+
+def test_html_source_payloads_are_parsed_by_ati_config():
+    parser = LxmlHtmlParser()
+    parser.refresh([ConfigEntryEntity(id=1, code="ATI", name="ATI", data=ATI_PARSER_CONFIG)])
+    (items,) = _fetch(SyntheticProviderSettings(items_per_fetch=3, mean_rows=10), source=ATI)
+
+    assert all("/html/" in i.url for i in items)
+    rows = parser.parse(ATI, items[0])
+    assert rows and rows[0]["external_id"] and rows[0]["load_point"]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"duplicate_ratio": 1.5}, {"kinds": {"pdf": 1.0}}, {"items_per_fetch": -1}, {"mean_rows": 0}],
+)
+def test_invalid_settings_raise_value_error(kwargs):
+    with pytest.raises(ValueError):
+        SyntheticProviderSettings(**kwargs)